@@ -406,6 +406,13 @@ class AbstractVariationalDriver(abc.ABC):
             for the corresponding operators as leaves.
         """
 
+        # If the expectation values are computed with the standard method, let the
+        # state share the evaluations of the model among all the observables.
+        if type(self)._estimate_stats is AbstractVariationalDriver._estimate_stats and (
+            hasattr(self.state, "expect_many")
+        ):
+            return self.state.expect_many(observables)
+
         # Do not unpack operators, even if they are pytrees!
         # this is necessary to support jax operators.
         return jax.tree_util.tree_map(
@@ -146,6 +146,13 @@ class TDVPSchmitt(TDVPBaseDriver):
                 (soft) truncated. This is :math:`\epsilon_{SNR}` in the formulas above.
 
         """
+        if getattr(variational_state, "reweighting_threshold", None) is not None:
+            raise ValueError(
+                "TDVPSchmitt does not support variational states with a "
+                "`reweighting_threshold`, as it does not account for the "
+                "importance weights of the samples."
+            )
+
         self.propagation_type = propagation_type
         if isinstance(variational_state, VariationalMixedState):
             # assuming Lindblad Dynamics
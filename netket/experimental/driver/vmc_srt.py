@@ -28,8 +28,12 @@ from netket.driver import AbstractVariationalDriver
 from netket.errors import UnoptimalSRtWarning
 from netket.jax import sharding
 from netket.operator import AbstractOperator
+from netket.optimizer.qgt.qgt_jacobian_common import (
+    cast_jacobian,
+    mixed_precision_tensordot,
+)
 from netket.utils import mpi, timing
-from netket.utils.types import ScalarOrSchedule, Optimizer, PyTree
+from netket.utils.types import DType, ScalarOrSchedule, Optimizer, PyTree
 from netket.vqs import MCState
 
 from jax.flatten_util import ravel_pytree
@@ -82,7 +86,12 @@ def SRt(
     # proc, twons, np -> (proc, twons) np
     O_LT = O_LT.reshape(-1, O_LT.shape[-1])
 
-    matrix, token = mpi.mpi_reduce_sum_jax(O_LT @ O_LT.T, token=token)
+    # If the jacobian is stored in reduced precision, accumulate the products
+    # in the precision of the local energies.
+    acc_dtype = jnp.promote_types(O_LT.dtype, dv.dtype)
+    matrix, token = mpi.mpi_reduce_sum_jax(
+        jnp.matmul(O_LT, O_LT.T, preferred_element_type=acc_dtype), token=token
+    )
     matrix_side = matrix.shape[-1]  # * it can be Ns or 2*Ns, depending on mode
 
     if mpi.rank == 0:
@@ -101,7 +110,7 @@ def SRt(
         shape = jnp.zeros((int(matrix_side / mpi.n_nodes),), dtype=jnp.float64)
         aus_vector, token = mpi.mpi_scatter_jax(shape, token=token)
 
-    updates = O_L.T @ aus_vector
+    updates = mixed_precision_tensordot(O_L.T, aus_vector, axes=1)
     updates, token = mpi.mpi_allreduce_sum_jax(updates, token=token)
 
     # If complex mode and we have complex parameters, we need
@@ -155,6 +164,7 @@ class VMC_SRt(AbstractVariationalDriver):
         diag_shift: ScalarOrSchedule,
         linear_solver_fn: Callable[[jax.Array, jax.Array], jax.Array] = linear_solver,
         jacobian_mode: str | None = None,
+        jacobian_dtype: DType | None = None,
         variational_state: MCState = None,
     ):
         """
@@ -171,11 +181,23 @@ class VMC_SRt(AbstractVariationalDriver):
                               updates of the parameters
             jacobian_mode: The mode used to compute the jacobian of the variational state. Can be `'real'`
                     or `'complex'` (defaults to the dtype of the output of the model).
+            jacobian_dtype: If supplied, the (real) dtype used to store the centred
+                    jacobian, such as `jnp.float32` or `jnp.bfloat16`. The
+                    :math:`X^TX` matrix is still accumulated in the precision of the
+                    parameters. Reduces the memory used by the jacobian and speeds up
+                    its products (defaults to the dtype of the parameters).
             variational_state: The :class:`netket.vqs.MCState` to be optimised. Other
                 variational states are not supported.
         """
         super().__init__(variational_state, optimizer, minimized_quantity_name="Energy")
 
+        if getattr(variational_state, "reweighting_threshold", None) is not None:
+            raise ValueError(
+                "VMC_SRt does not support variational states with a "
+                "`reweighting_threshold`, as it does not account for the "
+                "importance weights of the samples."
+            )
+
         if variational_state.hilbert != hamiltonian.hilbert:
             raise TypeError(
                 dedent(
@@ -214,6 +236,7 @@ class VMC_SRt(AbstractVariationalDriver):
 
         self.diag_shift = diag_shift
         self.jacobian_mode = jacobian_mode
+        self.jacobian_dtype = jacobian_dtype
         self._linear_solver_fn = linear_solver_fn
 
         self._params_structure = jax.tree_util.tree_map(
@@ -287,6 +310,7 @@ class VMC_SRt(AbstractVariationalDriver):
             center=True,
             chunk_size=self.state.chunk_size,
         )  # jacobians is centered
+        jacobians = cast_jacobian(jacobians, self.jacobian_dtype)
 
         diag_shift = self.diag_shift
         if callable(self.diag_shift):
@@ -20,6 +20,7 @@ import jax.numpy as jnp
 
 from netket.operator import DiscreteOperator
 from netket.hilbert import SpinOrbitalFermions
+from netket.jax import canonicalize_dtypes
 from netket.utils.optional_deps import import_optional_dependency
 from netket.operator import FermionOperator2nd
 
@@ -216,6 +217,200 @@ def operator_from_arrays(
     return cls(hi, terms, weights, constant)
 
 
+def compute_pyscf_integrals_packed(mol, mo_coeff):
+    """
+    Computes the nuclear repulsion energy, the one-body integrals and the
+    symmetry-unique two-body integrals in the molecular orbital basis, without
+    ever building the full 4-index tensor.
+
+    Returns:
+        The constant, the matrix of one-body integrals and the 8-fold symmetry
+        packed electron repulsion integrals :math:`(pq|rs)` (see
+        :func:`pyscf.ao2mo.restore`).
+    """
+    pyscf = import_optional_dependency("pyscf", descr="from_pyscf_molecule")
+
+    n_orbitals = mo_coeff.shape[1]
+    t_ij_ao = mol.intor("int1e_kin") + mol.intor("int1e_nuc")
+    t_ij_mo = mo_coeff.T @ t_ij_ao @ mo_coeff
+    eri = pyscf.ao2mo.restore(8, pyscf.ao2mo.kernel(mol, mo_coeff), n_orbitals)
+    const = float(mol.energy_nuc())
+    return const, t_ij_mo, eri
+
+
+def _pair_index(i, j):
+    # index of (i, j) in the packed lower triangle of a symmetric matrix
+    i, j = np.maximum(i, j), np.minimum(i, j)
+    return i * (i + 1) // 2 + j
+
+
+def _packed_eri(eri, p, q, r, s):
+    # (pq|rs) from the 8-fold symmetry packed integrals
+    return eri[_pair_index(_pair_index(p, q), _pair_index(r, s))]
+
+
+def one_body_terms(tij, *, cutoff: float = 1e-11):
+    r"""
+    Returns the terms :math:`T_{pq} \hat{c}^\dagger_{p\sigma}\hat{c}_{q\sigma}`
+    of the one-body hamiltonian in spin-orbital basis, following the NetKet
+    convention for the spin, as arrays of terms and weights.
+    """
+    n_orbitals = tij.shape[0]
+    p, q = np.nonzero(np.abs(tij) > cutoff)
+    w = tij[p, q]
+    P = np.concatenate([p, p + n_orbitals])
+    Q = np.concatenate([q, q + n_orbitals])
+    terms = np.stack(
+        [np.stack([P, np.ones_like(P)], -1), np.stack([Q, np.zeros_like(Q)], -1)],
+        axis=1,
+    )
+    return terms, np.concatenate([w, w])
+
+
+def two_body_terms_chunked(
+    eri, n_orbitals: int, *, cutoff: float = 1e-11, chunk_size: int = 2**22
+):
+    r"""
+    Iterates over the two-body terms of the electronic hamiltonian
+    :math:`\frac{1}{2}\sum_{pqrs\sigma\tau} (ps|qr)\hat{c}^\dagger_{p\sigma}
+    \hat{c}^\dagger_{q\tau}\hat{c}_{r\tau}\hat{c}_{s\sigma}` in spin-orbital basis,
+    following the NetKet convention for the spin.
+
+    The terms are directly generated in the ordered form
+    :math:`\hat{c}^\dagger_P\hat{c}^\dagger_Q\hat{c}_R\hat{c}_S` with `P>Q` and
+    `R>S`, where every term appears only once. They are computed from the
+    symmetry-unique integrals for a chunk of creation pairs `(P, Q)` at a time,
+    and the terms with weights below the cutoff are removed immediately.
+
+    Args:
+        eri: The 8-fold symmetry packed electron repulsion integrals
+            :math:`(pq|rs)` in the molecular orbital basis, as returned by
+            :func:`pyscf.ao2mo.restore`.
+        n_orbitals: The number of spatial orbitals.
+        cutoff: Ignores all terms with weight of magnitude below this value.
+        chunk_size: The approximate number of candidate terms in every chunk.
+
+    Yields:
+        Arrays of terms of shape `(n_terms, 4, 2)` and the corresponding weights.
+    """
+    M = 2 * n_orbitals
+    P, Q = np.tril_indices(M, -1)
+    n_pairs = len(P)
+    pairs_per_chunk = max(1, chunk_size // n_pairs)
+
+    for start in range(0, n_pairs, pairs_per_chunk):
+        # all combinations of the creation pairs of this chunk with the
+        # annihilation pairs that conserve the spin
+        i, j = np.meshgrid(
+            np.arange(start, min(start + pairs_per_chunk, n_pairs)),
+            np.arange(n_pairs),
+            indexing="ij",
+        )
+        i, j = i.reshape(-1), j.reshape(-1)
+        conserves_spin = (P[i] // n_orbitals + Q[i] // n_orbitals) == (
+            P[j] // n_orbitals + Q[j] // n_orbitals
+        )
+        i, j = i[conserves_spin], j[conserves_spin]
+        tP, tQ, tR, tS = P[i], Q[i], P[j], Q[j]
+
+        # antisymmetrized weight (ps|qr) δ(σP,σS) δ(σQ,σR) - (qs|pr) δ(σQ,σS) δ(σP,σR)
+        p, q, r, s = (x % n_orbitals for x in (tP, tQ, tR, tS))
+        sP, sQ, sR, sS = (x // n_orbitals for x in (tP, tQ, tR, tS))
+        w = np.where(sP == sS, _packed_eri(eri, p, s, q, r), 0) - np.where(
+            sQ == sS, _packed_eri(eri, q, s, p, r), 0
+        )
+
+        mask = np.abs(w) > cutoff
+        sites = np.stack([tP, tQ, tR, tS], axis=-1)[mask]
+        daggers = np.broadcast_to(np.array([1, 1, 0, 0]), sites.shape)
+        yield np.stack([sites, daggers], axis=-1), w[mask]
+
+
+def operator_from_integrals(
+    const,
+    tij,
+    eri,
+    n_electrons,
+    hi=None,
+    cls=FermionOperator2nd,
+    *,
+    cutoff: float = 1e-11,
+    chunk_size: int = 2**22,
+    memmap_file: str | None = None,
+):
+    r"""
+    Constructs the electronic hamiltonian
+    :math:`\hat{H} = E + \sum_{pq\sigma} T_{pq}\hat{c}^\dagger_{p\sigma}\hat{c}_{q\sigma}
+    + \frac{1}{2}\sum_{pqrs\sigma\tau} (ps|qr)\hat{c}^\dagger_{p\sigma}
+    \hat{c}^\dagger_{q\tau}\hat{c}_{r\tau}\hat{c}_{s\sigma}`
+    from the integrals in the spatial orbital basis.
+
+    The terms are generated chunk by chunk (see
+    :func:`two_body_terms_chunked`) directly in the array form used internally
+    by the fermionic operators, without building the 4-index tensor in the
+    spin-orbital basis.
+
+    Args:
+        const: The constant energy shift :math:`E`.
+        tij: The matrix of one-body integrals :math:`T_{pq}`.
+        eri: The 8-fold symmetry packed electron repulsion integrals
+            :math:`(pq|rs)`, as returned by :func:`pyscf.ao2mo.restore`.
+        n_electrons: The number of electrons per spin.
+        hi: (optional) The Hilbert space of the operator.
+        cls: The fermionic operator class to construct.
+        cutoff: Ignores all terms with weight of magnitude below this value.
+        chunk_size: The approximate number of candidate two-body terms
+            processed at once.
+        memmap_file: If specified, the arrays of terms and weights are written
+            chunk by chunk to the files `memmap_file + ".terms"` and
+            `memmap_file + ".weights"`, and the operator is backed by
+            :class:`numpy.memmap` arrays of those files.
+    """
+    n_orbitals = tij.shape[0]
+    if hi is None:
+        hi = SpinOrbitalFermions(
+            n_orbitals=n_orbitals, s=1 / 2, n_fermions_per_spin=tuple(n_electrons)
+        )
+    dtype = canonicalize_dtypes(float, tij, eri)
+
+    def _chunks():
+        if np.abs(const) > cutoff:
+            yield np.zeros((1, 0, 2), dtype=int), np.array([const])
+        yield one_body_terms(tij, cutoff=cutoff)
+        yield from two_body_terms_chunked(
+            eri, n_orbitals, cutoff=cutoff, chunk_size=chunk_size
+        )
+
+    def _padded(terms):
+        pad = ((0, 0), (0, 4 - terms.shape[1]), (0, 0))
+        return np.pad(terms, pad, constant_values=-1).astype(np.int64)
+
+    if memmap_file is None:
+        terms, weights = zip(*_chunks())
+        terms = np.concatenate([_padded(t) for t in terms])
+        weights = np.concatenate(weights).astype(dtype)
+    else:
+        n_terms = 0
+        with open(memmap_file + ".terms", "wb") as ft, open(
+            memmap_file + ".weights", "wb"
+        ) as fw:
+            for t, w in _chunks():
+                _padded(t).tofile(ft)
+                w.astype(dtype).tofile(fw)
+                n_terms += len(w)
+        terms = np.memmap(
+            memmap_file + ".terms", dtype=np.int64, mode="r", shape=(n_terms, 4, 2)
+        )
+        weights = np.memmap(
+            memmap_file + ".weights", dtype=dtype, mode="r", shape=(n_terms,)
+        )
+
+    ha = cls(hi, cutoff=cutoff, dtype=dtype)
+    # the terms are already unique and ordered
+    ha._term_arrays = (terms, weights)
+    return ha
+
+
 def TV_from_pyscf_molecule(
     molecule,  # type: pyscf.gto.mole.Mole  # noqa: F821
     mo_coeff: np.ndarray,
@@ -296,6 +491,8 @@ def from_pyscf_molecule(
     *,
     cutoff: float = 1e-11,
     implementation: DiscreteOperator = FermionOperator2nd,
+    chunk_size: int = 2**22,
+    memmap_file: str | None = None,
 ) -> DiscreteOperator:
     r"""
     Construct a netket operator encoding the electronic hamiltonian of a pyscf
@@ -349,13 +546,19 @@ def from_pyscf_molecule(
             linear combination of atomic orbitals to produce the
             molecular orbitals. If unspecified this defaults to
             the hartree fock orbitals computed using :class:`~pyscf.scf.HF`.
-        cutoff: Ignores all matrix elements in the `V` and `T` matrix that have
-            magnitude less than this value. Defaults to :math:`10^{-11}`
+        cutoff: Ignores all terms of the hamiltonian with weights of magnitude
+            less than this value. Defaults to :math:`10^{-11}`
         implementation: The particular implementation to use for the operator.
             Different fermionic operator implementation might have different
             performances. Defaults to
             :class:`netket.experimental.operator.FermionOperator2nd` (this might
             change in the future).
+        chunk_size: The approximate number of candidate two-body terms that are
+            generated at once. Lower values reduce the peak memory usage.
+        memmap_file: If specified, the arrays of terms and weights of the
+            operator are written to the files `memmap_file + ".terms"` and
+            `memmap_file + ".weights"` and memory-mapped with
+            :class:`numpy.memmap`, instead of being kept in memory.
 
     Returns:
         A netket second quantised operator that encodes the electronic hamiltonian.
@@ -367,15 +570,19 @@ def from_pyscf_molecule(
         mf = pyscf.scf.HF(molecule).run()
         mo_coeff = mf.mo_coeff
 
-    E_nuc, Tij, Vijkl = TV_from_pyscf_molecule(molecule, mo_coeff, cutoff=cutoff)
+    # the two-body terms are generated directly from the symmetry-unique
+    # integrals, to avoid building 4-index tensors in the spin-orbital basis
+    E_nuc, tij, eri = compute_pyscf_integrals_packed(molecule, mo_coeff)
 
-    ha = operator_from_arrays(
+    ha = operator_from_integrals(
         E_nuc,
-        Tij,
-        0.5 * Vijkl,
+        tij,
+        eri,
         molecule.nelec,
-        term_conj4=(1, 1, 0, 0),
         cls=implementation,
+        cutoff=cutoff,
+        chunk_size=chunk_size,
+        memmap_file=memmap_file,
     )
     # TODO maybe run setup and set _max_conn_size here estimating it analytially
     return ha
@@ -99,6 +99,78 @@ def get_naive_edges(positions, cutoff, order):
     return [sorted(list(zip(row[ii == k], col[ii == k]))) for k in range(order)]
 
 
+def get_nn_displacements(basis_vectors, extent, site_offsets, pbc, cutoff, order):
+    """
+    Finds all displacements between sites of the lattice that are shorter than
+    `cutoff`, expressed in integer cell coordinates.
+
+    Only one of the two displacements `(sl1, sl2, d_cell)` and `(sl2, sl1, -d_cell)`
+    describing the same bonds is returned. Displacements that cannot be realised
+    in the lattice with open boundary conditions (or in the lattice padded with
+    `order` unit cells along periodic directions) are discarded.
+
+    Returns:
+        The arrays `sl1`, `sl2`, `d_cell` and `distance`, such that the site
+        `sl2` of the cell `c + d_cell` lies at a distance `distance` from the site
+        `sl1` of the cell `c`.
+    """
+    ndim = len(extent)
+    n_sl = len(site_offsets)
+
+    # largest cell displacement that can fit within the cutoff
+    max_offset = np.linalg.norm(site_offsets - site_offsets[0], axis=1).max()
+    inv_norms = np.linalg.norm(np.linalg.inv(basis_vectors), axis=0)
+    d_max = np.floor((cutoff + 2 * max_offset) * inv_norms).astype(int)
+    d_max = np.minimum(d_max, np.where(pbc, extent + 2 * order, extent) - 1)
+
+    ranges = [slice(-d, d + 1) for d in d_max]
+    d_cell = np.mgrid[ranges].reshape(ndim, -1).T
+
+    # all (cell displacement, sl1, sl2) combinations
+    d_cell = np.repeat(d_cell, n_sl * n_sl, axis=0)
+    sl1 = np.tile(np.repeat(np.arange(n_sl), n_sl), len(d_cell) // n_sl**2)
+    sl2 = np.tile(np.arange(n_sl), len(d_cell) // n_sl)
+
+    # keep only the displacements whose key (d_cell, sl2 - sl1) is positive in
+    # lexicographic order, which removes the opposite displacements and zero
+    key = np.concatenate([d_cell, (sl2 - sl1)[:, None]], axis=1)
+    first_nonzero = np.argmax(key != 0, axis=1)
+    positive = key[np.arange(len(key)), first_nonzero] > 0
+
+    distance = np.linalg.norm(
+        d_cell @ basis_vectors + site_offsets[sl2] - site_offsets[sl1], axis=1
+    )
+    mask = positive & (distance <= cutoff)
+    return sl1[mask], sl2[mask], d_cell[mask], distance[mask]
+
+
+def translate_edges(extent, site_offsets, pbc, sl1, sl2, d_cell):
+    """
+    Generates all edges from the sublattice `sl1` of every unit cell `c` to the
+    sublattice `sl2` of the unit cell `c + d_cell`.
+
+    For open boundary conditions, only the edges whose endpoints are both
+    inside the lattice are generated.
+
+    Returns:
+        Two integer arrays containing the start and end nodes of the edges.
+    """
+    start_min = np.where(pbc, 0, np.maximum(0, -d_cell))
+    start_max = np.where(pbc, extent, extent - np.maximum(0, d_cell))
+    if np.any(start_max <= start_min):
+        empty = np.zeros(0, dtype=int)
+        return empty, empty
+
+    start_ranges = [slice(lo, hi) for lo, hi in zip(start_min, start_max)]
+    start = np.mgrid[start_ranges].reshape(len(extent), -1).T
+    end = start + d_cell
+
+    # Convert to site indices
+    start = site_to_idx((start, sl1), extent, site_offsets)
+    end = site_to_idx((end, sl2), extent, site_offsets)
+    return start, end
+
+
 def get_nn_edges(
     basis_vectors,
     extent,
@@ -109,32 +181,39 @@ def get_nn_edges(
 ):
     """For :code:`order == k`, generates all edges between up to :math:`k`-nearest
     neighbor sites (measured by their Euclidean distance). Edges are colored by length
-    with colors between 0 and `order - 1` in order of increasing length."""
-    positions, ids = create_padded_sites(
-        basis_vectors, extent, site_offsets, pbc, order
-    )
-    naive_edges_by_order = get_naive_edges(
-        positions,
-        order * np.linalg.norm(basis_vectors, axis=1).max() + distance_atol,
-        order,
+    with colors between 0 and `order - 1` in order of increasing length.
+
+    The edges are returned as an integer array of shape `(n_edges, 3)`, where every
+    row contains the two nodes (sorted in increasing order) and the color of an edge.
+    """
+    cutoff = order * np.linalg.norm(basis_vectors, axis=1).max() + distance_atol
+    sl1, sl2, d_cell, distance = get_nn_displacements(
+        basis_vectors, extent, site_offsets, pbc, cutoff, order
     )
-    colored_edges = []
-    for k, naive_edges in enumerate(naive_edges_by_order):
-        true_edges = set()
-        for node1, node2 in naive_edges:
-            # switch to real node indices
-            node1 = ids[node1]
-            node2 = ids[node2]
-            if node1 == node2:
-                raise RuntimeError(
-                    f"Lattice contains self-referential edge {(node1, node2)} of order {k}"
-                )
-            elif node1 > node2:
-                node1, node2 = node2, node1
-            true_edges.add((node1, node2))
-        for edge in true_edges:
-            colored_edges.append((*edge, k))
-    return colored_edges
+    # group displacements by their length
+    _, color = np.unique(comparable(distance), return_inverse=True)
+    color = color.reshape(-1)
+
+    n_nodes = np.prod(extent) * len(site_offsets)
+    keys = []
+    for i in np.flatnonzero(color < order):
+        start, end = translate_edges(
+            extent, site_offsets, pbc, sl1[i], sl2[i], d_cell[i]
+        )
+        if np.any(start == end):
+            node = start[np.argmax(start == end)]
+            raise RuntimeError(
+                f"Lattice contains self-referential edge {(node, node)} of order "
+                f"{color[i]}"
+            )
+        node1, node2 = np.minimum(start, end), np.maximum(start, end)
+        keys.append((color[i] * n_nodes + node1) * n_nodes + node2)
+
+    # remove the edges that appear more than once in small periodic lattices
+    keys = np.unique(np.concatenate(keys)) if keys else np.zeros(0, dtype=int)
+    color, keys = np.divmod(keys, n_nodes * n_nodes)
+    node1, node2 = np.divmod(keys, n_nodes)
+    return np.stack([node1, node2, color], axis=1)
 
 
 # Unit cell distribution logic
@@ -147,7 +226,10 @@ def get_custom_edges(
 ):
     """Generates the edges described in `custom_edges` for all unit cells.
 
-    See the docstring of `Lattice.__init__` for the syntax of `custom_edges."""
+    See the docstring of `Lattice.__init__` for the syntax of `custom_edges.
+
+    The edges are returned as an integer array of shape `(n_edges, 3)`, where every
+    row contains the two nodes and the color of an edge."""
     if not all([len(desc) in (3, 4) for desc in custom_edges]):
         raise ValueError(
             dedent(
@@ -186,22 +268,12 @@ def get_custom_edges(
                 f"Distance vector {distance} does not fit into the lattice"
             )
 
-        # Unit cells of starting points
-        start_min = np.where(pbc, 0, np.maximum(0, -d_cell))
-        start_max = np.where(pbc, extent, extent - np.maximum(0, d_cell))
-        start_ranges = [slice(lo, hi) for lo, hi in zip(start_min, start_max)]
-        start = np.mgrid[start_ranges].reshape(len(extent), -1).T
-        end = (start + d_cell) % extent
-
-        # Convert to site indices
-        start = site_to_idx((start, sl1), extent, site_offsets)
-        end = site_to_idx((end, sl2), extent, site_offsets)
-
-        return [(*edge, color) for edge in zip(start, end)]
+        start, end = translate_edges(extent, site_offsets, pbc, sl1, sl2, d_cell)
+        return np.stack([start, end, np.full_like(start, color)], axis=1)
 
-    colored_edges = []
+    colored_edges = [np.zeros((0, 3), dtype=int)]
     for i, desc in enumerate(custom_edges):
         edge_data = desc[:3]
         edge_color = desc[3] if len(desc) == 4 else i
-        colored_edges += translated_edges(*edge_data, edge_color)
-    return colored_edges
+        colored_edges.append(translated_edges(*edge_data, edge_color))
+    return np.concatenate(colored_edges, axis=0)
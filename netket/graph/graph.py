@@ -18,7 +18,7 @@ import numpy as np
 import igraph
 
 from netket.utils.deprecation import warn_deprecation
-from netket.utils.group import Permutation, PermutationGroup
+from netket.utils.group import PermutationGroup
 from .abstract_graph import AbstractGraph, Edge, ColoredEdge, EdgeSequence
 
 
@@ -34,7 +34,7 @@ class Graph(AbstractGraph):
     # ------------------------------------------------------------------------
     def __init__(
         self,
-        edges: Sequence[Edge] | Sequence[ColoredEdge],
+        edges: Sequence[Edge] | Sequence[ColoredEdge] | np.ndarray,
         n_nodes: int | None = None,
     ):
         """
@@ -42,7 +42,9 @@ class Graph(AbstractGraph):
         number of nodes.
 
         Args:
-            edges: list of (undirected) edges
+            edges: list of (undirected) edges, or an integer array of shape
+                `(n_edges, 2)` (or `(n_edges, 3)` for colored edges). Passing an
+                array is much faster for graphs with many edges.
             n_nodes: number of nodes. Can be used to specify the number vertices in the
                 graph if not all vertices appear in an edge.
 
@@ -50,7 +52,7 @@ class Graph(AbstractGraph):
         edges, colors = self._clean_edges(edges)
         if n_nodes is None:
             if len(edges) > 0:
-                n_nodes = max(max(e) for e in edges) + 1
+                n_nodes = int(np.max(edges)) + 1
             else:
                 n_nodes = 0
         graph = igraph.Graph(directed=False)
@@ -63,6 +65,19 @@ class Graph(AbstractGraph):
     @staticmethod
     def _clean_edges(edges):
         """Validate and normalize edges argument."""
+        if isinstance(edges, np.ndarray):
+            if edges.ndim != 2 or edges.shape[1] not in (2, 3):
+                raise ValueError(
+                    "Edges must be an array of shape (n_edges, 2) (or (n_edges, 3) "
+                    "for colored edges)."
+                )
+            if not np.issubdtype(edges.dtype, np.integer):
+                raise TypeError("Edges must be an array of integers.")
+            if edges.shape[1] == 2:
+                return edges, [0] * len(edges)
+            else:
+                return edges[:, :2], edges[:, 2].tolist()
+
         if not isinstance(edges, Sequence):
             raise TypeError("edges must be a sequence.")
         if len(edges) == 0:
@@ -196,16 +211,50 @@ class Graph(AbstractGraph):
     def _compute_automorphisms(self):
         """
         Compute the graph autmorphisms of this graph.
+
+        A generating set of the automorphism group is computed with BLISS, and the
+        full group is obtained by closing it under composition.
         """
-        colors = self.edge_colors
-        result = self._igraph.get_isomorphisms_vf2(
-            edge_color1=colors, edge_color2=colors
-        )
+        generators = self._automorphism_generators()
+        result = _permutation_closure(generators, self.n_nodes)
+        if result is None:
+            # hash collision in the closure, enumerate all automorphisms instead
+            colors = self.edge_colors
+            result = self._igraph.get_isomorphisms_vf2(
+                edge_color1=colors, edge_color2=colors
+            )
+            result = np.asarray(result).reshape(-1, self.n_nodes)
 
         # sort them s.t. the identity comes first
-        result = np.unique(result, axis=0).tolist()
-        result = PermutationGroup([Permutation(i) for i in result], self.n_nodes)
-        return result
+        result = np.unique(result, axis=0)
+        return PermutationGroup(result, self.n_nodes)
+
+    def _automorphism_generators(self) -> np.ndarray:
+        """
+        Returns a generating set of the automorphism group of the graph that
+        preserve the edge colors, as an integer array of shape
+        `(n_generators, n_nodes)`.
+        """
+        n = self.n_nodes
+        colors = np.asarray(self.edge_colors)
+        if len(np.unique(colors)) <= 1:
+            generators = self._igraph.automorphism_group()
+        else:
+            # BLISS only supports vertex colors: replace every edge (i, j) with
+            # a path i - k - j through a new vertex k carrying the edge color.
+            _, colors = np.unique(colors, return_inverse=True)
+            edges = np.asarray(self.edges(), dtype=int).reshape(-1, 2)
+            k = n + np.arange(len(edges))
+            subdivided = igraph.Graph(n + len(edges), directed=False)
+            subdivided.add_edges(
+                np.concatenate(
+                    [np.stack([edges[:, 0], k], 1), np.stack([k, edges[:, 1]], 1)]
+                )
+            )
+            vertex_colors = np.concatenate([np.zeros(n, dtype=int), colors + 1])
+            generators = subdivided.automorphism_group(color=vertex_colors.tolist())
+        generators = [g[:n] for g in generators]
+        return np.array(generators, dtype=int).reshape(len(generators), n)
 
     # TODO turn into a struct.property_cached?
     def automorphisms(self) -> PermutationGroup:
@@ -221,6 +270,51 @@ class Graph(AbstractGraph):
         )
 
 
+def _permutation_closure(generators: np.ndarray, n: int) -> np.ndarray | None:
+    """
+    Computes all elements of the group generated by the permutations `generators`
+    (an integer array of shape `(n_generators, n)`) by composing them in
+    breadth-first order, vectorised over all the elements found in every step.
+
+    Elements are identified by a 64-bit hash of their rows. In the unlikely case
+    of a hash collision (which is detected by checking that the result is closed
+    under composition), None is returned.
+
+    Returns:
+        An integer array of shape `(|G|, n)`, in no particular order.
+    """
+    coeffs = np.random.default_rng(0).integers(1, 2**63, size=n, dtype=np.uint64)
+
+    def hash_rows(x):
+        return x.astype(np.uint64) @ coeffs
+
+    frontier = np.arange(n)[None, :]
+    elements = [frontier]
+    # sorted hashes of all the elements found so far
+    seen = hash_rows(frontier)
+    while len(frontier) > 0:
+        # compose all elements found in the last step with every generator
+        candidates = frontier[:, generators].reshape(
+            len(frontier) * len(generators), n
+        )
+        keys, index = np.unique(hash_rows(candidates), return_index=True)
+        pos = np.minimum(np.searchsorted(seen, keys), len(seen) - 1)
+        is_new = seen[pos] != keys
+        seen = np.sort(np.concatenate([seen, keys[is_new]]))
+        frontier = candidates[index[is_new]]
+        elements.append(frontier)
+    elements = np.concatenate(elements, axis=0)
+
+    # check that every composition with a generator is among the elements
+    elements = elements[np.argsort(hash_rows(elements))]
+    for g in generators:
+        products = elements[:, g]
+        idx = np.searchsorted(seen, hash_rows(products))
+        if not np.array_equal(elements[np.minimum(idx, len(seen) - 1)], products):
+            return None
+    return elements
+
+
 def Edgeless(n_nodes: int) -> Graph:
     """
     Construct a set graph (collection of unconnected vertices).
@@ -23,7 +23,9 @@ import warnings
 
 import numpy as _np
 
-from netket.utils import HashableArray
+import jax
+import jax.numpy as jnp
+
 from netket.utils.float import comparable, comparable_periodic, is_approx_int
 from netket.utils.group import PointGroup, PermutationGroup, trivial_point_group
 
@@ -70,17 +72,6 @@ class LatticeSite:
         return f"LatticeSite({s})"
 
 
-def _create_sites(basis_vectors, extent, site_offsets):
-    basis_coords, positions = create_site_positions(basis_vectors, extent, site_offsets)
-
-    sites = [
-        LatticeSite(id=idx, position=pos, basis_coord=coord)
-        for idx, (coord, pos) in enumerate(zip(basis_coords, positions))
-    ]
-
-    return sites, basis_coords, positions
-
-
 REPR_TEMPLATE = """Lattice(
     n_nodes={},
     extent={},
@@ -257,18 +248,15 @@ class Lattice(Graph):
         self._point_group = point_group
 
         # Generate sites
-        self._sites, self._basis_coords, self._positions = _create_sites(
+        self._basis_coords, self._positions = create_site_positions(
             self._basis_vectors,
             self._extent,
             self._site_offsets,
         )
-        self._basis_coord_to_site = {
-            HashableArray(p.basis_coord): p.id for p in self._sites
-        }
-        int_positions = self._to_integer_position(self._positions)
-        self._int_position_to_site = {
-            HashableArray(pos): index for index, pos in enumerate(int_positions)
-        }
+        self._site_offsets_fractional = site_pos_fractional
+        self._int_positions = self._to_integer_position(self._positions)
+        # LatticeSite objects are only created if requested
+        self._sites = None
 
         # Generate edges
         if custom_edges is not None:
@@ -297,7 +285,7 @@ class Lattice(Graph):
             )
         self._max_neighbor_order = max_neighbor_order
 
-        super().__init__(colored_edges, len(self._sites))
+        super().__init__(colored_edges, len(self._positions))
 
     @staticmethod
     def _clean_basis(basis_vectors):
@@ -394,6 +382,13 @@ class Lattice(Graph):
     @property
     def sites(self) -> Sequence[LatticeSite]:
         """Sequence of lattice site objects"""
+        if self._sites is None:
+            self._sites = [
+                LatticeSite(id=idx, position=pos, basis_coord=coord)
+                for idx, (coord, pos) in enumerate(
+                    zip(self._basis_coords, self._positions)
+                )
+            ]
         return self._sites
 
     @property
@@ -413,40 +408,105 @@ class Lattice(Graph):
         frac_positions = _np.matmul(positions, self._inv_dims)
         return comparable_periodic(frac_positions, self.pbc)
 
-    @staticmethod
-    def _get_id_from_dict(dict: dict[HashableArray, int], key: Array) -> int | Array:
-        try:
-            if key.ndim == 1:
-                return dict[HashableArray(key)]
-            elif key.ndim == 2:
-                return _np.array([dict[HashableArray(k)] for k in key])
-            else:
-                raise ValueError("Input needs to be rank 1 or rank 2 array")
-        except KeyError as e:
-            raise InvalidSiteError(
-                "Some coordinates do not correspond to a valid lattice site"
-            ) from e
+    def _id_from_cells(self, cells: Array, sublattice: Array) -> tuple[Array, Array]:
+        """
+        Returns the ids of the sites with the given integer unit cell coordinates
+        and sublattice indices, and whether they are valid sites, computed by
+        mixed-radix arithmetic. Works both on numpy and jax arrays.
+        """
+        n_sub = len(self._site_offsets)
+        valid = (sublattice >= 0) & (sublattice < n_sub)
+        valid = valid & ((cells >= 0) & (cells < self._extent)).all(axis=-1)
+        # number of sites between unit cells one step apart along each axis
+        radix = _np.cumprod([n_sub, *self._extent[:0:-1]])[::-1]
+        ids = (cells * radix).sum(axis=-1) + sublattice
+        return ids, valid
+
+    def _id_from_position(self, position: Array) -> tuple[Array, Array, Array]:
+        """
+        Returns the ids of the sites closest to the given positions, whether they
+        lie inside the lattice (accounting for periodic boundaries) and their
+        distance from the positions in units of the basis vectors.
+        Works both on numpy and jax arrays.
+        """
+        xp = jnp if isinstance(position, jax.Array) else _np
+        # fractional coordinates relative to every site in the unit cell
+        frac = position @ _np.linalg.inv(self._basis_vectors)
+        frac = frac[..., None, :] - self._site_offsets_fractional
+        cells = xp.rint(frac)
+        error = xp.abs(frac - cells).max(axis=-1)
+        sublattice = xp.argmin(error, axis=-1)
+        cells = xp.take_along_axis(cells, sublattice[..., None, None], axis=-2)
+        cells = cells[..., 0, :].astype(int)
+        cells = xp.where(self._pbc, cells % self._extent, cells)
+
+        ids, valid = self._id_from_cells(cells, sublattice)
+        error = xp.take_along_axis(error, sublattice[..., None], axis=-1)[..., 0]
+        return ids, valid, error
 
     def id_from_position(self, position: PositionT) -> int | Array:
         """
-        Returns the id for a site at the given position. When passed a rank-2 array
-        where each row is a position, returns an array of the corresponding ids.
-        Throws an `InvalidSiteError` if any of the positions do not correspond
-        to a site.
+        Returns the id for a site at the given position. When passed an array of
+        shape `(..., ndim)` where each row is a position, returns an array of the
+        corresponding ids. Throws an `InvalidSiteError` if any of the positions do
+        not correspond to a site.
+
+        The ids are computed with vectorised arithmetic on the unit cell
+        coordinates of the positions. This function can also be called on jax
+        arrays inside of `jax.jit`, in which case the id of the closest site is
+        returned, and -1 for positions that are farther than :math:`10^{-4}`
+        (in units of the basis vectors) from any site.
         """
+        if isinstance(position, jax.Array):
+            ids, valid, error = self._id_from_position(position)
+            return jnp.where(valid & (error < 1e-4), ids, -1)
+
+        position = _np.asarray(position)
+        if position.shape[-1:] != (self._ndim,):
+            raise InvalidSiteError(
+                "Some coordinates do not correspond to a valid lattice site"
+            )
+        ids, valid, _ = self._id_from_position(position)
+        ids = _np.where(valid, ids, 0)
+        # the position must be in the same bin as the site, as compared by
+        # `comparable_periodic`
         int_pos = self._to_integer_position(position)
-        ids = self._get_id_from_dict(self._int_position_to_site, int_pos)
-        return ids
+        valid &= (self._int_positions[ids] == int_pos).all(axis=-1)
+        if not _np.all(valid):
+            raise InvalidSiteError(
+                "Some coordinates do not correspond to a valid lattice site"
+            )
+        return int(ids) if ids.ndim == 0 else ids
 
     def id_from_basis_coords(self, basis_coords: CoordT) -> int | Array:
         """
-        Return the id for a site at the given basis coordinates. When passed a rank-2
-        array where each row is a coordinate vector, returns an array of the
-        corresponding ids. Throws an `InvalidSiteError` if any of the coords do
-        not correspond to a site.
+        Return the id for a site at the given basis coordinates. When passed an
+        array of shape `(..., ndim+1)` where each row is a coordinate vector,
+        returns an array of the corresponding ids. Throws an `InvalidSiteError` if
+        any of the coords do not correspond to a site.
+
+        This function can also be called on jax arrays inside of `jax.jit`, in
+        which case -1 is returned for invalid coordinates.
         """
-        key = _np.asarray(basis_coords)
-        return self._get_id_from_dict(self._basis_coord_to_site, key)
+        if isinstance(basis_coords, jax.Array):
+            ids, valid = self._id_from_cells(
+                basis_coords[..., :-1], basis_coords[..., -1]
+            )
+            return jnp.where(valid, ids, -1)
+
+        basis_coords = _np.asarray(basis_coords)
+        if basis_coords.shape[-1:] != (self._ndim + 1,):
+            raise InvalidSiteError(
+                "Some coordinates do not correspond to a valid lattice site"
+            )
+        ids, valid = self._id_from_cells(
+            basis_coords[..., :-1], basis_coords[..., -1]
+        )
+        if not _np.all(valid):
+            raise InvalidSiteError(
+                "Some coordinates do not correspond to a valid lattice site"
+            )
+        return int(ids) if ids.ndim == 0 else ids
 
     def position_from_basis_coords(self, basis_coords: CoordT) -> PositionT:
         """
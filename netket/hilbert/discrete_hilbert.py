@@ -24,7 +24,7 @@ import jax.numpy as jnp
 from equinox import error_if
 
 from netket.utils.types import Array, DType
-from netket.jax import sharding
+from netket.jax import sharding, pack_bits, unpack_bits
 
 from .abstract_hilbert import AbstractHilbert
 from .index import is_indexable
@@ -302,6 +302,51 @@ class DiscreteHilbert(AbstractHilbert):
         """
         raise NotImplementedError()
 
+    @property
+    def is_packable(self) -> bool:
+        """Whether every local degree of freedom has two states, so that the
+        configurations can be stored as bits with :meth:`pack_states`."""
+        return self.is_finite and all(s == 2 for s in self.shape)
+
+    def pack_states(self, x: Array) -> Array:
+        r"""
+        Packs a batch of configurations of this Hilbert space into 32-bit words,
+        using one bit per degree of freedom. This reduces the memory used by the
+        configurations by a factor 8 (with respect to `int8`) or 32 (with respect
+        to `float32`).
+
+        The bit of every site is its local index (see
+        :meth:`states_to_local_indices`). This function can be jax-jitted.
+
+        Args:
+            x: a tensor of shape `(..., hilbert.size)` containing configurations
+                of this Hilbert space.
+
+        Returns:
+            a `uint32` tensor of shape `(..., ceil(hilbert.size/32))`.
+        """
+        if not self.is_packable:
+            raise ValueError(
+                f"Configurations of {self} cannot be packed, as not all degrees "
+                "of freedom have two local states."
+            )
+        return pack_bits(self.states_to_local_indices(x))
+
+    def unpack_states(self, x: Array, dtype: DType = None) -> Array:
+        r"""
+        Converts a tensor of packed configurations obtained with
+        :meth:`pack_states` back to the configurations of this Hilbert space.
+        This function can be jax-jitted.
+
+        Args:
+            x: a `uint32` tensor of shape `(..., ceil(hilbert.size/32))`.
+            dtype: the dtype of the output.
+
+        Returns:
+            a tensor of shape `(..., hilbert.size)` with the configurations.
+        """
+        return self.local_indices_to_states(unpack_bits(x, self.size), dtype=dtype)
+
     @property
     def is_indexable(self) -> bool:
         """Whether the space can be indexed with an integer"""
@@ -61,6 +61,8 @@ from ._jacobian import jacobian, jacobian_default_mode
 
 from ._sort import sort, searchsorted
 
+from ._bits import pack_bits, unpack_bits
+
 from ._expect import expect
 
 # internal sharding utilities
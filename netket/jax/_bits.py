@@ -0,0 +1,81 @@
+# Copyright 2025 The NetKet Authors - All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from functools import partial
+
+import jax
+import jax.numpy as jnp
+
+from netket.utils.types import Array, DType
+
+WORD_BITS = 32
+"""Number of bits stored in every word of a packed array."""
+
+
+def n_words(n_bits: int) -> int:
+    """
+    Returns the number of 32-bit words necessary to store `n_bits` bits.
+    """
+    return -(-n_bits // WORD_BITS)
+
+
+@jax.jit
+def pack_bits(x: Array) -> Array:
+    """
+    Packs the last axis of an array of zeros and ones into 32-bit unsigned
+    integers.
+
+    The i-th element of the last axis is stored in the bit `i % 32` (starting
+    from the least significant) of the word `i // 32`. This is the same layout as
+    :func:`numpy.packbits` with `bitorder="little"`, followed by a view of the
+    bytes as little-endian 32-bit words.
+
+    Args:
+        x: An array of shape `(..., N)` containing only zeros and ones.
+
+    Returns:
+        An array of shape `(..., ceil(N/32))` with dtype `uint32`.
+
+    Example:
+        >>> import jax.numpy as jnp
+        >>> from netket.jax import pack_bits
+        >>> pack_bits(jnp.array([1, 0, 1, 1]))
+        Array([13], dtype=uint32)
+    """
+    N = x.shape[-1]
+    W = n_words(N)
+    x = (x != 0).astype(jnp.uint32)
+    x = jnp.pad(x, [(0, 0)] * (x.ndim - 1) + [(0, W * WORD_BITS - N)])
+    x = x.reshape(x.shape[:-1] + (W, WORD_BITS))
+    shifts = jnp.arange(WORD_BITS, dtype=jnp.uint32)
+    return jnp.sum(x << shifts, axis=-1, dtype=jnp.uint32)
+
+
+@partial(jax.jit, static_argnums=(1, 2))
+def unpack_bits(x: Array, n_bits: int, dtype: DType = jnp.uint8) -> Array:
+    """
+    Unpacks an array of 32-bit words obtained from :func:`pack_bits`.
+
+    Args:
+        x: An array of shape `(..., W)` with unsigned integer dtype.
+        n_bits: The number of bits to unpack (at most `32 W`).
+        dtype: The dtype of the output.
+
+    Returns:
+        An array of shape `(..., n_bits)` containing zeros and ones.
+    """
+    shifts = jnp.arange(WORD_BITS, dtype=jnp.uint32)
+    bits = (x.astype(jnp.uint32)[..., None] >> shifts) & jnp.uint32(1)
+    bits = bits.reshape(x.shape[:-1] + (x.shape[-1] * WORD_BITS,))
+    return bits[..., :n_bits].astype(dtype)
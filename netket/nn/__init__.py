@@ -53,6 +53,7 @@ from .utils import (
     to_matrix,
     split_array_mpi,
     binary_encoding,
+    prepare_variables,
 )
 
 from . import blocks
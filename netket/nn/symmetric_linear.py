@@ -29,6 +29,7 @@ from netket.utils.group import PermutationGroup
 from collections.abc import Sequence
 from netket.graph import Graph, Lattice
 from netket.errors import SymmModuleInvalidInputShape
+from netket.nn.utils import PRECOMPUTED
 
 # All layers defined here have kernels of shape [out_features, in_features, n_symm]
 default_equivariant_initializer = lecun_normal(in_axis=1, out_axis=0)
@@ -132,6 +133,29 @@ class DenseSymmMatrix(Module):
         return x
 
 
+def _cached_kernel_fft(module: Module, kernel_fft):
+    """
+    Returns the Fourier transform of the kernel of an FFT-based layer, computed by
+    `kernel_fft()` or read from the :attr:`~netket.nn.utils.PRECOMPUTED`
+    collection if it was stored there by :func:`netket.nn.prepare_variables`.
+
+    The transform is only stored when the precomputed collection is mutable and
+    the parameters are not, so that it is never stored by `init` or added to the
+    state of the model.
+    """
+    if module.has_variable(PRECOMPUTED, "kernel_fft") and not (
+        module.is_mutable_collection(PRECOMPUTED)
+    ):
+        return module.get_variable(PRECOMPUTED, "kernel_fft")
+
+    kernel = kernel_fft()
+    if module.is_mutable_collection(PRECOMPUTED) and not (
+        module.is_mutable_collection("params")
+    ):
+        module.put_variable(PRECOMPUTED, "kernel_fft", kernel)
+    return kernel
+
+
 class DenseSymmFFT(Module):
     r"""Implements a symmetrized projection onto a space group using a Fast Fourier Transform"""
 
@@ -224,16 +248,16 @@ class DenseSymmFFT(Module):
         x, kernel, bias = promote_dtype(x, kernel, bias, dtype=None)
         dtype = x.dtype
 
-        # Converts the convolutional kernel of shape (features, in_features, n_sites)
-        # to the expanded kernel of shape (features, in_features, sites_per_cell,
-        # n_point, *shape) used in FFT-based group convolutions.
-        kernel = kernel[..., self.mapping]
+        def kernel_fft():
+            # Converts the convolutional kernel of shape (features, in_features,
+            # n_sites) to the expanded kernel of shape (features, in_features,
+            # sites_per_cell, n_point, *shape) used in FFT-based group convolutions.
+            k = kernel[..., self.mapping]
+            return jnp.fft.fftn(k, s=self.shape).reshape(*k.shape[:4], self.n_cells)
 
-        x = jnp.fft.fftn(x, s=self.shape).reshape(*x.shape[:3], self.n_cells)
+        kernel = _cached_kernel_fft(self, kernel_fft)
 
-        kernel = jnp.fft.fftn(kernel, s=self.shape).reshape(
-            *kernel.shape[:4], self.n_cells
-        )
+        x = jnp.fft.fftn(x, s=self.shape).reshape(*x.shape[:3], self.n_cells)
 
         # TODO: the batch ordering should be revised: batch dimensions should
         # be leading
@@ -349,16 +373,16 @@ class DenseEquivariantFFT(Module):
         x, kernel, bias = promote_dtype(x, kernel, bias, dtype=None)
         dtype = x.dtype
 
-        # Convert the convolutional kernel of shape (features, in_features, n_symm)
-        # to the expanded kernel of shape (features, in_features, n_point(in),
-        # n_point(out), *shape) used in FFT-based group convolutions
-        kernel = kernel[..., self.mapping]
+        def kernel_fft():
+            # Convert the convolutional kernel of shape (features, in_features,
+            # n_symm) to the expanded kernel of shape (features, in_features,
+            # n_point(in), n_point(out), *shape) used in FFT-based group convolutions
+            k = kernel[..., self.mapping]
+            return jnp.fft.fftn(k, s=self.shape).reshape(*k.shape[:4], self.n_cells)
 
-        x = jnp.fft.fftn(x, s=self.shape).reshape(*x.shape[:3], self.n_cells)
+        kernel = _cached_kernel_fft(self, kernel_fft)
 
-        kernel = jnp.fft.fftn(kernel, s=self.shape).reshape(
-            *kernel.shape[:4], self.n_cells
-        )
+        x = jnp.fft.fftn(x, s=self.shape).reshape(*x.shape[:3], self.n_cells)
 
         x = lax.dot_general(
             x, kernel, (((1, 2), (1, 2)), ((3,), (4,))), precision=self.precision
@@ -19,6 +19,7 @@ from typing import cast
 import jax
 from jax import numpy as jnp
 from jax.core import concrete_or_error
+from flax import linen as nn
 import numpy as np
 from math import prod
 
@@ -231,6 +232,53 @@ def to_matrix(
     return rho
 
 
+PRECOMPUTED = "precomputed"
+"""
+Name of the flax variable collection holding quantities that only depend on the
+parameters, such as the spectra of the kernels of FFT-based group convolutions.
+See :func:`netket.nn.prepare_variables`.
+"""
+
+
+@partial(jax.jit, static_argnums=0)
+def prepare_variables(model: Callable, variables: PyTree, x: Array) -> PyTree:
+    """
+    Precomputes the quantities of a model that only depend on its parameters, so
+    that they are not recomputed every time the model is evaluated with the same
+    variables.
+
+    The model is evaluated once on the first configuration in `x`, letting its
+    layers store those quantities in the :attr:`~netket.nn.utils.PRECOMPUTED`
+    collection, which is then added to the variables. Layers that find this
+    collection in their variables use it instead of recomputing it (for example
+    :class:`~netket.nn.DenseSymm` and :class:`~netket.nn.DenseEquivariant` with
+    `mode="fft"` cache the Fourier transform of their kernel).
+
+    The returned variables must only be used to evaluate the model with the same
+    parameters, and must not be differentiated with respect to the parameters,
+    as the gradient would not flow through the precomputed quantities.
+
+    Models that are not flax modules are left untouched.
+
+    Args:
+        model: The model (a flax module).
+        variables: The variables of the model.
+        x: A batch of configurations, of which only the first one is used.
+
+    Returns:
+        The variables, including the :attr:`~netket.nn.utils.PRECOMPUTED`
+        collection if some layer of the model populated it.
+    """
+    if not isinstance(model, nn.Module):
+        return variables
+
+    x = x.reshape(-1, x.shape[-1])[:1]
+    _, precomputed = model.apply(variables, x, mutable=[PRECOMPUTED])
+    if PRECOMPUTED not in precomputed:
+        return variables
+    return {**variables, PRECOMPUTED: precomputed[PRECOMPUTED]}
+
+
 def _get_output_idx(
     shape: tuple[int, ...], max_bits: int | None = None
 ) -> tuple[tuple[int, ...], int]:
@@ -32,6 +32,7 @@ from ._continuous_operator import ContinuousOperator
 from ._kinetic import KineticEnergy
 from ._potential import PotentialEnergy
 from ._sumoperators import SumOperator
+from ._sumoperators_jax import SumOperatorJax
 
 from ._fermion2nd import FermionOperator2nd, FermionOperator2ndJax
 
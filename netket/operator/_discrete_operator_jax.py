@@ -23,6 +23,7 @@ from jax.experimental.sparse import JAXSparse, BCOO, BCSR
 
 from netket.operator import AbstractOperator, DiscreteOperator
 from netket.utils.optional_deps import import_optional_dependency
+from netket.utils.types import Array
 
 
 class DiscreteJaxOperator(DiscreteOperator):
@@ -137,6 +138,30 @@ class DiscreteJaxOperator(DiscreteOperator):
             associated to each x' for every batch.
         """
 
+    def get_conn_padded_packed(self, x: Array) -> tuple[Array, Array]:
+        r"""Finds the connected elements of the Operator, starting from and
+        returning configurations packed into bits with
+        :meth:`~netket.hilbert.DiscreteHilbert.pack_states`.
+
+        This is equivalent to unpacking `x`, calling :meth:`get_conn_padded`
+        and packing the connected configurations, but operators acting on
+        two-level systems can override it to act directly on the packed words.
+        As the connected configurations are stored with one bit per degree of
+        freedom, this reduces the memory and bandwidth needed to store them
+        by a factor 8 or more.
+
+        Args:
+            x : A `uint32` tensor of shape :math:`(..., W)` containing the packed
+                configurations :math:`x`.
+
+        Returns:
+            **(x_primes, mels)**: The packed connected states x', with shape
+            :math:`(..., K_{max}, W)`, and the matrix elements :math:`O(x,x')`
+            with shape :math:`(..., K_{max})`.
+        """
+        xp, mels = self.get_conn_padded(self.hilbert.unpack_states(x))
+        return self.hilbert.pack_states(xp), mels
+
     def get_conn_flattened(
         self,
         x: np.ndarray,
@@ -290,6 +315,20 @@ class DiscreteJaxOperator(DiscreteOperator):
         else:
             return NotImplemented
 
+    def __add__(self, other):
+        if isinstance(other, DiscreteOperator):
+            from ._sumoperators_jax import SumOperatorJax
+
+            return SumOperatorJax(self, other)
+        return NotImplemented
+
+    def __radd__(self, other):
+        if isinstance(other, DiscreteOperator):
+            from ._sumoperators_jax import SumOperatorJax
+
+            return SumOperatorJax(other, self)
+        return NotImplemented
+
     def to_jax_operator(self) -> "DiscreteJaxOperator":
         """
         Return the JAX version of this operator.
@@ -30,14 +30,20 @@ from .utils import (
     _convert_terms_to_spin_blocks,
     _canonicalize_input,
     _check_hermitian,
-    transpose_term,
-    _remove_dict_zeros,
     _verify_input,
+    OperatorArrays,
     OperatorDict,
     OperatorTermsList,
     OperatorWeightsList,
-    _normal_ordering,
+    _array_to_terms,
+    _concatenate_terms,
+    _merge_terms,
+    _normal_order_arrays,
     _pair_ordering,
+    _remove_zero_weights,
+    _term_lengths,
+    _terms_to_array,
+    _transpose_arrays,
 )
 
 
@@ -76,7 +82,9 @@ class FermionOperator2ndBase(DiscreteOperator):
         Args:
             hilbert: hilbert of the resulting FermionOperator2nd object
             terms: single term operators (see
-                example below)
+                example below), or an integer array of shape
+                `(n_terms, n_operators, 2)` containing the `(idx, dagger)` pairs
+                of terms of equal length
             weights: corresponding coefficients of the single term operators
                 (defaults to a list of 1)
             constant: constant contribution, corresponding to the
@@ -115,14 +123,14 @@ class FermionOperator2ndBase(DiscreteOperator):
         self._cutoff = cutoff
 
         # bring terms, weights into consistent form, autopromote dtypes if necessary
-        _operators, dtype = _canonicalize_input(
+        _term_arrays, dtype = _canonicalize_input(
             terms, weights, dtype, cutoff, constant=constant
         )
-        _verify_input(hilbert, _operators, raise_error=True)
+        _verify_input(hilbert, _term_arrays[0], raise_error=True)
         self._dtype = dtype
 
         # we keep the input, in order to be able to add terms later
-        self._operators = _operators
+        self._term_arrays = _term_arrays
         self._initialized = False
         self._is_hermitian = None  # set when requested
         self._max_conn_size = None
@@ -139,6 +147,43 @@ class FermionOperator2ndBase(DiscreteOperator):
         """Analyze the operator strings and precompute arrays for get_conn inference"""
         raise NotImplementedError  # pragma: no cover
 
+    @property
+    def _term_arrays(self) -> OperatorArrays:
+        """
+        (Internal) The terms as a padded integer array of `(idx, dagger)` pairs
+        and the corresponding weights (see
+        :data:`~netket.operator._fermion2nd.utils.OperatorArrays`).
+
+        All symbolic manipulations act on this representation, while the
+        dictionary of terms is only built when requested.
+        """
+        if self._term_arrays_cache is None:
+            operators = self._operators_cache
+            self._term_arrays_cache = (
+                _terms_to_array(list(operators.keys())),
+                np.array(list(operators.values()), dtype=self.dtype),
+            )
+        return self._term_arrays_cache
+
+    @_term_arrays.setter
+    def _term_arrays(self, term_arrays: OperatorArrays):
+        self._term_arrays_cache = term_arrays
+        self._operators_cache = None
+
+    @property
+    def _operators(self) -> OperatorDict:
+        if self._operators_cache is None:
+            terms, weights = self._term_arrays_cache
+            self._operators_cache = dict(
+                zip(_array_to_terms(terms), weights.tolist())
+            )
+        return self._operators_cache
+
+    @_operators.setter
+    def _operators(self, operators: OperatorDict):
+        self._operators_cache = operators
+        self._term_arrays_cache = None
+
     @classmethod
     def from_openfermion(
         cls,
@@ -222,7 +267,7 @@ class FermionOperator2ndBase(DiscreteOperator):
     def __repr__(self):
         return (
             f"{type(self).__name__}(hilbert={self.hilbert}, "
-            f"n_operators={len(self._operators)}, dtype={self.dtype})"
+            f"n_operators={len(self._term_arrays[1])}, dtype={self.dtype})"
         )
 
     def reduce(self, order: bool = True, inplace: bool = True, cutoff: float = None):
@@ -237,14 +282,16 @@ class FermionOperator2ndBase(DiscreteOperator):
         if cutoff is None:
             cutoff = self._cutoff
 
-        operators = self._operators
-        terms, weights = list(operators.keys()), list(operators.values())
+        terms, weights = self._term_arrays
 
         if order:
-            terms, weights = _normal_ordering(terms, weights)
+            terms, weights = _normal_order_arrays(terms, weights)
 
         obj = self if inplace else self.copy()
-        obj._operators, _ = _canonicalize_input(terms, weights, self.dtype, cutoff)
+        obj._term_arrays = _remove_zero_weights(
+            *_merge_terms(terms, weights), cutoff
+        )
+        obj._reset_caches()
         return obj
 
     @property
@@ -300,14 +347,8 @@ class FermionOperator2ndBase(DiscreteOperator):
 
         op = type(self)(self.hilbert, cutoff=self._cutoff, dtype=dtype)
 
-        if dtype == self.dtype:
-            operators_new = self._operators.copy()
-        else:
-            operators_new = {
-                k: np.array(v, dtype=dtype) for k, v in self._operators.items()
-            }
-
-        op._operators = operators_new
+        terms, weights = self._term_arrays
+        op._term_arrays = (terms.copy(), weights.astype(dtype))
         return op
 
     def _remove_zeros(self, cutoff: float = None):
@@ -315,7 +356,7 @@ class FermionOperator2ndBase(DiscreteOperator):
         if cutoff is None:
             cutoff = self._cutoff
         op = type(self)(self.hilbert, cutoff=cutoff, dtype=self.dtype)
-        op._operators = _remove_dict_zeros(self._operators, cutoff)
+        op._term_arrays = _remove_zero_weights(*self._term_arrays, cutoff)
         return op
 
     @property
@@ -329,10 +370,8 @@ class FermionOperator2ndBase(DiscreteOperator):
     def is_hermitian(self) -> bool:
         """Returns true if this operator is hermitian."""
         if self._is_hermitian is None:  # only compute when needed, is expensive
-            terms = list(self._operators.keys())
-            weights = list(self._operators.values())
-            cutoff = self._cutoff
-            self._is_hermitian = _check_hermitian(terms, weights, cutoff)
+            terms, weights = self._term_arrays
+            self._is_hermitian = _check_hermitian(terms, weights, self._cutoff)
         return self._is_hermitian
 
     def operator_string(self) -> str:
@@ -362,16 +401,36 @@ class FermionOperator2ndBase(DiscreteOperator):
                 f"to operator with dtype {self.dtype}"
             )
 
-        new_operators = {}
-        for t, w in self._operators.items():
-            for to, wo in other._operators.items():
-                # if the last operator of t and the first of to are
-                # equal, we have a ...ĉᵢĉᵢ... which is null.
-                if len(t) == 0 or len(to) == 0 or t[-1] != to[0]:
-                    new_t = t + to
-                    new_operators[new_t] = new_operators.get(new_t, 0) + w * wo
-
-        self._operators = new_operators
+        terms, weights = self._term_arrays
+        terms_o, weights_o = other._term_arrays
+        lengths = _term_lengths(terms)
+
+        new_terms = [np.zeros((0, 0, 2), dtype=terms.dtype)]
+        new_weights = [np.zeros(0, dtype=self.dtype)]
+        # concatenate all pairs of terms, grouping the terms of self by length
+        for length in np.unique(lengths):
+            (idxs,) = np.nonzero(lengths == length)
+            t = terms[idxs, :length]
+            new_t = np.concatenate(
+                [
+                    np.repeat(t, len(terms_o), axis=0),
+                    np.tile(terms_o, (len(t), 1, 1)),
+                ],
+                axis=1,
+            )
+            new_w = np.outer(weights[idxs], weights_o).reshape(-1)
+            # if the last operator of t and the first of to are
+            # equal, we have a ...ĉᵢĉᵢ... which is null.
+            if length > 0 and terms_o.shape[1] > 0:
+                is_null = np.all(t[:, None, -1] == terms_o[None, :, 0], axis=-1)
+                new_t = new_t[~is_null.reshape(-1)]
+                new_w = new_w[~is_null.reshape(-1)]
+            new_terms.append(new_t)
+            new_weights.append(new_w.astype(self.dtype))
+
+        self._term_arrays = _merge_terms(
+            _concatenate_terms(*new_terms), np.concatenate(new_weights)
+        )
         self._reset_caches()
         return self
 
@@ -411,17 +470,14 @@ class FermionOperator2ndBase(DiscreteOperator):
                 f"Cannot add inplace operator with dtype {type(other)} "
                 f"to operator with dtype {self.dtype}"
             )
-        self_ops = self._operators
-        for t, w in other._operators.items():
-            sw = self_ops.get(t, None)
-            if sw is None and not np.isclose(w, 0):
-                self_ops[t] = w
-            elif sw is not None:
-                w = sw + w
-                if np.isclose(w, 0):
-                    del self_ops[t]
-                else:
-                    self_ops[t] = w
+        terms, weights = self._term_arrays
+        terms_o, weights_o = other._term_arrays
+        terms, weights = _merge_terms(
+            _concatenate_terms(terms, terms_o),
+            np.concatenate([weights, weights_o.astype(self.dtype)]),
+        )
+        is_zero = np.isclose(weights, 0)
+        self._term_arrays = (terms[~is_zero], weights[~is_zero])
         self._reset_caches()
         return self
 
@@ -448,12 +504,11 @@ class FermionOperator2ndBase(DiscreteOperator):
             )
         scalar = np.array(scalar, dtype=self.dtype).item()
 
+        terms, weights = self._term_arrays
         if np.isclose(scalar, 0):
-            new_operators = {}
-        else:
-            new_operators = {o: scalar * v for o, v in self._operators.items()}
+            terms, weights = terms[:0, :0], weights[:0]
 
-        self._operators = new_operators
+        self._term_arrays = (terms, scalar * weights)
         self._reset_caches()
         return self
 
@@ -474,7 +529,8 @@ class FermionOperator2ndBase(DiscreteOperator):
         if concrete:
             new = type(self)(self.hilbert, dtype=self.dtype, cutoff=self._cutoff)
             # operators (c,c†) are real already. Only conjugate coefficients if needed.
-            new._operators = {transpose_term(k): v for k, v in self._operators.items()}
+            terms, weights = self._term_arrays
+            new._term_arrays = (_transpose_arrays(terms), weights.copy())
             return new
         else:
             return Transpose(self)
@@ -492,7 +548,8 @@ class FermionOperator2ndBase(DiscreteOperator):
         else:
             new = type(self)(self.hilbert, dtype=self.dtype, cutoff=self._cutoff)
             # operators (c,c†) are real already. Only conjugate coefficients if needed.
-            new._operators = {k: np.conjugate(v) for k, v in self._operators.items()}
+            terms, weights = self._term_arrays
+            new._term_arrays = (terms.copy(), np.conjugate(weights))
             return new
 
     def to_normal_order(self):
@@ -502,16 +559,11 @@ class FermionOperator2ndBase(DiscreteOperator):
         In this ordering, we make sure to account for the anti-commutation of operators.
         `Normal ordering documentation <https://en.wikipedia.org/wiki/Normal_order#Fermions>`_
         """
-        terms, weights = _normal_ordering(self.terms, self.weights)
-        new = type(self)(
-            self.hilbert,
-            dtype=self.dtype,
-        )
-        new._operators, _ = _canonicalize_input(
-            terms, weights, self.dtype, self._cutoff
+        terms, weights = _normal_order_arrays(*self._term_arrays)
+        new = type(self)(self.hilbert, dtype=self.dtype, cutoff=self._cutoff)
+        new._term_arrays = _remove_zero_weights(
+            *_merge_terms(terms, weights), self._cutoff
         )
-        new._cutoff = self._cutoff
-        new.reduce(order=False)  # already ordered
         return new
 
     def to_pair_order(self):
@@ -525,7 +577,7 @@ class FermionOperator2ndBase(DiscreteOperator):
             self.hilbert,
             dtype=self.dtype,
         )
-        new._operators, _ = _canonicalize_input(
+        new._term_arrays, _ = _canonicalize_input(
             terms, weights, self.dtype, self._cutoff
         )
         new._cutoff = self._cutoff
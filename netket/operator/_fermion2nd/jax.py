@@ -12,7 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from functools import partial, wraps
+from functools import partial, wraps, lru_cache
 
 import jax
 import jax.numpy as jnp
@@ -27,41 +27,35 @@ from netket.utils.types import DType
 from netket.jax.sharding import sharding_decorator
 
 from .base import FermionOperator2ndBase
-from .utils import _is_diag_term
-
-
-@partial(jax.vmap, in_axes=(0, None, None))
-def _flip_daggers_split_cast_term_part(term, site_dtype, dagger_dtype):
-    # splits sites and daggers out of terms, casts to desired dtype
-    sites, daggers = jnp.array(term).reshape([-1, 2]).T
-    # we flip the daggers so that the operator returns xp s.t. <xp|O|x> != 0
-    daggers = jnp.ones_like(daggers) - daggers
-    return sites.astype(site_dtype), daggers.astype(dagger_dtype)
+from .utils import _is_diag_terms, _term_lengths
 
 
 def prepare_terms_list(
-    operators,
+    terms,
+    weights,
     site_dtype=np.uint32,
     dagger_dtype=np.int8,
     weight_dtype=jnp.float64,
 ):
-    # return xp s.t. <x|O|xp> != 0
-    # see https://github.com/netket/netket/issues/1385
-    term_dagger_split_fn = _flip_daggers_split_cast_term_part
-
+    """
+    Splits the (padded) term arrays of the operator into a list of
+    `(weights, sites, daggers)` arrays, one for every number of
+    creation/annihilation operators in the terms.
+    """
     # group the terms together with respect to the number of sites they act on
-    terms_dicts = {}
-    for t, w in operators.items():
-        l = len(t)
-        d = terms_dicts.get(l, {})
-        d[t] = w
-        terms_dicts[l] = d
+    lengths = _term_lengths(terms)
 
     res = []
-    for d in terms_dicts.values():
-        w = jnp.array(list(d.values()), dtype=weight_dtype)
-        t = np.array(list(d.keys()), dtype=int)
-        res.append((w, *term_dagger_split_fn(t, site_dtype, dagger_dtype)))
+    for length in np.unique(lengths):
+        mask = lengths == length
+        t = terms[mask, :length]
+        w = jnp.asarray(weights[mask], dtype=weight_dtype)
+        sites = jnp.asarray(t[..., 0], dtype=site_dtype)
+        # return xp s.t. <x|O|xp> != 0
+        # see https://github.com/netket/netket/issues/1385
+        # we flip the daggers so that the operator returns xp s.t. <xp|O|x> != 0
+        daggers = jnp.asarray(1 - t[..., 1], dtype=dagger_dtype)
+        res.append((w, sites, daggers))
     return res
 
 
@@ -248,6 +242,12 @@ def apply_terms_scan_bits(
     return x_res.astype(x.dtype), *res
 
 
+@lru_cache
+def _apply_terms_scan_bits_packed(n_orbitals):
+    # cached, so that it can be used as a static argument without recompiling
+    return partial(apply_terms_scan_bits, process=False, n_orbitals=n_orbitals)
+
+
 # mostly masks, some indexing
 def _apply_term_masks(x, w, sites, daggers):
     # sites can be an unsigned int
@@ -568,29 +568,27 @@ class FermionOperator2ndJax(FermionOperator2ndBase, DiscreteJaxOperator):
             # TODO ideally we would set dagger_dtype to the same as x
             # however, unfortunately, the dtype of the states in netket
             # is stored in the sampler and not in hilbert, so we don't know it at this stage
-            diag_operators = {
-                k: v for k, v in self._operators.items() if _is_diag_term(k)
-            }
-            offdiag_operators = {
-                k: v for k, v in self._operators.items() if not _is_diag_term(k)
-            }
+            terms, weights = self._term_arrays
+            is_diag = _is_diag_terms(terms)
 
             self._terms_list_diag = prepare_terms_list(
-                diag_operators,
+                terms[is_diag],
+                weights[is_diag],
                 site_dtype=np.uint32,
                 dagger_dtype=jnp.bool_,
                 weight_dtype=self._dtype,
             )
             self._terms_list_offdiag = prepare_terms_list(
-                offdiag_operators,
+                terms[~is_diag],
+                weights[~is_diag],
                 site_dtype=np.uint32,
                 dagger_dtype=jnp.bool_,
                 weight_dtype=self._dtype,
             )
 
             # TODO the following could be reduced further
-            self._max_conn_size = int(len(self._terms_list_diag) > 0) + len(
-                offdiag_operators
+            self._max_conn_size = int(len(self._terms_list_diag) > 0) + int(
+                np.sum(~is_diag)
             )
             self._initialized = True
 
@@ -629,7 +627,8 @@ class FermionOperator2ndJax(FermionOperator2ndBase, DiscreteJaxOperator):
         from .numba import FermionOperator2nd
 
         new_op = FermionOperator2nd(self.hilbert, cutoff=self._cutoff, dtype=self.dtype)
-        new_op._operators = self._operators.copy()
+        terms, weights = self._term_arrays
+        new_op._term_arrays = (terms.copy(), weights.copy())
         return new_op
 
     def get_conn_padded(self, x):
@@ -658,6 +657,34 @@ class FermionOperator2ndJax(FermionOperator2ndBase, DiscreteJaxOperator):
         # alternatively we could return success
         return xp, mels
 
+    def get_conn_padded_packed(self, x):
+        if self._mode != "scan":
+            return super().get_conn_padded_packed(x)
+        self._setup()
+
+        # the packed 32-bit words are viewed as the (little-endian) bytes used
+        # by the bit-wise implementation of the scan mode
+        n_orbitals = self.hilbert.size
+        n_bytes = -(-n_orbitals // 8)
+        xb = jax.lax.bitcast_convert_type(x, jnp.uint8)
+        xb = xb.reshape(x.shape[:-1] + (-1,))
+
+        apply_terms_fun = _apply_terms_scan_bits_packed(n_orbitals)
+        xpb, mels, _ = get_conn_padded_jax(
+            self._max_conn_size,
+            self._dtype,
+            self._terms_list_diag,
+            self._terms_list_offdiag,
+            xb[..., :n_bytes],
+            apply_terms_fun=apply_terms_fun,
+        )
+
+        xpb = jnp.pad(
+            xpb, [(0, 0)] * (xpb.ndim - 1) + [(0, xb.shape[-1] - n_bytes)]
+        )
+        xpb = xpb.reshape(xpb.shape[:-1] + x.shape[-1:] + (4,))
+        return jax.lax.bitcast_convert_type(xpb, x.dtype), mels
+
     def n_conn(self, x):
         self._setup()
         if self._mode == "scan":
@@ -20,7 +20,7 @@ import numba
 from netket.utils.types import DType
 from netket.errors import concrete_or_error, NumbaOperatorGetConnDuringTracingError
 
-from .utils import _is_diag_term, OperatorDict
+from .utils import _is_diag_terms, _term_lengths, _PAD
 from .base import FermionOperator2ndBase
 
 if TYPE_CHECKING:
@@ -54,7 +54,7 @@ class FermionOperator2nd(FermionOperator2ndBase):
         if force or not self._initialized:
             # following lists will be used to compute matrix elements
             # they are filled in _add_term
-            out = _pack_internals(self._operators, self._dtype)
+            out = _pack_internals(*self._term_arrays, self._dtype)
             (
                 self._orb_idxs,
                 self._daggers,
@@ -82,7 +82,8 @@ class FermionOperator2nd(FermionOperator2ndBase):
         new_op = FermionOperator2ndJax(
             self.hilbert, cutoff=self._cutoff, dtype=self.dtype
         )
-        new_op._operators = self._operators.copy()
+        terms, weights = self._term_arrays
+        new_op._term_arrays = (terms.copy(), weights.copy())
         return new_op
 
     def get_conn_flattened(self, x, sections, pad=False):
@@ -220,53 +221,24 @@ class FermionOperator2nd(FermionOperator2ndBase):
             return x_prime[:n_c], mels[:n_c]
 
 
-def _pack_internals(operators: OperatorDict, dtype: DType):
+def _pack_internals(terms: np.ndarray, weights: np.ndarray, dtype: DType):
     """
     Create the internal structures to compute the matrix elements
-    Processes and adds a single term such that we can compute its matrix elements, in tuple format ((1,1), (2,0))
+    from the (padded) arrays of terms in tuple format ((1,1), (2,0)) and weights.
     """
+    valid = terms[..., 1] != _PAD
     # properties of single-fermion operators, e.g. "0^"
-    orb_idxs = []
-    daggers = []
+    # orb_idxs: holds the hilbert index of the orbital
+    orb_idxs = terms[..., 0][valid].astype(np.intp)
+    # daggers: stores whether operator is creator or annihilator
+    daggers = terms[..., 1][valid] == 0
     # properties of multi-body operators, e.g. "0^ 1"
-    weights = []
-    # herm_term = []
-    diag_idxs = []
-    off_diag_idxs = []
+    weights = np.asarray(weights, dtype=dtype)
+    is_diag = _is_diag_terms(terms)
+    diag_idxs = np.nonzero(is_diag)[0].astype(np.intp)
+    off_diag_idxs = np.nonzero(~is_diag)[0].astype(np.intp)
     # below connect the second type to the first type (used to split single-fermion lists)
-    term_split_idxs = []
-
-    term_counter = 0
-    single_op_counter = 0
-    for term, weight in operators.items():
-        if len(term) > 0 and not all(len(t) == 2 for t in term):  # pragma: no cover
-            raise ValueError(f"terms must contain (i, dag) pairs, but received {term}")
-
-        # fill some info about the term
-        weights.append(weight)
-        is_diag = _is_diag_term(term)
-        if is_diag:
-            diag_idxs.append(term_counter)
-        else:
-            off_diag_idxs.append(term_counter)
-
-        # single-fermion operators
-        for orb_idx, dagger in term:
-            # orb_idxs: holds the hilbert index of the orbital
-            orb_idxs.append(orb_idx)
-            # daggers: stores whether operator is creator or annihilator
-            daggers.append(not bool(dagger))
-            single_op_counter += 1
-
-        term_split_idxs.append(single_op_counter)
-        term_counter += 1
-
-    orb_idxs = np.array(orb_idxs, dtype=np.intp)
-    daggers = np.array(daggers, dtype=bool)
-    weights = np.array(weights, dtype=dtype)
-    diag_idxs = np.array(diag_idxs, dtype=np.intp)
-    off_diag_idxs = np.array(off_diag_idxs, dtype=np.intp)
-    term_split_idxs = np.array(term_split_idxs, dtype=np.intp)
+    term_split_idxs = np.cumsum(_term_lengths(terms)).astype(np.intp)
 
     return (
         orb_idxs,
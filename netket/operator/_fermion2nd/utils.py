@@ -1,5 +1,4 @@
 import re
-from collections import defaultdict
 import numpy as np
 from numbers import Number
 import copy
@@ -27,6 +26,14 @@ OperatorWeightsList = list[Number]
 OperatorDict = dict[OperatorTerm, Number]
 """ A dict containing OperatorTerm as key and weights as the values """
 
+OperatorArrays = tuple[np.ndarray, np.ndarray]
+""" The terms as an integer array of shape `(n_terms, max_length, 2)`, where the
+last axis contains the `(idx, dagger)` pairs and shorter terms are padded at the
+end with `(-1, -1)`, and the corresponding array of weights of shape `(n_terms,)`.
+"""
+
+_PAD = -1
+
 
 def _normal_order_term(
     term: OperatorTerm, weight: Number = 1.0
@@ -183,68 +190,33 @@ def _pair_ordering(
     return ordered_terms, ordered_weights
 
 
-def _check_hermitian(
-    terms: OperatorTermsList, weights: OperatorWeightsList, cutoff: float
-) -> bool:
+def _check_hermitian(terms: np.ndarray, weights: np.ndarray, cutoff: float) -> bool:
     """
     Check whether a set of terms and weights for a hermitian operator
     The terms are ordered into a canonical form with daggers and high orbital numbers to the left.
     After conjugation, the result is again reordered into canonical form.
     The result of both ordered lists of terms and weights are compared to be the same
     """
-    # save in a dictionary the normal ordered terms and weights
-    normal_ordered = _normal_ordering(terms, weights)
-    dict_normal = defaultdict(complex)
-    for term, weight in zip(*normal_ordered):
-        dict_normal[tuple(term)] += weight
-
-    # take the hermitian conjugate of the terms
-    hc = _herm_conj(terms, weights)
-    # normal order the h.c. terms
-    hc_normal_ordered = _normal_ordering(*hc)
-
-    # save in a dictionary the normal ordered h.c. terms and weights
-    dict_hc_normal = defaultdict(complex)
-    for term_hc, weight_hc in zip(*hc_normal_ordered):
-        dict_hc_normal[tuple(term_hc)] += weight_hc
-
-    # check if hermitian by comparing the dictionaries
-    dict_normal = dict(dict_normal)
-    dict_hc_normal = dict(dict_hc_normal)
-
-    # compare dict up to a tolerance (1e-10)
-    is_hermitian = _dict_compare(dict_normal, dict_hc_normal, cutoff)
-
-    return is_hermitian
-
-
-def _herm_conj(
-    terms: OperatorTermsList, weights: OperatorWeightsList = 1
-) -> tuple[OperatorTermsList, OperatorWeightsList]:
-    """Returns the hermitian conjugate of the terms and weights."""
-    conj_term = transpose_terms(terms)
-    conj_weight = [np.conjugate(weight) for weight in weights]
-    return conj_term, conj_weight
-
-
-def transpose_terms(terms: OperatorTermsList) -> OperatorTermsList:
-    """Returns the transpose of the terms (creation/destruction operators).
-    The transpose is equivalent to the hermitian transpose because they are
-    real.
-    """
-    conj_term = []
-    for term in terms:
-        conj_term.append([(op, 1 - int(dag)) for (op, dag) in reversed(term)])
-    return conj_term
-
+    # normal order the terms and their hermitian conjugate
+    terms_n, weights_n = _merge_terms(*_normal_order_arrays(terms, weights))
+    terms_hc, weights_hc = _merge_terms(
+        *_normal_order_arrays(_transpose_arrays(terms), np.conjugate(weights))
+    )
+    terms_n, weights_n = _remove_zero_weights(terms_n, weights_n, cutoff)
+    terms_hc, weights_hc = _remove_zero_weights(terms_hc, weights_hc, cutoff)
+    if len(weights_n) != len(weights_hc):
+        return False
 
-def transpose_term(term: OperatorTerm) -> OperatorTerm:
-    """Returns the transpose of a single term (creation/destruction operators).
-    The transpose is equivalent to the hermitian transpose because they are
-    real.
-    """
-    # equivalent to transpose_terms
-    return tuple((op, 1 - int(dag)) for (op, dag) in reversed(term))
+    # check that both contain the same terms, and compare the weights up to a
+    # tolerance
+    index, inverse = _unique_terms(_concatenate_terms(terms_n, terms_hc))
+    if len(index) != len(weights_n):
+        return False
+    w1 = np.zeros(len(index), dtype=weights_n.dtype)
+    w2 = np.zeros(len(index), dtype=weights_hc.dtype)
+    w1[inverse[: len(weights_n)]] = weights_n
+    w2[inverse[len(weights_n) :]] = weights_hc
+    return bool(np.all(np.isclose(w1, w2, atol=cutoff)))
 
 
 def _convert_terms_to_spin_blocks(
@@ -278,15 +250,17 @@ def _convert_terms_to_spin_blocks(
 
 
 def _canonicalize_input(
-    terms: OperatorTermsList,
-    weights: OperatorWeightsList,
+    terms: OperatorTermsList | np.ndarray,
+    weights: OperatorWeightsList | np.ndarray,
     dtype: DType | None,
     cutoff: float,
     constant: Number = 0,
-) -> tuple[OperatorDict, Number, DType]:
+) -> tuple[OperatorArrays, DType]:
     r"""
-    The canonical form is a tree tuple with a tuple pair of integers at the
-    lowest level
+    The canonical form is an integer array of shape `(n_terms, max_length, 2)`
+    containing the `(idx, dagger)` pairs of every term, together with an array
+    of weights (see :data:`OperatorArrays`). Terms occurring multiple times are
+    merged, and terms with weights below the cutoff are removed.
 
     A term of the form :math:`\hat{a}_1^\dagger \hat{a}_2` would take the form
         `((1,1), (2,0))`, where (1,1) represents :math:`\hat{a}_1^\dagger` and (2,0)
@@ -298,63 +272,46 @@ def _canonicalize_input(
     if isinstance(terms, str):
         terms = (terms,)
 
-    if len(terms) > 0:
-        terms = _parse_term_tree(terms)
+    terms = _terms_to_array(terms)
 
     if weights is None:
-        weights = [1.0] * len(terms)
+        weights = np.ones(len(terms))
 
-    weights = list(weights)
+    weights = np.asarray(weights)
+    if weights.ndim != 1:
+        weights = weights.reshape(-1)
     # convert a constant to a diagonal operator
     if not np.isclose(constant, 0.0, atol=cutoff):
-        terms = [()] + list(terms)
-        weights = [constant] + weights
+        terms = _concatenate_terms(np.zeros((1, 0, 2), dtype=terms.dtype), terms)
+        weights = np.concatenate([np.asarray([constant]), weights])
 
-    dtype = canonicalize_dtypes(float, *weights, constant, dtype=dtype)
+    dtype = canonicalize_dtypes(float, weights, constant, dtype=dtype)
 
-    weights = np.array(weights, dtype=dtype).tolist()
+    weights = weights.astype(dtype)
 
     if not len(weights) == len(terms):
         raise ValueError(
             f"length of weights should be equal, but received {len(weights)} and {len(terms)}"
         )
 
-    _check_tree_structure(terms)
-
     # add the weights of terms that occur multiple times
-    operators = zero_defaultdict(dtype)
-    for t, w in zip(terms, weights):
-        operators[t] += w
-    operators = _remove_dict_zeros(dict(operators), cutoff)
+    terms, weights = _merge_terms(terms, weights)
+    terms, weights = _remove_zero_weights(terms, weights, cutoff)
 
-    return operators, dtype
+    return (terms, weights), dtype
 
 
-def _verify_input(hilbert, operators, raise_error=True) -> bool:
+def _verify_input(hilbert, terms: np.ndarray, raise_error=True) -> bool:
     """Check whether all input is valid"""
-    terms = list(operators.keys())
-
-    def _check_op(fop):
-        v1 = 0 <= fop[0] < hilbert.size
-        if not v1:
-            if raise_error:
-                raise ValueError(
-                    f"Found invalid orbital index {fop[0]} for hilbert space {hilbert} of size {hilbert.size}"
-                )
-            return False
-        v2 = fop[1] in (0, 1)
-        if not v2:
-            if raise_error:
-                raise ValueError(
-                    f"Found invalid character {fop[1]} for dagger, which should be 0 (no dagger) or 1 (dagger)."
-                )
-            return False
-        return True
-
-    def _check_term(term):
-        return all(_check_op(t) for t in term)
-
-    return all(_check_term(term) for term in terms)
+    sites = terms[..., 0][terms[..., 1] != _PAD]
+    invalid = (sites < 0) | (sites >= hilbert.size)
+    if np.any(invalid):
+        if raise_error:
+            raise ValueError(
+                f"Found invalid orbital index {sites[invalid][0]} for hilbert space {hilbert} of size {hilbert.size}"
+            )
+        return False
+    return True
 
 
 def _remove_dict_zeros(d: dict, cutoff: float) -> dict:
@@ -362,20 +319,6 @@ def _remove_dict_zeros(d: dict, cutoff: float) -> dict:
     return {k: v for k, v in d.items() if np.abs(v) > cutoff}
 
 
-def _parse_term_tree(terms: OperatorTermsList) -> OperatorTermsList:
-    """Convert the terms tree into a canonical form of tuple tree of depth 3"""
-
-    def _parse_branch(t):
-        if isinstance(t, str):
-            return _parse_string(t)
-        elif hasattr(t, "__len__"):
-            return tuple([_parse_branch(b) for b in t])
-        else:
-            return int(t)
-
-    return _parse_branch(terms)
-
-
 def _parse_string(s: str) -> OperatorTerm:
     """Parse strings such as '1^ 2' into a term form ((1, 1), (2, 0))"""
     s = s.strip()
@@ -426,58 +369,229 @@ def _make_tuple_tree(terms: PyTree) -> PyTree:
     return _make_tuple(terms)
 
 
-def _check_tree_structure(terms: OperatorTermsList) -> OperatorTermsList:
+def _terms_to_array(terms: OperatorTermsList | np.ndarray) -> np.ndarray:
     """
-    Check whether the terms structure is depth 3 everywhere
-    and contains pairs of (idx, dagger) everywhere
+    Convert the terms (strings or trees of `(idx, dagger)` pairs) into an integer
+    array of shape `(n_terms, max_length, 2)`, padded with `(-1, -1)`.
     """
-
-    def _descend(tree, current_depth, depths, pairs):
-        if current_depth == 2 and hasattr(tree, "__len__"):
-            pairs.append(len(tree) == 2)
-        if hasattr(tree, "__len__"):
-            for branch in tree:
-                _descend(branch, current_depth + 1, depths, pairs)
-        else:
-            depths.append(current_depth)
-
-    depths = []
-    pairs = []
-    _descend(terms, 0, depths, pairs)
-    if not np.all(np.array(depths) == 3):
-        raise ValueError(f"terms is not a depth 3 tree, found depths {depths}")
-    if not np.all(pairs):
-        raise ValueError(
-            "terms should be provided in (i, dag) pairs or empty for a constant"
+    if isinstance(terms, np.ndarray):
+        groups = [terms.reshape(0, 0, 2) if terms.size == 0 else terms]
+    else:
+        terms = [_parse_string(t) if isinstance(t, str) else t for t in terms]
+        # terms of the same length are converted together
+        lengths = np.array(
+            [len(t) if hasattr(t, "__len__") else -1 for t in terms], dtype=int
         )
+        if np.any(lengths < 0):
+            raise ValueError("terms is not a depth 3 tree")
+        groups = []
+        for length in np.unique(lengths):
+            group = [t for t, l in zip(terms, lengths) if l == length]
+            if length == 0:
+                groups.append(np.zeros((len(group), 0, 2), dtype=np.int64))
+                continue
+            try:
+                groups.append(np.asarray(group).reshape(len(group), length, -1))
+            except ValueError as err:
+                raise ValueError(
+                    "terms should be provided in (i, dag) pairs or empty for a constant"
+                ) from err
+
+    arrays = []
+    for group in groups:
+        if group.ndim != 3:
+            raise ValueError(f"terms is not a depth 3 tree, found {group.ndim}")
+        if group.shape[1] > 0 and group.shape[2] != 2:
+            raise ValueError(
+                "terms should be provided in (i, dag) pairs or empty for a constant"
+            )
+        group = group.reshape(group.shape[0], group.shape[1], 2)
+        if not np.issubdtype(group.dtype, np.integer):
+            if not np.issubdtype(group.dtype, np.bool_):
+                if np.any(group != np.round(group)):
+                    raise ValueError(f"Found non-integer entries in terms {group}")
+        group = group.astype(np.int64)
+        daggers = group[..., 1]
+        invalid = (daggers != 0) & (daggers != 1)
+        if isinstance(terms, np.ndarray):
+            # arrays can already be padded
+            invalid &= np.any(group != _PAD, axis=-1)
+        if np.any(invalid):
+            raise ValueError(
+                f"Found invalid character {daggers[invalid][0]} for dagger, "
+                "which should be 0 (no dagger) or 1 (dagger)."
+            )
+        arrays.append(group)
+
+    if isinstance(terms, np.ndarray):
+        return _concatenate_terms(np.zeros((0, 0, 2), dtype=np.int64), *arrays)
+
+    # restore the original order of the terms
+    res = _concatenate_terms(np.zeros((0, 0, 2), dtype=np.int64), *arrays)
+    order = np.argsort(lengths, kind="stable")
+    inv_order = np.empty_like(order)
+    inv_order[order] = np.arange(len(order))
+    return res[inv_order]
+
+
+def _array_to_terms(terms: np.ndarray) -> OperatorTermsList:
+    """Convert an array of padded terms into a list of tuple-tree terms."""
+    lengths = _term_lengths(terms)
+    res = [None] * len(terms)
+    for length in np.unique(lengths):
+        (idxs,) = np.nonzero(lengths == length)
+        group = terms[idxs, :length].tolist()
+        for i, t in zip(idxs.tolist(), group):
+            res[i] = tuple(map(tuple, t))
+    return res
+
+
+def _term_lengths(terms: np.ndarray) -> np.ndarray:
+    """Number of creation/annihilation operators in every (padded) term."""
+    return np.sum(terms[..., 1] != _PAD, axis=-1)
+
+
+def _concatenate_terms(*terms: np.ndarray) -> np.ndarray:
+    """Concatenate arrays of padded terms of possibly different widths."""
+    width = max(t.shape[1] for t in terms)
+    terms = [
+        np.pad(t, ((0, 0), (0, width - t.shape[1]), (0, 0)), constant_values=_PAD)
+        for t in terms
+    ]
+    return np.concatenate(terms, axis=0)
+
+
+def _trim_terms(terms: np.ndarray) -> np.ndarray:
+    """Remove the padding columns which are unused by all terms."""
+    width = int(np.max(_term_lengths(terms), initial=0))
+    return terms[:, :width]
+
+
+def _unique_terms(terms: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Find the distinct terms.
 
-
-def _is_diag_term(term: OperatorTerm) -> bool:
+    Returns the index of the first occurrence of every distinct term, sorted,
+    and the index in this list of every term.
     """
-    Check whether this term changes the sample or not
+    n_terms, width, _ = terms.shape
+    # encode every operator as an integer between 1 and 2*max_idx+2, with 0 for
+    # the padding, and if possible every term as a single integer
+    codes = np.where(terms[..., 1] != _PAD, 2 * terms[..., 0] + terms[..., 1] + 1, 0)
+    base = 2 * int(np.max(terms[..., 0], initial=0)) + 3
+    if width * np.log2(base) < 62:
+        keys = codes @ (base ** np.arange(width - 1, -1, -1, dtype=np.int64))
+        _, index, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    else:
+        _, index, inverse = np.unique(
+            codes, axis=0, return_index=True, return_inverse=True
+        )
+    inverse = inverse.reshape(-1)
+
+    # order the distinct terms by their first occurrence
+    order = np.argsort(index)
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    return index[order], rank[inverse]
+
+
+def _merge_terms(terms: np.ndarray, weights: np.ndarray) -> OperatorArrays:
+    """Sum the weights of the terms that occur multiple times."""
+    index, inverse = _unique_terms(terms)
+    if len(index) == len(terms):
+        return terms, weights
+    if np.iscomplexobj(weights):
+        new_weights = np.bincount(inverse, weights.real, len(index)) + 1j * np.bincount(
+            inverse, weights.imag, len(index)
+        )
+    else:
+        new_weights = np.bincount(inverse, weights, len(index))
+    return terms[index], new_weights.astype(weights.dtype)
+
+
+def _remove_zero_weights(
+    terms: np.ndarray, weights: np.ndarray, cutoff: float
+) -> OperatorArrays:
+    """Remove the terms with weights below the cutoff."""
+    mask = np.abs(weights) > cutoff
+    if np.all(mask):
+        return terms, weights
+    return _trim_terms(terms[mask]), weights[mask]
+
+
+def _transpose_arrays(terms: np.ndarray) -> np.ndarray:
+    """Returns the transpose of the (padded) terms."""
+    width = terms.shape[1]
+    lengths = _term_lengths(terms)
+    idxs = lengths[:, None] - 1 - np.arange(width)
+    valid = idxs >= 0
+    res = np.take_along_axis(terms, np.maximum(idxs, 0)[..., None], axis=1)
+    res[..., 1] = 1 - res[..., 1]
+    res[~valid] = _PAD
+    return res
+
+
+def _is_diag_terms(terms: np.ndarray) -> np.ndarray:
     """
-
-    def _init_empty_arr():
-        return [
-            0,
-            0,
-        ]  # first one counts number of daggers, second number of non-daggers
-
-    if len(term) == 0:
-        return True  # constant
-
-    ops = defaultdict(_init_empty_arr)
-    for orb_idx, dagger in term:
-        ops[orb_idx][int(dagger)] += 1
-    return all((x[0] == x[1]) for x in ops.values())
+    Check whether every term changes the sample or not
+    """
+    sites, daggers = terms[..., 0], terms[..., 1]
+    # +1 for a creation and -1 for an annihilation operator, 0 for the padding
+    signs = np.where(daggers == _PAD, 0, 2 * daggers - 1)
+    same = sites[:, :, None] == sites[:, None, :]
+    return np.all(np.einsum("nij,nj->ni", same, signs) == 0, axis=-1)
 
 
-def zero_defaultdict(dtype: DType) -> defaultdict:
+def _normal_order_arrays(terms: np.ndarray, weights: np.ndarray) -> OperatorArrays:
     """
-    Temporary function to make sure we get a good initializer for each dtype
+    Returns the normal ordered terms and weights of the fermion operator,
+    in array form (see :func:`_normal_order_term` for the ordering).
+
+    The terms which are simple permutations of their normal ordered form (no
+    annihilation operator acting before a creation operator on the same orbital)
+    are ordered all together, by sorting the operators and computing the sign of
+    the permutation. Only the others are ordered one by one.
+    The resulting terms are not merged.
     """
+    n_terms, width, _ = terms.shape
+    if n_terms == 0 or width == 0:
+        return terms, weights
+
+    sites, daggers = terms[..., 0], terms[..., 1]
+    valid = daggers != _PAD
+    before = np.triu(np.ones((width, width), dtype=bool), 1)[None]
+    same = (
+        (sites[:, :, None] == sites[:, None, :])
+        & valid[:, :, None]
+        & valid[:, None, :]
+        & before
+    )
+    # an annihilation operator to the left of a creation on the same orbital
+    # requires the anticommutation relation a a^ = 1 - a^ a
+    contract = same & (daggers[:, :, None] == 0) & (daggers[:, None, :] == 1)
+    needs_contraction = np.any(contract, axis=(1, 2))
+    # otherwise, a repeated operator gives zero
+    repeated = same & (daggers[:, :, None] == daggers[:, None, :])
+    is_zero = np.any(repeated, axis=(1, 2)) & ~needs_contraction
+
+    # creation operators go to the left and higher indices go to the left
+    key = np.where(valid, daggers * (np.max(sites) + 1) + sites, -1)
+    order = np.argsort(-key, axis=1, kind="stable")
+    n_swaps = np.sum((key[:, :, None] < key[:, None, :]) & before, axis=(1, 2))
+    sign = 1 - 2 * (n_swaps % 2)
+
+    simple = ~needs_contraction & ~is_zero
+    res_terms = [np.take_along_axis(terms[simple], order[simple][..., None], axis=1)]
+    res_weights = [sign[simple] * weights[simple]]
+
+    if np.any(needs_contraction):
+        (idxs,) = np.nonzero(needs_contraction)
+        terms_c, weights_c = _normal_ordering(
+            _array_to_terms(terms[idxs]), weights[idxs].tolist()
+        )
+        if len(terms_c) > 0:
+            res_terms.append(_terms_to_array(terms_c))
+            res_weights.append(np.asarray(weights_c, dtype=weights.dtype))
 
-    def _dtype_init():
-        return np.array(0, dtype=dtype).item()
-
-    return defaultdict(_dtype_init)
+    terms = _trim_terms(_concatenate_terms(*res_terms))
+    return terms, np.concatenate(res_weights).astype(weights.dtype)
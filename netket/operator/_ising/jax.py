@@ -23,6 +23,7 @@ from netket.graph import AbstractGraph
 from netket.hilbert import AbstractHilbert
 from netket.utils.numbers import StaticZero
 from netket.utils.types import DType
+from netket.jax import pack_bits, unpack_bits
 
 from .._discrete_operator_jax import DiscreteJaxOperator
 
@@ -77,6 +78,13 @@ class IsingJax(IsingBase, DiscreteJaxOperator):
         xp = self.hilbert.local_indices_to_states(xp_ids, dtype=x.dtype)
         return xp, mels
 
+    @jax.jit
+    @wraps(DiscreteJaxOperator.get_conn_padded_packed)
+    def get_conn_padded_packed(self, x):
+        return _ising_kernel_packed_jax(
+            x, self.hilbert.size, self._edges, self.h, self.J
+        )
+
     def to_numba_operator(self) -> "Ising":  # noqa: F821
         """
         Returns the standard (numba) version of this operator, which is an
@@ -155,6 +163,20 @@ def _ising_kernel_jax(x, edges, h, J):
     return x_prime, mels
 
 
+@partial(jax.jit, static_argnums=1)
+def _ising_kernel_packed_jax(x, hilb_size, edges, h, J):
+    # same as _ising_kernel_jax, but x and x_prime are packed into words
+    mels = _ising_mels_jax(unpack_bits(x, hilb_size), edges, h, J)
+
+    if isinstance(h, StaticZero):
+        x_prime = jnp.expand_dims(x, axis=-2)
+    else:
+        flip = jnp.eye(hilb_size + 1, hilb_size, k=-1, dtype=bool)
+        x_prime = x[..., None, :] ^ pack_bits(flip)
+
+    return x_prime, mels
+
+
 @jax.jit
 def _ising_n_conn_jax(x, edges, h, J):
     n_conn_X = 0 if isinstance(h, StaticZero) else x.shape[-1]
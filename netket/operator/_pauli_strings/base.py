@@ -12,15 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import re
 from typing import Union
 from collections.abc import Iterable
 from netket.utils.types import DType, Array
 
 import numpy as np
 import jax.numpy as jnp
-from numba import jit
-from itertools import product
 from numbers import Number
 
 from netket import jax as nkjax
@@ -31,8 +28,6 @@ from netket.utils.numbers import dtype as _dtype, is_scalar
 from .._abstract_operator import AbstractOperator
 from .._discrete_operator import DiscreteOperator
 
-valid_pauli_regex = re.compile(r"^[XYZI]+$")
-
 
 def _standardize_matrix_input_type(op):
     """
@@ -90,23 +85,24 @@ def canonicalize_input(hilbert: AbstractHilbert, operators, weights, *, dtype=No
             "PauliStrings only work for local hilbert size 2 where PauliMatrices are defined"
         )
 
-    if any(len(op) != hilbert.size for op in operators):
+    operators = np.asarray(operators, dtype=str).reshape(-1)
+    if np.any(np.char.str_len(operators) != hilbert.size):
         raise ValueError("Pauli strings have inhomogeneous lengths.")
 
-    consistent = all(bool(valid_pauli_regex.search(op)) for op in operators)
-    if not consistent:
+    chars = np.ascontiguousarray(operators, dtype=f"<U{hilbert.size}").view("<U1")
+    if not np.all(np.isin(chars, ["X", "Y", "Z", "I"])):
         raise ValueError(
             """Operators in string must be one of
             the Pauli operators X,Y,Z, or the identity I"""
         )
 
     weights = _standardize_matrix_input_type(weights)
-    operators = np.asarray(operators, dtype=str)
+    x, z = _strings_to_symplectic(operators, hilbert.size)
 
-    operators, weights = _reduce_pauli_string(operators, weights)
+    x, z, weights = _reduce_symplectic(x, z, weights)
 
     # When there is an odd number of 'Y' in any string, the whole operator must be complex
-    op_is_complex = any(s.count("Y") % 2 == 1 for s in operators)
+    op_is_complex = bool(np.any(_popcount(x & z) % 2 == 1))
 
     dtype = canonicalize_dtypes(
         complex if op_is_complex else float, weights, dtype=dtype
@@ -121,7 +117,7 @@ def canonicalize_input(hilbert: AbstractHilbert, operators, weights, *, dtype=No
 
     weights = cast_operator_matrix_dtype(weights, dtype=dtype)
 
-    return hilbert, operators, weights, weights.dtype
+    return hilbert, (x, z), weights, weights.dtype
 
 
 class PauliStringsBase(DiscreteOperator):
@@ -172,7 +168,7 @@ class PauliStringsBase(DiscreteOperator):
         if not isinstance(hilbert, AbstractHilbert):
             hilbert, operators, weights = None, hilbert, operators
 
-        hilbert, operators, weights, dtype = canonicalize_input(
+        hilbert, xz, weights, dtype = canonicalize_input(
             hilbert, operators, weights, dtype=dtype
         )
 
@@ -181,7 +177,10 @@ class PauliStringsBase(DiscreteOperator):
 
         super().__init__(hilbert)
 
-        self._operators = operators
+        # The strings are stored in symplectic form, and only converted back to
+        # strings when needed. Either attribute can be None if not computed yet.
+        self._operators = None
+        self._xz = xz
         self._weights = weights
         self._dtype = dtype
 
@@ -191,8 +190,25 @@ class PauliStringsBase(DiscreteOperator):
 
     @property
     def operators(self) -> Iterable[str]:
+        if self._operators is None and self._xz is not None:
+            self._operators = _symplectic_to_strings(*self._xz, self.hilbert.size)
         return self._operators
 
+    @property
+    def _symplectic(self) -> tuple[np.ndarray, np.ndarray]:
+        r"""
+        The strings in symplectic form `(x, z)`, where every string is
+        :math:`i^{|x \wedge z|} X^x Z^z` and the bits are packed into bytes.
+        """
+        if self._xz is None:
+            self._xz = _strings_to_symplectic(self._operators, self.hilbert.size)
+        return self._xz
+
+    def _set_symplectic(self, xz, weights):
+        self._xz = xz
+        self._operators = None
+        self._weights = weights
+
     @property
     def weights(self) -> Iterable[str]:
         return self._weights
@@ -302,7 +318,8 @@ class PauliStringsBase(DiscreteOperator):
 
         new = type(self)(self.hilbert, dtype=dtype)
         new._cutoff = cutoff
-        new._operators = self.operators
+        new._operators = self._operators
+        new._xz = self._xz
 
         if dtype == self.dtype:
             new._weights = self._weights.copy()
@@ -330,16 +347,15 @@ class PauliStringsBase(DiscreteOperator):
             raise ValueError(
                 f"Can only multiply identical hilbert spaces (got A@B, A={self.hilbert}, B={other.hilbert})"
             )
-        operators, weights = _matmul(
-            self.operators,
+        x, z, weights = _matmul(
+            self._symplectic,
             self.weights,
-            other.operators,
+            other._symplectic,
             other.weights,
             dtype=self.dtype,
         )
 
-        self._operators = operators
-        self._weights = weights
+        self._set_symplectic((x, z), weights)
         self._reset_caches()
         return self
 
@@ -398,12 +414,20 @@ class PauliStringsBase(DiscreteOperator):
         return -1 * self
 
     def __radd__(self, other):
+        if isinstance(other, DiscreteOperator) and not isinstance(
+            other, PauliStringsBase
+        ):
+            return _sum_operator_jax(other, self)
         return self.__add__(other)
 
     def __isub__(self, other):
         return self.__iadd__(-other)
 
     def __add__(self, other: Union["PauliStringsBase", Number]):
+        if isinstance(other, DiscreteOperator) and not isinstance(
+            other, PauliStringsBase
+        ):
+            return _sum_operator_jax(self, other)
         op = self.copy(dtype=jnp.promote_types(self.dtype, _dtype(other)))
         op = op.__iadd__(other)
         return op
@@ -415,12 +439,15 @@ class PauliStringsBase(DiscreteOperator):
                     f"Can only add identical hilbert spaces (got A+B, A={self.hilbert}, B={other.hilbert})"
                 )
 
-            operators = np.concatenate((self.operators, other.operators))
+            (x1, z1), (x2, z2) = self._symplectic, other._symplectic
             weights = np.concatenate((self.weights, other.weights), dtype=self.dtype)
-            operators, weights = _reduce_pauli_string(operators, weights)
+            x, z, weights = _reduce_symplectic(
+                np.concatenate((x1, x2)),
+                np.concatenate((z1, z2)),
+                weights,
+            )
 
-            self._operators = operators
-            self._weights = weights
+            self._set_symplectic((x, z), weights)
             self._cutoff = min(self._cutoff, other._cutoff)
             self._reset_caches()
             return self
@@ -440,6 +467,13 @@ class PauliStringsBase(DiscreteOperator):
         raise NotImplementedError
 
 
+def _sum_operator_jax(*operators):
+    """Sums discrete operators of different types into a SumOperatorJax."""
+    from .._sumoperators_jax import SumOperatorJax
+
+    return SumOperatorJax(*operators)
+
+
 def _count_of_locations(of_qubit_operator):
     """Obtain the number of qubits in the openfermion QubitOperator. Openfermion builds operators from terms that store operators locations.
 
@@ -461,136 +495,190 @@ def _count_of_locations(of_qubit_operator):
     return n_qubits
 
 
-@jit(nopython=True)
-def _num_to_pauli(k):
-    return ("I", "X", "Y", "Z")[k]
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+"""Number of set bits in every byte."""
 
+_PHASES = np.array([1, 1j, -1, -1j])
+"""The powers of the imaginary unit."""
 
-@jit(nopython=True)
-def _pauli_to_num(p):
-    if p == "X":
-        return 1
-    elif p == "Y":
-        return 2
-    elif p == "Z":
-        return 3
-    elif p == "I":
-        return 0
-    else:
-        raise ValueError("p should be in 'XYZ'")
-
-
-@jit(nopython=True)
-def _levi_term(i, j):
-    k = int(6 - i - j)  # i, j, k are permutations of (1,2,3), ijk=0 is already handled
-    term = (i - j) * (j - k) * (k - i) / 2
-    return _num_to_pauli(k), 1j * term
+_CHARS = np.array(["I", "X", "Z", "Y"])
+"""The Pauli operator corresponding to `x + 2 z`."""
 
+_SPREAD = np.array(
+    [sum(((b >> k) & 1) << (2 * k) for k in range(8)) for b in range(256)],
+    dtype=np.uint16,
+)
+"""The bits of every byte, interleaved with zeros."""
 
-@jit(nopython=True)
-def _apply_pauli_op_reduction(op1, op2):
-    if op1 == op2:
-        return "I", 1
-    elif op1 == "I":
-        return op2, 1
-    elif op2 == "I":
-        return op1, 1
-    else:
-        n1 = _pauli_to_num(op1)
-        n2 = _pauli_to_num(op2)
-        pauli, levi_factor = _levi_term(n1, n2)
-        return pauli, levi_factor
 
+def _popcount(a):
+    """Number of set bits in every row of a packed array of shape `(..., n_bytes)`."""
+    return _POPCOUNT[a].sum(axis=-1, dtype=np.int64)
 
-@jit(nopython=True)
-def _split_string(s):
-    return [x for x in str(s)]
 
+def _strings_to_symplectic(op_arr, n_sites):
+    r"""
+    Converts an array of Pauli strings to their symplectic representation, where
+    the string :math:`i^{|x \wedge z|} X^x Z^z` is stored as the bit vectors
+    `(x, z)`. The bits of every string are packed into bytes, with the first site
+    stored in the most significant bit.
 
-@jit(nopython=True)
-def _make_new_pauli_string(op1, w1, op2, w2):
-    """Compute the (symbolic) tensor product of two pauli strings with weights
     Args:
-        op1, op2 (str): Pauli strings (e.g. IIXIIXZ).
-        w1, w2 (complex): The corresponding weights
+        op_arr: An array of Pauli strings of length `n_sites`.
+        n_sites: The number of sites.
 
     Returns:
-        new_op (str): the new pauli string (result of the tensor product)
-        new_weight (complex): the weight of the pauli string
+        x, z: Two `uint8` arrays of shape `(len(op_arr), ceil(n_sites/8))`.
+    """
+    chars = np.ascontiguousarray(op_arr, dtype=f"<U{n_sites}")
+    chars = chars.view("<U1").reshape(len(op_arr), n_sites)
+    x = (chars == "X") | (chars == "Y")
+    z = (chars == "Z") | (chars == "Y")
+    return np.packbits(x, axis=1), np.packbits(z, axis=1)
+
 
+def _symplectic_to_strings(x, z, n_sites):
+    """Inverse of :func:`_strings_to_symplectic`."""
+    codes = np.unpackbits(x, axis=1, count=n_sites)
+    codes += 2 * np.unpackbits(z, axis=1, count=n_sites)
+    chars = np.ascontiguousarray(_CHARS[codes], dtype="<U1")
+    return chars.view(f"<U{n_sites}").reshape(len(codes))
+
+
+def _order_keys(x, z):
     """
-    assert len(op1) == len(op2)
-    op1 = _split_string(op1)
-    op2 = _split_string(op2)
-    o_w = [_apply_pauli_op_reduction(a, b) for a, b in zip(op1, op2)]
-    new_op = [o[0] for o in o_w]
-    new_weights = np.array([o[1] for o in o_w])
-    new_op = "".join(new_op)
-    new_weight = w1 * w2 * np.prod(new_weights)
-    return new_op, new_weight
-
-
-def _remove_zero_weights(op_arr, w_arr):
-    if len(op_arr) == 0:
-        return op_arr, w_arr
+    Returns an `uint64` array with one row for every symplectic string, whose
+    lexicographic order is the alphabetical order of the Pauli strings.
+
+    Every site is stored with the 2 bits `(z, x ^ z)`, which take the values 0,
+    1, 2 and 3 for I, X, Y and Z respectively.
+    """
+    keys = (_SPREAD[z] << 1) | _SPREAD[x ^ z]
+    n_pad = -keys.shape[1] % 4
+    keys = np.pad(keys, ((0, 0), (0, n_pad))).astype(">u2")
+    return keys.view(">u8").astype(np.uint64)
+
+
+def _void_rows(a):
+    """View every row of a 2D array as a single opaque element."""
+    a = np.ascontiguousarray(a)
+    return a.view(np.dtype((np.void, a.dtype.itemsize * a.shape[1]))).reshape(-1)
+
+
+def _remove_zero_weights(x, z, w_arr):
     idx_nz = ~np.isclose(w_arr, 0)
+    if np.all(idx_nz):
+        return x, z, w_arr
     if np.any(idx_nz):
-        operators = op_arr[idx_nz]
-        weights = w_arr[idx_nz]
+        return x[idx_nz], z[idx_nz], w_arr[idx_nz]
+    # convention: the zero operator is the identity with weight 0
+    x = np.zeros((1, x.shape[1]), dtype=x.dtype)
+    return x, x.copy(), np.zeros(1, dtype=w_arr.dtype)
+
+
+def _merge_duplicates(x, z, w_arr):
+    """
+    Sums the weights of identical symplectic strings.
+
+    Returns the unique strings sorted in alphabetical order and the summed
+    weights, or the unchanged input if all strings are distinct, together with a
+    flag telling which is the case.
+    """
+    keys = _order_keys(x, z)
+    if keys.shape[1] == 1:
+        _, index, inverse = np.unique(keys[:, 0], return_index=True, return_inverse=True)
+    else:
+        # unique of 64-bit hashes of the rows, which is much faster than sorting
+        # the rows themselves
+        coeffs = np.random.default_rng(0).integers(
+            1, 2**63, size=keys.shape[1], dtype=np.uint64
+        )
+        hashes = keys[:, 0] * coeffs[0]
+        for k in range(1, keys.shape[1]):
+            hashes ^= keys[:, k] * coeffs[k] + (hashes >> np.uint64(29))
+        _, index, inverse = np.unique(hashes, return_index=True, return_inverse=True)
+        if not np.array_equal(keys[index][inverse.reshape(-1)], keys):
+            _, index, inverse = np.unique(
+                _void_rows(keys), return_index=True, return_inverse=True
+            )
+    if len(index) == len(keys):
+        return x, z, w_arr, False
+
+    inverse = inverse.reshape(-1)
+    if np.iscomplexobj(w_arr):
+        weights = np.bincount(inverse, weights=w_arr.real) + 1j * np.bincount(
+            inverse, weights=w_arr.imag
+        )
     else:
-        # convention
-        operators = np.array(["I" * len(op_arr[0])])
-        weights = np.array([0], dtype=w_arr.dtype)
-    return operators, weights
+        weights = np.bincount(inverse, weights=w_arr)
+    weights = weights.astype(w_arr.dtype)
 
+    if keys.shape[1] > 1:
+        order = np.lexsort(keys[index].T[::-1])
+        index, weights = index[order], weights[order]
+    return x[index], z[index], weights, True
 
-def _reduce_pauli_string(op_arr, w_arr):
-    """From a list of pauli strings, sum the weights of duplicate strings.
-    Args:
-        op1, op2 (str): Pauli strings (e.g. IIXIIXZ).
-        w1, w2 (complex): The corresponding weights
 
-    Returns:
-        new_op (str): the new pauli string (result of the tensor product)
-        new_weight (complex): the weight of the pauli string
+def _reduce_symplectic(x, z, w_arr):
+    """
+    Sums the weights of duplicate strings and removes those with zero weight.
 
+    If there are duplicates, the resulting strings are sorted in alphabetical
+    order, otherwise their order is preserved.
     """
-    operators_unique, idx = np.unique(op_arr, return_inverse=True)
-    if len(operators_unique) == len(op_arr):
-        # still remove zeros
-        return _remove_zero_weights(op_arr, w_arr)
-    summed_weights = np.array(
-        [np.sum(w_arr[idx == i]) for i in range(len(operators_unique))],
-        dtype=w_arr.dtype,
-    )
-    operators, weights = _remove_zero_weights(operators_unique, summed_weights)
-    return operators, weights
+    w_arr = np.asarray(w_arr)
+    if len(w_arr) == 0:
+        return x, z, w_arr
+    x, z, w_arr, _ = _merge_duplicates(x, z, w_arr)
+    return _remove_zero_weights(x, z, w_arr)
 
 
-def _matmul(op_arr1, w_arr1, op_arr2, w_arr2, *, dtype):
-    """(Symbolic) Tensor product of two PauliStrings
+def _matmul(xz1, w_arr1, xz2, w_arr2, *, dtype, chunk_size=2**22):
+    """(Symbolic) product of two sums of Pauli strings in symplectic form.
+
+    The products of all pairs of strings are computed in chunks of rows of the
+    first operator, merging the duplicates after every chunk so that the memory
+    never exceeds that of a chunk and of the result.
+
     Args:
-        op_arr1, op_arr2 (np.array): Arrays operators (strings) in a PauliStrings sum
-        w_arr1, w_arr2 (np.array): The corresponding weights of the operators in the sums
+        xz1, xz2: The symplectic representations `(x, z)` of the strings.
+        w_arr1, w_arr2 (np.array): The corresponding weights.
+        dtype: The dtype of the resulting weights.
+        chunk_size: Approximate number of products computed at once.
 
     Returns:
-        operators (np.array): Array of the resulting operator strings
-        new_weight (np.array): Array of the corresponding weights
+        x, z (np.array): The symplectic representation of the resulting strings.
+        weights (np.array): The corresponding weights.
     """
+    (x1, z1), (x2, z2) = xz1, xz2
+    w_arr1 = np.asarray(w_arr1)
+    w_arr2 = np.asarray(w_arr2)
+    # (x1, z1) (x2, z2) = i^(|x1 z1| + |x2 z2| - |x z| + 2 |z1 x2|) (x, z)
+    y1, y2 = _popcount(x1 & z1), _popcount(x2 & z2)
+
+    n_rows = max(1, chunk_size // max(1, len(w_arr2)))
+    x, z = x1[:0], z1[:0]
+    weights = np.zeros(0, dtype=dtype)
+    merged = merged_c = False
+    for start in range(0, len(w_arr1), n_rows):
+        sl = slice(start, start + n_rows)
+        x_c = x1[sl, None] ^ x2[None]
+        z_c = z1[sl, None] ^ z2[None]
+        phase = y1[sl, None] + y2[None] - _popcount(x_c & z_c)
+        phase = (phase + 2 * _popcount(z1[sl, None] & x2[None])) % 4
+        w_c = w_arr1[sl, None] * w_arr2[None] * _PHASES[phase]
+        # explicit real part to avoid warning
+        if not nkjax.is_complex_dtype(dtype):
+            w_c = w_c.real
+        x, z, weights, merged_c = _merge_duplicates(
+            np.concatenate((x, x_c.reshape(-1, x1.shape[1]))),
+            np.concatenate((z, z_c.reshape(-1, z1.shape[1]))),
+            np.concatenate((weights, w_c.reshape(-1).astype(dtype))),
+        )
+        merged = merged or merged_c
 
-    operators = []
-    weights = []
-    for (op1, w1), (op2, w2) in product(zip(op_arr1, w_arr1), zip(op_arr2, w_arr2)):
-        # warning: numba always returns complex values, even if we are expecting float.
-        op, w = _make_new_pauli_string(op1, w1, op2, w2)
-        operators.append(op)
-        weights.append(w)
-    # so here we recast to the desired dtype
-    operators, weights = np.array(operators), np.array(weights)
-    # explicit real part to avoid warning
-    if not nkjax.is_complex_dtype(dtype):
-        weights = weights.real
-    weights = weights.astype(dtype)
-
-    operators, weights = _reduce_pauli_string(operators, weights)
-    return operators, weights
+    if merged and not merged_c:
+        # strings added by the last chunk are not in alphabetical order
+        order = np.lexsort(_order_keys(x, z).T[::-1])
+        x, z, weights = x[order], z[order], weights[order]
+    return _remove_zero_weights(x, z, weights)
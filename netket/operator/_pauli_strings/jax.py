@@ -24,6 +24,7 @@ from jax.tree_util import register_pytree_node_class
 from netket.hilbert import AbstractHilbert, HomogeneousHilbert
 from netket.errors import concrete_or_error, JaxOperatorSetupDuringTracingError
 from netket.utils.types import DType
+from netket.jax import pack_bits, unpack_bits
 from netket.utils import HashableArray
 
 from .._discrete_operator_jax import DiscreteJaxOperator
@@ -286,10 +287,24 @@ def _pauli_strings_kernel_jax(x_flip_masks_all, z_data, x, cutoff=None):
         nonzero_mels_mask = None
     # can re-use function from Ising
     x_prime = _ising_conn_states_jax(x[..., None, :], x_flip_masks_all)
-    # TODO we could optionally move nonzeros to front here
+    # the connected elements with zero matrix element are not compacted here, as
+    # the local-value kernels skip them when evaluating the model
     return x_prime, mels, nonzero_mels_mask
 
 
+@jax.jit
+def _pauli_strings_kernel_packed_jax(x_flip_masks_all, z_data, x, cutoff=None):
+    # same as _pauli_strings_kernel_jax, but x and x_prime are packed into words
+    mels = _pauli_strings_mels_jax(z_data, unpack_bits(x, x_flip_masks_all.shape[-1]))
+    x_prime = x[..., None, :] ^ pack_bits(x_flip_masks_all)
+    if cutoff is not None:
+        nonzero_mels_mask = jnp.abs(mels) > cutoff
+        mels = jax.lax.select(nonzero_mels_mask, mels, jnp.zeros_like(mels))
+        # only flip if corresponding mel is nonzero
+        x_prime = jnp.where(nonzero_mels_mask[..., None], x_prime, x[..., None, :])
+    return x_prime, mels
+
+
 @jax.jit
 def _pauli_strings_n_conn_jax(x_flip_masks_all, z_data, x, cutoff=None):
     _, _, nonzero_mels_mask = _pauli_strings_kernel_jax(
@@ -429,6 +444,16 @@ class PauliStringsJax(PauliStringsBase, DiscreteJaxOperator):
         xp = self.hilbert.local_indices_to_states(xp_ids, dtype=x.dtype)
         return xp, mels
 
+    def get_conn_padded_packed(self, x):
+        self._setup()
+
+        return _pauli_strings_kernel_packed_jax(
+            self._x_flip_masks_stacked,
+            self._z_data,
+            x,
+            cutoff=self._cutoff,
+        )
+
     def tree_flatten(self):
         self._setup()
         data = (self.weights, self._x_flip_masks_stacked, self._z_data)
@@ -452,6 +477,7 @@ class PauliStringsJax(PauliStringsBase, DiscreteJaxOperator):
         op._operators = (
             operators_hashable.wrapped if operators_hashable is not None else None
         )
+        op._xz = None
         op._operators_hashable = operators_hashable
         op._weights = weights
         op._x_flip_masks_stacked = xm
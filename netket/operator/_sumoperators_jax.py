@@ -0,0 +1,255 @@
+# Copyright 2025 The NetKet Authors - All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections.abc import Iterable
+
+import numpy as np
+
+import jax
+import jax.numpy as jnp
+from jax.tree_util import register_pytree_node_class
+
+from netket.jax import canonicalize_dtypes
+from netket.utils.numbers import is_scalar
+from netket.utils.types import Array, DType
+
+from ._discrete_operator import DiscreteOperator
+from ._discrete_operator_jax import DiscreteJaxOperator
+
+
+def _flatten_sumoperators_jax(
+    operators: Iterable[DiscreteOperator], coefficients: Iterable[complex]
+) -> tuple[list[DiscreteJaxOperator], list[complex]]:
+    """Flatten nested sums and convert all terms to jax operators."""
+    new_operators: list[DiscreteJaxOperator] = []
+    new_coeffs = []
+    for op, c in zip(operators, coefficients):
+        if isinstance(op, SumOperatorJax):
+            new_operators.extend(op.operators)
+            new_coeffs.extend(c * np.asarray(op.coefficients))
+        elif isinstance(op, DiscreteOperator):
+            new_operators.append(op.to_jax_operator())
+            new_coeffs.append(c)
+        else:
+            raise TypeError(
+                f"Cannot sum an object of type {type(op)} with discrete operators."
+            )
+    return new_operators, new_coeffs
+
+
+@register_pytree_node_class
+class SumOperatorJax(DiscreteJaxOperator):
+    r"""
+    Jax-compatible sum of discrete operators, possibly of different types.
+
+    The connected elements of all terms are fused into a single table: the
+    diagonal matrix elements of all terms are summed into a single entry, and
+    connected configurations produced by more than one term (for example the
+    single spin flips of an :class:`~netket.operator.IsingJax` and of a
+    :class:`~netket.operator.PauliStringsJax`) are merged by summing their
+    matrix elements. Entries with a nonzero matrix element come first, so that
+    the local estimators evaluate the model on every distinct connected
+    configuration only once.
+
+    Numba operators are converted with
+    :meth:`~netket.operator.DiscreteOperator.to_jax_operator`.
+
+    Example:
+
+        >>> import netket as nk
+        >>> g = nk.graph.Chain(4)
+        >>> hi = nk.hilbert.Spin(0.5, g.n_nodes)
+        >>> ha = nk.operator.SumOperatorJax(
+        ...     nk.operator.IsingJax(hi, g, h=1.0),
+        ...     nk.operator.PauliStringsJax(hi, ["XIII", "ZZII"], [0.5, 0.3]),
+        ... )
+        >>> ha.max_conn_size
+        7
+    """
+
+    def __init__(
+        self,
+        *operators: DiscreteOperator,
+        coefficients: float | Iterable[float] = 1.0,
+        dtype: DType | None = None,
+    ):
+        r"""
+        Constructs the sum of discrete operators.
+
+        Args:
+            operators: The discrete operators to sum. Sums are flattened, and
+                operators that are not jax-compatible are converted.
+            coefficients: A coefficient for every operator, or a single
+                coefficient for all of them.
+            dtype: Data type of the matrix elements.
+        """
+        if len(operators) == 0:
+            raise ValueError("SumOperatorJax needs at least one operator.")
+
+        hi_spaces = [op.hilbert for op in operators]
+        if not all(hi == hi_spaces[0] for hi in hi_spaces):
+            raise NotImplementedError(
+                "Cannot add operators on different hilbert spaces"
+            )
+
+        if is_scalar(coefficients):
+            coefficients = [coefficients for _ in operators]
+
+        if len(operators) != len(coefficients):
+            raise AssertionError("Each operator needs a coefficient")
+
+        operators, coefficients = _flatten_sumoperators_jax(operators, coefficients)
+
+        dtype = canonicalize_dtypes(float, *operators, *coefficients, dtype=dtype)
+
+        super().__init__(hi_spaces[0])
+        self._operators = tuple(operators)
+        self._coefficients = jnp.asarray(coefficients, dtype=dtype)
+        self._dtype = dtype
+        self._is_hermitian = all(op.is_hermitian for op in operators) and np.all(
+            np.isreal(coefficients)
+        )
+
+    @property
+    def dtype(self) -> DType:
+        return self._dtype
+
+    @property
+    def is_hermitian(self) -> bool:
+        return self._is_hermitian
+
+    @property
+    def operators(self) -> tuple[DiscreteJaxOperator, ...]:
+        """The list of all operators in the terms of this sum. Every
+        operator is summed with a corresponding coefficient.
+        """
+        return self._operators
+
+    @property
+    def coefficients(self) -> Array:
+        """The coefficients of the terms of this sum."""
+        return self._coefficients
+
+    @property
+    def max_conn_size(self) -> int:
+        """The maximum number of non zero ⟨x|O|x'⟩ for every x."""
+        return sum(op.max_conn_size for op in self.operators)
+
+    @jax.jit
+    def get_conn_padded(self, x):
+        xp = []
+        mels = []
+        for op, c in zip(self.operators, self.coefficients):
+            xp_k, mels_k = op.get_conn_padded(x)
+            xp.append(xp_k.astype(x.dtype))
+            mels.append((c * mels_k).astype(self.dtype))
+        return _fuse_connected(
+            x, jnp.concatenate(xp, axis=-2), jnp.concatenate(mels, axis=-1)
+        )
+
+    def __add__(self, other):
+        if isinstance(other, DiscreteOperator):
+            return SumOperatorJax(self, other)
+        return NotImplemented
+
+    def __radd__(self, other):
+        if isinstance(other, DiscreteOperator):
+            return SumOperatorJax(other, self)
+        return NotImplemented
+
+    def __mul__(self, other):
+        if is_scalar(other):
+            coefficients = other * self.coefficients
+            return SumOperatorJax(*self.operators, coefficients=coefficients)
+        return NotImplemented
+
+    def __rmul__(self, other):
+        return self.__mul__(other)
+
+    def tree_flatten(self):
+        data = (self.operators, self.coefficients)
+        metadata = {
+            "hilbert": self.hilbert,
+            "dtype": self.dtype,
+            "is_hermitian": self.is_hermitian,
+        }
+        return data, metadata
+
+    @classmethod
+    def tree_unflatten(cls, metadata, data):
+        operators, coefficients = data
+        res = cls.__new__(cls)
+        DiscreteJaxOperator.__init__(res, metadata["hilbert"])
+        res._operators = operators
+        res._coefficients = coefficients
+        res._dtype = metadata["dtype"]
+        res._is_hermitian = metadata["is_hermitian"]
+        return res
+
+    def __repr__(self):
+        return (
+            f"SumOperatorJax(operators={self.operators}, "
+            f"coefficients={self.coefficients})"
+        )
+
+
+def _fuse_connected(x, xp, mels):
+    """
+    Merges the connected elements `(xp, mels)` of shape `(..., K, N)` and
+    `(..., K)` that correspond to the same configuration.
+
+    The diagonal entries come first, followed by the other connected
+    configurations with a nonzero matrix element and then by the padding, which
+    is set to the configuration `x` itself with a zero matrix element. The
+    output has the same shape as the input.
+    """
+    batch_shape = x.shape[:-1]
+    N = x.shape[-1]
+    K = mels.shape[-1]
+    x = x.reshape(-1, N)
+    xp = xp.reshape(-1, K, N)
+    mels = mels.reshape(-1, K)
+
+    # Configurations are sorted by group (diagonal, off-diagonal, zero) and by a
+    # hash, so that identical configurations of the same group are contiguous.
+    # A collision of the hashes can only prevent some entries from being merged.
+    is_diag = jnp.all(xp == x[:, None, :], axis=-1)
+    group = jnp.where(mels == 0, 2, jnp.where(is_diag, 0, 1)).astype(jnp.int32)
+    bits = jax.lax.bitcast_convert_type(xp.astype(jnp.float32), jnp.uint32)
+    # mix the bits, as local states often only differ in the sign or exponent
+    bits = (bits ^ (bits >> 16)) * jnp.uint32(0x45D9F3B)
+    bits = bits ^ (bits >> 16)
+    hash_coeffs = np.random.default_rng(0).integers(1, 2**32, size=N, dtype=np.uint32)
+    keys = jnp.sum(bits * jnp.asarray(hash_coeffs), axis=-1, dtype=jnp.uint32)
+
+    iota = jnp.broadcast_to(jnp.arange(K, dtype=jnp.int32), mels.shape)
+    group, keys, order = jax.lax.sort((group, keys, iota), dimension=1, num_keys=2)
+    xp = jnp.take_along_axis(xp, order[..., None], axis=1)
+    mels = jnp.take_along_axis(mels, order, axis=1)
+
+    same = (
+        (group[:, 1:] == group[:, :-1])
+        & (keys[:, 1:] == keys[:, :-1])
+        & jnp.all(xp[:, 1:] == xp[:, :-1], axis=-1)
+    )
+    is_first = jnp.pad(~same, ((0, 0), (1, 0)), constant_values=True)
+    segment = jnp.cumsum(is_first, axis=1) - 1
+
+    def _merge(x, xp, mels, segment):
+        mels_merged = jnp.zeros_like(mels).at[segment].add(mels)
+        xp_merged = jnp.broadcast_to(x, xp.shape).at[segment].set(xp)
+        return xp_merged, mels_merged
+
+    xp, mels = jax.vmap(_merge)(x, xp, mels, segment)
+    return xp.reshape(*batch_shape, K, N), mels.reshape(*batch_shape, K)
@@ -100,7 +100,9 @@ class LinearOperator:
             info: optional additional information provided by the solver. Might be
                 None if there are no additional information provided.
         """
-        return self._solve(jax.tree_util.Partial(solve_fun), y, x0=x0, **kwargs)
+        if not isinstance(solve_fun, jax.tree_util.Partial):
+            solve_fun = jax.tree_util.Partial(solve_fun)
+        return self._solve(solve_fun, y, x0=x0, **kwargs)
 
     # PUBLIC API: METHOD TO EXTEND IF YOU WANT TO DEFINE A NEW S object
     @timing.timed
@@ -113,6 +115,21 @@ class LinearOperator:
         """
         raise NotImplementedError()
 
+    # PUBLIC API: METHOD TO EXTEND Optionally IF YOU WANT TO DEFINE A NEW S object
+    # that is averaged across optimisation steps
+    def running_average(self, previous: "LinearOperator | None") -> "LinearOperator":
+        """
+        Combine this operator with the one used at the previous optimisation step,
+        for example to compute an exponential moving average of the S matrix.
+
+        Called by :class:`~netket.optimizer.preconditioner.AbstractLinearPreconditioner`
+        before solving the linear system. By default returns `self` unchanged.
+
+        Args:
+            previous: The operator used at the previous step, or None.
+        """
+        return self
+
     # PUBLIC API: Only override if you want to, but there should be no need.
     def __call__(self, vec):
         return self @ vec
@@ -17,6 +17,8 @@ from collections.abc import Callable
 
 import abc
 
+import jax
+
 from netket.utils.types import PyTree, Scalar
 from netket.utils import timing, struct
 from netket.vqs import VariationalState
@@ -81,6 +83,11 @@ class AbstractLinearPreconditioner(struct.Pytree, mutable=True):
     """If False uses the last solution of the linear system as a starting point for the solution
     of the next."""
 
+    solver_recycle: bool = False
+    """If True, the Ritz vectors returned by the solver in its `info` are used to
+    deflate the linear system solved at the next step. Requires a recycling solver
+    such as :func:`~netket.optimizer.solver.deflated_cg`."""
+
     x0: PyTree | None = None
     """Solution of the last linear system solved."""
 
@@ -90,7 +97,7 @@ class AbstractLinearPreconditioner(struct.Pytree, mutable=True):
     _lhs: LinearOperator = struct.field(serialize=False, default=None)
     """LHS of the last linear system solved."""
 
-    def __init__(self, solver, *, solver_restart=False):
+    def __init__(self, solver, *, solver_restart=False, solver_recycle=False):
         """
         Constructs the structure holding the parameters for using the
         linear preconditioner.
@@ -100,9 +107,14 @@ class AbstractLinearPreconditioner(struct.Pytree, mutable=True):
             solver_restart: If False uses the last solution of the linear
                 system as a starting point for the solution of the next
                 (default=False).
+            solver_recycle: If True, the Ritz vectors computed by a recycling
+                solver such as :func:`~netket.optimizer.solver.deflated_cg`
+                are used to deflate the linear system at the next step
+                (default=False).
         """
         self.solver = solver
         self.solver_restart = solver_restart
+        self.solver_recycle = solver_recycle
 
     @timing.timed
     def __call__(
@@ -113,13 +125,35 @@ class AbstractLinearPreconditioner(struct.Pytree, mutable=True):
         *args,
         **kwargs,
     ) -> PyTree:
-        self._lhs = self.lhs_constructor(vstate, step)
+        lhs = self.lhs_constructor(vstate, step)
+        if isinstance(lhs, LinearOperator):
+            lhs = lhs.running_average(self._lhs)
+        self._lhs = lhs
 
         x0 = self.x0 if self.solver_restart else None
-        self.x0, self.info = self._lhs.solve(self.solver, gradient, x0=x0)
+        self.x0, self.info = self._lhs.solve(self._recycled_solver(), gradient, x0=x0)
+
+        if self.solver_recycle and not hasattr(self.info, "ritz_vectors"):
+            raise TypeError(
+                "`solver_recycle=True` requires a solver returning the Ritz "
+                "vectors in its info, such as `nk.optimizer.solver.deflated_cg`, "
+                f"but {self.solver} returned {type(self.info)}."
+            )
 
         return self.x0
 
+    def _recycled_solver(self):
+        """
+        Returns the solver, with the deflation subspace computed during the last
+        solve bound to it if `solver_recycle` is True.
+        """
+        if not self.solver_recycle or self.info is None:
+            return self.solver
+
+        # A jax Partial stores the arrays as leaves, so it does not trigger
+        # recompilation of the solve at every step.
+        return jax.tree_util.Partial(self.solver, ritz_vectors=self.info.ritz_vectors)
+
     @abc.abstractmethod
     def lhs_constructor(self, vstate: VariationalState, step: Scalar | None = None):
         """
@@ -132,6 +166,7 @@ class AbstractLinearPreconditioner(struct.Pytree, mutable=True):
             f"{type(self).__name__}("
             + f"\n\tsolver          = {self.solver}, "
             + f"\n\tsolver_restart  = {self.solver_restart},"
+            + f"\n\tsolver_recycle  = {self.solver_recycle},"
             + ")"
         )
 
@@ -147,10 +182,12 @@ class LinearPreconditioner(AbstractLinearPreconditioner, mutable=True):
         solver: SolverT,
         *,
         solver_restart: bool = False,
+        solver_recycle: bool = False,
     ):
         self._lhs_constructor = lhs_constructor
         self.solver = solver
         self.solver_restart = solver_restart
+        self.solver_recycle = solver_recycle
 
     def lhs_constructor(self, vstate: VariationalState, step: Scalar | None = None):
         """
@@ -164,5 +201,6 @@ class LinearPreconditioner(AbstractLinearPreconditioner, mutable=True):
             + f"\n\tlhs_constructor = {self._lhs_constructor}, "
             + f"\n\tsolver          = {self.solver}, "
             + f"\n\tsolver_restart  = {self.solver_restart},"
+            + f"\n\tsolver_recycle  = {self.solver_recycle},"
             + ")"
         )
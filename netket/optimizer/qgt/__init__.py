@@ -14,6 +14,8 @@
 
 from .qgt_jacobian import QGTJacobianDense, QGTJacobianPyTree
 from .qgt_onthefly import QGTOnTheFly
+from .qgt_diagonal import QGTDiagonal, QGTDiagonalT
+from .qgt_kfac import QGTKFAC, QGTKFACT
 
 from .default import QGTAuto
 
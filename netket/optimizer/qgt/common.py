@@ -17,10 +17,39 @@ import jax
 from jax import numpy as jnp
 
 from netket.utils.types import PyTree
+from netket.nn import split_array_mpi
+from netket.utils import mpi
 from netket.errors import RealQGTComplexDomainError
 from netket.jax._utils_tree import RealImagTuple
 
 
+def samples_and_pdf(vstate):
+    """
+    Returns the samples of a variational state with which the QGT is estimated,
+    and their probabilities, which are None if the samples are drawn from the
+    distribution of the state.
+
+    Reweighted samples of a :class:`~netket.vqs.MCState` (see
+    :attr:`~netket.vqs.MCState.sample_weights`) have probabilities proportional
+    to their importance weights.
+    """
+    # imported here to avoid a circular import
+    from netket.vqs import FullSumState
+
+    if isinstance(vstate, FullSumState):
+        samples = split_array_mpi(vstate._all_states)
+        pdf = split_array_mpi(vstate.probability_distribution())
+    else:
+        samples = vstate.samples
+        weights = getattr(vstate, "sample_weights", None)
+        if weights is None:
+            pdf = None
+        else:
+            # the weights have mean 1 across all ranks
+            pdf = weights / (weights.size * mpi.n_nodes)
+    return samples, pdf
+
+
 def check_valid_vector_type(x: PyTree, target: PyTree):
     """
     Raises a TypeError if x is complex where target is real, because it is not
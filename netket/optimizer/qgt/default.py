@@ -33,10 +33,13 @@ QGTConstructor = Callable[["VariationalState"], LinearOperator]
 
 solvers: list[Callable] = []
 
+# iterative solvers that do not need a dense matrix
+_iterative_solvers = ("deflated_cg", "DeflatedCGInfo")
+
 for solver in dir(nk_solver_module):
     # only add solvers, not random
     # useless things
-    if solver[:2] == "__":
+    if solver[:2] == "__" or solver in _iterative_solvers:
         continue
     else:
         solvers.append(getattr(nk_solver_module, solver))
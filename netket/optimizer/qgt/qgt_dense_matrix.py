@@ -0,0 +1,168 @@
+# Copyright 2021 The NetKet Authors - All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import jax
+from jax import numpy as jnp
+from flax import struct
+
+from netket.utils.types import PyTree
+
+from ..linear_operator import LinearOperator, SolverT, Uninitialized
+
+from .common import check_valid_vector_type
+from .qgt_jacobian_dense import convert_tree_to_dense_format
+
+
+@struct.dataclass
+class QGTDenseMatrixT(LinearOperator):
+    """
+    Quantum Geometric Tensor stored as a dense matrix, behaving like a linear
+    operator.
+
+    It is constructed by :func:`~netket.optimizer.qgt.QGTJacobianDense` with
+    `streaming=True`, which accumulates the matrix over chunks of samples
+    without ever storing the jacobian.
+    """
+
+    S: jnp.ndarray = Uninitialized  # type: ignore
+    """The (real part of the) S matrix, with rows and columns corresponding to the
+    ravelled parameters, split into real and imaginary parts unless the mode is
+    holomorphic. If scale is not None, rows and columns are divided by it.
+    """
+
+    scale: jnp.ndarray | None = None
+    """If not None, contains the sqrt of the diagonal elements of the S matrix
+    (plus an offset)."""
+
+    mode: str = struct.field(pytree_node=False, default=Uninitialized)
+    """Differentiation mode used to compute the S matrix ("real", "complex" or
+    "holomorphic")."""
+
+    _in_solve: bool = struct.field(pytree_node=False, default=False)
+    """Internal flag used to signal that we are inside the _solve method and matmul
+    should not take apart into real and complex parts the other vector"""
+
+    _params_structure: PyTree = struct.field(pytree_node=False, default=Uninitialized)
+    """Parameters of the network. Its only purpose is to represent its own shape."""
+
+    @jax.jit
+    def __matmul__(self, vec: PyTree | jnp.ndarray) -> PyTree | jnp.ndarray:
+        if not hasattr(vec, "ndim") and not self._in_solve:
+            check_valid_vector_type(self._params_structure, vec)
+
+        vec, reassemble = convert_tree_to_dense_format(
+            vec, self.mode, disable=self._in_solve
+        )
+
+        if self.scale is not None:
+            vec = vec * self.scale
+
+        result = self.S @ vec + _dense_diag_shift(self.diag_shift, self.mode) * vec
+
+        if self.scale is not None:
+            result = result * self.scale
+
+        return reassemble(result)
+
+    @jax.jit
+    def _solve(
+        self, solve_fun: SolverT, y: PyTree, *, x0: PyTree | None = None
+    ) -> PyTree:
+        if not hasattr(y, "ndim"):
+            check_valid_vector_type(self._params_structure, y)
+
+        y, reassemble = convert_tree_to_dense_format(y, self.mode)
+
+        if x0 is not None:
+            x0, _ = convert_tree_to_dense_format(x0, self.mode)
+            if self.scale is not None:
+                x0 = x0 * self.scale
+
+        if self.scale is not None:
+            y = y / self.scale
+
+        # to pass the object LinearOperator itself down
+        # but avoid rescaling, we pass down an object with
+        # scale = None
+        unscaled_self = self.replace(scale=None, _in_solve=True)
+        out, info = solve_fun(unscaled_self, y, x0=x0)
+
+        if self.scale is not None:
+            out = out / self.scale
+
+        return reassemble(out), info
+
+    @jax.jit
+    def to_dense(self) -> jnp.ndarray:
+        """
+        Convert the lazy matrix representation to a dense matrix representation.
+
+        Returns:
+            A dense matrix representation of this S matrix.
+        """
+        diag = jnp.ones(self.S.shape[0], dtype=self.S.dtype)
+        S = self.S
+        if self.scale is not None:
+            S = S * self.scale[:, jnp.newaxis] * self.scale[jnp.newaxis, :]
+            diag = self.scale**2
+
+        diag_shift = _dense_diag_shift(self.diag_shift, self.mode)
+        return S + jnp.diag(diag_shift * diag)
+
+    def to_real_part(self) -> "QGTDenseMatrixT":
+        """
+        Returns the operator computing the real part of the QGT, which is this
+        operator itself.
+        """
+        return self
+
+    def to_imag_part(self) -> "QGTDenseMatrixT":
+        """
+        Not supported, as only the real part of the QGT is stored.
+        """
+        raise ValueError(
+            "Cannot compute the imaginary part of the QGT constructed "
+            "with `streaming=True`, which only stores its real part."
+        )
+
+    def __repr__(self):
+        return (
+            f"QGTDenseMatrix(diag_shift={self.diag_shift}, "
+            f"scale={self.scale}, mode={self.mode}, dtype={self.S.dtype})"
+        )
+
+
+def _dense_diag_shift(diag_shift, mode: str):
+    """
+    Converts a diag_shift given as a pytree of the shape of the parameters to the
+    dense format of the S matrix. Scalars and arrays are returned unchanged.
+    """
+    if jax.tree_util.treedef_is_leaf(jax.tree_util.tree_structure(diag_shift)):
+        return diag_shift
+    if mode != "holomorphic":
+        # the real and imaginary part of complex parameters have the same shift
+        diag_shift = jax.tree_util.tree_map(
+            lambda d: d.real + 1j * d.real if jnp.iscomplexobj(d) else d, diag_shift
+        )
+    return convert_tree_to_dense_format(diag_shift, mode)[0]
+
+
+@jax.jit
+def rescale_dense(S: jnp.ndarray, offset):
+    """
+    Computes √(Sₖₖ + offset) and divides the rows and columns of S by it, to do
+    scale-invariant regularization (Becca & Sorella 2017, pp. 143).
+    """
+    scale = (jnp.diag(S).real + offset) ** 0.5
+    return S / scale[:, jnp.newaxis] / scale[jnp.newaxis, :], scale
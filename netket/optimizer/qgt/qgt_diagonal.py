@@ -0,0 +1,260 @@
+# Copyright 2021 The NetKet Authors - All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from functools import partial
+
+import jax
+from jax import numpy as jnp
+from flax import struct
+
+from netket.utils import timing
+from netket.utils.types import Array, PyTree
+from netket.utils.api_utils import partial_from_kwargs
+from netket import jax as nkjax
+
+from ..linear_operator import LinearOperator, SolverT, Uninitialized
+
+from .common import check_valid_vector_type, samples_and_pdf
+from .qgt_jacobian_common import jacobian_chunked_reduce, streaming_mode
+
+
+@partial_from_kwargs
+def QGTDiagonal(
+    vstate,
+    *,
+    mode: str | None = None,
+    chunk_size: int | None = None,
+    decay: float = 0.0,
+    diag_shift: float = 0.0,
+    diag_scale: float | None = None,
+    **kwargs,
+) -> "QGTDiagonalT":
+    r"""
+    Diagonal approximation of the Quantum Geometric Tensor, which only
+    computes and stores the diagonal elements
+
+    .. math::
+
+        S_{kk} = \langle |\Delta O_k|^2 \rangle.
+
+    The diagonal is accumulated chunk by chunk over the samples, so that the
+    full jacobian is never stored, and the linear system is solved exactly in
+    :math:`\mathcal{O}(N_\text{params})` operations. The linear solver passed to
+    :class:`~netket.optimizer.SR` is therefore ignored.
+
+    When used through :class:`~netket.optimizer.SR`, the diagonal can be averaged
+    across optimisation steps with an exponential moving average of rate `decay`.
+
+    Complex parameters are always treated by splitting them into their real and
+    imaginary parts.
+
+    Args:
+        vstate: The variational state.
+        mode: "real" or "complex": the mode used to compute the jacobian (see
+            :func:`netket.jax.jacobian`). Defaults to the most appropriate one.
+        chunk_size: If supplied, overrides the chunk size of the variational state.
+        decay: Rate of the exponential moving average of the diagonal across
+            optimisation steps (0 means no averaging).
+        diag_shift: Constant shift :math:`\epsilon_2` added to the diagonal.
+        diag_scale: Fractional shift :math:`\epsilon_1` added to the diagonal,
+            such that :math:`S_{kk} \mapsto (1+\epsilon_1)S_{kk} + \epsilon_2`.
+    """
+    samples, pdf = samples_and_pdf(vstate)
+
+    if chunk_size is None:
+        chunk_size = getattr(vstate, "chunk_size", None)
+
+    return QGTDiagonal_DefaultConstructor(
+        vstate._apply_fun,
+        vstate.parameters,
+        vstate.model_state,
+        samples,
+        pdf=pdf,
+        mode=mode,
+        chunk_size=chunk_size,
+        decay=decay,
+        diag_shift=diag_shift,
+        diag_scale=diag_scale,
+        **kwargs,
+    )
+
+
+@timing.timed
+def QGTDiagonal_DefaultConstructor(
+    apply_fun,
+    parameters,
+    model_state,
+    samples,
+    pdf=None,
+    *,
+    mode: str | None = None,
+    chunk_size: int | None = None,
+    diag_shift: float = 0.0,
+    diag_scale: float | None = None,
+    **kwargs,
+) -> "QGTDiagonalT":
+    """
+    Construct a :class:`QGTDiagonalT` starting from the definition of a
+    variational state.
+    """
+    mode, samples, pdf = streaming_mode(
+        apply_fun, parameters, model_state, samples, pdf, mode=mode
+    )
+
+    moments = jacobian_chunked_reduce(
+        _diag_moments,
+        apply_fun,
+        parameters,
+        model_state,
+        samples,
+        pdf,
+        mode=mode,
+        chunk_size=chunk_size,
+    )
+    diag = _centred_diag(moments)
+
+    if diag_scale is not None:
+        diag = jax.tree_util.tree_map(lambda d: (1 + diag_scale) * d, diag)
+
+    pars_struct = jax.tree_util.tree_map(
+        lambda x: jax.ShapeDtypeStruct(x.shape, x.dtype), parameters
+    )
+    return QGTDiagonalT(
+        diag=diag,
+        mode=mode,
+        diag_shift=diag_shift,
+        _params_structure=pars_struct,
+        **kwargs,
+    )
+
+
+def _diag_moments(O, w):
+    """
+    Given a chunk of the jacobian with leaves of shape (n_samples, 2, ...) and
+    the weights of every sample, computes the weighted sum of the jacobian and
+    of its square.
+    """
+    O_mean = jax.tree_util.tree_map(lambda o: jnp.tensordot(w, o, axes=1), O)
+    O2_mean = jax.tree_util.tree_map(
+        lambda o: jnp.tensordot(w, o**2, axes=1).sum(axis=0), O
+    )
+    return O_mean, O2_mean
+
+
+@jax.jit
+def _centred_diag(moments):
+    O_mean, O2_mean = moments
+    return jax.tree_util.tree_map(
+        lambda m, m2: jnp.maximum(m2 - (m**2).sum(axis=0), 0), O_mean, O2_mean
+    )
+
+
+@struct.dataclass
+class QGTDiagonalT(LinearOperator):
+    """
+    Diagonal approximation of the Quantum Geometric Tensor, behaving like a
+    linear operator.
+
+    The linear system is solved exactly by elementwise division, and the solver
+    passed to :meth:`solve` is ignored.
+    """
+
+    diag: PyTree = Uninitialized
+    """Diagonal of the S matrix, with the structure of the parameters split into
+    real and imaginary parts."""
+
+    mode: str = struct.field(pytree_node=False, default=Uninitialized)
+    """Differentiation mode used to compute the jacobian ("real" or "complex")."""
+
+    decay: float = struct.field(pytree_node=False, default=0.0)
+    """Rate of the exponential moving average of the diagonal across steps."""
+
+    _params_structure: PyTree = struct.field(pytree_node=False, default=Uninitialized)
+    """Parameters of the network. Its only purpose is to represent its own shape."""
+
+    @jax.jit
+    def __matmul__(self, vec: PyTree | Array) -> PyTree | Array:
+        return _apply_real(
+            self, vec, lambda d, v: (d + self.diag_shift) * v, self.diag
+        )
+
+    def _solve(
+        self, solve_fun: SolverT, y: PyTree, *, x0: PyTree | None = None, **kwargs
+    ) -> PyTree:
+        return _solve(self, y), None
+
+    @jax.jit
+    def to_dense(self) -> jnp.ndarray:
+        """
+        Convert the lazy matrix representation to a dense matrix representation.
+
+        Returns:
+            A dense matrix representation of this S matrix. Complex parameters
+            get separate rows/columns for their real and imaginary parts.
+        """
+        diag, _ = nkjax.tree_ravel(self.diag)
+        return jnp.diag(diag + self.diag_shift)
+
+    def running_average(self, previous: LinearOperator | None) -> "QGTDiagonalT":
+        if (
+            self.decay == 0
+            or not isinstance(previous, QGTDiagonalT)
+            or jax.tree_util.tree_structure(previous.diag)
+            != jax.tree_util.tree_structure(self.diag)
+        ):
+            return self
+
+        diag = jax.tree_util.tree_map(
+            partial(_ema, self.decay), previous.diag, self.diag
+        )
+        return self.replace(diag=diag)
+
+    def __repr__(self):
+        return (
+            f"QGTDiagonal(diag_shift={self.diag_shift}, mode={self.mode}, "
+            f"decay={self.decay})"
+        )
+
+
+def _ema(decay, old, new):
+    return decay * old + (1 - decay) * new
+
+
+def _apply_real(self, vec, fun, *trees):
+    """
+    Applies `fun(*leaves, vec_leaf)` to the vector `vec`, (a pytree with the
+    structure of the parameters or its ravelled version), after splitting it
+    into real and imaginary parts.
+    """
+    if hasattr(vec, "ndim"):
+        _, unravel = nkjax.tree_ravel(self._params_structure)
+        vec = unravel(vec)
+        ravel = True
+    else:
+        ravel = False
+
+    check_valid_vector_type(self._params_structure, vec)
+
+    vec, reassemble = nkjax.tree_to_real(vec)
+    res = jax.tree_util.tree_map(fun, *trees, vec)
+    res = reassemble(res)
+
+    if ravel:
+        res, _ = nkjax.tree_ravel(res)
+    return res
+
+
+@jax.jit
+def _solve(self: QGTDiagonalT, y: PyTree) -> PyTree:
+    return _apply_real(self, y, lambda d, v: v / (d + self.diag_shift), self.diag)
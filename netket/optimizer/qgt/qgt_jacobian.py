@@ -14,17 +14,23 @@
 
 
 import jax
+from jax.tree_util import Partial
 
-from netket.utils import timing
+from netket.utils import timing, HashablePartial
+from netket.utils.types import DType
 from netket.utils.api_utils import partial_from_kwargs
 from netket import jax as nkjax
-from netket.nn import split_array_mpi
 
+from .common import samples_and_pdf
 from .qgt_jacobian_dense import QGTJacobianDenseT
 from .qgt_jacobian_pytree import QGTJacobianPyTreeT
+from .qgt_dense_matrix import QGTDenseMatrixT, rescale_dense
 from .qgt_jacobian_common import (
     to_shift_offset,
     rescale,
+    cast_jacobian,
+    jacobian_chunked_covariance,
+    full_precision_mat_vec,
 )
 
 
@@ -42,8 +48,10 @@ def QGTJacobian_DefaultConstructor(
     diag_shift: float | None = 0.0,
     diag_scale: float | None = None,
     chunk_size: int | None = None,
+    jacobian_dtype: DType | None = None,
+    streaming: bool = False,
     **kwargs,
-) -> QGTJacobianDenseT | QGTJacobianPyTreeT:
+) -> QGTJacobianDenseT | QGTJacobianPyTreeT | QGTDenseMatrixT:
     """
     Construct a :class:`QGTJacobianDenseT` or :class:`QGTJacobianPyTreeT`
     starting from the definition of a variational state.
@@ -96,6 +104,51 @@ def QGTJacobian_DefaultConstructor(
         # jacobian to be computed.
         jac_mode = "complex"
 
+    pars_struct = jax.tree_util.tree_map(
+        lambda x: jax.ShapeDtypeStruct(x.shape, x.dtype), parameters
+    )
+
+    if streaming:
+        if not dense:
+            raise NotImplementedError(
+                "`streaming=True` is only supported by QGTJacobianDense."
+            )
+        if mode == "imag":
+            raise NotImplementedError(
+                "`streaming=True` does not support the imaginary part of the QGT."
+            )
+        if jacobian_dtype is not None or kwargs.get("refine_steps", 0) > 0:
+            raise ValueError(
+                "`jacobian_dtype` and `refine_steps` are not supported with "
+                "`streaming=True`, as the jacobian is never stored."
+            )
+        kwargs.pop("refine_steps", None)
+        # Accumulate S chunk by chunk, so that memory does not depend on the
+        # number of samples, and store it directly.
+        S = jacobian_chunked_covariance(
+            apply_fun,
+            parameters,
+            model_state,
+            samples,
+            pdf,
+            mode=jac_mode,
+            chunk_size=chunk_size,
+        )
+        shift, offset = to_shift_offset(diag_shift, diag_scale)
+        if offset is not None:
+            S, scale = rescale_dense(S, offset)
+        else:
+            scale = None
+
+        return QGTDenseMatrixT(
+            S=S,
+            scale=scale,
+            mode=mode,
+            _params_structure=pars_struct,
+            diag_shift=shift,
+            **kwargs,
+        )
+
     jacobians = nkjax.jacobian(
         apply_fun,
         parameters,
@@ -116,9 +169,26 @@ def QGTJacobian_DefaultConstructor(
     else:
         scale = None
 
-    pars_struct = jax.tree_util.tree_map(
-        lambda x: jax.ShapeDtypeStruct(x.shape, x.dtype), parameters
-    )
+    # The jacobian is centred and rescaled in full precision, and only then
+    # stored in reduced precision.
+    jacobians = cast_jacobian(jacobians, jacobian_dtype)
+
+    if jacobian_dtype is not None:
+        # the residuals of the iterative refinement are computed by
+        # differentiating the model in the precision of the parameters
+        kwargs["_full_precision_mat_vec"] = Partial(
+            HashablePartial(
+                full_precision_mat_vec,
+                apply_fun,
+                mode=jac_mode,
+                dense=dense,
+                chunk_size=chunk_size,
+            ),
+            parameters,
+            model_state,
+            samples,
+            pdf,
+        )
 
     QGT_T = QGTJacobianDenseT if dense else QGTJacobianPyTreeT
     return QGT_T(
@@ -140,6 +210,8 @@ def QGTJacobianDense(
     diag_shift: float | None = 0.0,
     diag_scale: float | None = None,
     chunk_size: int | None = None,
+    jacobian_dtype: DType | None = None,
+    streaming: bool = False,
     **kwargs,
 ) -> QGTJacobianDenseT:
     """
@@ -177,16 +249,30 @@ def QGTJacobianDense(
         chunk_size: If supplied, overrides the chunk size of the variational state
                     (useful for models where the backward pass requires more
                     memory than the forward pass).
+        jacobian_dtype: If supplied, the (real) dtype used to store the centred
+                    jacobian, such as `jnp.float32` or `jnp.bfloat16`. Products
+                    with the jacobian are still accumulated in the precision of
+                    the parameters. Reduces the memory used by the QGT and
+                    speeds up matrix-vector products. (Defaults to the dtype of
+                    the parameters).
+        refine_steps: Number of steps of iterative refinement to perform after
+                    solving the linear system, each solving again for the
+                    residual. If `jacobian_dtype` is given, the residual is
+                    computed with a jvp and a vjp of the model in the precision
+                    of the parameters, which corrects the error due to storing
+                    the jacobian in reduced precision. It also reduces the error
+                    of inexact (e.g. iterative) solvers (defaults to 0).
+        streaming: If True, the jacobian is never stored. Instead, the
+                    :math:`N_\\text{params} \\times N_\\text{params}` S matrix is
+                    accumulated over chunks of `chunk_size` samples and stored
+                    directly, so that the memory cost does not depend on the
+                    number of samples. This is advantageous when the number of
+                    samples is much larger than the number of parameters. The
+                    imaginary part of the QGT, `jacobian_dtype` and
+                    `refine_steps` are not available in this case (defaults to
+                    False).
     """
-    # TODO: Find a better way to handle this case
-    from netket.vqs import FullSumState
-
-    if isinstance(vstate, FullSumState):
-        samples = split_array_mpi(vstate._all_states)
-        pdf = split_array_mpi(vstate.probability_distribution())
-    else:
-        samples = vstate.samples
-        pdf = None
+    samples, pdf = samples_and_pdf(vstate)
 
     if chunk_size is None:
         chunk_size = getattr(vstate, "chunk_size", None)
@@ -203,6 +289,8 @@ def QGTJacobianDense(
         diag_shift=diag_shift,
         diag_scale=diag_scale,
         chunk_size=chunk_size,
+        jacobian_dtype=jacobian_dtype,
+        streaming=streaming,
         **kwargs,
     )
 
@@ -216,6 +304,7 @@ def QGTJacobianPyTree(
     diag_shift: float | None = 0.0,
     diag_scale: float | None = None,
     chunk_size: int | None = None,
+    jacobian_dtype: DType | None = None,
     **kwargs,
 ) -> QGTJacobianPyTreeT:
     """
@@ -253,16 +342,21 @@ def QGTJacobianPyTree(
         chunk_size: If supplied, overrides the chunk size of the variational state
                     (useful for models where the backward pass requires more
                     memory than the forward pass).
+        jacobian_dtype: If supplied, the (real) dtype used to store the centred
+                    jacobian, such as `jnp.float32` or `jnp.bfloat16`. Products
+                    with the jacobian are still accumulated in the precision of
+                    the parameters. Reduces the memory used by the QGT and
+                    speeds up matrix-vector products. (Defaults to the dtype of
+                    the parameters).
+        refine_steps: Number of steps of iterative refinement to perform after
+                    solving the linear system, each solving again for the
+                    residual. If `jacobian_dtype` is given, the residual is
+                    computed with a jvp and a vjp of the model in the precision
+                    of the parameters, which corrects the error due to storing
+                    the jacobian in reduced precision. It also reduces the error
+                    of inexact (e.g. iterative) solvers (defaults to 0).
     """
-    # TODO: Find a better way to handle this case
-    from netket.vqs import FullSumState
-
-    if isinstance(vstate, FullSumState):
-        samples = split_array_mpi(vstate._all_states)
-        pdf = split_array_mpi(vstate.probability_distribution())
-    else:
-        samples = vstate.samples
-        pdf = None
+    samples, pdf = samples_and_pdf(vstate)
 
     if chunk_size is None:
         chunk_size = getattr(vstate, "chunk_size", None)
@@ -279,5 +373,6 @@ def QGTJacobianPyTree(
         diag_shift=diag_shift,
         diag_scale=diag_scale,
         chunk_size=chunk_size,
+        jacobian_dtype=jacobian_dtype,
         **kwargs,
     )
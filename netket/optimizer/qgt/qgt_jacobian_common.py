@@ -18,6 +18,10 @@ import jax
 import jax.numpy as jnp
 
 from netket.utils import mpi
+from netket.stats import subtract_mean
+from netket import jax as nkjax
+
+from .qgt_onthefly_logic import _O_jvp, _O_vjp
 
 
 def to_shift_offset(
@@ -63,3 +67,319 @@ def rescale(centered_oks, offset, *, ndims: int = 1):
     centered_oks = jax.tree_util.tree_map(jnp.divide, centered_oks, scale)
     scale = jax.tree_util.tree_map(partial(jnp.squeeze, axis=axis), scale)
     return centered_oks, scale
+
+
+def cast_jacobian(centered_oks, dtype):
+    """
+    Casts the (centred) jacobian to the storage precision `dtype`, keeping
+    complex leaves complex.
+
+    Args:
+        centered_oks: A pytree or dense jacobian.
+        dtype: The real dtype used to store the jacobian (e.g. `jnp.float32`
+            or `jnp.bfloat16`). If None, the jacobian is returned unchanged.
+    """
+    if dtype is None:
+        return centered_oks
+
+    def _cast(x):
+        if jnp.iscomplexobj(x):
+            # there is no complex bfloat16
+            return x.astype(jnp.promote_types(dtype, jnp.complex64))
+        return x.astype(dtype)
+
+    return jax.tree_util.tree_map(_cast, centered_oks)
+
+
+def mixed_precision_tensordot(a, b, axes: int):
+    """
+    Equivalent of :func:`jax.numpy.tensordot` with integer `axes`, where one
+    of the operands (the jacobian) might be stored in a lower precision than
+    the other one (the vector).
+
+    The high-precision operand is split into the sum of two terms representable
+    in the lower precision, so that the products can be computed reading the
+    jacobian in its storage precision, while being accumulated in the higher
+    precision. The error is then dominated by the rounding of the jacobian
+    itself and not by the rounding of the vector.
+
+    If both operands have the same precision, this is a standard tensordot.
+    """
+    bits_a = jnp.finfo(a.dtype).bits
+    bits_b = jnp.finfo(b.dtype).bits
+    if bits_a == bits_b:
+        return jnp.tensordot(a, b, axes=axes)
+
+    dtype = jnp.result_type(a, b)
+
+    def _split(x, low_dtype):
+        if jnp.iscomplexobj(x):
+            # there is no complex bfloat16
+            low_dtype = jnp.promote_types(low_dtype, jnp.complex64)
+        x_hi = x.astype(low_dtype)
+        x_lo = (x - x_hi.astype(x.dtype)).astype(low_dtype)
+        return x_hi, x_lo
+
+    # The split operand is stacked along a new axis that is not contracted:
+    # the leading one for a and the trailing one for b.
+    if bits_a > bits_b:
+        a = jnp.stack(_split(a, b.dtype), axis=0)
+        res = jnp.tensordot(a, b, axes=axes, preferred_element_type=dtype)
+        return res.sum(axis=0)
+    else:
+        b = jnp.stack(_split(b, a.dtype), axis=-1)
+        res = jnp.tensordot(a, b, axes=axes, preferred_element_type=dtype)
+        return res.sum(axis=-1)
+
+
+def full_precision_mat_vec(
+    apply_fun,
+    parameters,
+    model_state,
+    samples,
+    pdf,
+    v,
+    *,
+    mode: str,
+    dense: bool,
+    chunk_size: int | None = None,
+    imag: bool = False,
+):
+    """
+    Computes the product of the QGT (without diagonal shift) with the vector `v`
+    by differentiating the model with a jvp and a vjp in the precision of the
+    parameters, as :class:`~netket.optimizer.qgt.QGTOnTheFly` does, instead of
+    using the stored jacobian.
+
+    The vector has the format of the jacobian of the given `mode`: the parameters
+    split into their real and imaginary parts unless the mode is holomorphic,
+    raveled if `dense` is True. If `imag` is True, the product is computed with
+    the imaginary part of the QGT of a jacobian in complex mode.
+    """
+    if mode != "holomorphic":
+        parameters, reassemble = nkjax.tree_to_real(parameters)
+    else:
+        reassemble = lambda x: x
+    if dense:
+        parameters, unravel = nkjax.tree_ravel(parameters)
+    else:
+        unravel = lambda x: x
+
+    def forward_fn(W, σ):
+        out = apply_fun({"params": reassemble(unravel(W)), **model_state}, σ)
+        return out.real if mode == "real" else out
+
+    def _mat_vec(v):
+        w = _O_jvp(forward_fn, parameters, samples, v, chunk_size)
+        if pdf is None:
+            w = subtract_mean(w / (samples.shape[0] * mpi.n_nodes))
+        else:
+            w = pdf * (w - mpi.mpi_sum_jax(pdf @ w)[0])
+        if imag:
+            # Oᵣᵀ Im[w] - Oᵢᵀ Re[w], where O = Oᵣ + i Oᵢ
+            res = _O_vjp(forward_fn, parameters, samples, 1j * w.conj(), chunk_size)
+        else:
+            res = nkjax.tree_conj(
+                _O_vjp(forward_fn, parameters, samples, w.conj(), chunk_size)
+            )
+        return jax.tree_util.tree_map(lambda x: mpi.mpi_sum_jax(x)[0], res)
+
+    if mode != "holomorphic" and nkjax.tree_leaf_iscomplex(v):
+        # the QGT acts on the real and imaginary part of v separately
+        res_r = _mat_vec(jax.tree_util.tree_map(jnp.real, v))
+        res_i = _mat_vec(jax.tree_util.tree_map(jnp.imag, v))
+        return jax.tree_util.tree_map(lambda r, i: r + 1j * i, res_r, res_i)
+    return _mat_vec(v)
+
+
+def streaming_mode(apply_fun, parameters, model_state, samples, pdf, *, mode=None):
+    """
+    Validates the arguments of the QGT constructors that never store the jacobian,
+    returning the jacobian mode and the samples and pdf collapsed to a batch
+    of 2D inputs.
+
+    Those constructors always work with the parameters split into their real and
+    imaginary parts, so the holomorphic mode is replaced by the (equivalent but
+    redundant) complex mode.
+    """
+    if mode is None:
+        mode = nkjax.jacobian_default_mode(
+            apply_fun, parameters, model_state, samples, warn=False
+        )
+        if mode == "holomorphic":
+            mode = "complex"
+    elif mode not in ("real", "complex"):
+        raise ValueError(
+            f"The mode must be either 'real' or 'complex', but got mode={mode}."
+        )
+
+    if pdf is not None:
+        if not pdf.shape == samples.shape[:-1]:
+            raise ValueError(
+                "The shape of pdf must match the shape of the samples, "
+                f"instead you provided (pdf.shape={pdf.shape}) != "
+                f"(samples.shape={samples.shape[:-1]})"
+            )
+        pdf = pdf.reshape(-1)
+
+    samples = samples.reshape(-1, samples.shape[-1])
+    return mode, samples, pdf
+
+
+@partial(
+    jax.jit,
+    static_argnames=("reduce_fun", "apply_fun", "mode", "chunk_size", "dense", "op"),
+)
+def jacobian_chunked_reduce(
+    reduce_fun,
+    apply_fun,
+    parameters,
+    model_state,
+    samples,
+    pdf=None,
+    *,
+    mode: str,
+    chunk_size: int | None = None,
+    dense: bool = False,
+    op=None,
+):
+    """
+    Computes `sum_c reduce_fun(O_c, w_c)` over chunks of `chunk_size` samples,
+    where `O_c` is the (uncentred) jacobian of the chunk and `w_c` the weights of
+    its samples, summed over all MPI ranks.
+
+    The full jacobian is never stored: only one chunk at a time is materialised.
+
+    The leaves of `O_c` have the structure of the parameters split into real and
+    imaginary parts, with shape `(chunk_size, n, ...)` where `n=2` in complex mode
+    (derivatives of the real and imaginary part of the log-wavefunction) and
+    `n=1` otherwise. The weights are `1/N_samples` or the `pdf` when given, so
+    that `reduce_fun` should compute weighted sums over the samples.
+
+    Args:
+        reduce_fun: A function `(O_c, w_c) -> PyTree` that is linear in `w_c`.
+        apply_fun: The forward pass of the model.
+        parameters: The parameters of the model.
+        model_state: The state of the model.
+        samples: A 2D batch of samples.
+        pdf: Optional weights of the samples (for full-summation calculations).
+        mode: The mode of the jacobian (see :func:`netket.jax.jacobian`).
+        chunk_size: The number of samples per chunk (all at once if None).
+        dense: If True, `O_c` is the dense jacobian of shape
+            `(chunk_size, n, n_parameters)` instead of a pytree.
+        op: If specified, the pairwise reduction used instead of the sum to
+            combine the results of the chunks. In this case the results are not
+            reduced over MPI ranks, which is left to the caller.
+    """
+    n_samples = samples.shape[0]
+    if pdf is None:
+        dtype = nkjax.dtype_real(
+            jnp.result_type(*jax.tree_util.tree_leaves(parameters))
+        )
+        weights = jnp.full((n_samples,), 1 / (n_samples * mpi.n_nodes), dtype=dtype)
+    else:
+        weights = pdf
+
+    if chunk_size is None or chunk_size >= n_samples:
+        chunk_size = n_samples
+    else:
+        # pad to a multiple of the chunk size with zero-weight copies
+        n_pad = -n_samples % chunk_size
+        samples = jnp.concatenate([samples, samples[:n_pad]], axis=0)
+        weights = jnp.concatenate([weights, jnp.zeros_like(weights[:n_pad])], axis=0)
+
+    def _chunk_fun(x):
+        samples_c, weights_c = x
+        O = nkjax.jacobian(
+            apply_fun, parameters, samples_c, model_state, mode=mode, dense=dense
+        )
+        if mode != "complex":
+            O = jax.tree_util.tree_map(lambda o: jnp.expand_dims(o, 1), O)
+        return reduce_fun(O, weights_c)
+
+    scan_kwargs = {} if op is None else {"op": op}
+    res = nkjax.scan_reduce(
+        _chunk_fun,
+        (nkjax.chunk(samples, chunk_size)[0], nkjax.chunk(weights, chunk_size)[0]),
+        **scan_kwargs,
+    )
+    if op is not None:
+        return res
+    return jax.tree_util.tree_map(lambda x: mpi.mpi_sum_jax(x)[0], res)
+
+
+def _covariance_moments(O, w):
+    """
+    Returns the total weight, the weighted mean of the rows of the dense jacobian
+    chunk `O` of shape (n_samples, n, n_parameters) and their centred weighted
+    second moment Σᵢ wᵢ (Oᵢ - m)ᴴ(Oᵢ - m).
+    """
+    W = w.sum()
+    m = jnp.tensordot(w, O, axes=1) / jnp.where(W > 0, W, 1)
+    dO = O - m
+    C = jnp.einsum("s,sjp,sjq->pq", w, dO.conj(), dO)
+    return W, m, C
+
+
+def _combine_moments(a, b):
+    """
+    Merges the moments of two sets of samples (Chan et al.'s parallel algorithm),
+    which avoids the catastrophic cancellation of Σ w O^2 - m^2.
+    """
+    W_a, m_a, C_a = a
+    W_b, m_b, C_b = b
+    W = W_a + W_b
+    W_safe = jnp.where(W > 0, W, 1)
+    delta = m_b - m_a
+    m = m_a + delta * (W_b / W_safe)
+    C = C_a + C_b + (W_a * W_b / W_safe) * jnp.einsum("jp,jq->pq", delta.conj(), delta)
+    return W, m, C
+
+
+@partial(jax.jit, static_argnames=("apply_fun", "mode", "chunk_size"))
+def jacobian_chunked_covariance(
+    apply_fun,
+    parameters,
+    model_state,
+    samples,
+    pdf=None,
+    *,
+    mode: str,
+    chunk_size: int | None = None,
+):
+    r"""
+    Computes the (real part of the) quantum geometric tensor
+    :math:`S = \sum_i w_i \Delta O_i^\dagger \Delta O_i` as a dense
+    `(n_parameters, n_parameters)` matrix, accumulating it over chunks of
+    `chunk_size` samples without ever storing the full jacobian.
+
+    The memory cost is therefore independent of the number of samples.
+
+    Args:
+        apply_fun: The forward pass of the model.
+        parameters: The parameters of the model.
+        model_state: The state of the model.
+        samples: A 2D batch of samples.
+        pdf: Optional weights of the samples (for full-summation calculations).
+        mode: The mode of the jacobian (see :func:`netket.jax.jacobian`).
+        chunk_size: The number of samples per chunk (all at once if None).
+    """
+    W, m, C = jacobian_chunked_reduce(
+        _covariance_moments,
+        apply_fun,
+        parameters,
+        model_state,
+        samples,
+        pdf,
+        mode=mode,
+        chunk_size=chunk_size,
+        dense=True,
+        op=_combine_moments,
+    )
+
+    # merge the moments of the different ranks
+    W_tot = mpi.mpi_sum_jax(W)[0]
+    m_tot = mpi.mpi_sum_jax(W * m)[0] / W_tot
+    delta = m - m_tot
+    C = C + W * jnp.einsum("jp,jq->pq", delta.conj(), delta)
+    return mpi.mpi_sum_jax(C)[0]
@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from collections.abc import Callable
+from functools import partial
 
 import jax
 from jax import numpy as jnp
@@ -24,6 +26,7 @@ from netket import jax as nkjax
 from ..linear_operator import LinearOperator, SolverT, Uninitialized
 
 from .common import check_valid_vector_type
+from .qgt_jacobian_common import mixed_precision_tensordot
 
 
 @struct.dataclass
@@ -62,6 +65,15 @@ class QGTJacobianDenseT(LinearOperator):
         - "auto": autoselect real or complex.
     """
 
+    refine_steps: int = struct.field(pytree_node=False, default=0)
+    """Number of steps of iterative refinement performed after solving the linear
+    system."""
+
+    _full_precision_mat_vec: Callable | None = None
+    """If not None, computes the product of the QGT (without diagonal shift) with a
+    vector in the precision of the parameters. It is used to compute the residuals
+    of the iterative refinement when the jacobian is stored in reduced precision."""
+
     _in_solve: bool = struct.field(pytree_node=False, default=False)
     """Internal flag used to signal that we are inside the _solve method and matmul should
     not take apart into real and complex parts the other vector"""
@@ -110,6 +122,11 @@ class QGTJacobianDenseT(LinearOperator):
         # but avoid rescaling, we pass down an object with
         # scale = None
         unscaled_self = self.replace(scale=None, _in_solve=True)
+
+        full_mat_vec = None
+        if self._full_precision_mat_vec is not None:
+            full_mat_vec = partial(_full_precision_unscaled_mat_vec, self)
+
         if self.mode == "imag":
             # If we want to solve the linear system IM(G)x=vec,
             # the G matrix is hermitian so its imaginary part is skew-simmetric
@@ -123,10 +140,14 @@ class QGTJacobianDenseT(LinearOperator):
             # O by √i
             #
             unscaled_self = unscaled_self.replace(O=unscaled_self.O * jnp.sqrt(1j))
-            out, info = solve_fun(unscaled_self, 1j * y, x0=x0)
+            out, info = _solve_refined(
+                unscaled_self, solve_fun, 1j * y, x0=x0, mat_vec=full_mat_vec
+            )
             out = out.real
         else:
-            out, info = solve_fun(unscaled_self, y, x0=x0)
+            out, info = _solve_refined(
+                unscaled_self, solve_fun, y, x0=x0, mat_vec=full_mat_vec
+            )
 
         if self.scale is not None:
             out = out / self.scale
@@ -141,24 +162,37 @@ class QGTJacobianDenseT(LinearOperator):
         Returns:
             A dense matrix representation of this S matrix.
         """
+        # If the jacobian is stored in reduced precision, products are
+        # accumulated in the precision of the parameters.
+        dtype = jnp.promote_types(
+            self.O.dtype,
+            nkjax.dtype_real(
+                jnp.result_type(*jax.tree_util.tree_leaves(self._params_structure))
+            ),
+        )
+
+        O = self.O
         if self.scale is None:
-            O = self.O
             diag = jnp.eye(self.O.shape[-1])
         else:
-            O = self.O * self.scale[jnp.newaxis, :]
             diag = jnp.diag(self.scale**2)
 
         # concatenate samples with real/Imaginary dimension
         if self.mode == "imag":
             # Equivalent to Jr.T@Ji - Ji.T@Jr
-            flip_sign = jnp.array([1, -1]).reshape(1, 2, 1)
+            flip_sign = jnp.array([1, -1], dtype=O.dtype).reshape(1, 2, 1)
             Ol = (flip_sign * O).reshape(-1, O.shape[-1])
             Or = jnp.flip(O, axis=1).reshape(-1, O.shape[-1])
-            return mpi.mpi_sum_jax(Ol.T @ Or)[0] + self.diag_shift * diag
+            S = jnp.matmul(Ol.T, Or, preferred_element_type=dtype)
         else:
             # Equivalent to Jr.T@Jr + Ji.T@Ji
             O = O.reshape(-1, O.shape[-1])
-            return mpi.mpi_sum_jax(O.conj().T @ O)[0] + self.diag_shift * diag
+            S = jnp.matmul(O.conj().T, O, preferred_element_type=dtype)
+
+        if self.scale is not None:
+            S = S * self.scale[:, jnp.newaxis] * self.scale[jnp.newaxis, :]
+
+        return mpi.mpi_sum_jax(S)[0] + self.diag_shift * diag
 
     def to_real_part(self) -> "QGTJacobianDenseT":
         """
@@ -227,6 +261,11 @@ class QGTJacobianDenseT(LinearOperator):
         """
 
         if self.mode == "complex":
+            if self.O.shape[1] != 2:
+                raise ValueError(
+                    "Cannot compute the imaginary part of the QGT constructed "
+                    "with `streaming=True`, which only stores its real part."
+                )
             return self.replace(mode="imag")
         elif self.mode == "imag":
             return self
@@ -239,7 +278,7 @@ class QGTJacobianDenseT(LinearOperator):
     def __repr__(self):
         return (
             f"QGTJacobianDense(diag_shift={self.diag_shift}, "
-            f"scale={self.scale}, mode={self.mode})"
+            f"scale={self.scale}, mode={self.mode}, dtype={self.O.dtype})"
         )
 
 
@@ -248,13 +287,50 @@ class QGTJacobianDenseT(LinearOperator):
 #################################################
 
 
+def _solve_refined(self: QGTJacobianDenseT, solve_fun, y, *, x0, mat_vec=None):
+    """
+    Solves the linear system, and if `self.refine_steps > 0` improves the
+    solution by iterative refinement.
+
+    The residuals are computed with `mat_vec` if given, or with the stored
+    jacobian otherwise.
+    """
+    if mat_vec is None:
+        mat_vec = lambda x: self @ x
+
+    out, info = solve_fun(self, y, x0=x0)
+    for _ in range(self.refine_steps):
+        residual = y - mat_vec(out)
+        correction, info = solve_fun(self, residual)
+        out = out + correction
+    return out, info
+
+
+def _full_precision_unscaled_mat_vec(self: QGTJacobianDenseT, x):
+    """
+    Computes in the precision of the parameters the product of `x` with the
+    matrix solved by `_solve`, that is the QGT (times i for its imaginary part)
+    rescaled by `self.scale` plus the diagonal shift.
+    """
+    v = x if self.scale is None else x / self.scale
+    res = self._full_precision_mat_vec(v, imag=(self.mode == "imag"))
+    if self.scale is not None:
+        res = res / self.scale
+    if self.mode == "imag":
+        # _solve solves the system i Im(G) x = i y
+        res = 1j * res
+    return res + self.diag_shift * x
+
+
 def mat_vec(v: PyTree, O: PyTree, diag_shift: Scalar, imag: bool = False) -> PyTree:
+    # The jacobian might be stored in a lower precision than v, in which case
+    # mixed_precision_tensordot accumulates in the precision of v.
     if not imag:
         # Matrix vector product of the (real part, or holomorphic) QGT matrix
         # with a vector. In the standard case, it does the multiplication equivalent
         # to J_r.T@(J_r@v_r) + J_i.T@(J_i@v_i) + diag_shift*v
-        w = O @ v
-        res = jnp.tensordot(w.conj(), O, axes=w.ndim).conj()
+        w = mixed_precision_tensordot(O, v, axes=1)
+        res = mixed_precision_tensordot(w.conj(), O, axes=w.ndim).conj()
         return mpi.mpi_sum_jax(res)[0] + diag_shift * v
     else:
         # Matrix vector product of the imaginary part of the QGT matrix
@@ -262,11 +338,13 @@ def mat_vec(v: PyTree, O: PyTree, diag_shift: Scalar, imag: bool = False) -> PyT
         # J_r.T@(J_i@v_i) - J_i.T@(J_r@v_r) + diag_shift*v
 
         Or = jnp.flip(O, axis=1).reshape(-1, O.shape[-1])
-        w = Or @ v
+        w = mixed_precision_tensordot(Or, v, axes=1)
 
-        flip_sign = jnp.array([1, -1]).reshape(1, 2, 1)
+        flip_sign = jnp.array([1, -1], dtype=O.dtype).reshape(1, 2, 1)
         Ol = (flip_sign * O).reshape(-1, O.shape[-1])
-        res = jnp.tensordot(w.conj(), Ol, axes=w.ndim).conj()
+        # Ol is not conjugated, as in to_dense, so that the factor √i multiplying
+        # the jacobian in _solve is squared to i
+        res = mixed_precision_tensordot(w, Ol, axes=w.ndim)
         return mpi.mpi_sum_jax(res)[0] + diag_shift * v
 
 
@@ -13,6 +13,9 @@
 # limitations under the License.
 
 
+from collections.abc import Callable
+from functools import partial
+
 import jax
 from jax import numpy as jnp
 from flax import struct
@@ -24,6 +27,7 @@ from netket import jax as nkjax
 from ..linear_operator import LinearOperator, SolverT, Uninitialized
 
 from .common import check_valid_vector_type
+from .qgt_jacobian_common import mixed_precision_tensordot
 
 
 @struct.dataclass
@@ -64,6 +68,15 @@ class QGTJacobianPyTreeT(LinearOperator):
     _params_structure: PyTree = struct.field(pytree_node=False, default=Uninitialized)
     """Parameters of the network. Its only purpose is to represent its own shape."""
 
+    refine_steps: int = struct.field(pytree_node=False, default=0)
+    """Number of steps of iterative refinement performed after solving the linear
+    system."""
+
+    _full_precision_mat_vec: Callable | None = None
+    """If not None, computes the product of the QGT (without diagonal shift) with a
+    vector in the precision of the parameters. It is used to compute the residuals
+    of the iterative refinement when the jacobian is stored in reduced precision."""
+
     _in_solve: bool = struct.field(pytree_node=False, default=False)
     """Internal flag used to signal that we are inside the _solve method and matmul should
     not take apart into real and complex parts the other vector"""
@@ -138,6 +151,10 @@ class QGTJacobianPyTreeT(LinearOperator):
         # mode=holomorphic to disable splitting the complex part
         unscaled_self = self.replace(scale=None, _in_solve=True)
 
+        full_mat_vec = None
+        if self._full_precision_mat_vec is not None:
+            full_mat_vec = partial(_full_precision_unscaled_mat_vec, self)
+
         if self.mode == "imag":
             # If we want to solve the linear system IM(G)x=vec,
             # the G matrix is hermitian so its imaginary part is skew-simmetric
@@ -153,10 +170,14 @@ class QGTJacobianPyTreeT(LinearOperator):
             sqrt_i_O = nkjax.tree_ax(jnp.sqrt(1j), unscaled_self.O)
             y_vec = nkjax.tree_ax(1j, y)
             unscaled_self = unscaled_self.replace(O=sqrt_i_O)
-            out, info = solve_fun(unscaled_self, y_vec, x0=x0)
+            out, info = _solve_refined(
+                unscaled_self, solve_fun, y_vec, x0=x0, mat_vec=full_mat_vec
+            )
             out = jax.tree_util.tree_map(lambda x: x.real, out)
         else:
-            out, info = solve_fun(unscaled_self, y, x0=x0)
+            out, info = _solve_refined(
+                unscaled_self, solve_fun, y, x0=x0, mat_vec=full_mat_vec
+            )
 
         if self.scale is not None:
             out = jax.tree_util.tree_map(jnp.divide, out, self.scale)
@@ -182,23 +203,36 @@ class QGTJacobianPyTreeT(LinearOperator):
             O = jax.tree_util.tree_map(lambda x: x.reshape(-1, *x.shape[2:]), O)
         O = jax.vmap(lambda l: nkjax.tree_ravel(l)[0])(O)
 
+        # If the jacobian is stored in reduced precision, products are
+        # accumulated in the precision of the parameters.
+        dtype = jnp.promote_types(
+            O.dtype,
+            nkjax.dtype_real(
+                jnp.result_type(*jax.tree_util.tree_leaves(self._params_structure))
+            ),
+        )
+
         if self.scale is None:
             diag = jnp.eye(O.shape[-1])
         else:
             scale, _ = nkjax.tree_ravel(self.scale)
-            O = O * scale[jnp.newaxis, :]
             diag = jnp.diag(scale**2)
 
         # concatenate samples with real/Imaginary dimension
         if self.mode == "imag":
             O = O.reshape(O.shape[0] // 2, 2, -1)
 
-            flip_sign = jnp.array([1, -1]).reshape(1, 2, 1)
+            flip_sign = jnp.array([1, -1], dtype=O.dtype).reshape(1, 2, 1)
             Ol = (flip_sign * O).reshape(-1, O.shape[-1])
             Or = jnp.flip(O, axis=1).reshape(-1, O.shape[-1])
-            return mpi.mpi_sum_jax(Ol.T @ Or)[0] + self.diag_shift * diag
+            S = jnp.matmul(Ol.T, Or, preferred_element_type=dtype)
         else:
-            return mpi.mpi_sum_jax(O.T.conj() @ O)[0] + self.diag_shift * diag
+            S = jnp.matmul(O.T.conj(), O, preferred_element_type=dtype)
+
+        if self.scale is not None:
+            S = S * scale[:, jnp.newaxis] * scale[jnp.newaxis, :]
+
+        return mpi.mpi_sum_jax(S)[0] + self.diag_shift * diag
 
     def to_real_part(self) -> "QGTJacobianPyTreeT":
         """
@@ -287,11 +321,48 @@ class QGTJacobianPyTreeT(LinearOperator):
 #################################################
 
 
+def _solve_refined(self: QGTJacobianPyTreeT, solve_fun, y, *, x0, mat_vec=None):
+    """
+    Solves the linear system, and if `self.refine_steps > 0` improves the
+    solution by iterative refinement.
+
+    The residuals are computed with `mat_vec` if given, or with the stored
+    jacobian otherwise.
+    """
+    if mat_vec is None:
+        mat_vec = lambda x: self @ x
+
+    out, info = solve_fun(self, y, x0=x0)
+    for _ in range(self.refine_steps):
+        residual = jax.tree_util.tree_map(jnp.subtract, y, mat_vec(out))
+        correction, info = solve_fun(self, residual)
+        out = jax.tree_util.tree_map(jnp.add, out, correction)
+    return out, info
+
+
+def _full_precision_unscaled_mat_vec(self: QGTJacobianPyTreeT, x: PyTree) -> PyTree:
+    """
+    Computes in the precision of the parameters the product of `x` with the
+    matrix solved by `_solve`, that is the QGT (times i for its imaginary part)
+    rescaled by `self.scale` plus the diagonal shift.
+    """
+    v = x
+    if self.scale is not None:
+        v = jax.tree_util.tree_map(jnp.divide, x, self.scale)
+    res = self._full_precision_mat_vec(v, imag=(self.mode == "imag"))
+    if self.scale is not None:
+        res = jax.tree_util.tree_map(jnp.divide, res, self.scale)
+    if self.mode == "imag":
+        # _solve solves the system i Im(G) x = i y
+        res = nkjax.tree_ax(1j, res)
+    return nkjax.tree_axpy(self.diag_shift, x, res)
+
+
 def _jvp(oks: PyTree, v: PyTree) -> Array:
     """
     Compute the matrix-vector product between the pytree jacobian oks and the pytree vector v
     """
-    td = lambda x, y: jnp.tensordot(x, y, axes=y.ndim)
+    td = lambda x, y: mixed_precision_tensordot(x, y, axes=y.ndim)
     t = jax.tree_util.tree_map(td, oks, v)
     return jax.tree_util.tree_reduce(jnp.add, t)
 
@@ -300,7 +371,9 @@ def _vjp(oks: PyTree, w: Array) -> PyTree:
     """
     Compute the vector-matrix product between the vector w and the pytree jacobian oks
     """
-    res = jax.tree_util.tree_map(lambda x: jnp.tensordot(w, x, axes=w.ndim), oks)
+    res = jax.tree_util.tree_map(
+        lambda x: mixed_precision_tensordot(w, x, axes=w.ndim), oks
+    )
     return jax.tree_util.tree_map(lambda x: mpi.mpi_sum_jax(x)[0], res)  # MPI
 
 
@@ -320,18 +393,21 @@ def _mat_vec(v: PyTree, oks: PyTree) -> PyTree:
 def _imag_mat_vec(v: PyTree, oks: PyTree) -> PyTree:
     # jvp
     oks_r = jax.tree_util.tree_map(lambda o: jnp.flip(o, axis=1), oks)
-    w = _jvp(oks_r, v).conjugate()
+    w = _jvp(oks_r, v)
 
     # prepare
     flip_sign = jnp.array([1, -1]).reshape(1, 2, 1)
     oks_l = jax.tree_util.tree_map(
         lambda o: o
-        * flip_sign.reshape(tuple(2 if i == 1 else 1 for i in range(o.ndim))),
+        * flip_sign.reshape(tuple(2 if i == 1 else 1 for i in range(o.ndim))).astype(
+            o.dtype
+        ),
         oks,
     )
 
-    # vjp
-    res = nkjax.tree_conj(_vjp(oks_l, w))
+    # vjp. oks_l is not conjugated, as in to_dense, so that the factor √i
+    # multiplying the jacobian in _solve is squared to i
+    res = _vjp(oks_l, w)
     return nkjax.tree_cast(res, v)
 
 
@@ -0,0 +1,355 @@
+# Copyright 2021 The NetKet Authors - All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from functools import lru_cache, partial
+import math
+
+import jax
+from jax import numpy as jnp
+from flax import struct
+
+from netket.utils import timing
+from netket.utils.types import Array, PyTree
+from netket.utils.api_utils import partial_from_kwargs
+from netket import jax as nkjax
+
+from ..linear_operator import LinearOperator, SolverT, Uninitialized
+
+from .common import check_valid_vector_type, samples_and_pdf
+from .qgt_jacobian_common import jacobian_chunked_reduce, streaming_mode
+
+
+@partial_from_kwargs
+def QGTKFAC(
+    vstate,
+    *,
+    mode: str | None = None,
+    chunk_size: int | None = None,
+    max_factor_size: int = 2048,
+    decay: float = 0.0,
+    diag_shift: float = 0.0,
+    diag_scale: float | None = None,
+    **kwargs,
+) -> "QGTKFACT":
+    r"""
+    Block-diagonal, Kronecker-factored (KFAC-like) approximation of the Quantum
+    Geometric Tensor.
+
+    Every parameter with two or more dimensions, such as the kernel of a dense or
+    convolutional layer, is reshaped to a matrix :math:`G` of shape
+    `(fan_in, fan_out)` by collapsing all but its last axis. The corresponding
+    diagonal block of the QGT is approximated by the Kronecker product
+
+    .. math::
+
+        S_{\text{block}} \approx \frac{L \otimes R}{\text{tr}(L)},
+        \qquad L = \langle \Delta G \Delta G^\dagger \rangle,
+        \qquad R = \langle \Delta G^\dagger \Delta G \rangle,
+
+    which has the same trace as the exact block. All other parameters (biases, or
+    kernels with a dimension larger than `max_factor_size`) are treated with the
+    diagonal approximation of :class:`~netket.optimizer.qgt.QGTDiagonal`.
+
+    The factors are accumulated chunk by chunk over the samples, so that the full
+    jacobian is never stored, and the linear system is solved exactly by
+    diagonalising the factors. The linear solver passed to
+    :class:`~netket.optimizer.SR` is therefore ignored.
+
+    When used through :class:`~netket.optimizer.SR`, the factors can be averaged
+    across optimisation steps with an exponential moving average of rate `decay`.
+
+    Complex parameters are always treated by splitting them into their real and
+    imaginary parts.
+
+    Args:
+        vstate: The variational state.
+        mode: "real" or "complex": the mode used to compute the jacobian (see
+            :func:`netket.jax.jacobian`). Defaults to the most appropriate one.
+        chunk_size: If supplied, overrides the chunk size of the variational state.
+        max_factor_size: Parameters whose `fan_in` or `fan_out` is larger than this
+            value are treated with the diagonal approximation.
+        decay: Rate of the exponential moving average of the factors across
+            optimisation steps (0 means no averaging).
+        diag_shift: Constant shift :math:`\epsilon_2` added to the diagonal.
+        diag_scale: Not supported by this approximation, must be None.
+    """
+    samples, pdf = samples_and_pdf(vstate)
+
+    if chunk_size is None:
+        chunk_size = getattr(vstate, "chunk_size", None)
+
+    return QGTKFAC_DefaultConstructor(
+        vstate._apply_fun,
+        vstate.parameters,
+        vstate.model_state,
+        samples,
+        pdf=pdf,
+        mode=mode,
+        chunk_size=chunk_size,
+        max_factor_size=max_factor_size,
+        decay=decay,
+        diag_shift=diag_shift,
+        diag_scale=diag_scale,
+        **kwargs,
+    )
+
+
+@timing.timed
+def QGTKFAC_DefaultConstructor(
+    apply_fun,
+    parameters,
+    model_state,
+    samples,
+    pdf=None,
+    *,
+    mode: str | None = None,
+    chunk_size: int | None = None,
+    max_factor_size: int = 2048,
+    diag_shift: float = 0.0,
+    diag_scale: float | None = None,
+    **kwargs,
+) -> "QGTKFACT":
+    """
+    Construct a :class:`QGTKFACT` starting from the definition of a
+    variational state.
+    """
+    if diag_scale is not None:
+        raise ValueError(
+            "QGTKFAC does not support `diag_scale`, use `diag_shift` instead."
+        )
+
+    mode, samples, pdf = streaming_mode(
+        apply_fun, parameters, model_state, samples, pdf, mode=mode
+    )
+
+    moments = jacobian_chunked_reduce(
+        _kfac_moments_fun(max_factor_size),
+        apply_fun,
+        parameters,
+        model_state,
+        samples,
+        pdf,
+        mode=mode,
+        chunk_size=chunk_size,
+    )
+
+    pars_struct = jax.tree_util.tree_map(
+        lambda x: jax.ShapeDtypeStruct(x.shape, x.dtype), parameters
+    )
+    return QGTKFACT(
+        blocks=_centred_blocks(moments),
+        mode=mode,
+        diag_shift=diag_shift,
+        _params_structure=pars_struct,
+        **kwargs,
+    )
+
+
+def _factor_shape(shape, max_factor_size):
+    """
+    Returns the (fan_in, fan_out) shape of a parameter treated with Kronecker
+    factors, or None if it should be treated with the diagonal approximation.
+    """
+    if len(shape) < 2:
+        return None
+    fan_in, fan_out = math.prod(shape[:-1]), shape[-1]
+    if max(fan_in, fan_out) > max_factor_size:
+        return None
+    return fan_in, fan_out
+
+
+@lru_cache
+def _kfac_moments_fun(max_factor_size):
+    # cached, so that it can be used as a static argument without recompiling
+    return partial(_kfac_moments, max_factor_size)
+
+
+def _kfac_moments(max_factor_size, O, w):
+    """
+    Given a chunk of the jacobian with leaves of shape (n_samples, 2, ...) and
+    the weights of every sample, computes for every leaf the weighted sum of the
+    jacobian and either of its Kronecker factors or of its square.
+
+    Returns a list with one dictionary per leaf of the real parameters.
+    """
+    res = []
+    for o in jax.tree_util.tree_leaves(O):
+        factor_shape = _factor_shape(o.shape[2:], max_factor_size)
+        if factor_shape is None:
+            res.append(
+                {
+                    "mean": jnp.tensordot(w, o, axes=1),
+                    "diag": jnp.tensordot(w, o**2, axes=1).sum(axis=0),
+                }
+            )
+        else:
+            G = o.reshape(o.shape[:2] + factor_shape)
+            res.append(
+                {
+                    "mean": jnp.tensordot(w, G, axes=1),
+                    "L": jnp.einsum("s,sjio,sjko->ik", w, G, G),
+                    "R": jnp.einsum("s,sjio,sjiq->oq", w, G, G),
+                }
+            )
+    return res
+
+
+@jax.jit
+def _centred_blocks(moments):
+    blocks = []
+    for m in moments:
+        M = m["mean"]
+        if "diag" in m:
+            blocks.append({"diag": jnp.maximum(m["diag"] - (M**2).sum(axis=0), 0)})
+        else:
+            blocks.append(
+                {
+                    "L": m["L"] - jnp.einsum("jio,jko->ik", M, M),
+                    "R": m["R"] - jnp.einsum("jio,jiq->oq", M, M),
+                }
+            )
+    return blocks
+
+
+@struct.dataclass
+class QGTKFACT(LinearOperator):
+    """
+    Kronecker-factored approximation of the Quantum Geometric Tensor, behaving
+    like a linear operator.
+
+    The linear system is solved exactly by diagonalising the factors, and the
+    solver passed to :meth:`solve` is ignored.
+    """
+
+    blocks: list = Uninitialized
+    """List with one entry for every leaf of the parameters split into real and
+    imaginary parts, holding either the Kronecker factors `L` and `R` or the
+    diagonal `diag` of the corresponding block of the S matrix."""
+
+    mode: str = struct.field(pytree_node=False, default=Uninitialized)
+    """Differentiation mode used to compute the jacobian ("real" or "complex")."""
+
+    decay: float = struct.field(pytree_node=False, default=0.0)
+    """Rate of the exponential moving average of the factors across steps."""
+
+    _params_structure: PyTree = struct.field(pytree_node=False, default=Uninitialized)
+    """Parameters of the network. Its only purpose is to represent its own shape."""
+
+    @jax.jit
+    def __matmul__(self, vec: PyTree | Array) -> PyTree | Array:
+        return _apply_blocks(self, vec, _block_matmul)
+
+    def _solve(
+        self, solve_fun: SolverT, y: PyTree, *, x0: PyTree | None = None, **kwargs
+    ) -> PyTree:
+        return _solve(self, y), None
+
+    @jax.jit
+    def to_dense(self) -> jnp.ndarray:
+        """
+        Convert the lazy matrix representation to a dense matrix representation.
+
+        Returns:
+            A dense matrix representation of this S matrix. Complex parameters
+            get separate rows/columns for their real and imaginary parts.
+        """
+        dense_blocks = []
+        for block in self.blocks:
+            if "diag" in block:
+                dense_blocks.append(jnp.diag(block["diag"].reshape(-1)))
+            else:
+                L, R = block["L"], block["R"]
+                dense_blocks.append(jnp.kron(L, R) / _trace(L))
+        S = jax.scipy.linalg.block_diag(*dense_blocks)
+        return S + self.diag_shift * jnp.eye(S.shape[0], dtype=S.dtype)
+
+    def running_average(self, previous: LinearOperator | None) -> "QGTKFACT":
+        if (
+            self.decay == 0
+            or not isinstance(previous, QGTKFACT)
+            or jax.tree_util.tree_structure(previous.blocks)
+            != jax.tree_util.tree_structure(self.blocks)
+        ):
+            return self
+
+        blocks = jax.tree_util.tree_map(
+            lambda old, new: self.decay * old + (1 - self.decay) * new,
+            previous.blocks,
+            self.blocks,
+        )
+        return self.replace(blocks=blocks)
+
+    def __repr__(self):
+        return (
+            f"QGTKFAC(diag_shift={self.diag_shift}, mode={self.mode}, "
+            f"decay={self.decay})"
+        )
+
+
+def _trace(L):
+    # avoid dividing by zero for parameters that do not affect the output
+    return jnp.maximum(jnp.trace(L), jnp.finfo(L.dtype).tiny)
+
+
+def _block_matmul(block, x, diag_shift):
+    if "diag" in block:
+        return (block["diag"] + diag_shift) * x
+    L, R = block["L"], block["R"]
+    X = x.reshape(L.shape[0], R.shape[0])
+    return ((L @ X @ R) / _trace(L)).reshape(x.shape) + diag_shift * x
+
+
+def _block_solve(block, x, diag_shift):
+    if "diag" in block:
+        return x / (block["diag"] + diag_shift)
+    L, R = block["L"], block["R"]
+    a, U = jnp.linalg.eigh(L)
+    b, V = jnp.linalg.eigh(R)
+    # the factors are positive semi-definite up to numerical noise
+    a, b = jnp.maximum(a, 0), jnp.maximum(b, 0)
+    X = x.reshape(L.shape[0], R.shape[0])
+    Y = (U.T @ X @ V) / (jnp.outer(a, b) / _trace(L) + diag_shift)
+    return (U @ Y @ V.T).reshape(x.shape)
+
+
+def _apply_blocks(self, vec, block_fun):
+    """
+    Applies `block_fun(block, leaf, diag_shift)` to every leaf of the vector
+    `vec`, (a pytree with the structure of the parameters or its ravelled
+    version), after splitting it into real and imaginary parts.
+    """
+    if hasattr(vec, "ndim"):
+        _, unravel = nkjax.tree_ravel(self._params_structure)
+        vec = unravel(vec)
+        ravel = True
+    else:
+        ravel = False
+
+    check_valid_vector_type(self._params_structure, vec)
+
+    vec, reassemble = nkjax.tree_to_real(vec)
+    leaves, treedef = jax.tree_util.tree_flatten(vec)
+    res = [
+        block_fun(block, x, self.diag_shift) for block, x in zip(self.blocks, leaves)
+    ]
+    res = reassemble(jax.tree_util.tree_unflatten(treedef, res))
+
+    if ravel:
+        res, _ = nkjax.tree_ravel(res)
+    return res
+
+
+@jax.jit
+def _solve(self: QGTKFACT, y: PyTree) -> PyTree:
+    return _apply_blocks(self, y, _block_solve)
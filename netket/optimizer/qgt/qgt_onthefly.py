@@ -23,14 +23,13 @@ import netket.jax as nkjax
 from netket.utils import timing, HashablePartial
 from netket.utils.types import PyTree
 from netket.utils.api_utils import partial_from_kwargs
-from netket.nn import split_array_mpi
 from netket.errors import (
     IllegalHolomorphicDeclarationForRealParametersError,
     NonHolomorphicQGTOnTheFlyDenseRepresentationError,
     HolomorphicUndeclaredWarning,
 )
 
-from .common import check_valid_vector_type
+from .common import check_valid_vector_type, samples_and_pdf
 from .qgt_onthefly_logic import mat_vec_factory, mat_vec_chunked_factory
 
 from ..linear_operator import LinearOperator, SolverT, Uninitialized
@@ -64,15 +63,7 @@ def QGTOnTheFly(
             "this feature.\n\n"
         )
 
-    # TODO: Find a better way to handle this case
-    from netket.vqs import FullSumState
-
-    if isinstance(vstate, FullSumState):
-        samples = split_array_mpi(vstate._all_states)
-        pdf = split_array_mpi(vstate.probability_distribution())
-    else:
-        samples = vstate.samples
-        pdf = None
+    samples, pdf = samples_and_pdf(vstate)
 
     if chunk_size is None:
         chunk_size = getattr(vstate, "chunk_size", None)
@@ -1,4 +1,5 @@
 from .solvers import cholesky, LU, solve, svd, pinv, pinv_smooth
+from .krylov import deflated_cg, DeflatedCGInfo
 
 from netket.utils import _hide_submodules
 
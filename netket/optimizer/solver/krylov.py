@@ -0,0 +1,248 @@
+# Copyright 2021 The NetKet Authors - All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import jax
+import jax.numpy as jnp
+import jax.scipy as jsp
+
+from netket.jax import tree_ravel
+from netket.utils import struct
+from netket.utils.api_utils import partial_from_kwargs
+
+
+@struct.dataclass
+class DeflatedCGInfo:
+    """
+    Convergence information returned by
+    :func:`~netket.optimizer.solver.deflated_cg`.
+    """
+
+    n_iter: jax.Array
+    """Number of conjugate-gradient iterations (matrix-vector products, excluding
+    those used to refresh the deflation subspace)."""
+
+    residual_norm: jax.Array
+    """Norm of the residual of the final solution."""
+
+    ritz_vectors: jax.Array
+    """Approximate eigenvectors of the smallest eigenvalues of the matrix, stored as
+    the columns of a real array. Can be passed as `ritz_vectors` to the next call
+    of :func:`~netket.optimizer.solver.deflated_cg` to deflate a similar system."""
+
+    ritz_values: jax.Array
+    """Approximate eigenvalues corresponding to `ritz_vectors`."""
+
+
+@partial_from_kwargs
+def deflated_cg(
+    A,
+    b,
+    *,
+    x0=None,
+    ritz_vectors=None,
+    tol: float = 1e-5,
+    atol: float = 0.0,
+    maxiter: int | None = None,
+    M=None,
+    n_ritz: int = 8,
+    n_harvest: int | None = None,
+):
+    r"""
+    Solve the linear system with a deflated (and optionally preconditioned)
+    Conjugate Gradient, recycling a Krylov subspace between consecutive solves.
+
+    The iteration is the Deflated-CG of
+    `Saad et al., SIAM J. Sci. Comput. 21, 1909 (2000)
+    <https://doi.org/10.1137/S1064829598339761>`_: the conjugate directions are
+    kept :math:`A`-orthogonal to the space spanned by the columns of
+    `ritz_vectors` :math:`W`, and the initial guess is corrected with the
+    Galerkin projection on :math:`W`. Deflating the smallest eigenvalues of
+    :math:`A` reduces its effective condition number and therefore the number of
+    iterations.
+
+    At the end of the solve, a Rayleigh-Ritz procedure on :math:`W` and on the
+    last `n_harvest` conjugate directions extracts `n_ritz` approximate
+    eigenvectors for the smallest eigenvalues, which are returned in the
+    `info` and can be used to deflate the next system. Since the Quantum
+    Geometric Tensor changes little between consecutive optimisation steps, this
+    is particularly effective when used with
+    :class:`~netket.optimizer.SR` and `solver_recycle=True`, which
+    automatically feeds the Ritz vectors of one step to the next.
+
+    Refreshing the deflation subspace costs `n_ritz` additional matrix-vector
+    products per solve.
+
+    .. note::
+
+        If you pass only keyword arguments, this solver will directly create
+        a partial capturing them.
+
+    Args:
+        A: LinearOperator (matrix)
+        b: vector or Pytree
+        x0: Initial guess for the solution.
+        ritz_vectors: Deflation subspace, as returned in the `info` of a previous
+            call to this solver. If None, no deflation is performed.
+        tol, atol: Tolerances for convergence,
+            ``norm(residual) <= max(tol*norm(b), atol)``.
+        maxiter: Maximum number of iterations (defaults to 10 times the size of the system).
+        M: Preconditioner for A, acting on the same structure as `b`.
+        n_ritz: Number of Ritz vectors to return.
+        n_harvest: Number of last conjugate directions used to compute the
+            Ritz vectors (defaults to `2 * n_ritz`).
+
+    Returns:
+        The solution and a :class:`~netket.optimizer.solver.DeflatedCGInfo`
+        structure.
+    """
+    if n_harvest is None:
+        n_harvest = 2 * n_ritz
+
+    b_flat, unravel = tree_ravel(b)
+    is_complex = jnp.iscomplexobj(b_flat)
+    n = b_flat.size
+
+    # Complex vectors are treated as real vectors of twice the size, which
+    # makes the algorithm valid also for operators that are only real-linear.
+    def to_real(v):
+        if is_complex:
+            return jnp.concatenate([v.real, v.imag])
+        return v
+
+    def from_real(v):
+        if is_complex:
+            return jax.lax.complex(v[:n], v[n:])
+        return v
+
+    def as_real_operator(op):
+        def fun(v):
+            res, _ = tree_ravel(op(unravel(from_real(v))))
+            return to_real(res).astype(v.dtype)
+
+        return fun
+
+    matvec = as_real_operator(lambda v: A @ v)
+
+    precond = as_real_operator(M) if M is not None else lambda v: v
+
+    b = to_real(b_flat)
+    dtype = b.dtype
+    if maxiter is None:
+        maxiter = 10 * b.size
+
+    if x0 is None:
+        x = jnp.zeros_like(b)
+        r = b
+    else:
+        x0, _ = tree_ravel(x0)
+        x = to_real(x0).astype(dtype)
+        r = b - matvec(x)
+
+    if ritz_vectors is not None:
+        W = ritz_vectors.astype(dtype)
+        # This uses lax.map instead of vmap because some operators (chunked
+        # QGTOnTheFly) do not support batching.
+        AW = jax.lax.map(matvec, W.T).T
+        E = W.T @ AW
+        E = 0.5 * (E + E.T)
+        # Ritz vectors might be zero if not enough directions were harvested
+        E = E + jnp.diag(jnp.linalg.norm(W, axis=0) == 0).astype(dtype)
+        E_fact = jsp.linalg.cho_factor(E)
+
+        mu = jsp.linalg.cho_solve(E_fact, W.T @ r)
+        x = x + W @ mu
+        r = r - AW @ mu
+
+        def deflate(z):
+            return z - W @ jsp.linalg.cho_solve(E_fact, AW.T @ z)
+
+    else:
+        W = jnp.zeros((b.size, 0), dtype=dtype)
+        AW = W
+
+        def deflate(z):
+            return z
+
+    bs = b @ b
+    atol2 = jnp.maximum(jnp.square(tol) * bs, jnp.square(atol))
+
+    z = precond(r)
+    p = deflate(z)
+    gamma = r @ z
+    P = jnp.zeros((n_harvest, b.size), dtype=dtype)
+    AP = jnp.zeros((n_harvest, b.size), dtype=dtype)
+
+    def cond_fun(val):
+        _, r, _, _, k, _, _ = val
+        return (r @ r > atol2) & (k < maxiter)
+
+    def body_fun(val):
+        x, r, gamma, p, k, P, AP = val
+        Ap = matvec(p)
+        alpha = gamma / (p @ Ap)
+        x = x + alpha * p
+        r = r - alpha * Ap
+        z = precond(r)
+        gamma_new = r @ z
+        beta = gamma_new / gamma
+        P = P.at[k % n_harvest].set(p)
+        AP = AP.at[k % n_harvest].set(Ap)
+        p = beta * p + deflate(z)
+        return x, r, gamma_new, p, k + 1, P, AP
+
+    x, r, _, _, n_iter, P, AP = jax.lax.while_loop(
+        cond_fun, body_fun, (x, r, gamma, p, 0, P, AP)
+    )
+
+    ritz_vectors, ritz_values = _harvest_ritz(
+        jnp.concatenate([W, P.T], axis=1),
+        jnp.concatenate([AW, AP.T], axis=1),
+        n_ritz,
+    )
+
+    info = DeflatedCGInfo(
+        n_iter=n_iter,
+        residual_norm=jnp.sqrt(r @ r),
+        ritz_vectors=ritz_vectors,
+        ritz_values=ritz_values,
+    )
+    return unravel(from_real(x)), info
+
+
+def _harvest_ritz(Z, AZ, n_ritz):
+    """
+    Rayleigh-Ritz extraction of the `n_ritz` smallest eigenpairs of A restricted
+    to the span of the columns of Z, given AZ = A @ Z.
+
+    Linearly dependent (or zero) columns are discarded, and the returned vectors
+    are orthonormal. If the span has dimension smaller than `n_ritz`, the
+    remaining vectors are zero.
+    """
+    dtype = Z.dtype
+    F = Z.T @ Z
+    f, V = jnp.linalg.eigh(0.5 * (F + F.T))
+    keep = f > 10 * jnp.finfo(dtype).eps * jnp.max(f)
+    T = jnp.where(keep, V / jnp.sqrt(jnp.where(keep, f, 1)), 0)
+
+    H = T.T @ (Z.T @ AZ) @ T
+    H = 0.5 * (H + H.T)
+    # push discarded directions to the end of the spectrum
+    big = 10 * (jnp.max(jnp.abs(H)) + 1)
+    H = H + jnp.diag(jnp.where(keep, 0, big))
+    theta, Y = jnp.linalg.eigh(H)
+
+    n_ritz = min(n_ritz, theta.size)
+    ritz_vectors = Z @ (T @ Y[:, :n_ritz])
+    ritz_values = jnp.where(theta[:n_ritz] < big, theta[:n_ritz], 0)
+    return ritz_vectors, ritz_values
@@ -118,6 +118,7 @@ class SR(AbstractLinearPreconditioner, mutable=True):
         diag_shift: ScalarOrSchedule = 0.01,
         diag_scale: ScalarOrSchedule | None = None,
         solver_restart: bool = False,
+        solver_recycle: bool = False,
         **kwargs,
     ):
         r"""
@@ -146,6 +147,11 @@ class SR(AbstractLinearPreconditioner, mutable=True):
             solver_restart: If False uses the last solution of the linear
                 system as a starting point for the solution of the next
                 (default=False).
+            solver_recycle: If True, the Ritz vectors computed by a recycling
+                solver such as :func:`~netket.optimizer.solver.deflated_cg` are
+                used to deflate the linear system solved at the next step,
+                reducing the number of iterations required when the geometric
+                tensor changes little between consecutive steps (default=False).
             holomorphic: boolean indicating if the ansatz is holomorphic or not. May
                 speed up computations for models with complex-valued parameters.
         """
@@ -166,7 +172,9 @@ class SR(AbstractLinearPreconditioner, mutable=True):
             "In the future, this warning will become an error.",
         )
 
-        super().__init__(solver, solver_restart=solver_restart)
+        super().__init__(
+            solver, solver_restart=solver_restart, solver_recycle=solver_recycle
+        )
 
     def lhs_constructor(self, vstate: VariationalState, step: Scalar | None = None):
         """
@@ -205,6 +213,7 @@ class SR(AbstractLinearPreconditioner, mutable=True):
             + f"\n  diag_scale      = {self.diag_scale}, "
             + f"\n  qgt_kwargs      = {self.qgt_kwargs}, "
             + f"\n  solver          = {self.solver}, "
-            + f"\n  solver_restart  = {self.solver_restart}"
+            + f"\n  solver_restart  = {self.solver_restart}, "
+            + f"\n  solver_recycle  = {self.solver_recycle}"
             + ")"
         )
@@ -17,7 +17,7 @@ from .base import (
     SamplerState,
 )
 
-from .exact import ExactSampler
+from .exact import ExactSampler, BlockedExactSampler
 
 from .metropolis import (
     MetropolisSampler,
@@ -45,13 +45,18 @@ from .metropolis_numpy import (
     MetropolisCustomNumpy,
 )
 
+from .smc import SMCSampler, SMCSamplerState
+
 from .autoreg import ARDirectSampler
 
+from .hamiltonian_mc import HamiltonianMCSampler, HamiltonianMCSamplerState
+
 from . import rules
 
 # Shorthand
 Metropolis = MetropolisSampler
 MetropolisNumpy = MetropolisSamplerNumpy
+HamiltonianMC = HamiltonianMCSampler
 
 # Replacements for efficiency
 # MetropolisHamiltonian = MetropolisHamiltonianNumpy
@@ -21,9 +21,10 @@ from jax import numpy as jnp
 
 from netket import config
 from netket.hilbert import DiscreteHilbert
+from netket.jax import apply_chunked
 from netket.nn import to_array
 from netket.utils.types import PyTree, SeedT, DType
-from netket.utils import struct
+from netket.utils import mpi, struct
 
 from .base import Sampler, SamplerState
 
@@ -145,3 +146,227 @@ class ExactSampler(Sampler):
             return (samples, log_probabilities), state.replace(rng=new_rng)
         else:
             return samples, state.replace(rng=new_rng)
+
+
+class BlockedExactSamplerState(SamplerState):
+    log_block_weights: jnp.ndarray = struct.field(serialize=False)
+    """Logarithm of the unnormalized probability of every block of states."""
+    rng: jnp.ndarray = struct.field(
+        sharded=struct.ShardedFieldSpec(
+            sharded=True, deserialization_function="relaxed-rng-key"
+        )
+    )
+
+    def __init__(self, log_block_weights: Any, rng: Any):
+        self.log_block_weights = log_block_weights
+        self.rng = rng
+        super().__init__()
+
+    def __repr__(self):
+        return f"BlockedExactSamplerState(rng state={self.rng})"
+
+
+class BlockedExactSampler(Sampler):
+    """
+    This sampler generates i.i.d. samples from :math:`|\\Psi(\\sigma)|^2` like
+    :class:`~netket.sampler.ExactSampler`, but without ever storing the probability
+    of all the states of the Hilbert space.
+
+    The states are split into contiguous blocks of `block_size` states, in the order
+    given by :meth:`~netket.hilbert.DiscreteHilbert.numbers_to_states`. When the
+    sampler is reset, only the total probability of every block is stored, computing
+    the probabilities of the states one block at a time. The samples are then
+    generated by inverse transform sampling: a sorted batch of uniform numbers is
+    first assigned to the blocks, and the probabilities of every block containing
+    some samples are recomputed once to locate the samples inside of it.
+
+    The memory cost is therefore proportional to `block_size` plus the number of
+    blocks, instead of the number of states, at the price of evaluating the model
+    on every block containing a sample again. The cost of every reset is still
+    proportional to the number of states. When running with MPI, the blocks are
+    distributed among the ranks during the reset.
+    """
+
+    block_size: int = struct.field(pytree_node=False, default=2**16)
+    """Number of states in every block."""
+    chunk_size: int | None = struct.field(pytree_node=False, default=None)
+    """Chunk size used to evaluate the model on every block."""
+
+    def __init__(
+        self,
+        hilbert: DiscreteHilbert,
+        block_size: int = 2**16,
+        *,
+        chunk_size: int | None = None,
+        machine_pow: int = 2,
+        dtype: DType = None,
+    ):
+        """
+        Construct a blocked exact sampler.
+
+        Args:
+            hilbert: The Hilbert space to sample.
+            block_size: The number of states in every block (default = 2**16). It
+                is reduced to the number of states of the Hilbert space if larger.
+            chunk_size: Optional chunk size used to evaluate the model on every
+                block. If `None` (default), a whole block is evaluated at once.
+            machine_pow: The power to which the machine should be exponentiated to generate the pdf (default = 2).
+            dtype: The dtype of the states sampled (default = np.float64).
+        """
+        if not hilbert.is_indexable:
+            raise ValueError(
+                "BlockedExactSampler can only sample indexable Hilbert spaces."
+            )
+        if block_size < 1:
+            raise ValueError(f"block_size ({block_size}) must be positive.")
+        if chunk_size is not None and chunk_size < 1:
+            raise ValueError(f"chunk_size ({chunk_size}) must be positive.")
+
+        super().__init__(hilbert, machine_pow=machine_pow, dtype=dtype)
+        self.block_size = int(min(block_size, hilbert.n_states))
+        self.chunk_size = chunk_size
+
+    @property
+    def is_exact(sampler):
+        return True
+
+    @property
+    def n_blocks(self) -> int:
+        """The number of blocks the states of the Hilbert space are split into."""
+        return -(-self.hilbert.n_states // self.block_size)
+
+    def _init_state(
+        self,
+        machine: nn.Module,
+        parameters: PyTree,
+        seed: SeedT | None = None,
+    ):
+        log_block_weights = jnp.zeros(self.n_blocks)
+        return BlockedExactSamplerState(log_block_weights=log_block_weights, rng=seed)
+
+    @partial(jax.jit, static_argnames="machine")
+    def _reset(self, machine, parameters, state):
+        # Every rank computes the blocks b ≡ rank (mod n_nodes), and the results
+        # are combined with a max as the other blocks are set to -inf.
+        n_blocks_per_rank = -(-self.n_blocks // mpi.n_nodes)
+        blocks = mpi.rank + mpi.n_nodes * jnp.arange(n_blocks_per_rank)
+
+        def block_weight(block):
+            log_prob = _block_log_prob(self, machine, parameters, block)
+            return jax.scipy.special.logsumexp(log_prob)
+
+        log_weights = jax.lax.map(block_weight, blocks)
+        log_block_weights = (
+            jnp.full(self.n_blocks, -jnp.inf, dtype=log_weights.dtype)
+            .at[blocks]
+            .set(log_weights, mode="drop")
+        )
+        log_block_weights, _ = mpi.mpi_max_jax(log_block_weights)
+
+        return state.replace(log_block_weights=log_block_weights)
+
+    @partial(
+        jax.jit, static_argnames=("machine", "chain_length", "return_log_probabilities")
+    )
+    def _sample_chain(
+        self,
+        machine: nn.Module,
+        parameters: PyTree,
+        state: SamplerState,
+        chain_length: int,
+        return_log_probabilities: bool = False,
+    ) -> (
+        tuple[jax.Array, SamplerState]
+        | tuple[tuple[jax.Array, jax.Array], SamplerState]
+    ):
+        n_samples = self.n_batches * chain_length
+        new_rng, rng_u, rng_perm = jax.random.split(state.rng, 3)
+
+        # Assign a sorted batch of uniform numbers to the blocks, and store the
+        # relative position of every number inside of its block.
+        weights = jnp.exp(state.log_block_weights - state.log_block_weights.max())
+        cdf = jnp.cumsum(weights)
+        u = jnp.sort(jax.random.uniform(rng_u, (n_samples,), dtype=cdf.dtype))
+        u = u * cdf[-1]
+        blocks = jnp.searchsorted(cdf, u, side="right")
+        blocks = jnp.clip(blocks, 0, self.n_blocks - 1)
+        u = jnp.clip((u - cdf[blocks] + weights[blocks]) / weights[blocks], 0, 1)
+
+        # Index of the distinct blocks (which are contiguous as u is sorted)
+        is_first = jnp.concatenate(
+            [jnp.ones((1,), dtype=bool), blocks[1:] != blocks[:-1]]
+        )
+        inverse = jnp.cumsum(is_first) - 1
+        n_distinct = inverse[-1] + 1
+        distinct_blocks = (
+            jnp.zeros(min(n_samples, self.n_blocks), dtype=blocks.dtype)
+            .at[inverse]
+            .set(blocks)
+        )
+
+        # Locate the samples inside every block containing some of them
+        def locate_in_block(k, carry):
+            numbers, log_probabilities = carry
+            block = distinct_blocks[k]
+            log_prob = _block_log_prob(self, machine, parameters, block)
+            block_cdf = jnp.cumsum(jnp.exp(log_prob - log_prob.max()))
+            idx = jnp.searchsorted(block_cdf / block_cdf[-1], u, side="right")
+            idx = jnp.clip(idx, 0, self.block_size - 1)
+
+            in_block = inverse == k
+            numbers = jnp.where(in_block, block * self.block_size + idx, numbers)
+            log_probabilities = jnp.where(in_block, log_prob[idx], log_probabilities)
+            return numbers, log_probabilities
+
+        numbers, log_probabilities = jax.lax.fori_loop(
+            0,
+            n_distinct,
+            locate_in_block,
+            (
+                jnp.zeros(n_samples, dtype=blocks.dtype),
+                jnp.zeros(n_samples, dtype=cdf.dtype),
+            ),
+        )
+
+        # The samples are sorted, so they must be shuffled among the chains
+        perm = jax.random.permutation(rng_perm, n_samples)
+        numbers = numbers[perm].reshape(self.n_batches, chain_length)
+        log_probabilities = log_probabilities[perm].reshape(
+            self.n_batches, chain_length
+        )
+
+        samples = self.hilbert.numbers_to_states(numbers).astype(self.dtype)
+
+        if return_log_probabilities:
+            return (samples, log_probabilities), state.replace(rng=new_rng)
+        else:
+            return samples, state.replace(rng=new_rng)
+
+    def __repr__(self):
+        return (
+            f"{type(self).__name__}("
+            + f"\n  hilbert = {self.hilbert},"
+            + f"\n  block_size = {self.block_size},"
+            + f"\n  chunk_size = {self.chunk_size},"
+            + f"\n  machine_pow = {self.machine_pow},"
+            + f"\n  dtype = {self.dtype})"
+        )
+
+
+def _block_log_prob(
+    sampler: BlockedExactSampler, machine: nn.Module, parameters: PyTree, block
+) -> jax.Array:
+    """
+    Computes the unnormalized log-probability of the states in a block, which is
+    -inf for the padding after the last state of the Hilbert space.
+    """
+    numbers = block * sampler.block_size + jnp.arange(sampler.block_size)
+    valid = numbers < sampler.hilbert.n_states
+    σ = sampler.hilbert.numbers_to_states(jnp.where(valid, numbers, 0))
+    log_psi = apply_chunked(
+        machine.apply,
+        in_axes=(None, 0),
+        chunk_size=sampler.chunk_size,
+        axis_0_is_sharded=False,
+    )(parameters, σ.astype(sampler.dtype))
+    return jnp.where(valid, sampler.machine_pow * log_psi.real, -jnp.inf)
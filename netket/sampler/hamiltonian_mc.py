@@ -0,0 +1,802 @@
+# Copyright 2025 The NetKet Authors - All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from functools import partial
+from typing import NamedTuple
+
+import numpy as np
+
+import jax
+from jax import numpy as jnp
+
+from netket.hilbert import ContinuousHilbert
+from netket.utils import mpi, struct
+from netket.utils.types import DType
+from netket import jax as nkjax
+from netket.jax.sharding import device_count, shard_along_axis
+from netket.nn.utils import prepare_variables
+
+from .base import Sampler
+from .metropolis import MetropolisSamplerState, _round_n_chains_to_next_multiple
+
+# Constants of the dual averaging scheme of Hoffman and Gelman.
+_DA_GAMMA = 0.05
+_DA_T0 = 10.0
+_DA_KAPPA = 0.75
+
+# Trajectories whose energy error exceeds this value are considered divergent.
+_MAX_DELTA_ENERGY = 1000.0
+
+
+class HamiltonianMCSamplerState(MetropolisSamplerState):
+    """
+    State for the Hamiltonian Monte Carlo sampler.
+
+    Contains the usual quantities of a Metropolis sampler, the gradient of the
+    log-probability of the current configurations and the state of the
+    step-size adaptation.
+    """
+
+    grad_log_prob: jnp.ndarray = struct.field(sharded=True, serialize=False)
+    """Gradient of the log probability at the current configurations σ."""
+    step_size: jnp.ndarray = None
+    """Step size of the leapfrog integrator used outside of the adaptation."""
+    log_step_size: jnp.ndarray = None
+    """Logarithm of the step size used during the adaptation."""
+    log_step_size_avg: jnp.ndarray = None
+    """Running average of the logarithm of the step size during the adaptation."""
+    log_step_size_0: jnp.ndarray = None
+    """Logarithm of the step size at the beginning of the adaptation."""
+    h_avg: jnp.ndarray = None
+    """Running average of the difference between target and actual acceptance."""
+    n_adapt_steps: jnp.ndarray = None
+    """Number of adaptation steps performed since the last reset."""
+
+    def __init__(
+        self,
+        σ: jnp.ndarray,
+        rng: jnp.ndarray,
+        step_size: jnp.ndarray,
+        log_prob: jnp.ndarray | None = None,
+    ):
+        super().__init__(σ, rng=rng, rule_state=None, log_prob=log_prob)
+        self.grad_log_prob = shard_along_axis(jnp.zeros_like(σ), axis=0)
+
+        self.step_size = jnp.asarray(step_size, dtype=σ.dtype)
+        self.log_step_size = jnp.log(self.step_size)
+        self.log_step_size_avg = self.log_step_size
+        self.log_step_size_0 = self.log_step_size
+        self.h_avg = jnp.zeros((), dtype=σ.dtype)
+        self.n_adapt_steps = jnp.zeros((), dtype=int)
+
+    def __repr__(self):
+        try:
+            if self.n_steps > 0:
+                acc_string = f"# accepted = {self.n_accepted}/{self.n_steps} ({self.acceptance * 100}%), "
+            else:
+                acc_string = ""
+
+            return (
+                f"{type(self).__name__}({acc_string}step_size={self.step_size}, "
+                f"rng state={self.rng})"
+            )
+        except TypeError:
+            return f"{type(self).__name__}(???, rng state={self.rng})"
+
+
+class HamiltonianMCSampler(Sampler):
+    r"""
+    Hamiltonian Monte Carlo sampler for continuous Hilbert spaces.
+
+    Every step of the chains augments the configuration :math:`x` with a
+    normally distributed momentum :math:`p`, and integrates Hamilton's equations
+    for the energy :math:`H(x, p) = -\log P(x) + |p|^2/2` with the leapfrog
+    integrator. Here :math:`P(x)=|M(x)|^p` is the probability being sampled
+    from. The end point of the trajectory is accepted with probability
+
+    .. math::
+
+        A = \mathrm{min}\left(1, e^{H(x,p) - H(x^\prime, p^\prime)}\right).
+
+    Positions along periodic dimensions (see :attr:`ContinuousHilbert.pbc
+    <netket.hilbert.ContinuousHilbert.pbc>`) are wrapped back into the box
+    after every leapfrog step.
+
+    If :code:`nuts=True`, the length of the trajectories is instead chosen
+    adaptively with the No-U-Turn Sampler (NUTS) of Hoffman and Gelman [1],
+    in its multinomial variant, which doubles the trajectory until it starts
+    turning back on itself or reaches :math:`2^{\text{max_tree_depth}}`
+    leapfrog steps.
+
+    The step size is adapted with the dual averaging scheme of [1] during the
+    first :attr:`n_adapt` samples of the chains after every reset of the
+    sampler, targeting an average acceptance of :attr:`target_acceptance`.
+    Those samples do not respect detailed balance and should be discarded,
+    so :attr:`n_adapt` should not be larger than the `n_discard_per_chain` of
+    the variational state. Every adaptation restarts from the step size found
+    by the previous one, which is used for all the following samples.
+
+    The cost of a step is one forward and backward pass of the model per
+    leapfrog step, as the gradient at the end of every trajectory is kept in
+    the sampler state.
+
+    [1]: M. D. Hoffman and A. Gelman, `The No-U-Turn Sampler <https://arxiv.org/abs/1111.4246>`_,
+    JMLR 15, 1593 (2014).
+    """
+
+    step_size: float = 0.1
+    """Initial step size of the leapfrog integrator."""
+    n_leapfrog: int = struct.field(pytree_node=False, default=10)
+    """Number of leapfrog steps of every trajectory, if NUTS is not used."""
+    nuts: bool = struct.field(pytree_node=False, default=False)
+    """If True, the length of the trajectories is chosen with NUTS."""
+    max_tree_depth: int = struct.field(pytree_node=False, default=10)
+    """Maximum number of doublings of the NUTS trajectories."""
+    target_acceptance: float = 0.8
+    """Average acceptance targeted by the step-size adaptation."""
+    n_adapt: int = struct.field(pytree_node=False, default=0)
+    """Number of samples after every reset during which the step size is adapted."""
+    sweep_size: int = struct.field(pytree_node=False, default=1)
+    """Number of trajectories for each step along the chain."""
+    n_chains: int = struct.field(pytree_node=False)
+    """Total number of independent chains across all MPI ranks and/or devices."""
+    chunk_size: int | None = struct.field(pytree_node=False, default=None)
+    """Chunk size for evaluating the gradients of the model."""
+    reset_chains: bool = struct.field(pytree_node=False, default=False)
+    """If True, resets the chain state when `reset` is called on every new sampling."""
+
+    def __init__(
+        self,
+        hilbert: ContinuousHilbert,
+        *,
+        step_size: float = 0.1,
+        n_leapfrog: int = 10,
+        nuts: bool = False,
+        max_tree_depth: int = 10,
+        target_acceptance: float = 0.8,
+        n_adapt: int = 0,
+        sweep_size: int = 1,
+        reset_chains: bool = False,
+        n_chains: int | None = None,
+        n_chains_per_rank: int | None = None,
+        chunk_size: int | None = None,
+        machine_pow: int = 2,
+        dtype: DType = None,
+    ):
+        """
+        Constructs a Hamiltonian Monte Carlo sampler.
+
+        Args:
+            hilbert: The continuous Hilbert space to sample.
+            step_size: The (initial) step size of the leapfrog integrator (default = 0.1).
+            n_leapfrog: The number of leapfrog steps of every trajectory, if NUTS is
+                not used (default = 10).
+            nuts: If True, chooses the length of every trajectory with the No-U-Turn
+                criterion instead of using `n_leapfrog` steps (default = False).
+            max_tree_depth: The maximum number of doublings of the NUTS trajectories
+                (default = 10).
+            target_acceptance: The average acceptance targeted by the step-size
+                adaptation (default = 0.8).
+            n_adapt: The number of samples after every reset during which the step size
+                is adapted. Should not exceed the number of discarded samples
+                (default = 0, which disables the adaptation).
+            sweep_size: Number of trajectories for each step along the chain (default = 1).
+            reset_chains: If True, resets the chain state when `reset` is called on every
+                new sampling (default = False).
+            n_chains: The total number of independent Markov chains across all MPI ranks.
+                Either specify this or `n_chains_per_rank`.
+            n_chains_per_rank: Number of independent chains on every MPI rank (default = 16).
+            chunk_size: Chunk size for evaluating the gradients of the model while
+                sampling. Must divide n_chains_per_rank.
+            machine_pow: The power to which the machine should be exponentiated to generate
+                the pdf (default = 2).
+            dtype: The dtype of the states sampled (default = np.float64).
+        """
+        if not isinstance(hilbert, ContinuousHilbert):
+            raise ValueError("This sampler only works for Continuous Hilbert spaces.")
+
+        if not isinstance(reset_chains, bool):
+            raise TypeError("reset_chains must be a boolean.")
+
+        if n_leapfrog < 1:
+            raise ValueError(f"n_leapfrog ({n_leapfrog}) must be a positive integer.")
+        if max_tree_depth < 1:
+            raise ValueError(
+                f"max_tree_depth ({max_tree_depth}) must be a positive integer."
+            )
+        if n_adapt < 0:
+            raise ValueError(f"n_adapt ({n_adapt}) must be non-negative.")
+        if not 0 < target_acceptance < 1:
+            raise ValueError(
+                f"target_acceptance ({target_acceptance}) must be between 0 and 1."
+            )
+
+        # Default n_chains per rank, if unset
+        if n_chains is None and n_chains_per_rank is None:
+            n_chains_per_rank = 16
+
+        n_chains = _round_n_chains_to_next_multiple(
+            n_chains,
+            n_chains_per_rank,
+            device_count(),
+            "rank",
+        )
+        n_chains_per_rank = n_chains // device_count()
+
+        if chunk_size is not None and n_chains_per_rank % chunk_size != 0:
+            raise ValueError(
+                f"Chunk size must divide number of chains per rank, {n_chains_per_rank}"
+            )
+
+        super().__init__(
+            hilbert=hilbert,
+            machine_pow=machine_pow,
+            dtype=dtype,
+        )
+
+        if jnp.issubdtype(self.dtype, jnp.complexfloating):
+            raise TypeError(
+                "HamiltonianMCSampler does not work with complex basis elements."
+            )
+
+        self.step_size = step_size
+        self.n_leapfrog = n_leapfrog
+        self.nuts = nuts
+        self.max_tree_depth = max_tree_depth
+        self.target_acceptance = target_acceptance
+        self.n_adapt = n_adapt
+        self.sweep_size = sweep_size
+        self.n_chains = n_chains
+        self.chunk_size = chunk_size
+        self.reset_chains = reset_chains
+
+    def _random_state(self, key):
+        return self.hilbert.random_state(key, size=self.n_batches, dtype=self.dtype)
+
+    def _log_prob_and_grad(self, machine, parameters, σ):
+        fun = partial(_log_prob_and_grad, machine.apply, self.machine_pow)
+        return nkjax.vmap_chunked(fun, in_axes=(None, 0), chunk_size=self.chunk_size)(
+            parameters, σ
+        )
+
+    @partial(jax.jit, static_argnums=1)
+    def _init_state(self, machine, parameters, key):
+        key_state, key_σ = jax.random.split(key)
+        σ = jnp.zeros((self.n_batches, self.hilbert.size), dtype=self.dtype)
+        if not self.reset_chains:
+            σ = self._random_state(key_σ)
+        σ = shard_along_axis(σ, axis=0)
+
+        output_dtype = jax.eval_shape(machine.apply, parameters, σ).dtype
+        log_prob = jnp.full(
+            (self.n_batches,), -jnp.inf, dtype=nkjax.dtype_real(output_dtype)
+        )
+        log_prob = shard_along_axis(log_prob, axis=0)
+
+        return HamiltonianMCSamplerState(
+            σ=σ, rng=key_state, step_size=self.step_size, log_prob=log_prob
+        )
+
+    @partial(jax.jit, static_argnums=1)
+    def _reset(self, machine, parameters, state):
+        rng = state.rng
+
+        if self.reset_chains:
+            rng, key = jax.random.split(state.rng)
+            σ = shard_along_axis(self._random_state(key), axis=0)
+        else:
+            σ = state.σ
+
+        log_prob, grad_log_prob = self._log_prob_and_grad(machine, parameters, σ)
+        log_step_size = jnp.log(state.step_size)
+
+        return state.replace(
+            σ=σ,
+            log_prob=log_prob.astype(state.log_prob.dtype),
+            grad_log_prob=grad_log_prob,
+            rng=rng,
+            log_step_size=log_step_size,
+            log_step_size_avg=log_step_size,
+            log_step_size_0=log_step_size,
+            h_avg=jnp.zeros_like(state.h_avg),
+            n_adapt_steps=jnp.zeros_like(state.n_adapt_steps),
+            n_steps_proc=jnp.zeros_like(state.n_steps_proc),
+            n_accepted_proc=jnp.zeros_like(state.n_accepted_proc),
+        )
+
+    def _sample_next(self, machine, parameters, state):
+        hilb = self.hilbert
+        n_dims = len(hilb.extent)
+        pbc = np.tile(np.array(hilb.pbc, dtype=bool), hilb.size // n_dims)
+        extent = np.tile(np.array(hilb.extent, dtype=float), hilb.size // n_dims)
+        modulus = np.where(pbc, extent, 1.0).astype(self.dtype)
+
+        value_and_grad = partial(
+            _log_prob_and_grad, machine.apply, self.machine_pow, parameters
+        )
+        if self.nuts:
+            kernel = partial(
+                _nuts_kernel,
+                value_and_grad,
+                pbc,
+                modulus,
+                max_tree_depth=self.max_tree_depth,
+            )
+        else:
+            kernel = partial(
+                _hmc_kernel, value_and_grad, pbc, modulus, n_leapfrog=self.n_leapfrog
+            )
+        kernel = nkjax.vmap_chunked(
+            kernel, in_axes=(0, 0, 0, 0, None), chunk_size=self.chunk_size
+        )
+
+        # number of trajectories performed since the last reset
+        n_trajectories = state.n_steps_proc // self.n_batches
+
+        def loop_body(i, s):
+            s["key"], key = jax.random.split(s["key"])
+            keys = shard_along_axis(jax.random.split(key, self.n_batches), axis=0)
+
+            adapting = n_trajectories + i < self.n_adapt * self.sweep_size
+            step_size = jnp.where(
+                adapting, jnp.exp(s["log_step_size"]), s["step_size"]
+            )
+
+            σ, log_prob, grad_log_prob, accept_prob, moved = kernel(
+                keys, s["σ"], s["log_prob"], s["grad_log_prob"], step_size
+            )
+            s["σ"] = σ
+            s["log_prob"] = log_prob
+            s["grad_log_prob"] = grad_log_prob
+            s["accepted"] += moved
+
+            # dual averaging of the step size
+            accept_prob, _ = mpi.mpi_mean_jax(jnp.mean(accept_prob))
+            m = s["n_adapt_steps"] + 1
+            h_avg = (1 - 1 / (m + _DA_T0)) * s["h_avg"] + (
+                self.target_acceptance - accept_prob
+            ) / (m + _DA_T0)
+            log_step_size = s["log_step_size_0"] - jnp.sqrt(m) / _DA_GAMMA * h_avg
+            weight = m ** (-_DA_KAPPA)
+            log_step_size_avg = (
+                weight * log_step_size + (1 - weight) * s["log_step_size_avg"]
+            )
+
+            new = {
+                "n_adapt_steps": m,
+                "h_avg": h_avg,
+                "log_step_size": log_step_size,
+                "log_step_size_avg": log_step_size_avg,
+                "step_size": jnp.exp(log_step_size_avg),
+            }
+            for k, v in new.items():
+                s[k] = jnp.where(adapting, v.astype(s[k].dtype), s[k])
+
+            return s
+
+        s = {
+            "key": state.rng,
+            "σ": state.σ,
+            "log_prob": state.log_prob,
+            "grad_log_prob": state.grad_log_prob,
+            "accepted": state.n_accepted_proc,
+            "step_size": state.step_size,
+            "log_step_size": state.log_step_size,
+            "log_step_size_avg": state.log_step_size_avg,
+            "log_step_size_0": state.log_step_size_0,
+            "h_avg": state.h_avg,
+            "n_adapt_steps": state.n_adapt_steps,
+        }
+        s = jax.lax.fori_loop(0, self.sweep_size, loop_body, s)
+
+        new_state = state.replace(
+            rng=s["key"],
+            σ=s["σ"],
+            log_prob=s["log_prob"],
+            grad_log_prob=s["grad_log_prob"],
+            step_size=s["step_size"],
+            log_step_size=s["log_step_size"],
+            log_step_size_avg=s["log_step_size_avg"],
+            h_avg=s["h_avg"],
+            n_adapt_steps=s["n_adapt_steps"],
+            n_accepted_proc=s["accepted"],
+            n_steps_proc=state.n_steps_proc + self.sweep_size * self.n_batches,
+        )
+
+        return new_state, (new_state.σ, new_state.log_prob)
+
+    @partial(
+        jax.jit, static_argnames=("machine", "chain_length", "return_log_probabilities")
+    )
+    def _sample_chain(
+        self,
+        machine,
+        parameters,
+        state,
+        chain_length,
+        return_log_probabilities: bool = False,
+    ):
+        # precompute the parts of the model that only depend on the parameters
+        # once, instead of at every step of the chain
+        parameters = prepare_variables(machine, parameters, state.σ)
+
+        state, (samples, log_probabilities) = jax.lax.scan(
+            lambda state, _: self._sample_next(machine, parameters, state),
+            state,
+            xs=None,
+            length=chain_length,
+        )
+        # make it (n_chains, n_samples_per_chain) as expected by netket.stats.statistics
+        samples = jnp.swapaxes(samples, 0, 1)
+        log_probabilities = jnp.swapaxes(log_probabilities, 0, 1)
+
+        if return_log_probabilities:
+            return (samples, log_probabilities), state
+        else:
+            return samples, state
+
+    def __repr__(self):
+        return (
+            f"{type(self).__name__}("
+            + f"\n  hilbert = {self.hilbert},"
+            + f"\n  step_size = {self.step_size},"
+            + (
+                f"\n  nuts = True, max_tree_depth = {self.max_tree_depth},"
+                if self.nuts
+                else f"\n  n_leapfrog = {self.n_leapfrog},"
+            )
+            + f"\n  n_adapt = {self.n_adapt},"
+            + f"\n  n_chains = {self.n_chains},"
+            + f"\n  sweep_size = {self.sweep_size},"
+            + f"\n  reset_chains = {self.reset_chains},"
+            + f"\n  machine_power = {self.machine_pow},"
+            + f"\n  dtype = {self.dtype}"
+            + ")"
+        )
+
+    def __str__(self):
+        return (
+            f"{type(self).__name__}("
+            + f"step_size = {self.step_size}, "
+            + (
+                f"nuts = True, max_tree_depth = {self.max_tree_depth}, "
+                if self.nuts
+                else f"n_leapfrog = {self.n_leapfrog}, "
+            )
+            + f"n_chains = {self.n_chains}, "
+            + f"sweep_size = {self.sweep_size}, "
+            + f"machine_power = {self.machine_pow}, "
+            + f"dtype = {self.dtype})"
+        )
+
+
+def _log_prob_and_grad(apply_fun, machine_pow, parameters, x):
+    """Log probability and its gradient for a single sample x"""
+
+    def _log_prob(x):
+        return machine_pow * apply_fun(parameters, x).real.ravel()[0]
+
+    log_prob, grad = nkjax.value_and_grad(_log_prob)(x)
+    return log_prob, grad.real.astype(x.dtype)
+
+
+def _leapfrog(value_and_grad, pbc, modulus, x, p, grad, step_size):
+    """Single leapfrog step, wrapping the positions along periodic dimensions."""
+    p = p + 0.5 * step_size * grad
+    x = x + step_size * p
+    x = jnp.where(pbc, x % modulus, x)
+    log_prob, grad = value_and_grad(x)
+    p = p + 0.5 * step_size * grad
+    return x, p, log_prob.astype(x.dtype), grad
+
+
+def _hmc_kernel(
+    value_and_grad, pbc, modulus, key, x, log_prob, grad, step_size, *, n_leapfrog
+):
+    """Single HMC trajectory of fixed length for one chain."""
+    key_p, key_u = jax.random.split(key)
+    p = jax.random.normal(key_p, shape=x.shape, dtype=x.dtype)
+
+    def _body(i, carry):
+        x, p, _, grad = carry
+        return _leapfrog(value_and_grad, pbc, modulus, x, p, grad, step_size)
+
+    carry = (x, p, log_prob.astype(x.dtype), grad)
+    xp, pp, log_prob_p, grad_p = jax.lax.fori_loop(0, n_leapfrog, _body, carry)
+
+    log_accept = (log_prob_p - 0.5 * jnp.sum(pp**2)) - (
+        log_prob - 0.5 * jnp.sum(p**2)
+    )
+    log_accept = jnp.where(jnp.isnan(log_accept), -jnp.inf, log_accept)
+    accept_prob = jnp.minimum(1.0, jnp.exp(log_accept))
+    accept = jax.random.uniform(key_u, dtype=accept_prob.dtype) < accept_prob
+
+    return (
+        jnp.where(accept, xp, x),
+        jnp.where(accept, log_prob_p, log_prob).astype(log_prob.dtype),
+        jnp.where(accept, grad_p, grad),
+        accept_prob,
+        accept,
+    )
+
+
+class _Tree(NamedTuple):
+    """A (sub)trajectory of the No-U-Turn sampler."""
+
+    x_left: jax.Array
+    p_left: jax.Array
+    grad_left: jax.Array
+    x_right: jax.Array
+    p_right: jax.Array
+    grad_right: jax.Array
+    x_proposal: jax.Array
+    log_prob_proposal: jax.Array
+    grad_proposal: jax.Array
+    depth: jax.Array
+    log_weight: jax.Array
+    p_sum: jax.Array
+    turning: jax.Array
+    diverging: jax.Array
+    sum_accept_probs: jax.Array
+    n_proposals: jax.Array
+
+
+def _is_turning(p_left, p_right, p_sum):
+    # generalised no-U-turn criterion, with an identity mass matrix
+    rho = p_sum - (p_left + p_right) / 2
+    return (jnp.dot(p_left, rho) <= 0) | (jnp.dot(p_right, rho) <= 0)
+
+
+def _leaf_to_checkpoints(n):
+    """
+    Range of the checkpoints to compare with the n-th leaf of a subtree, in the
+    iterative formulation of NUTS.
+    """
+    # number of nonzero bits, except the last one
+    idx_max = jax.lax.population_count(n >> 1)
+    # number of trailing nonzero bits
+    n_subtrees = jax.lax.population_count(n ^ (n + 1)) - 1
+    return idx_max - n_subtrees + 1, idx_max
+
+
+def _is_iterative_turning(p, p_sum, p_ckpts, p_sum_ckpts, idx_min, idx_max):
+    def _cond(carry):
+        i, turning = carry
+        return (i >= idx_min) & ~turning
+
+    def _body(carry):
+        i, _ = carry
+        subtree_p_sum = p_sum - p_sum_ckpts[i] + p_ckpts[i]
+        return i - 1, _is_turning(p_ckpts[i], p, subtree_p_sum)
+
+    _, turning = jax.lax.while_loop(_cond, _body, (idx_max, False))
+    return turning
+
+
+def _combine_trees(tree, new_tree, going_right, key, biased):
+    """Merges a new subtree at one end of a tree, sampling the new proposal."""
+
+    def _pick(right, left):
+        return jax.tree_util.tree_map(
+            lambda a, b: jnp.where(going_right, a, b), right, left
+        )
+
+    x_left, p_left, grad_left = _pick(
+        (tree.x_left, tree.p_left, tree.grad_left),
+        (new_tree.x_left, new_tree.p_left, new_tree.grad_left),
+    )
+    x_right, p_right, grad_right = _pick(
+        (new_tree.x_right, new_tree.p_right, new_tree.grad_right),
+        (tree.x_right, tree.p_right, tree.grad_right),
+    )
+
+    log_weight = jnp.logaddexp(tree.log_weight, new_tree.log_weight)
+    if biased:
+        # favours the new subtree, to move away from the initial point
+        transition_prob = jnp.minimum(
+            1.0, jnp.exp(new_tree.log_weight - tree.log_weight)
+        )
+        transition_prob = jnp.where(
+            new_tree.turning | new_tree.diverging, 0.0, transition_prob
+        )
+    else:
+        transition_prob = jnp.exp(new_tree.log_weight - log_weight)
+    transition = jax.random.bernoulli(key, transition_prob)
+
+    x_proposal, log_prob_proposal, grad_proposal = jax.tree_util.tree_map(
+        lambda a, b: jnp.where(transition, a, b),
+        (new_tree.x_proposal, new_tree.log_prob_proposal, new_tree.grad_proposal),
+        (tree.x_proposal, tree.log_prob_proposal, tree.grad_proposal),
+    )
+
+    p_sum = tree.p_sum + new_tree.p_sum
+    turning = new_tree.turning
+    if biased:
+        turning = turning | _is_turning(p_left, p_right, p_sum)
+
+    return _Tree(
+        x_left,
+        p_left,
+        grad_left,
+        x_right,
+        p_right,
+        grad_right,
+        x_proposal,
+        log_prob_proposal,
+        grad_proposal,
+        tree.depth + 1,
+        log_weight,
+        p_sum,
+        turning,
+        new_tree.diverging,
+        tree.sum_accept_probs + new_tree.sum_accept_probs,
+        tree.n_proposals + new_tree.n_proposals,
+    )
+
+
+def _nuts_kernel(
+    value_and_grad,
+    pbc,
+    modulus,
+    key,
+    x,
+    log_prob,
+    grad,
+    step_size,
+    *,
+    max_tree_depth,
+):
+    """Single multinomial NUTS trajectory for one chain."""
+    key_p, key = jax.random.split(key)
+    p = jax.random.normal(key_p, shape=x.shape, dtype=x.dtype)
+    log_prob_dtype = log_prob.dtype
+    log_prob = log_prob.astype(x.dtype)
+    energy = -log_prob + 0.5 * jnp.sum(p**2)
+
+    def _leaf(x, p, grad, going_right):
+        x, p, log_prob, grad = _leapfrog(
+            value_and_grad,
+            pbc,
+            modulus,
+            x,
+            p,
+            grad,
+            jnp.where(going_right, step_size, -step_size),
+        )
+        delta_energy = -log_prob + 0.5 * jnp.sum(p**2) - energy
+        delta_energy = jnp.where(jnp.isnan(delta_energy), jnp.inf, delta_energy)
+        return _Tree(
+            x,
+            p,
+            grad,
+            x,
+            p,
+            grad,
+            x,
+            log_prob,
+            grad,
+            jnp.zeros((), dtype=int),
+            -delta_energy,
+            p,
+            jnp.zeros((), dtype=bool),
+            delta_energy > _MAX_DELTA_ENERGY,
+            jnp.minimum(1.0, jnp.exp(-delta_energy)),
+            jnp.ones((), dtype=int),
+        )
+
+    def _build_subtree(tree, going_right, key):
+        """Builds the 2^depth leaves beyond one end of the tree, iteratively."""
+        max_n_proposals = 2**tree.depth
+        p_ckpts = jnp.zeros((max_tree_depth,) + x.shape, dtype=x.dtype)
+        p_sum_ckpts = jnp.zeros_like(p_ckpts)
+
+        def _cond(carry):
+            subtree, turning, _, _, _ = carry
+            return (
+                (subtree.n_proposals < max_n_proposals)
+                & ~turning
+                & ~subtree.diverging
+            )
+
+        def _body(carry):
+            subtree, _, p_ckpts, p_sum_ckpts, key = carry
+            key, key_transition = jax.random.split(key)
+
+            x_edge, p_edge, grad_edge = jax.tree_util.tree_map(
+                lambda a, b: jnp.where(going_right, a, b),
+                (subtree.x_right, subtree.p_right, subtree.grad_right),
+                (subtree.x_left, subtree.p_left, subtree.grad_left),
+            )
+            leaf = _leaf(x_edge, p_edge, grad_edge, going_right)
+            new_subtree = jax.lax.cond(
+                subtree.n_proposals == 0,
+                lambda: leaf,
+                lambda: _combine_trees(
+                    subtree, leaf, going_right, key_transition, biased=False
+                ),
+            )
+
+            # check the no-U-turn criterion on all the sub-subtrees ending here
+            leaf_idx = subtree.n_proposals
+            idx_min, idx_max = _leaf_to_checkpoints(leaf_idx)
+            is_even = leaf_idx % 2 == 0
+            p_ckpts = jnp.where(
+                is_even, p_ckpts.at[idx_max].set(leaf.p_right), p_ckpts
+            )
+            p_sum_ckpts = jnp.where(
+                is_even, p_sum_ckpts.at[idx_max].set(new_subtree.p_sum), p_sum_ckpts
+            )
+            turning = jnp.where(
+                is_even,
+                False,
+                _is_iterative_turning(
+                    leaf.p_right,
+                    new_subtree.p_sum,
+                    p_ckpts,
+                    p_sum_ckpts,
+                    idx_min,
+                    idx_max,
+                ),
+            )
+            return new_subtree, turning, p_ckpts, p_sum_ckpts, key
+
+        subtree = tree._replace(n_proposals=jnp.zeros_like(tree.n_proposals))
+        subtree, turning, _, _, _ = jax.lax.while_loop(
+            _cond,
+            _body,
+            (subtree, jnp.zeros((), dtype=bool), p_ckpts, p_sum_ckpts, key),
+        )
+        return subtree._replace(depth=tree.depth, turning=turning)
+
+    def _cond(carry):
+        tree, _ = carry
+        return (tree.depth < max_tree_depth) & ~tree.turning & ~tree.diverging
+
+    def _body(carry):
+        tree, key = carry
+        key, key_direction, key_subtree, key_transition = jax.random.split(key, 4)
+        going_right = jax.random.bernoulli(key_direction)
+        subtree = _build_subtree(tree, going_right, key_subtree)
+        tree = _combine_trees(tree, subtree, going_right, key_transition, biased=True)
+        return tree, key
+
+    tree = _Tree(
+        x,
+        p,
+        grad,
+        x,
+        p,
+        grad,
+        x,
+        log_prob,
+        grad,
+        jnp.zeros((), dtype=int),
+        jnp.zeros((), dtype=x.dtype),
+        p,
+        jnp.zeros((), dtype=bool),
+        jnp.zeros((), dtype=bool),
+        jnp.zeros((), dtype=x.dtype),
+        jnp.zeros((), dtype=int),
+    )
+    tree, _ = jax.lax.while_loop(_cond, _body, (tree, key))
+
+    accept_prob = tree.sum_accept_probs / jnp.maximum(tree.n_proposals, 1)
+    moved = jnp.any(tree.x_proposal != x)
+    return (
+        tree.x_proposal,
+        tree.log_prob_proposal.astype(log_prob_dtype),
+        tree.grad_proposal,
+        accept_prob,
+        moved,
+    )
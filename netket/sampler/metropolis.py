@@ -36,6 +36,7 @@ from netket.jax.sharding import (
     shard_along_axis,
 )
 from netket.jax import apply_chunked, dtype_real
+from netket.nn.utils import prepare_variables
 
 from .base import Sampler, SamplerState
 from .rules import MetropolisRule
@@ -238,6 +239,9 @@ class MetropolisSampler(Sampler):
     """Chunk size for evaluating wave functions."""
     reset_chains: bool = struct.field(pytree_node=False, default=False)
     """If True, resets the chain state when `reset` is called on every new sampling."""
+    n_tries: int = struct.field(pytree_node=False, default=1)
+    """Number of proposals generated at every step of the multiple-try Metropolis
+    algorithm (1 for standard Metropolis-Hastings)."""
 
     def __init__(
         self,
@@ -250,6 +254,7 @@ class MetropolisSampler(Sampler):
         n_chains: int | None = None,
         n_chains_per_rank: int | None = None,
         chunk_size: int | None = None,
+        n_tries: int = 1,
         machine_pow: int = 2,
         dtype: DType = None,
     ):
@@ -275,6 +280,13 @@ class MetropolisSampler(Sampler):
                 in the Hilbert space.)
             reset_chains: If True, resets the chain state when `reset` is called on every
                 new sampling (default = False).
+            n_tries: Number of proposals generated at every step (default = 1). If larger
+                than 1, the multiple-try Metropolis algorithm is used: `n_tries` proposals
+                per chain are evaluated in a single batch, one of them is selected
+                according to its probability and accepted with the generalized
+                Metropolis-Hastings rule. This requires `2 n_tries - 1` evaluations of
+                the model per chain at every step, but increases the acceptance rate
+                and the size of the batches evaluated at once.
             machine_pow: The power to which the machine should be exponentiated to generate
                 the pdf (default = 2).
             dtype: The dtype of the states sampled (default = np.float64).
@@ -290,6 +302,9 @@ class MetropolisSampler(Sampler):
         if not isinstance(reset_chains, bool):
             raise TypeError("reset_chains must be a boolean.")
 
+        if not isinstance(n_tries, int) or n_tries < 1:
+            raise ValueError(f"n_tries ({n_tries}) must be a positive integer.")
+
         if n_sweeps is not None:
             warn_deprecation(
                 "Specifying `n_sweeps` when constructing sampler is deprecated. Please use `sweep_size` instead."
@@ -330,6 +345,7 @@ class MetropolisSampler(Sampler):
         self.reset_chains = reset_chains
         self.rule = rule
         self.sweep_size = sweep_size
+        self.n_tries = n_tries
 
     @property
     def n_sweeps(self):
@@ -419,7 +435,9 @@ class MetropolisSampler(Sampler):
         )
         log_prob_σ = self.machine_pow * apply_machine(parameters, σ).real
 
-        rule_state = self.rule.reset(self, machine, parameters, state)
+        rule_state = self.rule.reset(
+            self, machine, parameters, state.replace(σ=σ, log_prob=log_prob_σ)
+        )
 
         return state.replace(
             σ=σ,
@@ -445,8 +463,15 @@ class MetropolisSampler(Sampler):
             # 1 to propagate for next iteration, 1 for uniform rng and n_chains for transition kernel
             s["key"], key1, key2 = jax.random.split(s["key"], 3)
 
-            σp, log_prob_correction = self.rule.transition(
-                self, machine, parameters, state, key1, s["σ"]
+            # the rule sees the current configurations, log-probabilities and
+            # rule state of the chains
+            state_i = state.replace(
+                σ=s["σ"], log_prob=s["log_prob"], rule_state=s["rule_state"]
+            )
+            σp, log_prob_correction, proposal_log_prob, proposal_rule_state = (
+                self.rule.transition_and_log_prob(
+                    self, machine, parameters, state_i, key1, s["σ"]
+                )
             )
             _assert_good_sample_shape(
                 σp,
@@ -454,7 +479,11 @@ class MetropolisSampler(Sampler):
                 self.dtype,
                 f"{self.rule}.transition",
             )
-            proposal_log_prob = self.machine_pow * apply_machine(parameters, σp).real
+            # the rule might have already evaluated the model on the proposals
+            if proposal_log_prob is None:
+                proposal_log_prob = (
+                    self.machine_pow * apply_machine(parameters, σp).real
+                )
             _assert_good_log_prob_shape(proposal_log_prob, self.n_batches, machine)
 
             uniform = jax.random.uniform(key2, shape=(self.n_batches,))
@@ -472,12 +501,65 @@ class MetropolisSampler(Sampler):
             s["log_prob"] = jax.numpy.where(
                 do_accept.reshape(-1), proposal_log_prob, s["log_prob"]
             )
+            if proposal_rule_state is not None:
+                s["rule_state"] = self.rule.accept_rule_state(
+                    s["rule_state"], proposal_rule_state, do_accept
+                )
 
             return s
 
+        def multiple_try_loop_body(i, s):
+            s["key"], key_fw, key_select, key_bw, key_acc = jax.random.split(
+                s["key"], 5
+            )
+            state_i = state.replace(
+                σ=s["σ"], log_prob=s["log_prob"], rule_state=s["rule_state"]
+            )
+
+            # generate n_tries proposals from every chain, and weight them with
+            # w(y, x) = P(y) sqrt(T(y→x)/T(x→y)), which makes the multiple-try
+            # acceptance rule valid for non-symmetric proposals as well.
+            σp, log_prob_p, log_corr_p = self._multiple_tries(
+                machine, parameters, state_i, key_fw, s["σ"], self.n_tries
+            )
+            log_w_p = log_prob_p + 0.5 * log_corr_p
+            selected = jax.random.categorical(key_select, log_w_p, axis=0)
+            σ_new = jnp.take_along_axis(σp, selected[None, :, None], axis=0)[0]
+            log_prob_new = jnp.take_along_axis(log_prob_p, selected[None], axis=0)[0]
+            log_corr_new = jnp.take_along_axis(log_corr_p, selected[None], axis=0)[0]
+
+            # generate the reference set from the selected proposal, completed
+            # by the current configuration
+            state_new = state_i.replace(σ=σ_new, log_prob=log_prob_new)
+            _, log_prob_r, log_corr_r = self._multiple_tries(
+                machine, parameters, state_new, key_bw, σ_new, self.n_tries - 1
+            )
+            log_w_r = jnp.concatenate(
+                [
+                    log_prob_r + 0.5 * log_corr_r,
+                    (s["log_prob"] - 0.5 * log_corr_new)[None],
+                ],
+                axis=0,
+            )
+
+            log_acceptance = jax.scipy.special.logsumexp(
+                log_w_p, axis=0
+            ) - jax.scipy.special.logsumexp(log_w_r, axis=0)
+            uniform = jax.random.uniform(key_acc, shape=(self.n_batches,))
+            do_accept = uniform < jnp.exp(log_acceptance)
+
+            s["σ"] = jnp.where(do_accept.reshape(-1, 1), σ_new, s["σ"])
+            s["accepted"] += do_accept
+            s["log_prob"] = jnp.where(do_accept, log_prob_new, s["log_prob"])
+            return s
+
+        if self.n_tries > 1:
+            loop_body = multiple_try_loop_body
+
         s = {
             "key": state.rng,
             "σ": state.σ,
+            "rule_state": state.rule_state,
             # Log prob is already computed in reset, so don't recompute it.
             # "log_prob": self.machine_pow * apply_machine(parameters, state.σ).real,
             "log_prob": state.log_prob,
@@ -490,12 +572,38 @@ class MetropolisSampler(Sampler):
             rng=s["key"],
             σ=s["σ"],
             log_prob=s["log_prob"],
+            rule_state=s["rule_state"],
             n_accepted_proc=s["accepted"],
             n_steps_proc=state.n_steps_proc + self.sweep_size * self.n_batches,
         )
 
         return new_state, (new_state.σ, new_state.log_prob)
 
+    def _multiple_tries(self, machine, parameters, state, key, σ, n_tries):
+        """
+        Generates `n_tries` independent proposals from every configuration in `σ`
+        with the transition rule, and evaluates the model on all of them at once.
+
+        Returns:
+            The proposals, their log-probabilities and the log-corrections of the
+            rule, with shapes `(n_tries, n_batches, N)` and `(n_tries, n_batches)`.
+        """
+        σp, log_corr = jax.vmap(
+            lambda key: self.rule.transition(self, machine, parameters, state, key, σ)
+        )(jax.random.split(key, n_tries))
+        if log_corr is None:
+            log_corr = jnp.zeros(σp.shape[:2])
+
+        # evaluate the proposals of every chain contiguously, so that the leading
+        # axis is still sharded over the chains
+        apply_machine = apply_chunked(
+            machine.apply, in_axes=(None, 0), chunk_size=self.chunk_size
+        )
+        σp_flat = jnp.swapaxes(σp, 0, 1).reshape(-1, σp.shape[-1])
+        log_prob = self.machine_pow * apply_machine(parameters, σp_flat).real
+        log_prob = log_prob.reshape(self.n_batches, n_tries).T
+        return σp, log_prob, log_corr
+
     @partial(
         jax.jit, static_argnames=("machine", "chain_length", "return_log_probabilities")
     )
@@ -522,6 +630,10 @@ class MetropolisSampler(Sampler):
             σ: The next batch of samples.
             state: The new state of the sampler
         """
+        # precompute the parts of the model that only depend on the parameters
+        # once, instead of at every step of the chain
+        parameters = prepare_variables(machine, parameters, state.σ)
+
         state, (samples, log_probabilities) = jax.lax.scan(
             lambda state, _: self._sample_next(machine, parameters, state),
             state,
@@ -545,6 +657,7 @@ class MetropolisSampler(Sampler):
             + f"\n  n_chains = {self.n_chains},"
             + f"\n  sweep_size = {self.sweep_size},"
             + f"\n  reset_chains = {self.reset_chains},"
+            + (f"\n  n_tries = {self.n_tries}," if self.n_tries > 1 else "")
             + f"\n  machine_power = {self.machine_pow},"
             + f"\n  dtype = {self.dtype}"
             + ")"
@@ -125,6 +125,8 @@ class MetropolisSamplerNumpy(MetropolisSampler):
     @wraps(MetropolisSampler.__init__)
     def __init__(self, hilbert: AbstractHilbert, rule: MetropolisRule, **kwargs):
         super().__init__(hilbert, rule, **kwargs)
+        if self.n_tries != 1:
+            raise ValueError("MetropolisSamplerNumpy does not support n_tries > 1.")
         # standard samplers use jax arrays, this must be a numpy array
         self.machine_pow = np.array(self.machine_pow)
 
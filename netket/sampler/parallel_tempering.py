@@ -23,7 +23,7 @@ from jax import numpy as jnp
 from netket import config
 from netket.utils.types import PyTree, PRNGKeyT, Array
 from netket.utils import struct, mpi
-from netket.jax import dtype_real
+from netket.jax import apply_chunked, dtype_real
 from netket.jax.sharding import shard_along_axis, sharding_decorator
 
 from netket.sampler import MetropolisSamplerState, MetropolisSampler
@@ -35,6 +35,11 @@ from netket.sampler.rules import LocalRule, ExchangeRule, HamiltonianRule
 # Python port
 # https://github.com/netket/netket/blob/87d469aa8c23f71c4838cf09d7ed7b87ff2ea01f/netket/legacy/sampler/numpy/metropolis_hastings_pt.py
 
+# Rate and decay time of the adaptation of the temperature ladder, following
+# Vousden, Farr and Mandel, MNRAS 455, 1919 (2016).
+_LADDER_ADAPTATION_RATE = 0.1
+_LADDER_ADAPTATION_T0 = 100.0
+
 
 class ParallelTemperingSamplerState(MetropolisSamplerState):
     """
@@ -51,11 +56,20 @@ class ParallelTemperingSamplerState(MetropolisSamplerState):
     beta_0_index: jnp.ndarray = None
     r"""Index of the position of the chain with :math:`\\beta=1`."""
     beta_position: jnp.ndarray = None
-    r"""Averaged position of :math:`\\beta=1`."""
+    r"""Averaged position in the ladder of the first replica, which starts at
+    :math:`\\beta=1`."""
     beta_diffusion: jnp.ndarray = None
-    """Average variance of the position of :math:`\\beta = 1`."""
+    """Average variance of the position in the ladder of the first replica."""
     exchange_steps: int = 0
     """Number of exchanges between the different temperatures."""
+    n_proposed_exchanges: jnp.ndarray = None
+    """Number of exchanges proposed between every pair of neighbouring temperatures
+    of every chain since the last reset."""
+    n_accepted_exchanges: jnp.ndarray = None
+    """Number of exchanges accepted between every pair of neighbouring temperatures
+    of every chain since the last reset."""
+    ladder_adapt_steps: jnp.ndarray = None
+    """Number of updates of the temperature ladder since the initialization."""
 
     def __init__(
         self,
@@ -73,6 +87,9 @@ class ParallelTemperingSamplerState(MetropolisSamplerState):
         self.beta_position = jnp.zeros((n_chains,), dtype=float)
         self.beta_diffusion = jnp.zeros((n_chains,), dtype=float)
         self.exchange_steps = jnp.zeros((), dtype=int)
+        self.n_proposed_exchanges = jnp.zeros((n_chains, n_replicas - 1), dtype=int)
+        self.n_accepted_exchanges = jnp.zeros((n_chains, n_replicas - 1), dtype=int)
+        self.ladder_adapt_steps = jnp.zeros((), dtype=int)
         super().__init__(σ, rng=rng, rule_state=rule_state, log_prob=log_prob)
         self.n_accepted_proc = jnp.zeros(
             n_chains, dtype=int
@@ -91,10 +108,25 @@ class ParallelTemperingSamplerState(MetropolisSamplerState):
         )
         return text
 
+    @property
+    def exchange_acceptance(self) -> jnp.ndarray:
+        r"""
+        The fraction of accepted exchanges between every pair of neighbouring
+        temperatures across all chains and MPI processes, from the one between
+        :math:`\\beta=1` and the next lower inverse temperature to the one
+        between the two lowest.
+
+        The rate is computed since the last reset of the sampler.
+        """
+        n_accepted, _ = mpi.mpi_sum_jax(self.n_accepted_exchanges.sum(axis=0))
+        n_proposed, _ = mpi.mpi_sum_jax(self.n_proposed_exchanges.sum(axis=0))
+        return n_accepted / n_proposed
+
     @property
     def normalized_diffusion(self):
         r"""
-        Average variance of the position of :math:`\\beta = 1`.
+        Average variance of the position in the ladder of the first replica,
+        which starts at :math:`\\beta = 1`.
         In the ideal case, this quantity should be of order ~[0.2, 1.0]
         """
         diffusion = jnp.sqrt(
@@ -107,7 +139,8 @@ class ParallelTemperingSamplerState(MetropolisSamplerState):
     @property
     def normalized_position(self):
         r"""
-        Average position of :math:`\\beta = 1`, normalized and centered around 0.
+        Average position in the ladder of the first replica, which starts at
+        :math:`\\beta = 1`, normalized and centered around 0.
         """
         position = self.beta_position / float(self.beta.shape[-1] - 1) - 0.5
         out, _ = mpi.mpi_mean_jax(position.mean())
@@ -141,12 +174,18 @@ class ParallelTemperingSampler(MetropolisSampler):
     """
     An internal for the user-specified distribution of betas.
     """
+    n_adapt: int = struct.field(pytree_node=False, default=0)
+    """
+    Number of samples after every reset during which the temperature ladder is
+    adapted.
+    """
 
     def __init__(
         self,
         *args,
         n_replicas: int | None = None,
         betas: str | jax.Array | None = "linear",
+        n_adapt: int = 0,
         **kwargs,
     ):
         r"""
@@ -164,6 +203,20 @@ class ParallelTemperingSampler(MetropolisSampler):
         :math:`β` is the temperature of the Markov Chain and :math:`L(s,s^\prime)` is a suitable correcting factor
         computed by the transition kernel.
 
+        After every move, the inverse temperatures of neighbouring replicas in the
+        ladder are exchanged with the usual Metropolis acceptance, alternating
+        between the pairs starting from an even and an odd position of the ladder.
+
+        The inverse temperatures can be adapted during the first `n_adapt` samples
+        after every reset of the sampler, keeping the largest and smallest β fixed.
+        The spacing of the ladder is updated so that the acceptance of the
+        exchanges between neighbouring temperatures becomes the same along the
+        whole ladder [Vousden, Farr and Mandel, MNRAS 455, 1919 (2016)], with a rate
+        that decays over the whole run. This reduces the number of replicas
+        needed to reach a given round-trip rate of β=1. Samples drawn
+        while adapting do not respect detailed balance, so `n_adapt` should not
+        exceed the `n_discard_per_chain` of the variational state.
+
 
         Args:
             hilbert: The hilbert space to sample
@@ -177,6 +230,8 @@ class ParallelTemperingSampler(MetropolisSampler):
                     For the explicit list of values, the length must be even and the value β=1 must
                     obligatory be an element of betas, all other temperatures must be in (0,1].
                     (default : "lin", i.e. linear distribution between (0,1]).
+            n_adapt: The number of samples after every reset during which the
+                    temperature ladder is adapted (default : 0, no adaptation).
             n_chains: The number of Markov Chain to be run in parallel on a single process.
             sweep_size: The number of exchanges that compose a single sweep.
                     If None, sweep_size is equal to the number of degrees of freedom being sampled
@@ -239,12 +294,19 @@ class ParallelTemperingSampler(MetropolisSampler):
                 "n_replicas (or the length of `betas`) must be an even integer > 0."
             )
 
+        if n_adapt < 0:
+            raise ValueError(f"n_adapt ({n_adapt}) must be non-negative.")
+
         self.n_replicas = n_replicas
+        self.n_adapt = n_adapt
         self._beta_sorted = betas
         self._beta_distribution = beta_distribution
 
         super().__init__(*args, **kwargs)
 
+        if self.n_tries != 1:
+            raise ValueError("ParallelTemperingSampler does not support n_tries > 1.")
+
     @property
     def sorted_betas(self):
         """
@@ -276,6 +338,7 @@ class ParallelTemperingSampler(MetropolisSampler):
             + f"\n  n_chains = {self.n_chains},"
             + f"\n  n_replicas = {self.n_replicas},"
             + f"\n  beta_distribution = {self._beta_distribution},"
+            + f"\n  n_adapt = {self.n_adapt},"
             + f"\n  sweep_size = {self.sweep_size},"
             + f"\n  reset_chains = {self.reset_chains},"
             + f"\n  machine_power = {self.machine_pow},"
@@ -333,6 +396,8 @@ class ParallelTemperingSampler(MetropolisSampler):
             beta_position=jnp.zeros_like(state.beta_position),
             beta_diffusion=jnp.zeros_like(state.beta_diffusion),
             exchange_steps=jnp.zeros_like(state.exchange_steps),
+            n_proposed_exchanges=jnp.zeros_like(state.n_proposed_exchanges),
+            n_accepted_exchanges=jnp.zeros_like(state.n_accepted_exchanges),
             # beta=beta,
             # beta_0_index=jnp.zeros((self.n_chains,), dtype=jnp.int64),
         )
@@ -340,6 +405,10 @@ class ParallelTemperingSampler(MetropolisSampler):
     def _sample_next(
         self, machine, parameters: PyTree, state: ParallelTemperingSamplerState
     ):
+        apply_machine = apply_chunked(
+            machine.apply, in_axes=(None, 0), chunk_size=self.chunk_size
+        )
+
         def loop_body(i, s):
             # 1 to propagate for next iteration, 1 for uniform rng and n_chains for transition kernel
             s["key"], key1, key2, key3, key4 = jax.random.split(s["key"], 5)
@@ -361,7 +430,7 @@ class ParallelTemperingSampler(MetropolisSampler):
             σp, log_prob_correction = self.rule.transition(
                 self, machine, parameters, state, key1, s["σ"]
             )
-            proposal_log_prob = self.machine_pow * machine.apply(parameters, σp).real
+            proposal_log_prob = self.machine_pow * apply_machine(parameters, σp).real
 
             uniform = jax.random.uniform(key2, shape=(self.n_batches,))
             if log_prob_correction is not None:
@@ -384,31 +453,38 @@ class ParallelTemperingSampler(MetropolisSampler):
                 do_accept.reshape(-1), proposal_log_prob, s["log_prob"]
             )
 
-            ## exchange betas
+            ## exchange betas between neighbouring temperatures
+            n_rows = self.n_batches // self.n_replicas
 
             # randomly decide if every set of replicas should be swapped in even or odd order
             swap_order = jax.random.randint(
                 key3,
                 minval=0,
                 maxval=2,
-                shape=(self.n_batches // self.n_replicas,),
+                shape=(n_rows,),
             )  # 0 or 1
 
-            # indices of even swapped elements (per-row)
-            idxs = jnp.arange(0, self.n_replicas, 2).reshape(
+            # ranks of the temperatures exchanged with the next lower one (per-row)
+            ranks = jnp.arange(0, self.n_replicas, 2).reshape(
                 (1, -1)
             ) + swap_order.reshape((-1, 1))
-            # indices off odd swapped elements (per-row)
-            inn = (idxs + 1) % self.n_replicas
+            # in odd order, the lowest temperature has no neighbour to exchange with
+            # and it is paired with β=1 only to keep the indices unique
+            valid = ranks < self.n_replicas - 1
+
+            # slots holding the temperatures of every pair (per-row)
+            order = jnp.argsort(-beta, axis=-1)
+            idxs = jnp.take_along_axis(order, ranks, axis=-1)
+            inn = jnp.take_along_axis(order, (ranks + 1) % self.n_replicas, axis=-1)
 
             # for every rows of the input, swap elements at idxs with elements at inn
             @partial(jax.vmap, in_axes=(0, 0, 0), out_axes=0)
             def swap_rows(beta_row, idxs, inn):
                 proposed_beta = beta_row.at[idxs].set(
-                    beta_row[inn], unique_indices=True, indices_are_sorted=True
+                    beta_row[inn], unique_indices=True
                 )
                 proposed_beta = proposed_beta.at[inn].set(
-                    beta_row[idxs], unique_indices=True, indices_are_sorted=False
+                    beta_row[idxs], unique_indices=True
                 )
                 return proposed_beta
 
@@ -424,7 +500,7 @@ class ParallelTemperingSampler(MetropolisSampler):
 
             # compute the probability of the swaps
             log_prob = (proposed_beta - s["beta"]) * s["log_prob"].reshape(
-                (self.n_batches // self.n_replicas, self.n_replicas)
+                (n_rows, self.n_replicas)
             )
 
             prob_rescaled = jnp.exp(compute_proposed_prob(log_prob, idxs, inn))
@@ -432,43 +508,26 @@ class ParallelTemperingSampler(MetropolisSampler):
             uniform = jax.random.uniform(
                 key4,
                 shape=(
-                    self.n_batches // self.n_replicas,
+                    n_rows,
                     self.n_replicas // 2,
                 ),
             )
 
             # decide where to swap
-            do_swap = uniform < prob_rescaled
+            do_swap_pairs = valid & (uniform < prob_rescaled)
 
-            do_swap = jnp.dstack((do_swap, do_swap)).reshape(
-                (-1, self.n_replicas)
-            )  # concat along last dimension
+            # flag the two slots of every accepted pair
+            @partial(jax.vmap, in_axes=(0, 0, 0), out_axes=0)
+            def scatter_pairs(do_swap, idxs, inn):
+                mask = jnp.zeros((self.n_replicas,), dtype=bool)
+                return mask.at[idxs].set(do_swap).at[inn].set(do_swap)
 
-            # roll if swap_order is odd
-            do_swap = jax.vmap(jnp.where, in_axes=(0, 0, 0), out_axes=0)(
-                swap_order == 0, do_swap, jnp.roll(do_swap, 1, axis=-1)
-            )
+            do_swap = scatter_pairs(do_swap_pairs, idxs, inn)
 
             # Do the swap where it has to be done
             new_beta = jax.numpy.where(do_swap, proposed_beta, beta)
             s["beta"] = new_beta
-
-            swap_order = swap_order.reshape(-1)
-
-            # we use shard_map to avoid the all-gather emitted by the batched jnp.take / indexing
-            beta_0_moved = sharding_decorator(jax.vmap(jnp.take), (True, True))(
-                do_swap, s["beta_0_index"]
-            )  # flag saying if beta_0 should move
-            proposed_beta_0_index = jnp.mod(
-                s["beta_0_index"]
-                + (-2 * jnp.mod(swap_order, 2) + 1)
-                * (-2 * jnp.mod(s["beta_0_index"], 2) + 1),
-                self.n_replicas,
-            )
-
-            s["beta_0_index"] = jnp.where(
-                beta_0_moved, proposed_beta_0_index, s["beta_0_index"]
-            )
+            s["beta_0_index"] = jnp.argmax(new_beta, axis=-1)
 
             # swap acceptances
             swapped_n_accepted_per_beta = swap_rows(n_accepted_per_beta, idxs, inn)
@@ -478,12 +537,36 @@ class ParallelTemperingSampler(MetropolisSampler):
                 n_accepted_per_beta,
             )
 
+            # count the proposed and accepted exchanges of every pair of
+            # neighbouring temperatures
+            @partial(jax.vmap, in_axes=(0, 0), out_axes=0)
+            def per_gap(x, ranks):
+                return jnp.zeros((self.n_replicas,), dtype=int).at[ranks].set(x)[:-1]
+
+            s["n_proposed_exchanges"] += per_gap(valid, ranks)
+            s["n_accepted_exchanges"] += per_gap(do_swap_pairs, ranks)
+
+            # Adapt the temperature ladder during the first exchanges after a reset
+            if self.n_adapt > 0:
+                adapting = s["exchange_steps"] < self.n_adapt * self.sweep_size
+                beta, n_steps = _adapt_ladder(
+                    s["beta"],
+                    s["log_prob"].reshape(s["beta"].shape),
+                    s["ladder_adapt_steps"],
+                )
+                s["beta"] = jnp.where(adapting, beta, s["beta"])
+                s["ladder_adapt_steps"] = jnp.where(
+                    adapting, n_steps, s["ladder_adapt_steps"]
+                )
+
             # Update statistics to compute diffusion coefficient of replicas
             # Total exchange steps performed
             s["exchange_steps"] += 1
-            delta = s["beta_0_index"] - s["beta_position"]
+            # position in the ladder of the first replica, which starts at β=1
+            position = jnp.sum(s["beta"] > s["beta"][:, :1], axis=-1)
+            delta = position - s["beta_position"]
             s["beta_position"] = s["beta_position"] + delta / s["exchange_steps"]
-            delta2 = s["beta_0_index"] - s["beta_position"]
+            delta2 = position - s["beta_position"]
             s["beta_diffusion"] = s["beta_diffusion"] + delta * delta2
 
             return s
@@ -501,6 +584,9 @@ class ParallelTemperingSampler(MetropolisSampler):
             "beta_position": state.beta_position,
             "beta_diffusion": state.beta_diffusion,
             "exchange_steps": state.exchange_steps,
+            "n_proposed_exchanges": state.n_proposed_exchanges,
+            "n_accepted_exchanges": state.n_accepted_exchanges,
+            "ladder_adapt_steps": state.ladder_adapt_steps,
         }
         s = jax.lax.fori_loop(0, self.sweep_size, loop_body, s)
 
@@ -520,6 +606,9 @@ class ParallelTemperingSampler(MetropolisSampler):
             beta_position=s["beta_position"],
             beta_diffusion=s["beta_diffusion"],
             exchange_steps=s["exchange_steps"],
+            n_proposed_exchanges=s["n_proposed_exchanges"],
+            n_accepted_exchanges=s["n_accepted_exchanges"],
+            ladder_adapt_steps=s["ladder_adapt_steps"],
             n_accepted_per_beta=s["n_accepted_per_beta"],
             n_accepted_proc=n_accepted_proc,
         )
@@ -541,6 +630,51 @@ class ParallelTemperingSampler(MetropolisSampler):
         return new_state, (σ_new, log_prob_new)
 
 
+def _adapt_ladder(beta, log_prob, n_steps):
+    """
+    Updates the spacing of the inverse temperatures to equalise the acceptance
+    of the exchanges between neighbouring temperatures, keeping the largest and
+    smallest inverse temperature fixed.
+
+    Args:
+        beta: The inverse temperatures of all replicas, of shape
+            `(n_chains, n_replicas)`. Every row is a permutation of the ladder.
+        log_prob: The log probabilities of the replicas, of the same shape.
+        n_steps: The number of updates performed so far.
+
+    Returns:
+        The updated inverse temperatures and number of updates.
+    """
+    # replicas sorted by decreasing beta, and rank of every replica
+    order = jnp.argsort(-beta, axis=-1)
+    rank = jnp.argsort(order, axis=-1)
+    ladder = jnp.take_along_axis(beta, order, axis=-1)
+    log_prob_sorted = jnp.take_along_axis(log_prob, order, axis=-1)
+
+    # expected acceptance of an exchange between neighbouring temperatures
+    log_acc = (ladder[:, :-1] - ladder[:, 1:]) * (
+        log_prob_sorted[:, 1:] - log_prob_sorted[:, :-1]
+    )
+    acc = jnp.mean(jnp.exp(jnp.minimum(log_acc, 0.0)), axis=0)
+    acc, _ = mpi.mpi_mean_jax(acc)
+
+    # widen the gaps with a larger acceptance than the average and shrink the
+    # others, with a rate decaying over the run
+    n_steps = n_steps + 1
+    rate = _LADDER_ADAPTATION_RATE * _LADDER_ADAPTATION_T0
+    rate = rate / (n_steps + _LADDER_ADAPTATION_T0)
+    gaps = ladder[:, :-1] - ladder[:, 1:]
+    gaps = gaps * jnp.exp(rate * (acc - jnp.mean(acc)))
+    gaps = gaps * (ladder[:, :1] - ladder[:, -1:]) / jnp.sum(gaps, -1, keepdims=True)
+    ladder = jnp.concatenate(
+        [ladder[:, :1], ladder[:, :1] - jnp.cumsum(gaps, axis=-1)], axis=-1
+    )
+    # the endpoints are kept exactly
+    ladder = ladder.at[:, -1].set(jnp.take_along_axis(beta, order[:, -1:], -1)[:, 0])
+
+    return jnp.take_along_axis(ladder, rank, axis=-1).astype(beta.dtype), n_steps
+
+
 def ParallelTemperingLocal(hilbert, *args, **kwargs):
     r"""
     Sampler acting on one local degree of freedom.
@@ -17,6 +17,7 @@ from .base import MetropolisRule
 from .fixed import FixedRule
 from .local import LocalRule
 from .exchange import ExchangeRule
+from .cluster import ClusterFlipRule, LoopExchangeRule
 from .hamiltonian import HamiltonianRule
 from .continuous_gaussian import GaussianRule
 from .langevin import LangevinRule
@@ -16,6 +16,7 @@ from typing import Any
 import abc
 
 from flax import linen as nn
+import jax
 from jax import numpy as jnp
 
 from netket.utils.types import PyTree, PRNGKeyT
@@ -119,6 +120,82 @@ class MetropolisRule(struct.Pytree):
            log corrections to the transition probability.
         """
 
+    def transition_and_log_prob(
+        self,
+        sampler: "sampler.MetropolisSampler",  # noqa: F821
+        machine: nn.Module,
+        params: PyTree,
+        sampler_state: "sampler.SamplerState",  # noqa: F821
+        key: PRNGKeyT,
+        σ: jnp.ndarray,
+    ) -> tuple[jnp.ndarray, jnp.ndarray | None, jnp.ndarray | None, Any | None]:
+        r"""
+        Proposes new configurations like :meth:`transition`, optionally returning
+        also the log-probability of the proposed configurations and the rule state
+        to use for the chains where the proposal is accepted.
+
+        Rules that must evaluate the model at the proposed configurations anyway
+        (such as :class:`~netket.sampler.rules.LangevinRule`) can override this
+        method so that the sampler does not evaluate the model again. The
+        `sampler_state` holds the current configurations, log-probabilities and
+        rule state of the chains.
+
+        The default implementation calls :meth:`transition` and returns `None`
+        for the last two elements, in which case the sampler evaluates the
+        log-probability and keeps the rule state unchanged.
+
+        Arguments:
+            sampler: The Metropolis sampler.
+            machine: A Flax module with the forward pass of the log-pdf.
+            params: The PyTree of parameters of the model.
+            sampler_state: The current state of the sampler. Should not modify it.
+            key: A Jax PRNGKey to use to generate new random configurations.
+            σ: The current configurations stored in a 2D matrix.
+
+        Returns:
+           A tuple containing the new configurations :math:`\sigma'`, the optional
+           vector of log corrections to the transition probability, the optional
+           vector of log-probabilities of :math:`\sigma'` and the optional rule
+           state of the proposals, which is passed to :meth:`accept_rule_state`.
+        """
+        σp, log_prob_correction = self.transition(
+            sampler, machine, params, sampler_state, key, σ
+        )
+        return σp, log_prob_correction, None, None
+
+    def accept_rule_state(
+        self,
+        rule_state: Any | None,
+        proposal_rule_state: Any,
+        accepted: jnp.ndarray,
+    ) -> Any | None:
+        r"""
+        Returns the rule state of the chains after a Metropolis step, given the
+        rule state of the proposals returned by :meth:`transition_and_log_prob`.
+
+        The default implementation keeps the rule state of the proposals for the
+        chains where they were accepted. Rules with a large state can instead
+        return only the change of the state from :meth:`transition_and_log_prob`,
+        and override this method to apply it in place.
+
+        Arguments:
+            rule_state: The current rule state of the chains.
+            proposal_rule_state: The rule state of the proposals, as returned by
+                :meth:`transition_and_log_prob`.
+            accepted: A boolean vector flagging the chains where the proposal
+                was accepted.
+
+        Returns:
+           The new rule state of the chains.
+        """
+        return jax.tree_util.tree_map(
+            lambda xp, x: jnp.where(
+                accepted.reshape((-1,) + (1,) * (x.ndim - 1)), xp, x
+            ),
+            proposal_rule_state,
+            rule_state,
+        )
+
     def random_state(
         self,
         sampler: "sampler.MetropolisSampler",  # noqa: F821
@@ -0,0 +1,326 @@
+# Copyright 2025 The NetKet Authors - All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from functools import partial
+
+import numpy as np
+
+import jax
+from jax import numpy as jnp
+
+from netket.graph import AbstractGraph
+from netket.hilbert import DiscreteHilbert
+from netket.jax.sharding import sharding_decorator
+from netket.utils import struct
+
+from .base import MetropolisRule
+
+
+class ClusterFlipRule(MetropolisRule):
+    r"""
+    A Rule flipping a cluster of sites built by activating the bonds of a graph,
+    in the spirit of the Wolff and Swendsen-Wang algorithms.
+
+    This rule only works for Hilbert spaces with two local states (such as
+    spins 1/2) without constraints. The transition is made of three steps:
+
+    1. Every edge :math:`(i,j)` of the graph such that :math:`s_i = s_j` (or
+       :math:`s_i \neq s_j` if `antiferromagnetic` is True) is activated with
+       probability :math:`p` = `bond_probability`;
+    2. A site is chosen with uniform probability, and the cluster of sites
+       connected to it by activated edges is built;
+    3. The local states of all the sites of the cluster are flipped.
+
+    The probability of this proposal and of the reverse one only differ by the
+    edges on the boundary of the cluster that could have been activated, which
+    must not be. The Metropolis-Hastings correction is therefore
+
+    .. math::
+
+        \frac{T(\mathbf{s}^\prime \rightarrow \mathbf{s})}
+        {T(\mathbf{s} \rightarrow \mathbf{s}^\prime)} =
+        (1-p)^{B(\mathbf{s}^\prime) - B(\mathbf{s})},
+
+    where :math:`B(\mathbf{s})` is the number of edges on the boundary of the
+    cluster which could be activated in the configuration :math:`\mathbf{s}`.
+
+    When the wave function is close to the Boltzmann distribution of a classical
+    Ising model, a good choice for the bond probability is the one of the
+    Wolff algorithm, :math:`p = 1 - e^{-2\beta J}`. Large clusters are flipped at
+    once, which decorrelates the chains much faster than local moves close to
+    a phase transition or in ordered phases.
+    """
+
+    edges: jax.Array
+    r"""2-Dimensional tensor of shape :math:`N_\text{edges}\times 2` containing
+    the edges of the graph."""
+    bond_probability: float = struct.field(pytree_node=False)
+    """Probability with which every edge that can be activated is activated."""
+    antiferromagnetic: bool = struct.field(pytree_node=False)
+    """If True, the edges between sites in different states are activated instead
+    of the ones between sites in the same state."""
+
+    def __init__(
+        self,
+        graph: AbstractGraph,
+        *,
+        bond_probability: float = 0.5,
+        antiferromagnetic: bool = False,
+    ):
+        r"""
+        Constructs the ClusterFlip Rule.
+
+        Args:
+            graph: A graph, whose edges can be activated to build the clusters.
+            bond_probability: The probability :math:`p` with which an edge that can
+                be activated is activated, strictly between 0 and 1 (default = 0.5).
+            antiferromagnetic: If True, activate the edges between sites in
+                different states instead of the ones between sites in the same
+                state (default = False).
+        """
+        if not 0 < bond_probability < 1:
+            raise ValueError(
+                f"bond_probability ({bond_probability}) must be strictly between "
+                "0 and 1."
+            )
+
+        self.edges = jnp.asarray(_graph_edges(graph))
+        self.bond_probability = float(bond_probability)
+        self.antiferromagnetic = bool(antiferromagnetic)
+
+    def init_state(self, sampler, machine, params, key):
+        hilbert = sampler.hilbert
+        if not (
+            isinstance(hilbert, DiscreteHilbert)
+            and not hilbert.constrained
+            and all(n == 2 for n in hilbert.shape)
+        ):
+            raise ValueError(
+                "ClusterFlipRule only works for Hilbert spaces without constraints "
+                f"and with two local states on every site, but got {hilbert}."
+            )
+        return super().init_state(sampler, machine, params, key)
+
+    def transition(rule, sampler, machine, parameters, state, key, σ):
+        n_chains = σ.shape[0]
+        n_sites = σ.shape[-1]
+        # sum of the two local states, used to flip a local state into the other
+        local_states_sum = sum(sampler.hilbert.states_at_index(0))
+        log_1mp = np.log1p(-rule.bond_probability)
+
+        keys = jnp.asarray(jax.random.split(key, n_chains))
+
+        # use shard_map to avoid the all-gather coming from the batched indexing
+        @partial(sharding_decorator, sharded_args_tree=(True, True))
+        @jax.vmap
+        def _update_samples(key, σ):
+            key_bonds, key_site = jax.random.split(key)
+
+            e_i, e_j = rule.edges[:, 0], rule.edges[:, 1]
+            can_activate = _same_state(σ[e_i], σ[e_j]) != rule.antiferromagnetic
+            active = can_activate & (
+                jax.random.uniform(key_bonds, can_activate.shape)
+                < rule.bond_probability
+            )
+
+            site = jax.random.randint(key_site, (), 0, n_sites)
+            cluster = _connected_component(rule.edges, active, site, n_sites)
+
+            σp = jnp.where(cluster, local_states_sum - σ, σ).astype(σ.dtype)
+
+            # flipping both ends of an edge does not change whether it can be
+            # activated, while flipping only one end does
+            boundary = cluster[e_i] != cluster[e_j]
+            n_boundary = boundary.sum()
+            n_activable = (boundary & can_activate).sum()
+            n_activable_proposed = n_boundary - n_activable
+
+            log_prob_corr = (n_activable_proposed - n_activable) * log_1mp
+            return σp, log_prob_corr
+
+        return _update_samples(keys, σ)
+
+    def __repr__(self):
+        return (
+            f"ClusterFlipRule(# of edges: {len(self.edges)}, "
+            f"bond_probability: {self.bond_probability}, "
+            f"antiferromagnetic: {self.antiferromagnetic})"
+        )
+
+
+class LoopExchangeRule(MetropolisRule):
+    r"""
+    A Rule cyclically permuting the local states along a random path of a graph.
+
+    The path :math:`i_0, i_1, \dots, i_{L-1}` of `length` :math:`L` distinct sites
+    is built by choosing a first site with uniform probability, and then moving to
+    one of the neighbours not yet visited, also with uniform probability. The new
+    configuration is obtained by moving the local state of every site of the path to
+    the previous one, and the one of the first site to the last one:
+
+    .. math::
+
+        s^\prime_{i_k} = s_{i_{k+1}}, \qquad s^\prime_{i_{L-1}} = s_{i_0}.
+
+    As the local states are only permuted, global quantities such as the total
+    magnetization or the number of particles are conserved, so this rule can be
+    used to sample Hilbert spaces with such (U(1)) constraints. It is a
+    generalization of the :class:`~netket.sampler.rules.ExchangeRule`, which
+    corresponds to paths of 2 sites, that can move a whole string of local states
+    in a single step.
+
+    The reverse move is the same permutation along the reversed path, so the
+    Metropolis-Hastings correction is given by the ratio of the probabilities of
+    building the path in the two directions, which only depends on the graph.
+    If the path reaches a site without unvisited neighbours before having
+    `length` sites, the configuration is left unchanged.
+    """
+
+    neighbors: jax.Array
+    r"""2-Dimensional tensor of shape :math:`N_\text{sites}\times d_\text{max}`
+    containing the neighbours of every site, padded with -1."""
+    length: int = struct.field(pytree_node=False)
+    """Number of sites of the paths along which the local states are permuted."""
+
+    def __init__(self, graph: AbstractGraph, *, length: int = 4):
+        r"""
+        Constructs the LoopExchange Rule.
+
+        Args:
+            graph: A graph, along whose edges the paths are built.
+            length: The number of sites of the paths, which must be at least 2
+                (default = 4).
+        """
+        if length < 2:
+            raise ValueError(f"length ({length}) must be at least 2.")
+
+        adjacency = [set() for _ in range(graph.n_nodes)]
+        for i, j in _graph_edges(graph):
+            adjacency[i].add(j)
+            adjacency[j].add(i)
+        max_degree = max(len(a) for a in adjacency)
+        neighbors = np.full((graph.n_nodes, max_degree), -1, dtype=np.int64)
+        for i, a in enumerate(adjacency):
+            neighbors[i, : len(a)] = sorted(a)
+
+        self.neighbors = jnp.asarray(neighbors)
+        self.length = int(length)
+
+    def init_state(self, sampler, machine, params, key):
+        if self.neighbors.shape[0] != sampler.hilbert.size:
+            raise ValueError(
+                f"The graph used by LoopExchangeRule has {self.neighbors.shape[0]} "
+                f"sites, but the Hilbert space has {sampler.hilbert.size}."
+            )
+        return super().init_state(sampler, machine, params, key)
+
+    def transition(rule, sampler, machine, parameters, state, key, σ):
+        n_chains = σ.shape[0]
+        n_sites = σ.shape[-1]
+
+        keys = jnp.asarray(jax.random.split(key, n_chains))
+
+        def _n_available(path, position, k, backward):
+            # number of neighbours of path[k] that were not visited yet when
+            # building the path forward (or backward)
+            nbs = rule.neighbors[path[k]]
+            pos = position[nbs]
+            visited = (pos >= k) if backward else ((pos >= 0) & (pos <= k))
+            return ((nbs >= 0) & ~visited).sum()
+
+        # use shard_map to avoid the all-gather coming from the batched indexing
+        @partial(sharding_decorator, sharded_args_tree=(True, True))
+        @jax.vmap
+        def _update_samples(key, σ):
+            key_site, key_path = jax.random.split(key)
+
+            def _step(carry, xs):
+                site, position, stuck = carry
+                key, k = xs
+                nbs = rule.neighbors[site]
+                available = (nbs >= 0) & (position[nbs] < 0)
+                logits = jnp.where(available, 0.0, -jnp.inf)
+                next_site = nbs[jax.random.categorical(key, logits)]
+                stuck = stuck | ~available.any()
+                position = position.at[next_site].set(jnp.where(stuck, -1, k))
+                return (next_site, position, stuck), next_site
+
+            first = jax.random.randint(key_site, (), 0, n_sites)
+            position = jnp.full((n_sites,), -1).at[first].set(0)
+            (_, position, stuck), rest = jax.lax.scan(
+                _step,
+                (first, position, jnp.asarray(False)),
+                (
+                    jax.random.split(key_path, rule.length - 1),
+                    jnp.arange(1, rule.length),
+                ),
+            )
+            path = jnp.concatenate([first[None], rest])
+
+            σp = σ.at[path].set(jnp.roll(σ[path], -1))
+            σp = jnp.where(stuck, σ, σp)
+
+            k = jnp.arange(rule.length - 1)
+            n_forward = jax.vmap(_n_available, (None, None, 0, None))(
+                path, position, k, False
+            )
+            n_backward = jax.vmap(_n_available, (None, None, 0, None))(
+                path, position, k + 1, True
+            )
+            log_prob_corr = jnp.log(n_forward).sum() - jnp.log(n_backward).sum()
+            log_prob_corr = jnp.where(stuck, 0.0, log_prob_corr)
+            return σp, log_prob_corr
+
+        return _update_samples(keys, σ)
+
+    def __repr__(self):
+        return (
+            f"LoopExchangeRule(# of sites: {self.neighbors.shape[0]}, "
+            f"length: {self.length})"
+        )
+
+
+def _graph_edges(graph: AbstractGraph) -> np.ndarray:
+    edges = np.asarray(graph.edges(), dtype=np.int64).reshape(-1, 2)
+    if edges.shape[0] == 0:
+        raise ValueError("The graph must have at least one edge.")
+    return edges
+
+
+def _same_state(σi, σj):
+    if jnp.issubdtype(σi.dtype, jnp.bool) or jnp.issubdtype(σi.dtype, jnp.integer):
+        return σi == σj
+    else:
+        return jnp.isclose(σi, σj)
+
+
+def _connected_component(edges, active, site, n_sites):
+    """
+    Returns a mask of the sites connected to `site` by the `active` edges.
+    """
+
+    def _cond(carry):
+        _, changed = carry
+        return changed
+
+    def _grow(carry):
+        cluster, _ = carry
+        e_i, e_j = edges[:, 0], edges[:, 1]
+        cluster_new = cluster.at[e_i].max(cluster[e_j] & active)
+        cluster_new = cluster_new.at[e_j].max(cluster[e_i] & active)
+        return cluster_new, jnp.any(cluster_new != cluster)
+
+    cluster = jnp.zeros((n_sites,), dtype=bool).at[site].set(True)
+    cluster, _ = jax.lax.while_loop(_cond, _grow, (cluster, True))
+    return cluster
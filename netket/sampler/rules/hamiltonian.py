@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import math
+from functools import partial
 
 import jax
 import jax.numpy as jnp
@@ -22,7 +23,7 @@ import numpy as np
 from numba import jit
 
 from netket import config
-from netket.operator import DiscreteOperator, DiscreteJaxOperator
+from netket.operator import DiscreteOperator, DiscreteJaxOperator, LocalOperatorJax
 from netket.utils import struct
 
 from .base import MetropolisRule
@@ -151,10 +152,24 @@ class HamiltonianRuleJax(HamiltonianRuleBase):
        T( \mathbf{s} \rightarrow \mathbf{s}^\prime) = \frac{1}{\mathcal{N}(\mathbf{s})}\theta(|H_{\mathbf{s},\mathbf{s}^\prime}|),
 
     This rule only works with operators which are written in jax.
+
+    For a :class:`~netket.operator.LocalOperatorJax`, the connected elements are
+    not computed at every step. Instead, the transitions of every term of the
+    operator are precomputed in tables, from which a single term and transition
+    are drawn. The number of connected elements generated by every term is kept
+    in a Fenwick tree in the state of the rule, which is descended to draw the
+    term, and only the terms acting on the sites modified by an accepted
+    proposal are updated, so that the cost of a step grows only logarithmically
+    with the number of terms. The diagonal is counted among the connected
+    elements if it is nonzero for any configuration.
     """
 
     operator: DiscreteJaxOperator = struct.field(pytree_node=True)
     """The (hermitian) operator giving the transition amplitudes."""
+    _tables: "_LocalOperatorTables | None" = struct.field(
+        pytree_node=True, default=None, init=False
+    )
+    """The transition tables of the operator, if it is a local operator."""
 
     def __init__(self, operator: DiscreteJaxOperator):
         if not isinstance(operator, DiscreteJaxOperator):
@@ -163,8 +178,39 @@ class HamiltonianRuleJax(HamiltonianRuleBase):
                 f"but operator is a {type(operator)}."
             )
         self.operator = operator
+        if isinstance(operator, LocalOperatorJax):
+            self._tables = _LocalOperatorTables.from_operator(operator)
+        else:
+            self._tables = None
+
+    def init_state(self, sampler, machine, params, key):
+        super().init_state(sampler, machine, params, key)
+        if self._tables is None:
+            return None
+        # the counts are computed in reset, once the configurations are known
+        n_terms = self._tables.neighbors.shape[0]
+        dtype = self._tables.n_conns.dtype
+        return _LocalTransitionState(
+            tree=jnp.zeros((sampler.n_batches, n_terms + 1), dtype=dtype),
+            n_conn=jnp.zeros((sampler.n_batches,), dtype=dtype),
+        )
+
+    def reset(self, sampler, machine, params, state):
+        if self._tables is None:
+            return None
+        return _local_transition_state(self._tables, self.operator.hilbert, state.σ)
 
     def transition(self, _0, _1, _2, _3, key, x):
+        if self._tables is not None:
+            # without a rule state, the counts are computed from scratch
+            rule_state = _local_transition_state(
+                self._tables, self.operator.hilbert, x
+            )
+            xp, log_prob_corr, _ = _local_transition(
+                self._tables, self.operator.hilbert, key, x, rule_state
+            )
+            return xp, log_prob_corr
+
         xp, mels = self.operator.get_conn_padded(x)
 
         n_conn = self.operator.n_conn(x)
@@ -212,6 +258,224 @@ class HamiltonianRuleJax(HamiltonianRuleBase):
 
         return x_proposed.astype(x.dtype), log_prob_corr
 
+    def transition_and_log_prob(self, sampler, machine, params, state, key, x):
+        if self._tables is None:
+            return super().transition_and_log_prob(
+                sampler, machine, params, state, key, x
+            )
+        # the number of connected elements of the current configurations is
+        # read from the rule state, and only its change is returned, which
+        # accept_rule_state applies to the accepted chains
+        xp, log_prob_corr, update = _local_transition(
+            self._tables, self.operator.hilbert, key, x, state.rule_state
+        )
+        return xp, log_prob_corr, None, update
+
+    def accept_rule_state(self, rule_state, proposal_rule_state, accepted):
+        if self._tables is None:
+            return super().accept_rule_state(
+                rule_state, proposal_rule_state, accepted
+            )
+        return _accept_local_transition(rule_state, proposal_rule_state, accepted)
+
+
+@struct.dataclass
+class _LocalOperatorTables:
+    """
+    Transitions of the off-diagonal terms of a local operator, padded to the same
+    number of sites, rows and connected elements. The last row of `acting_on`,
+    `strides` and `n_conns` is an empty term used for padding.
+    """
+
+    acting_on: jax.Array
+    """Sites each term acts on, padded with the number of sites."""
+    strides: jax.Array
+    """Strides converting the local indices of the sites to a row of the term."""
+    n_conns: jax.Array
+    """Number of off-diagonal elements of every row of every term."""
+    x_prime: jax.Array
+    """Local indices of the sites after every off-diagonal transition."""
+    neighbors: jax.Array
+    """Terms acting on at least one of the sites of each term, padded with the
+    index of the empty term."""
+    n_conn_diag: int = struct.field(pytree_node=False)
+    """1 if the diagonal is counted among the connected elements, otherwise 0."""
+
+    @staticmethod
+    def from_operator(operator: LocalOperatorJax) -> "_LocalOperatorTables | None":
+        operator._setup()
+
+        acting_on, strides, n_conns, x_prime = [], [], [], []
+        for k in range(len(operator._acting_on)):
+            group_n_conns = np.asarray(operator._n_conns[k])
+            # pure diagonal terms never contribute a transition
+            (terms,) = np.nonzero(group_n_conns.max(axis=-1, initial=0) > 0)
+            acting_on.extend(np.asarray(operator._acting_on[k])[terms])
+            # see _state_to_number in the operator kernel
+            strides.extend(np.asarray(operator._basis[k])[terms, ::-1])
+            n_conns.extend(group_n_conns[terms])
+            x_prime.extend(np.asarray(operator._x_prime[k])[terms])
+
+        n_terms = len(acting_on)
+        if n_terms == 0:
+            return None
+        n_sites = operator.hilbert.size
+
+        def _pad(arrays, fill_value):
+            shape = np.max([a.shape for a in arrays], axis=0)
+            out = np.full((n_terms + 1, *shape), fill_value, dtype=arrays[0].dtype)
+            for t, a in enumerate(arrays):
+                out[(t, *(slice(0, n) for n in a.shape))] = a
+            return out
+
+        site_terms = [[] for _ in range(n_sites)]
+        for t, sites in enumerate(acting_on):
+            for i in sites:
+                site_terms[i].append(t)
+        neighbors = [
+            np.unique(np.concatenate([site_terms[i] for i in sites]))
+            for sites in acting_on
+        ]
+
+        return _LocalOperatorTables(
+            acting_on=jnp.asarray(_pad(acting_on, n_sites)),
+            strides=jnp.asarray(_pad(strides, 0)),
+            n_conns=jnp.asarray(_pad(n_conns, 0)),
+            x_prime=jnp.asarray(_pad(x_prime, 0)),
+            neighbors=jnp.asarray(_pad(neighbors, n_terms)[:-1]),
+            n_conn_diag=int(operator._nonzero_diagonal),
+        )
+
+
+@struct.dataclass
+class _LocalTransitionState:
+    """
+    State of :class:`HamiltonianRuleJax` for a local operator, holding the
+    number of connected elements of the current configuration of every chain.
+    """
+
+    tree: jax.Array
+    """Fenwick tree of the number of off-diagonal elements generated by every
+    term: entry `k` (starting from 1) holds the sum of the counts of the terms
+    from `k - (k & -k)` to `k - 1`, and entry 0 is unused."""
+    n_conn: jax.Array
+    """Total number of connected elements, including the diagonal."""
+
+
+@struct.dataclass
+class _LocalTransitionUpdate:
+    """
+    Change of the state of :class:`HamiltonianRuleJax` for a local operator
+    after a transition, to be applied to the chains where it is accepted.
+    """
+
+    terms: jax.Array
+    """Terms whose number of off-diagonal elements changed, padded with the
+    number of terms."""
+    delta: jax.Array
+    """Change of the number of off-diagonal elements of those terms."""
+    n_conn: jax.Array
+    """Total number of connected elements of the proposed configuration."""
+
+
+def _rows(tables, x_ids, terms):
+    return (x_ids[tables.acting_on[terms]] * tables.strides[terms]).sum(axis=-1)
+
+
+def _fenwick_path(terms, n_terms):
+    """
+    Indices of the entries of a Fenwick tree over `n_terms` elements that hold
+    the given terms, with shape `(*terms.shape, bit_length(n_terms))`. Indices
+    larger than `n_terms` must be dropped.
+    """
+    k = terms + 1
+    path = []
+    for _ in range(max(1, n_terms.bit_length())):
+        path.append(k)
+        k = k + (k & -k)
+    return jnp.stack(path, axis=-1)
+
+
+def _local_transition_state(tables, hilbert, x):
+    terms = jnp.arange(tables.neighbors.shape[0])
+
+    def _counts(x_ids):
+        return tables.n_conns[terms, _rows(tables, x_ids, terms)]
+
+    counts = jax.vmap(_counts)(hilbert.states_to_local_indices(x))
+
+    # entry k of the tree is the difference of two prefix sums
+    prefix = jnp.pad(jnp.cumsum(counts, axis=-1), ((0, 0), (1, 0)))
+    k = jnp.arange(1, counts.shape[-1] + 1)
+    tree = prefix[:, k] - prefix[:, k - (k & -k)]
+    return _LocalTransitionState(
+        tree=jnp.pad(tree, ((0, 0), (1, 0))),
+        n_conn=tables.n_conn_diag + counts.sum(axis=-1),
+    )
+
+
+def _local_transition(tables, hilbert, key, x, rule_state):
+    x_ids = hilbert.states_to_local_indices(x)
+    keys = jax.random.split(key, x.shape[0])
+    xp_ids, log_prob_corr, update = jax.vmap(
+        partial(_local_transition_single, tables)
+    )(keys, x_ids, rule_state)
+    xp = hilbert.local_indices_to_states(xp_ids, dtype=x.dtype)
+    return xp, log_prob_corr, update
+
+
+def _local_transition_single(tables, key, x_ids, rule_state):
+    n_terms = tables.neighbors.shape[0]
+    tree, n_conn = rule_state.tree, rule_state.n_conn
+
+    # select one of the connected elements uniformly, where the diagonal comes first
+    i = jax.random.randint(key, (), 0, n_conn) - tables.n_conn_diag
+    stay = (i < 0) | (n_conn == tables.n_conn_diag)
+
+    # descend the tree to find the term t generating the i-th off-diagonal
+    # element, and its index j among those of the term
+    t = jnp.zeros((), dtype=jnp.int32)
+    j = jnp.maximum(i, 0)
+    step = 1 << (n_terms.bit_length() - 1)
+    while step > 0:
+        count = tree[jnp.minimum(t + step, n_terms)]
+        go_right = (t + step <= n_terms) & (count <= j)
+        t = jnp.where(go_right, t + step, t)
+        j = jnp.where(go_right, j - count, j)
+        step >>= 1
+    t = jnp.minimum(t, n_terms - 1)
+
+    x_new = tables.x_prime[t, _rows(tables, x_ids, t), j].astype(x_ids.dtype)
+    xp_ids = x_ids.at[tables.acting_on[t]].set(x_new, mode="drop")
+    xp_ids = jnp.where(stay, x_ids, xp_ids)
+
+    # only the terms acting on the sites modified by term t change their number
+    # of connected elements. The padding index n_terms selects the empty term.
+    neighbors = tables.neighbors[t]
+    counts_new = tables.n_conns[neighbors, _rows(tables, xp_ids, neighbors)]
+    counts_old = tables.n_conns[neighbors, _rows(tables, x_ids, neighbors)]
+    delta = counts_new - counts_old
+    n_conn_proposed = n_conn + delta.sum()
+
+    log_prob_corr = jnp.where(stay, 0.0, jnp.log(n_conn) - jnp.log(n_conn_proposed))
+    return (
+        xp_ids,
+        log_prob_corr,
+        _LocalTransitionUpdate(terms=neighbors, delta=delta, n_conn=n_conn_proposed),
+    )
+
+
+def _accept_local_transition(rule_state, update, accepted):
+    # the tree is updated in place, adding the changes of the accepted chains
+    n_terms = rule_state.tree.shape[-1] - 1
+    path = _fenwick_path(update.terms, n_terms)
+    delta = jnp.where(accepted[:, None], update.delta, 0)
+    delta = jnp.broadcast_to(delta[..., None], path.shape)
+    chains = jnp.broadcast_to(jnp.arange(path.shape[0])[:, None, None], path.shape)
+    tree = rule_state.tree.at[chains, path].add(delta, mode="drop")
+    n_conn = jnp.where(accepted, update.n_conn, rule_state.n_conn)
+    return _LocalTransitionState(tree=tree, n_conn=n_conn)
+
 
 def HamiltonianRule(operator):
     r"""
@@ -34,6 +34,12 @@ class LangevinRule(MetropolisRule):
     where  :math:`\eta` is normal distributed noise :math:`\eta \sim \mathcal{N}(0,1)`.
     This rule only works for continuous Hilbert spaces.
 
+    The gradient of the log-probability at the current configurations is stored
+    in the rule state. When used in a :class:`~netket.sampler.MetropolisSampler`,
+    the log-probability and its gradient at the proposed configurations are
+    computed together, so every step costs a single forward and backward pass
+    of the model.
+
     [1]: https://en.wikipedia.org/wiki/Metropolis-adjusted_Langevin_algorithm
     """
 
@@ -53,18 +59,25 @@ class LangevinRule(MetropolisRule):
         self.dt = dt
         self.chunk_size = chunk_size
 
+    def init_state(rule, sampler, machine, parameters, key):
+        # gradient of the log-probability at the current configurations
+        return jnp.zeros((sampler.n_batches, sampler.hilbert.size), dtype=sampler.dtype)
+
+    def reset(rule, sampler, machine, parameters, state):
+        _, grad_logp = _log_prob_and_grad(
+            state.σ,
+            machine.apply,
+            parameters,
+            sampler.machine_pow,
+            chunk_size=rule.chunk_size,
+        )
+        return grad_logp
+
     def transition(rule, sampler, machine, parameters, state, key, r):
         if jnp.issubdtype(r.dtype, jnp.complexfloating):
             raise TypeError("LangevinRule does not work with complex basis elements.")
 
-        n_chains = r.shape[0]
-        hilb = sampler.hilbert
-
-        pbc = np.array(hilb.n_particles * hilb.pbc, dtype=r.dtype)
-        boundary = np.tile(pbc, (n_chains, 1))
-
-        Ls = np.array(hilb.n_particles * hilb.extent, dtype=r.dtype)
-        modulus = np.where(np.equal(pbc, False), jnp.inf, Ls)
+        boundary, modulus = _boundary_conditions(sampler.hilbert, r)
 
         # one langevin step
         rp, log_corr = _langevin_step(
@@ -82,10 +95,90 @@ class LangevinRule(MetropolisRule):
 
         return rp, log_corr
 
+    def transition_and_log_prob(rule, sampler, machine, parameters, state, key, r):
+        if jnp.issubdtype(r.dtype, jnp.complexfloating):
+            raise TypeError("LangevinRule does not work with complex basis elements.")
+
+        boundary, modulus = _boundary_conditions(sampler.hilbert, r)
+
+        # one langevin step, using the cached gradient at r
+        rp, log_prob_rp, grad_logp_rp, log_corr = _langevin_step_cached(
+            key,
+            r,
+            state.rule_state,
+            machine.apply,
+            parameters,
+            sampler.machine_pow,
+            rule.dt,
+            boundary,
+            modulus,
+            chunk_size=rule.chunk_size,
+        )
+        return rp, log_corr, log_prob_rp, grad_logp_rp
+
     def __repr__(self):
         return f"LangevinRule(dt={self.dt})"
 
 
+def _boundary_conditions(hilb, r):
+    n_chains = r.shape[0]
+
+    pbc = np.array(hilb.n_particles * hilb.pbc, dtype=r.dtype)
+    boundary = np.tile(pbc, (n_chains, 1))
+
+    Ls = np.array(hilb.n_particles * hilb.extent, dtype=r.dtype)
+    modulus = np.where(np.equal(pbc, False), jnp.inf, Ls)
+    return boundary, modulus
+
+
+def _log_prob_and_grad(x, apply_fun, parameters, machine_pow, chunk_size=None):
+    """Log probability and its gradient for a batch of samples x"""
+
+    def _single_value_and_grad(xi):
+        xi = xi.reshape(xi.shape[-1])
+
+        def _log_prob(xi):
+            return machine_pow * apply_fun(parameters, xi).real.ravel()[0]
+
+        return nkjax.value_and_grad(_log_prob)(xi)
+
+    return nkjax.vmap_chunked(_single_value_and_grad, chunk_size=chunk_size)(x)
+
+
+@partial(jax.jit, static_argnames=("apply_fun", "chunk_size"))
+def _langevin_step_cached(
+    key,
+    r,
+    grad_logp_r,
+    apply_fun,
+    parameters,
+    machine_pow,
+    dt,
+    boundary,
+    modulus,
+    chunk_size=None,
+):
+    """
+    Single step of samples with Langevin dynamics, given the gradient of the log
+    probability at r. Returns the new samples, the log probability and its
+    gradient at the new samples and the log correction of the transition.
+    """
+    noise_vec = jax.random.normal(key, shape=r.shape, dtype=r.dtype)
+
+    rp = r + dt * grad_logp_r + jnp.sqrt(2 * dt) * noise_vec
+    rp_wrapped = jnp.where(jnp.equal(boundary, False), rp, rp % modulus)
+
+    log_prob_rp, grad_logp_rp = _log_prob_and_grad(
+        rp_wrapped, apply_fun, parameters, machine_pow, chunk_size=chunk_size
+    )
+    grad_logp_rp = grad_logp_rp.real.astype(r.dtype)
+
+    log_q_xp = -0.5 * jnp.sum(noise_vec**2, axis=-1)
+    log_q_x = -jnp.sum((r - rp - dt * grad_logp_rp) ** 2, axis=-1) / (4 * dt)
+
+    return rp_wrapped, log_prob_rp, grad_logp_rp, log_q_x - log_q_xp
+
+
 @partial(jax.jit, static_argnames=("apply_fun", "chunk_size", "return_log_corr"))
 def _langevin_step(
     key,
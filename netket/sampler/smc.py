@@ -0,0 +1,231 @@
+# Copyright 2025 The NetKet Authors - All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Any
+from functools import partial
+
+import jax
+from jax import numpy as jnp
+
+from netket.utils import mpi, struct
+from netket.utils.types import PRNGKeyT
+
+from .metropolis import MetropolisSampler, MetropolisSamplerState
+
+
+class SMCSamplerState(MetropolisSamplerState):
+    """
+    State of the :class:`~netket.sampler.SMCSampler`.
+
+    Contains the usual quantities of a Metropolis sampler, as well as the
+    statistics of the last reweighting of the population.
+    """
+
+    ess: jnp.ndarray = None
+    """Normalized effective sample size of the importance weights computed at the
+    last reset, between 0 and 1 (0 if the population had never been sampled)."""
+    n_rejuvenations: jnp.ndarray = None
+    """Number of resets after which the population was rejuvenated, since the
+    initialization."""
+
+    def __init__(
+        self,
+        σ: jnp.ndarray,
+        rng: jnp.ndarray,
+        rule_state: Any | None,
+        log_prob: jnp.ndarray | None = None,
+    ):
+        self.ess = jnp.zeros((), dtype=float)
+        self.n_rejuvenations = jnp.zeros((), dtype=int)
+        super().__init__(σ, rng=rng, rule_state=rule_state, log_prob=log_prob)
+
+    def __repr__(self):
+        if self.n_steps > 0:
+            acc_string = f"# accepted = {self.n_accepted}/{self.n_steps} ({self.acceptance * 100}%), "
+        else:
+            acc_string = ""
+
+        return (
+            f"{type(self).__name__}({acc_string}ess = {self.ess}, "
+            f"rng state={self.rng})"
+        )
+
+
+class SMCSampler(MetropolisSampler):
+    r"""
+    Sequential Monte Carlo (population annealing) sampler.
+
+    The chains of this sampler are a population of configurations that is carried
+    over from one set of parameters to the next. When the sampler is reset with new
+    parameters, the population sampled from the previous distribution
+    :math:`P_{\text{old}}` is reweighted with the importance weights
+
+    .. math::
+
+        w(\sigma) = \frac{P_{\text{new}}(\sigma)}{P_{\text{old}}(\sigma)} ,
+
+    and resampled with systematic resampling, so that it is approximately
+    distributed according to the new distribution. If the normalized effective
+    sample size of the weights
+
+    .. math::
+
+        \text{ESS} = \frac{1}{N}\frac{(\sum_i w_i)^2}{\sum_i w_i^2}
+
+    falls below `ess_threshold`, the population is then rejuvenated with
+    `n_rejuvenation` steps of Metropolis-Hastings (each made of `sweep_size`
+    transitions of the rule), decorrelating the duplicated configurations.
+
+    When the parameters change slowly (for example in VMC with a small learning
+    rate) the effective sample size stays large, and the population does not need to
+    be thermalized again at every iteration. In this case the variational state
+    should be built with `n_discard_per_chain=0`.
+
+    The effective sample size of the last reset is available as
+    :attr:`SMCSamplerState.ess`.
+
+    .. note::
+
+        When running with MPI, the population is resampled independently on
+        every rank, while the effective sample size is computed on the whole
+        population.
+    """
+
+    ess_threshold: float = struct.field(pytree_node=False, default=0.5)
+    """Normalized effective sample size below which the population is rejuvenated."""
+    n_rejuvenation: int = struct.field(pytree_node=False, default=5)
+    """Number of Metropolis-Hastings steps used to rejuvenate the population."""
+
+    def __init__(
+        self,
+        *args,
+        ess_threshold: float = 0.5,
+        n_rejuvenation: int = 5,
+        **kwargs,
+    ):
+        """
+        Constructs a sequential Monte Carlo sampler.
+
+        Args:
+            hilbert: The Hilbert space to sample.
+            rule: A `MetropolisRule` used to rejuvenate the population and to sample.
+            ess_threshold: The normalized effective sample size (between 0 and 1) below
+                which the population is rejuvenated after being resampled (default = 0.5).
+            n_rejuvenation: The number of Metropolis-Hastings steps, each made of
+                `sweep_size` transitions, used to rejuvenate the population (default = 5).
+
+        All the other arguments are the same as :class:`~netket.sampler.MetropolisSampler`.
+        """
+        if not 0 <= ess_threshold <= 1:
+            raise ValueError(
+                f"ess_threshold ({ess_threshold}) must be between 0 and 1."
+            )
+        if n_rejuvenation < 0:
+            raise ValueError(f"n_rejuvenation ({n_rejuvenation}) must be non-negative.")
+        if kwargs.get("reset_chains", False):
+            raise ValueError(
+                "SMCSampler reuses the population across resets, so `reset_chains` "
+                "must be False."
+            )
+
+        self.ess_threshold = ess_threshold
+        self.n_rejuvenation = n_rejuvenation
+
+        super().__init__(*args, **kwargs)
+
+    @partial(jax.jit, static_argnums=1)
+    def _init_state(self, machine, parameters, key):
+        state = super()._init_state(machine, parameters, key)
+        return SMCSamplerState(
+            σ=state.σ,
+            rng=state.rng,
+            rule_state=state.rule_state,
+            log_prob=state.log_prob,
+        )
+
+    @partial(jax.jit, static_argnums=1)
+    def _reset(self, machine, parameters, state):
+        # the log-probability of the population under the previous parameters,
+        # which is -inf if it was never sampled
+        log_prob_old = state.log_prob
+        state = super()._reset(machine, parameters, state)
+
+        log_w = state.log_prob - log_prob_old
+        never_sampled = ~jnp.all(jnp.isfinite(log_prob_old))
+        log_w = jnp.where(never_sampled, 0, log_w)
+        ess = _effective_sample_size(log_w)
+        ess = jnp.where(never_sampled, 0, ess)
+
+        rng, key = jax.random.split(state.rng)
+        idx = _systematic_resample(key, log_w)
+        state = state.replace(σ=state.σ[idx], log_prob=state.log_prob[idx], rng=rng)
+        state = state.replace(
+            rule_state=self.rule.reset(self, machine, parameters, state)
+        )
+
+        if self.n_rejuvenation > 0:
+            rejuvenate = ess < self.ess_threshold
+            state = jax.lax.cond(
+                rejuvenate,
+                lambda state: self._sample_chain(
+                    machine, parameters, state, self.n_rejuvenation
+                )[1],
+                lambda state: state,
+                state,
+            )
+            state = state.replace(n_rejuvenations=state.n_rejuvenations + rejuvenate)
+
+        return state.replace(
+            ess=ess,
+            n_steps_proc=jnp.zeros_like(state.n_steps_proc),
+            n_accepted_proc=jnp.zeros_like(state.n_accepted_proc),
+        )
+
+    def __repr__(self):
+        return (
+            f"{type(self).__name__}("
+            + f"\n  hilbert = {self.hilbert},"
+            + f"\n  rule = {self.rule},"
+            + f"\n  n_chains = {self.n_chains},"
+            + f"\n  sweep_size = {self.sweep_size},"
+            + f"\n  ess_threshold = {self.ess_threshold},"
+            + f"\n  n_rejuvenation = {self.n_rejuvenation},"
+            + f"\n  machine_power = {self.machine_pow},"
+            + f"\n  dtype = {self.dtype}"
+            + ")"
+        )
+
+
+def _effective_sample_size(log_w: jax.Array) -> jax.Array:
+    """
+    Computes the normalized effective sample size of the importance weights
+    `exp(log_w)` of the whole population, across all MPI ranks.
+    """
+    log_w_max, _ = mpi.mpi_max_jax(jnp.max(log_w))
+    w = jnp.exp(log_w - log_w_max)
+    sum_w, _ = mpi.mpi_sum_jax(jnp.sum(w))
+    sum_w2, _ = mpi.mpi_sum_jax(jnp.sum(w**2))
+    return sum_w**2 / sum_w2 / (w.size * mpi.n_nodes)
+
+
+def _systematic_resample(key: PRNGKeyT, log_w: jax.Array) -> jax.Array:
+    """
+    Returns the indices of the configurations selected by systematic resampling
+    with weights `exp(log_w)`.
+    """
+    n = log_w.shape[0]
+    cdf = jnp.cumsum(jnp.exp(log_w - jnp.max(log_w)))
+    u = (jax.random.uniform(key, dtype=cdf.dtype) + jnp.arange(n)) / n
+    idx = jnp.searchsorted(cdf / cdf[-1], u, side="right")
+    return jnp.clip(idx, 0, n - 1)
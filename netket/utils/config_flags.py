@@ -243,6 +243,22 @@ config.define(
     runtime=True,
 )
 
+config.define(
+    "NETKET_EXPERIMENTAL_PACKED_CONFIGURATIONS",
+    bool,
+    default=False,
+    help=dedent(
+        """
+        When computing local estimators of jax operators acting on Hilbert spaces with two
+        local states (such as `Spin(1/2)`, `Qubit` or `SpinOrbitalFermions`), store the
+        connected configurations packed into 32-bit words, with one bit per degree of
+        freedom, and unpack them only right before evaluating the model. This reduces the
+        memory used by the connected configurations by a factor 8 or more.
+        """
+    ),
+    runtime=False,
+)
+
 # TODO: removed in january 2025, defaults to True now.
 config.define(
     "NETKET_EXPERIMENTAL_DISABLE_ODE_JIT",
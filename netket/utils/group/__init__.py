@@ -14,7 +14,7 @@
 
 from ._semigroup import Element, Identity
 from ._group import FiniteGroup
-from ._permutation_group import Permutation, PermutationGroup
+from ._permutation_group import Permutation, PermutationArray, PermutationGroup
 from ._point_group import PGSymmetry, PointGroup, trivial_point_group
 
 from . import axial, cubic, planar, icosa
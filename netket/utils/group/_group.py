@@ -185,22 +185,11 @@ class FiniteGroup(FiniteSemiGroup):
             - inverse: the conjugacy class index of every group element
 
         """
-        row_index = np.arange(len(self))[:, np.newaxis]
-
-        # if is_conjugate[i,j] is True, self[i] and self[j] are in the same class
-        is_conjugate = np.full((len(self), len(self)), False)
-        is_conjugate[row_index, self.conjugacy_table] = True
-
-        classes, representatives, inverse = np.unique(
-            is_conjugate, axis=0, return_index=True, return_inverse=True
-        )
-
-        # Usually self[0] == Identity(), which is its own class
-        # This class is listed last by the lexicographic order used by np.unique
-        # so we reverse it to get a more conventional layout
-        classes = classes[::-1]
-        representatives = representatives[::-1]
-        inverse = (representatives.size - 1) - inverse
+        # row g of the conjugacy table lists all the elements conjugate to g,
+        # so its minimum is the lowest-indexed member of the class of g
+        lowest = self.conjugacy_table.min(axis=1)
+        representatives, inverse = np.unique(lowest, return_inverse=True)
+        classes = inverse[np.newaxis, :] == np.arange(representatives.size)[:, None]
 
         return classes, representatives, inverse
 
@@ -215,7 +204,7 @@ class FiniteGroup(FiniteSemiGroup):
         Assumes that :code:`Identity() == self[0]`, if not, the sign of some
         characters may be flipped. The irreps are sorted by dimension.
         """
-        classes, _, _ = self.conjugacy_classes
+        classes, _, class_index = self.conjugacy_classes
         class_sizes = classes.sum(axis=1)
         # Construct a random linear combination of the class matrices c_S
         #    (c_S)_{RT} = #{r,s: r \in R, s \in S: rs = t}
@@ -228,9 +217,13 @@ class FiniteGroup(FiniteSemiGroup):
         #    c_{RST} = |S| d_{RST} / |T|;
         # since we only want a random linear combination, we forget about the
         # constant |S| and only divide each column through with the appropriate |T|
-        class_matrix = (
-            classes @ random(len(self), seed=0)[self.product_table] @ classes.T
-        )
+        n_classes = len(class_sizes)
+        class_pairs = class_index[:, np.newaxis] * n_classes + class_index
+        class_matrix = np.bincount(
+            class_pairs.ravel(),
+            weights=random(len(self), seed=0)[self.product_table].ravel(),
+            minlength=n_classes**2,
+        ).reshape(n_classes, n_classes)
         class_matrix /= class_sizes
 
         # The vectors |R|\chi(r) are (column) eigenvectors of all class matrices
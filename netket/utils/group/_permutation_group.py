@@ -16,6 +16,7 @@
 # pylint: disable=function-redefined
 
 import itertools
+from collections.abc import Sequence
 
 import numpy as np
 
@@ -85,6 +86,165 @@ def product(p: Permutation, q: Permutation):  # noqa: F811
     return Permutation(p(np.asarray(q)), name)
 
 
+class PermutationArray(Sequence):
+    """
+    Sequence of :class:`Permutation` stored as the rows of a single `int32` array
+    of shape `(n_elements, degree)`, used as the elements of a
+    :class:`PermutationGroup`.
+
+    The element objects are only constructed when they are accessed, so the
+    array can represent groups with very many elements cheaply.
+    """
+
+    def __init__(self, array: Array, elements: Sequence | None = None):
+        """
+        Constructs the sequence.
+
+        Args:
+            array: integer array of shape `(n_elements, degree)`, whose rows are
+                the permutations in the format accepted by :class:`Permutation`.
+            elements: optional sequence of the same length with the objects
+                returned when the elements are accessed. Its entries can be
+                :class:`~netket.utils.group.Element` objects, the names of the
+                permutations (strings) or None.
+        """
+        array = np.array(array, dtype=np.int32)
+        if array.ndim != 2:
+            raise ValueError(
+                "The permutations must be an array of shape (n_elements, degree)."
+            )
+        if elements is not None and len(elements) != len(array):
+            raise ValueError("The number of elements and permutations do not match.")
+        array.flags.writeable = False
+        self.array = array
+        self._elements = elements
+
+    def __len__(self):
+        return self.array.shape[0]
+
+    def __getitem__(self, i):
+        if not isinstance(i, int | np.integer):
+            return [self[j] for j in np.arange(len(self))[i]]
+        elem = None if self._elements is None else self._elements[i]
+        if isinstance(elem, Element):
+            return elem
+        return Permutation(self.array[i], name=elem)
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def __contains__(self, x):
+        if not isinstance(x, Element):
+            return False
+        row = x(np.arange(self.array.shape[1]))
+        return bool(np.any(np.all(self.array == row, axis=1)))
+
+    def __hash__(self):
+        return hash(HashableArray(self.array))
+
+    def __eq__(self, other):
+        if isinstance(other, PermutationArray):
+            return np.array_equal(self.array, other.array)
+        elif isinstance(other, list | tuple):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def take(self, indices: Array) -> "PermutationArray":
+        """
+        Returns a new sequence with the elements at positions `indices`.
+        """
+        indices = np.asarray(indices, dtype=int)
+        elements = None
+        if self._elements is not None:
+            elements = _TakeSequence(self._elements, indices)
+        return PermutationArray(self.array[indices], elements)
+
+
+class _TakeSequence(Sequence):
+    """Lazy view of the entries `indices` of `sequence`."""
+
+    def __init__(self, sequence: Sequence, indices: Array):
+        self.sequence = sequence
+        self.indices = indices
+
+    def __len__(self):
+        return len(self.indices)
+
+    def __getitem__(self, i):
+        return self.sequence[self.indices[i]]
+
+
+class _ProductSequence(Sequence):
+    """Lazy sequence of the products `a @ b` for all `a` in `A` and `b` in `B`."""
+
+    def __init__(self, A: Sequence, B: Sequence):
+        self.A = A
+        self.B = B
+
+    def __len__(self):
+        return len(self.A) * len(self.B)
+
+    def __getitem__(self, i):
+        i, j = divmod(i, len(self.B))
+        return self.A[i] @ self.B[j]
+
+
+class _RowIndex:
+    """
+    Finds the index of integer arrays among the rows of a fixed table, by
+    bisection on 64-bit hashes of the rows.
+    """
+
+    def __init__(self, table: Array):
+        self.table = np.asarray(table)
+        # pick hashes without collisions between distinct rows of the table
+        for seed in itertools.count():
+            self.coeffs = np.random.default_rng(seed).integers(
+                1, 2**63, size=self.table.shape[-1], dtype=np.uint64
+            )
+            keys = self.hash_rows(self.table)
+            # stable, so that the first of duplicate rows is found
+            self.order = np.argsort(keys, kind="stable")
+            self.keys = keys[self.order]
+            rows = self.table[self.order]
+            same = self.keys[1:] == self.keys[:-1]
+            if np.array_equal(rows[1:][same], rows[:-1][same]):
+                break
+
+    def hash_rows(self, x: Array) -> Array:
+        return x.astype(np.uint64) @ self.coeffs
+
+    def __call__(self, rows: Array) -> Array:
+        """
+        Returns the indices of `rows` (an array of shape `(..., width)`) in the
+        table, or -1 for the rows that are not found.
+        """
+        keys = self.hash_rows(rows)
+        pos = np.minimum(np.searchsorted(self.keys, keys), len(self.keys) - 1)
+        index = self.order[pos]
+        found = (self.keys[pos] == keys) & np.all(self.table[index] == rows, axis=-1)
+        return np.where(found, index, -1)
+
+
+def _base(perms: Array) -> list[int]:
+    """
+    Returns a list of points such that every element of `perms` (the rows of a
+    permutation table) is uniquely identified by the preimages of these points.
+    """
+    n_distinct = len(np.unique(perms, axis=0))
+    base = []
+    n_found = 1
+    # points that are fixed by all elements cannot distinguish them
+    for i in np.flatnonzero(np.any(perms != perms[:1], axis=0)):
+        if n_found == n_distinct:
+            break
+        n = len(np.unique(perms[:, base + [i]], axis=0))
+        if n > n_found:
+            base.append(int(i))
+            n_found = n
+    return base
+
+
 @struct.dataclass
 class PermutationGroup(FiniteGroup):
     r"""
@@ -93,21 +253,78 @@ class PermutationGroup(FiniteGroup):
     Group elements need not all be of type :class:`netket.utils.group.Permutation`,
     only act as such on a sequence when called.
 
+    The permutations are stored as a single integer array of shape
+    `(len(group), degree)` (see :class:`~netket.utils.group.PermutationArray`),
+    from which products, inverses and character tables are computed. The group
+    can therefore also be constructed directly from such an array, in which case
+    the element objects are only created when they are accessed.
+
     The class can contain elements that are distinct as objects (e.g.,
     :code:`Identity()` and :code:`Translation((0,))`) but have identical action.
     Those can be removed by calling
     :meth:`~netket.utils.group.PermutationGroup.remove_duplicates`.
     """
 
+    elems: PermutationArray
+    """The elements of the group."""
+
     degree: int
     """Number of elements the permutations act on."""
 
+    def __pre_init__(
+        self,
+        elems: Sequence[Element] | Array,
+        degree: int | None = None,
+        names: Sequence[str] | None = None,
+    ) -> tuple[tuple, dict]:
+        """
+        Constructs a `PermutationGroup`.
+
+        Args:
+            elems: a sequence of group elements, or an integer array of shape
+                `(n_elements, degree)` listing :math:`g^{-1}(x)` for every element.
+            degree: number of elements the permutations act on. Inferred from
+                `elems` if it is an array.
+            names: optional names of the elements, only used if `elems` is an
+                array.
+        """
+        if not isinstance(elems, PermutationArray):
+            if isinstance(elems, Sequence) and all(
+                isinstance(x, Element) for x in elems
+            ):
+                if names is not None:
+                    raise TypeError("`names` can only be given for an array of elems.")
+                if degree is None:
+                    raise TypeError(
+                        "The degree must be specified to construct a "
+                        "`PermutationGroup` from a sequence of elements."
+                    )
+                ids = np.arange(degree, dtype=int)
+                array = np.array([x(ids) for x in elems]).reshape(len(elems), degree)
+                elems = PermutationArray(array, elems)
+            else:
+                elems = PermutationArray(np.asarray(elems), names)
+        if degree is None:
+            degree = elems.array.shape[1]
+        elif elems.array.shape[1] != degree:
+            raise ValueError(
+                f"The permutations act on {elems.array.shape[1]} elements, but the "
+                f"degree of the group is {degree}."
+            )
+        return (elems, degree), {}
+
     def __hash__(self):
         return super().__hash__()
 
     def _canonical(self, x: Element) -> Array:
         return x(np.arange(self.degree, dtype=int))
 
+    def _canonical_array(self) -> Array:
+        return self.elems.array
+
+    def _canonical_lookup(self) -> dict:
+        return {HashableArray(row): i for i, row in enumerate(self.elems.array)}
+
     def to_array(self) -> Array:
         r"""
         Convert the abstract group operations to an array of permutation indices.
@@ -146,59 +363,62 @@ class PermutationGroup(FiniteGroup):
             :code:`return_inverse==True`, it also returns the indices needed to
             reconstruct the original group from the result.
         """
-        if return_inverse:
-            group, inverse = super().remove_duplicates(return_inverse=True)
-        else:
-            group = super().remove_duplicates(return_inverse=False)
-
-        pgroup = PermutationGroup(group.elems, self.degree)
+        _, index, inverse = np.unique(
+            self.to_array(), axis=0, return_index=True, return_inverse=True
+        )
+        # keep the elements in their original order
+        order = np.argsort(index)
+        pgroup = PermutationGroup(self.elems.take(index[order]), self.degree)
 
         if return_inverse:
-            return pgroup, inverse
+            return pgroup, np.argsort(order)[inverse.reshape(-1)]
         else:
             return pgroup
 
     @struct.property_cached
     def inverse(self) -> Array:
-        try:
-            lookup = self._canonical_lookup()
-            inverses = []
-            # `np.argsort` on a 1D permutation list generates the inverse permutation
-            # it acts along last axis by default, so can perform it on to_array()
-            # `np.argsort` changes int32 to int64 on Windows,
-            # and we need to change it back
-            perms = self.to_array()
-            invperms = np.argsort(perms).astype(perms.dtype)
-
-            for invperm in invperms:
-                inverses.append(lookup[HashableArray(invperm)])
-
-            return np.asarray(inverses, dtype=int)
-        except KeyError as err:
+        # `np.argsort` on a 1D permutation list generates the inverse permutation
+        # it acts along last axis by default, so can perform it on to_array()
+        perms = self.to_array()
+        inverses = _RowIndex(perms)(np.argsort(perms, axis=-1))
+        if np.any(inverses < 0):
             raise RuntimeError(
                 "PermutationGroup does not contain the inverse of all elements"
-            ) from err
+            )
+        return inverses.astype(int)
 
     @struct.property_cached
     def product_table(self) -> Array:
         perms = self.to_array()
-        inverse = perms[self.inverse].squeeze()
         n_symm = len(perms)
-        lookup = np.unique(np.column_stack((perms, np.arange(len(self)))), axis=0)
+        # g^{-1}h is identified by the preimages of the points in the base, which
+        # are obtained by composing h with the corresponding entries of g^{-1}
+        base = _base(perms)
+        if len(base) == 0:
+            return np.zeros([n_symm, n_symm], dtype=int)
+        perms_base = perms[:, base]
+        lookup = _RowIndex(perms_base)
+        inverse_base = perms[self.inverse][:, base]
 
         product_table = np.zeros([n_symm, n_symm], dtype=int)
-        for i, g_inv in enumerate(inverse):
-            row_perms = perms[:, g_inv]
-            row_perms = np.unique(
-                np.column_stack((row_perms, np.arange(len(self)))), axis=0
-            )
-            # row_perms should be a permutation of perms, so identical after sorting
-            if np.any(row_perms[:, :-1] != lookup[:, :-1]):
+        chunk_size = max(1, 2**22 // (n_symm * len(base)))
+        for start in range(0, n_symm, chunk_size):
+            g_inv = inverse_base[start : start + chunk_size]
+            row_perms = np.swapaxes(perms[:, g_inv], 0, 1)
+            # every row should be a permutation of the group elements, so the
+            # sorted hashes of the products must match those of the elements
+            keys = lookup.hash_rows(row_perms)
+            idx = np.argsort(keys, axis=1)
+            if np.any(np.take_along_axis(keys, idx, axis=1) != lookup.keys):
+                raise RuntimeError(
+                    "PermutationGroup is not closed under multiplication"
+                )
+            rows = product_table[start : start + chunk_size]
+            np.put_along_axis(rows, idx, lookup.order[np.newaxis, :], axis=1)
+            if not np.array_equal(perms_base[rows], row_perms):
                 raise RuntimeError(
                     "PermutationGroup is not closed under multiplication"
                 )
-            # match elements in row_perms to group indices
-            product_table[i, row_perms[:, -1]] = lookup[:, -1]
 
         return product_table
 
@@ -222,8 +442,13 @@ def product(A: PermutationGroup, B: PermutationGroup):  # noqa: F811
         raise ValueError(
             "Incompatible groups (`PermutationGroup`s of different degree)"
         )
+    # (a @ b)(x) = a(b(x)) is the permutation array b[a]
+    perms = np.swapaxes(B.to_array()[:, A.to_array()], 0, 1)
     return PermutationGroup(
-        elems=[a @ b for a, b in itertools.product(A.elems, B.elems)], degree=A.degree
+        PermutationArray(
+            perms.reshape(-1, A.degree), _ProductSequence(A.elems, B.elems)
+        ),
+        A.degree,
     )
 
 
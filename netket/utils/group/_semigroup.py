@@ -18,6 +18,7 @@
 
 import itertools
 from abc import ABC
+from collections.abc import Hashable
 from dataclasses import dataclass
 
 import numpy as np
@@ -142,7 +143,11 @@ class FiniteSemiGroup:
     def __post_init__(self):
         # manually assign self.__hash == ... for frozen dataclass,
         # see https://docs.python.org/3/library/dataclasses.html#frozen-instances
-        myhash = hash(tuple(hash(x) for x in self.elems))
+        if isinstance(self.elems, Hashable):
+            # e.g. the elements of a PermutationGroup, hashed as a whole
+            myhash = hash(self.elems)
+        else:
+            myhash = hash(tuple(hash(x) for x in self.elems))
         object.__setattr__(self, "_FiniteSemiGroup__hash", myhash)
 
     def __matmul__(self, other):
@@ -22,6 +22,7 @@ from functools import partial
 import jax
 import jax.numpy as jnp
 
+from netket import config
 from netket.utils.types import PyTree, Array
 import netket.jax as nkjax
 from netket.operator import DiscreteJaxOperator
@@ -60,15 +61,120 @@ def local_value_kernel(logpsi: Callable, pars: PyTree, σ: Array, args: PyTree):
     return jnp.sum(mel * jnp.exp(logpsi(pars, σp) - logpsi(pars, σ)))
 
 
+def logpsi_conn_compacted(
+    logpsi: Callable,
+    σp: Array,
+    mels: Array,
+    logpsi_σ: Array,
+    *,
+    chunk_size: int | None = None,
+) -> Array:
+    """
+    Evaluates `logpsi` on the connected configurations `σp` (with shape
+    `(..., max_conn_size, N)`) skipping most of those whose matrix element is zero.
+
+    The connected configurations are stably partitioned so that those with a
+    nonzero matrix element come first. Only the first `width` of them are then
+    evaluated in a single call, where `width` is the smallest of the bucketed
+    widths `n_conn`, `n_conn/2`, `n_conn/4`, ... (but not smaller than the number
+    of samples) that is larger than the number of nonzero matrix elements. The
+    cost of this function therefore scales with the number of nonzero matrix
+    elements and not with the padded width `max_conn_size`, while compiling only
+    a logarithmic number of widths.
+
+    The entries corresponding to zero matrix elements are set to the
+    value `logpsi_σ` of the originating sample, so that the ratio of
+    the wavefunctions is finite and they do not contribute to the
+    local estimator nor to its gradient.
+
+    Args:
+        logpsi: A function taking a batch of configurations of shape `(B, N)`.
+        σp: The (padded) connected configurations.
+        mels: The matrix elements, with shape `σp.shape[:-1]`.
+        logpsi_σ: The value of `logpsi` on the samples, with shape
+            `σp.shape[:-2]`.
+        chunk_size: If given, the configurations are evaluated in chunks of
+            this size (see :func:`netket.jax.apply_chunked`).
+
+    Returns:
+        An array with shape `σp.shape[:-1]` holding `logpsi` evaluated on the
+        connected configurations.
+    """
+    N = σp.shape[-1]
+    σp_flat = σp.reshape(-1, N)
+    n_conn = σp_flat.shape[0]
+    nonzero = (mels != 0).reshape(-1)
+
+    # destination of every configuration in the stable partition
+    n_nonzero = nonzero.sum()
+    dest = jnp.where(
+        nonzero, jnp.cumsum(nonzero) - 1, n_nonzero + jnp.cumsum(~nonzero) - 1
+    )
+    σp_sorted = jnp.zeros_like(σp_flat).at[dest].set(σp_flat, unique_indices=True)
+
+    if chunk_size is not None:
+        logpsi = nkjax.apply_chunked(logpsi, in_axes=0, chunk_size=chunk_size)
+
+    min_width = max(1, σp.size // (σp.shape[-1] * σp.shape[-2]))
+    widths = [n_conn]
+    while -(-widths[-1] // 2) >= min_width and widths[-1] > 1:
+        widths.append(-(-widths[-1] // 2))
+
+    def _evaluate(width, σp_sorted):
+        out = logpsi(σp_sorted[:width])
+        return jnp.pad(out, (0, n_conn - width))
+
+    # index of the smallest width holding all nonzero matrix elements
+    bucket = sum((n_nonzero <= w).astype(jnp.int32) for w in widths[1:])
+    logpsi_sorted = jax.lax.switch(
+        bucket, [partial(_evaluate, w) for w in widths], σp_sorted
+    )
+
+    logpsi_σp = logpsi_sorted[dest].reshape(mels.shape)
+    return jnp.where(
+        mels != 0, logpsi_σp, jnp.expand_dims(logpsi_σ, -1).astype(logpsi_σp.dtype)
+    )
+
+
+def get_conn_padded_maybe_packed(
+    O: DiscreteJaxOperator,
+    σ: Array,
+    packed: bool = config.netket_experimental_packed_configurations,
+):
+    """
+    Returns the connected configurations and matrix elements of `O`, together
+    with a function converting the former to configurations of the Hilbert space.
+
+    If `packed` is True (defaults to the value of the flag
+    `NETKET_EXPERIMENTAL_PACKED_CONFIGURATIONS`) and the Hilbert space has two
+    local states, the connected configurations are packed into bits (see
+    :meth:`netket.hilbert.DiscreteHilbert.pack_states`).
+    """
+    if packed and O.hilbert.is_packable:
+        σp, mel = O.get_conn_padded_packed(O.hilbert.pack_states(σ))
+        return σp, mel, partial(O.hilbert.unpack_states, dtype=σ.dtype)
+    σp, mel = O.get_conn_padded(σ)
+    return σp, mel, lambda x: x
+
+
 def local_value_kernel_jax(
     logpsi: Callable, pars: PyTree, σ: Array, O: DiscreteJaxOperator
 ):
     """
-    local_value kernel for MCState for jax-compatible operators
+    local_value kernel for MCState for jax-compatible operators.
+
+    The model is only evaluated on the connected configurations with a nonzero
+    matrix element (see :func:`logpsi_conn_compacted`).
     """
-    σp, mel = O.get_conn_padded(σ)
     logpsi_σ = logpsi(pars, σ)
-    logpsi_σp = logpsi(pars, σp.reshape(-1, σp.shape[-1])).reshape(σp.shape[:-1])
+    if config.netket_experimental_sharding:
+        σp, mel = O.get_conn_padded(σ)
+        logpsi_σp = logpsi(pars, σp.reshape(-1, σp.shape[-1])).reshape(σp.shape[:-1])
+    else:
+        σp, mel, unpack = get_conn_padded_maybe_packed(O, σ)
+        logpsi_σp = logpsi_conn_compacted(
+            lambda s: logpsi(pars, unpack(s)), σp, mel, logpsi_σ
+        )
     return jnp.sum(mel * jnp.exp(logpsi_σp - jnp.expand_dims(logpsi_σ, -1)), axis=-1)
 
 
@@ -85,10 +191,15 @@ def local_value_kernel_jax_conn_chunked(
     apply_conn = lambda s: logpsi(pars, s)
     apply_conn = nkjax.apply_chunked(apply_conn, in_axes=0, chunk_size=chunk_size)
 
-    σp, mel = O.get_conn_padded(σ)
-
     logpsi_σ = apply_conn(σ)
-    logpsi_σp = apply_conn(σp.reshape(-1, σ.shape[-1])).reshape(σp.shape[:-1])
+    if config.netket_experimental_sharding:
+        σp, mel = O.get_conn_padded(σ)
+        logpsi_σp = apply_conn(σp.reshape(-1, σ.shape[-1])).reshape(σp.shape[:-1])
+    else:
+        σp, mel, unpack = get_conn_padded_maybe_packed(O, σ)
+        logpsi_σp = logpsi_conn_compacted(
+            lambda s: logpsi(pars, unpack(s)), σp, mel, logpsi_σ, chunk_size=chunk_size
+        )
 
     return jnp.sum(mel * jnp.exp(logpsi_σp - jnp.expand_dims(logpsi_σ, -1)), axis=-1)
 
@@ -13,6 +13,7 @@
 # limitations under the License.
 
 from netket.utils.dispatch import dispatch
+from netket.utils.types import PyTree
 
 from netket.operator import (
     DiscreteOperator,
@@ -28,9 +29,18 @@ from netket.vqs.mc import (
     get_local_kernel,
 )
 
+from netket.vqs.mc.mc_state.expect import _prepared_model_state
+
 from .state import MCMixedState
 
 
+@dispatch
+def _prepared_model_state(vstate: MCMixedState, σ) -> PyTree:  # noqa: F811
+    # Physical observables are estimated from the samples of the diagonal, which
+    # are not inputs of the model, so nothing can be precomputed from them.
+    return vstate.model_state
+
+
 @dispatch
 def get_local_kernel_arguments(vstate: MCMixedState, Ô: DiscreteOperator):  # noqa: F811
     check_hilbert(vstate.diagonal.hilbert, Ô.hilbert)
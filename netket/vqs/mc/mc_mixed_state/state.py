@@ -89,6 +89,8 @@ class MCMixedState(VariationalMixedState, MCState):
                 Useful for example when you have a batchnorm layer that constructs the average/mean only during training.
 
         """
+        if kwargs.get("reweighting_threshold") is not None:
+            raise ValueError("MCMixedState does not support `reweighting_threshold`.")
 
         seed, seed_diag = jax.random.split(nkjax.PRNGKey(seed))
         if sampler_seed is None:
@@ -18,7 +18,8 @@ from functools import partial
 import jax
 from jax import numpy as jnp
 
-from netket.stats import Stats, statistics as mpi_statistics
+from netket.nn.utils import PRECOMPUTED, prepare_variables
+from netket.stats import Stats, mean as mpi_mean, statistics as mpi_statistics
 from netket.utils.types import PyTree
 from netket.utils.dispatch import dispatch
 
@@ -113,12 +114,34 @@ def expect(
         vstate._apply_fun,
         vstate.sampler.machine_pow,
         vstate.parameters,
-        vstate.model_state,
+        _prepared_model_state(vstate, σ),
         σ,
         args,
+        vstate.sample_weights,
     )
 
 
+@dispatch
+def _prepared_model_state(vstate: MCState, σ) -> PyTree:
+    """
+    Returns the model state of `vstate` including the quantities that only depend
+    on the parameters, precomputed by :func:`netket.nn.prepare_variables`, so that
+    they are computed once instead of at every evaluation of the local kernel.
+
+    The returned state must not be used to differentiate the model with respect
+    to the parameters. Use :func:`_without_precomputed` to strip it.
+
+    Variational states whose local kernels do not evaluate the model on the
+    configurations `σ` must override this to return their model state unchanged.
+    """
+    variables = prepare_variables(vstate._model, vstate.variables, σ)
+    return {k: v for k, v in variables.items() if k != "params"}
+
+
+def _without_precomputed(model_state: PyTree) -> PyTree:
+    return {k: v for k, v in model_state.items() if k != PRECOMPUTED}
+
+
 @partial(jax.jit, static_argnums=(0, 1))
 def _expect(
     local_value_kernel: Callable,
@@ -128,6 +151,7 @@ def _expect(
     model_state: PyTree,
     σ: jnp.ndarray,
     local_value_args: PyTree,
+    weights: jnp.ndarray | None = None,
 ) -> Stats:
     n_chains = σ.shape[0]
     if σ.ndim >= 3:
@@ -151,6 +175,27 @@ def _expect(
     # )
 
     L_σ = local_value_kernel(logpsi, parameters, σ, local_value_args)
+    if weights is not None:
+        return _weighted_statistics(
+            L_σ.reshape((n_chains, -1)), weights.reshape((n_chains, -1))
+        )
     Ō_stats = mpi_statistics(L_σ.reshape((n_chains, -1)))
 
     return Ō_stats
+
+
+def _weighted_statistics(O_loc: jnp.ndarray, weights: jnp.ndarray) -> Stats:
+    """
+    Statistics of the local estimators `O_loc` of reweighted samples, given their
+    importance `weights` normalized to have mean 1. Both arrays have shape
+    `(n_chains, n_samples_per_chain)`.
+
+    The mean and the variance are the weighted ones, estimating those of `O_loc`
+    under the current distribution. The error of the mean, the autocorrelation
+    time and R̂ are the ones of the weighted deviations `weights * (O_loc - mean)`,
+    whose variance is the one of the self-normalized estimator of the mean.
+    """
+    Ō = mpi_mean(weights * O_loc)
+    ΔO = O_loc - Ō
+    stats = mpi_statistics(weights * ΔO)
+    return stats.replace(mean=Ō, variance=mpi_mean(weights * jnp.abs(ΔO) ** 2))
@@ -44,6 +44,7 @@ from netket.vqs.mc import (
 )
 
 from .state import MCState
+from .expect import _weighted_statistics
 
 
 # Dispatches to select what expect-kernel to use
@@ -117,6 +118,7 @@ def expect_mcstate_operator_chunked(
         vstate.model_state,
         σ,
         args,
+        vstate.sample_weights,
     )
 
 
@@ -130,6 +132,7 @@ def _expect_chunking(
     model_state: PyTree,
     σ: jnp.ndarray,
     args: PyTree,
+    weights: jnp.ndarray | None = None,
 ) -> Stats:
     σ_shape = σ.shape
 
@@ -142,6 +145,12 @@ def _expect_chunking(
     def log_pdf(w, σ):
         return machine_pow * model_apply_fun({"params": w, **model_state}, σ).real
 
+    if weights is not None:
+        L_σ = local_value_kernel(logpsi, parameters, σ, args, chunk_size=chunk_size)
+        return _weighted_statistics(
+            L_σ.reshape(σ_shape[:-1]), weights.reshape(σ_shape[:-1])
+        )
+
     _, Ō_stats = nkjax.expect(
         log_pdf,
         partial(local_value_kernel, logpsi, chunk_size=chunk_size),
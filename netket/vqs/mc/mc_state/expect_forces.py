@@ -35,6 +35,11 @@ from netket.vqs.mc import (
 )
 
 from .state import MCState
+from .expect import (
+    _prepared_model_state,
+    _weighted_statistics,
+    _without_precomputed,
+)
 
 
 @dispatch
@@ -54,9 +59,10 @@ def expect_and_forces(  # noqa: F811
         vstate._apply_fun,
         mutable,
         vstate.parameters,
-        vstate.model_state,
+        _prepared_model_state(vstate, σ),
         σ,
         args,
+        vstate.sample_weights,
     )
 
     if mutable is not False:
@@ -74,6 +80,7 @@ def forces_expect_hermitian(
     model_state: PyTree,
     σ: jnp.ndarray,
     local_value_args: PyTree,
+    weights: jnp.ndarray | None = None,
 ) -> tuple[PyTree, PyTree]:
     n_chains = σ.shape[0]
     if σ.ndim >= 3:
@@ -88,13 +95,24 @@ def forces_expect_hermitian(
         local_value_args,
     )
 
-    Ō = statistics(O_loc.reshape((n_chains, -1)))
-
-    O_loc -= Ō.mean
+    if weights is None:
+        Ō = statistics(O_loc.reshape((n_chains, -1)))
+        O_loc -= Ō.mean
+    else:
+        # reweighted samples: both the estimate and the forces are averages
+        # weighted by the importance weights
+        weights = weights.reshape(O_loc.shape)
+        Ō = _weighted_statistics(
+            O_loc.reshape((n_chains, -1)), weights.reshape((n_chains, -1))
+        )
+        O_loc = weights * (O_loc - Ō.mean)
 
     # Then compute the vjp.
     # Code is a bit more complex than a standard one because we support
     # mutable state (if it's there)
+    # The precomputed quantities do not depend on the parameters, so they must
+    # not be used when differentiating.
+    model_state = _without_precomputed(model_state)
     is_mutable = mutable is not False
     _, vjp_fun, *new_model_state = nkjax.vjp(
         lambda w: model_apply_fun({"params": w, **model_state}, σ, mutable=mutable),
@@ -35,6 +35,7 @@ from netket.vqs.mc import (
 )
 
 from .state import MCState
+from .expect import _weighted_statistics
 
 
 # If batch_size is unspecified, set it to None
@@ -87,6 +88,7 @@ def expect_and_forces_impl(  # noqa: F811
         vstate.model_state,
         σ,
         args,
+        vstate.sample_weights,
     )
 
     if mutable is not False:
@@ -105,6 +107,7 @@ def forces_expect_hermitian_chunked(
     model_state: PyTree,
     σ: jnp.ndarray,
     local_value_args: PyTree,
+    weights: jnp.ndarray | None = None,
 ) -> tuple[PyTree, PyTree]:
     σ_shape = σ.shape
     if jnp.ndim(σ) != 2:
@@ -120,9 +123,17 @@ def forces_expect_hermitian_chunked(
         chunk_size=chunk_size,
     )
 
-    Ō = statistics(O_loc.reshape(σ_shape[:-1]))
-
-    O_loc -= Ō.mean
+    if weights is None:
+        Ō = statistics(O_loc.reshape(σ_shape[:-1]))
+        O_loc -= Ō.mean
+    else:
+        # reweighted samples: both the estimate and the forces are averages
+        # weighted by the importance weights
+        weights = weights.reshape(O_loc.shape)
+        Ō = _weighted_statistics(
+            O_loc.reshape(σ_shape[:-1]), weights.reshape(σ_shape[:-1])
+        )
+        O_loc = weights * (O_loc - Ō.mean)
 
     # Then compute the vjp.
     # Code is a bit more complex than a standard one because we support
@@ -103,6 +103,11 @@ def expect_and_grad_nonhermitian(
         )
 
     σ, args = get_local_kernel_arguments(vstate, Ô)
+    if vstate.sample_weights is not None:
+        raise NotImplementedError(
+            "The gradient of non-hermitian operators is not implemented for "
+            "reweighted samples."
+        )
 
     local_estimator_fun = get_local_kernel(vstate, Ô)
 
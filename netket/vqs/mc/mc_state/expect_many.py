@@ -0,0 +1,254 @@
+# Copyright 2021 The NetKet Authors - All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections.abc import Callable
+from functools import partial
+
+import numpy as np
+
+import jax
+from jax import numpy as jnp
+
+from netket import jax as nkjax
+from netket import config
+from netket.stats import Stats, statistics as mpi_statistics
+from netket.operator import DiscreteOperator, DiscreteJaxOperator
+from netket.operator._abstract_observable import AbstractObservable
+from netket.utils.types import PyTree
+from netket.vqs.mc import kernels, get_local_kernel, check_hilbert
+
+from .state import MCState
+from .expect import _weighted_statistics
+
+
+def _is_leaf(x):
+    # Do not unpack operators, even if they are pytrees!
+    return isinstance(x, AbstractObservable)
+
+
+def _is_batchable(vstate: MCState, Ô) -> bool:
+    """
+    Returns True if the expectation value of Ô is computed with the standard
+    local-value kernel of discrete operators, so that its connected elements
+    can be merged with those of other operators.
+    """
+    if not isinstance(Ô, DiscreteOperator):
+        return False
+    kernel = get_local_kernel(vstate, Ô)
+    return kernel in (kernels.local_value_kernel, kernels.local_value_kernel_jax)
+
+
+def expect_many(vstate: MCState, operators: PyTree) -> PyTree:
+    """
+    Estimates the expectation values of a pytree of operators, sharing the
+    evaluations of the model among all of them.
+
+    See :meth:`netket.vqs.MCState.expect_many` for the documentation.
+    """
+    leaves, treedef = jax.tree_util.tree_flatten(operators, is_leaf=_is_leaf)
+
+    batched = []
+    if not config.netket_experimental_sharding:
+        batched = [i for i, Ô in enumerate(leaves) if _is_batchable(vstate, Ô)]
+
+    results = [None] * len(leaves)
+    if len(batched) > 1:
+        stats = _expect_batched(vstate, [leaves[i] for i in batched])
+        for i, s in zip(batched, stats):
+            results[i] = s
+
+    for i, Ô in enumerate(leaves):
+        if results[i] is None:
+            results[i] = vstate.expect(Ô)
+
+    return jax.tree_util.tree_unflatten(treedef, results)
+
+
+def _expect_batched(vstate: MCState, operators: list) -> list[Stats]:
+    """
+    Computes the expectation values of several discrete operators by evaluating
+    the model only once on every distinct configuration connected to the samples
+    by any of the operators.
+    """
+    σ = vstate.samples
+    weights = vstate.sample_weights
+    n_chains = σ.shape[0]
+    σ = σ.reshape(-1, σ.shape[-1])
+    σ_host = np.asarray(σ)
+    n_samples = σ.shape[0]
+    chunk_size = vstate.chunk_size if vstate.chunk_size is not None else n_samples
+
+    # The distinct configurations are collected as the connected elements of
+    # every chunk of samples are computed, so that only those of one chunk of
+    # one operator are stored at any time. Connected configurations equal to
+    # their sample (such as the diagonal) are mapped to the sample directly.
+    table = _UniqueRows(σ_host)
+    idx_σ = table.add(σ_host)
+    all_mels = []
+    all_idx = []
+    for Ô in operators:
+        check_hilbert(vstate.hilbert, Ô.hilbert)
+        mels_chunks = []
+        idx_chunks = []
+        for start in range(0, n_samples, chunk_size):
+            chunk = slice(start, start + chunk_size)
+            σp, mels = _get_conn_padded(Ô, σ[chunk], σ_host[chunk])
+            idx = np.repeat(idx_σ[chunk, None], mels.shape[-1], axis=1)
+            is_σ = np.all(σp == σ_host[chunk, None, :], axis=-1)
+            connected = (mels != 0) & ~is_σ
+            idx[connected] = table.add(σp[connected])
+            mels_chunks.append(mels)
+            idx_chunks.append(idx)
+        all_mels.append(np.concatenate(mels_chunks, axis=0))
+        all_idx.append(np.concatenate(idx_chunks, axis=0))
+
+    σ_unique = table.rows
+    n_unique = σ_unique.shape[0]
+
+    # pad to a bucketed size to limit the number of recompilations
+    n_padded = _bucket_size(n_unique)
+    σ_unique = np.concatenate(
+        [σ_unique, np.repeat(σ_unique[:1], n_padded - n_unique, axis=0)], axis=0
+    )
+    logpsi_unique = _logpsi_chunked(
+        vstate._apply_fun, vstate.chunk_size, vstate.variables, σ_unique
+    )
+
+    stats = []
+    for mels, idx in zip(all_mels, all_idx):
+        O_loc = _local_values(logpsi_unique, idx_σ, idx, mels)
+        stats.append(_statistics(O_loc, weights, n_chains))
+
+    return stats
+
+
+def _get_conn_padded(
+    Ô: DiscreteOperator, σ: jax.Array, σ_host: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the connected elements of the samples on the host, computing them
+    on the device for jax operators.
+    """
+    if isinstance(Ô, DiscreteJaxOperator):
+        σp, mels = _get_conn_padded_jax(Ô, σ)
+    else:
+        σp, mels = Ô.get_conn_padded(σ_host)
+    return np.asarray(σp), np.asarray(mels)
+
+
+@jax.jit
+def _get_conn_padded_jax(Ô: DiscreteJaxOperator, σ: jax.Array):
+    return Ô.get_conn_padded(σ)
+
+
+class _UniqueRows:
+    """
+    Incrementally collects the distinct rows of several arrays.
+
+    Rows are identified by sorting 64-bit hashes of their bytes, which is much
+    faster than sorting the rows themselves. In the unlikely case of a collision
+    of the hashes, the colliding row is stored again as a new distinct row, which
+    only costs an additional evaluation of the model.
+    """
+
+    def __init__(self, x: np.ndarray):
+        n_bytes = x[:1].view(np.uint8).size
+        self._coeffs = np.random.default_rng(0).integers(
+            1, 2**63, size=n_bytes, dtype=np.uint64
+        )
+        # sorted hashes, and index of the row of every hash
+        self._keys = np.zeros((0,), dtype=np.uint64)
+        self._keys_index = np.zeros((0,), dtype=np.intp)
+        # the rows are stored in a buffer whose capacity is doubled when full
+        self._buffer = np.zeros((0, x.shape[-1]), dtype=x.dtype)
+        self._n_rows = 0
+
+    @property
+    def rows(self) -> np.ndarray:
+        """The distinct rows collected so far."""
+        return self._buffer[: self._n_rows]
+
+    def _append(self, x: np.ndarray) -> np.ndarray:
+        n = self._n_rows + x.shape[0]
+        if n > self._buffer.shape[0]:
+            shape = (max(n, 2 * self._buffer.shape[0]), x.shape[-1])
+            buffer = np.zeros(shape, dtype=self._buffer.dtype)
+            buffer[: self._n_rows] = self.rows
+            self._buffer = buffer
+        self._buffer[self._n_rows : n] = x
+        index = np.arange(self._n_rows, n)
+        self._n_rows = n
+        return index
+
+    def add(self, x: np.ndarray) -> np.ndarray:
+        """
+        Adds the rows of x, returning the index of every row among the distinct
+        rows.
+        """
+        x = np.ascontiguousarray(x, dtype=self._buffer.dtype)
+        keys = x.view(np.uint8).reshape(x.shape[0], self._coeffs.size)
+        keys = keys.astype(np.uint64)
+        keys = keys @ self._coeffs
+        keys, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+
+        # look up the hashes that were already seen
+        pos = np.searchsorted(self._keys, keys)
+        found = pos < self._keys.shape[0]
+        found[found] = self._keys[pos[found]] == keys[found]
+        index = np.empty(keys.shape, dtype=np.intp)
+        index[found] = self._keys_index[pos[found]]
+        index[~found] = self._append(x[first[~found]])
+
+        self._keys = np.insert(self._keys, pos[~found], keys[~found])
+        self._keys_index = np.insert(self._keys_index, pos[~found], index[~found])
+
+        index = index[inverse.reshape(-1)]
+        collided = np.any(self._buffer[index] != x, axis=-1)
+        if np.any(collided):
+            index[collided] = self._append(x[collided])
+        return index
+
+
+def _bucket_size(n: int) -> int:
+    """
+    Rounds n up to a number with at most 4 significant binary digits.
+    """
+    step = 2 ** max(0, n.bit_length() - 4)
+    return -(-n // step) * step
+
+
+@partial(jax.jit, static_argnums=(0, 1))
+def _logpsi_chunked(
+    apply_fun: Callable, chunk_size: int | None, variables: PyTree, σ: jax.Array
+) -> jax.Array:
+    return nkjax.apply_chunked(
+        apply_fun, in_axes=(None, 0), chunk_size=chunk_size, axis_0_is_sharded=False
+    )(variables, σ)
+
+
+@jax.jit
+def _local_values(logpsi_unique, idx_σ, idx, mels):
+    logpsi_σ = logpsi_unique[idx_σ]
+    logpsi_σp = logpsi_unique[idx]
+    terms = mels * jnp.exp(logpsi_σp - jnp.expand_dims(logpsi_σ, -1))
+    return jnp.sum(jnp.where(mels != 0, terms, 0), axis=-1)
+
+
+@partial(jax.jit, static_argnums=2)
+def _statistics(O_loc, weights, n_chains):
+    if weights is not None:
+        return _weighted_statistics(
+            O_loc.reshape((n_chains, -1)), weights.reshape((n_chains, -1))
+        )
+    return mpi_statistics(O_loc.reshape((n_chains, -1)))
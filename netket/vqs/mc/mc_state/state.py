@@ -32,6 +32,7 @@ from netket.stats import Stats
 from netket.operator import AbstractOperator, Squared
 from netket.sampler import Sampler, SamplerState
 from netket.utils import (
+    mpi,
     model_frameworks,
     wrap_afun,
     wrap_to_support_scalar,
@@ -161,6 +162,15 @@ class MCState(VariationalState):
     #############
     _samples: jax.Array | None = None
     """Cached samples obtained with the last sampling."""
+    _samples_log_prob: jax.Array | None = None
+    """Log-probabilities of the cached samples when they were sampled, only stored
+    if the samples are reweighted."""
+    _sample_weights: jax.Array | None = None
+    """Importance weights of the cached samples, or None if they are unweighted."""
+    _sample_weights_outdated: bool = False
+    """Whether the parameters changed since the importance weights were computed."""
+    _reweighting_threshold: float | None = None
+    """Effective sample size below which reweighted samples are discarded."""
 
     def __init__(
         self,
@@ -178,6 +188,7 @@ class MCState(VariationalState):
         sampler_seed: SeedT | None = None,
         mutable: CollectionFilter = False,
         training_kwargs: dict = {},
+        reweighting_threshold: float | None = None,
     ):
         """
         Constructs the MCState.
@@ -208,9 +219,21 @@ class MCState(VariationalState):
             chunk_size: (Defaults to `None`) If specified, calculations are split into chunks where the neural network
                 is evaluated at most on :code:`chunk_size` samples at once. This does not change the mathematical results,
                 but will trade a higher computational cost for lower memory cost.
+            reweighting_threshold: (Defaults to `None`) If specified, the samples are
+                not discarded when the parameters change, but are reused with
+                importance weights until their normalized effective sample size falls
+                below this threshold, between 0 and 1. See
+                :attr:`~MCState.sample_weights`.
         """
         super().__init__(sampler.hilbert)
 
+        if reweighting_threshold is not None and not 0 < reweighting_threshold <= 1:
+            raise ValueError(
+                f"reweighting_threshold ({reweighting_threshold}) must be between "
+                "0 and 1."
+            )
+        self._reweighting_threshold = reweighting_threshold
+
         # TODO: Move this somewhere else below?
         # If variables is specified manually, we will enforce that it's leafs are
         # jax arrays and that it has the good 'replicated sharding'
@@ -395,6 +418,7 @@ class MCState(VariationalState):
         if self._chain_length > 0:
             self.n_samples = n_samples_old  # type: ignore
 
+        self._samples = None
         self.reset()
 
     @property
@@ -435,6 +459,7 @@ class MCState(VariationalState):
         check_chunk_size(n_samples, self.chunk_size)
 
         self._chain_length = chain_length
+        self._samples = None
         self.reset()
 
     @property
@@ -510,12 +535,28 @@ class MCState(VariationalState):
 
         self._chunk_size = chunk_size
 
+    @property
+    def reweighting_threshold(self) -> float | None:
+        """
+        Threshold on the normalized effective sample size of the importance weights
+        below which the state is sampled again, or None if the samples are discarded
+        every time the parameters change (see :attr:`~MCState.sample_weights`).
+        """
+        return self._reweighting_threshold
+
     def reset(self):
         """
         Resets the sampled states. This method is called automatically every time
         that the parameters/state is updated.
+
+        If the state was constructed with a `reweighting_threshold`, the samples
+        are kept and their importance weights are recomputed the next time they
+        are used.
         """
-        self._samples = None
+        if self._reweighting_threshold is None or self._samples is None:
+            self._samples = None
+        else:
+            self._sample_weights_outdated = True
 
     @timing.timed
     def sample(
@@ -569,12 +610,25 @@ class MCState(VariationalState):
                 # This won't actually block unless we are really timing
                 timer.block_until_ready(_)
 
-        self._samples, self.sampler_state = self.sampler.sample(
-            self._sampler_model,
-            self._sampler_variables,
-            state=self.sampler_state,
-            chain_length=chain_length,
-        )
+        if self._reweighting_threshold is None:
+            self._samples, self.sampler_state = self.sampler.sample(
+                self._sampler_model,
+                self._sampler_variables,
+                state=self.sampler_state,
+                chain_length=chain_length,
+            )
+        else:
+            (self._samples, self._samples_log_prob), self.sampler_state = (
+                self.sampler.sample(
+                    self._sampler_model,
+                    self._sampler_variables,
+                    state=self.sampler_state,
+                    chain_length=chain_length,
+                    return_log_probabilities=True,
+                )
+            )
+        self._sample_weights = None
+        self._sample_weights_outdated = False
         return self._samples
 
     @property
@@ -591,8 +645,64 @@ class MCState(VariationalState):
         """
         if self._samples is None:
             self.sample()
+        elif self._sample_weights_outdated:
+            self._update_sample_weights()
         return self._samples  # type: ignore[return-value]
 
+    @property
+    def sample_weights(self) -> jax.Array | None:
+        r"""
+        Returns the importance weights of the cached samples, or None if the
+        samples are distributed according to the current state.
+
+        If the state was constructed with a `reweighting_threshold`, the samples
+        are not discarded when the parameters change. The samples :math:`\sigma`,
+        drawn from the distribution :math:`P_{\text{old}}` of the parameters at
+        the time of sampling, are instead reused with the importance weights
+
+        .. math::
+
+            w(\sigma) = \frac{P_{\text{new}}(\sigma)}{P_{\text{old}}(\sigma)}
+                \propto \left|\frac{\psi_{\text{new}}(\sigma)}
+                {\psi_{\text{old}}(\sigma)}\right|^{p},
+
+        where :math:`p` is the `machine_pow` of the sampler. The weights are
+        normalized to have mean 1, and the samples are reused until the normalized
+        effective sample size of the weights falls below the threshold, when the
+        state is sampled again.
+
+        The weights have the same shape as :attr:`~MCState.samples` without the last
+        dimension, and are taken into account by :meth:`~MCState.expect`,
+        :meth:`~MCState.expect_and_grad`, :meth:`~MCState.expect_and_forces` and by
+        the quantum geometric tensors. The variance reported by
+        :meth:`~MCState.expect` is the weighted one, while the error of the mean,
+        the autocorrelation time and R̂ are computed from the weighted deviations
+        from the mean. :meth:`~MCState.local_estimators`, which cannot account for
+        the weights, raises an error when they are present.
+        """
+        if self._samples is not None and self._sample_weights_outdated:
+            self._update_sample_weights()
+        return self._sample_weights
+
+    def _update_sample_weights(self):
+        """
+        Recomputes the importance weights of the cached samples for the current
+        parameters, sampling again if their effective sample size is too small.
+        """
+        weights, ess = _importance_weights(
+            self._apply_fun,
+            self.chunk_size,
+            self.sampler.machine_pow,
+            self.variables,
+            self._samples,
+            self._samples_log_prob,
+        )
+        if ess < self._reweighting_threshold:
+            self.sample()
+        else:
+            self._sample_weights = weights
+            self._sample_weights_outdated = False
+
     def log_value(self, σ: jnp.ndarray) -> jnp.ndarray:
         r"""
         Evaluate the variational state for a batch of states and returns
@@ -629,6 +739,9 @@ class MCState(VariationalState):
             (Use functions like :code:`self.expect` to get process-independent quantities without
             manual reductions.)
 
+        Raises a :class:`ValueError` if the samples are reweighted (see
+        :attr:`~MCState.sample_weights`), as their plain averages would be biased.
+
         Args:
             op: The operator.
             chunk_size: Suggested maximum size of the chunks used in forward and backward evaluations
@@ -656,6 +769,28 @@ class MCState(VariationalState):
         """
         return expect(self, O, self.chunk_size)
 
+    @timing.timed
+    def expect_many(self, operators: PyTree) -> PyTree:
+        r"""Estimates the quantum expectation values of several operators at once.
+
+        This is equivalent to calling :meth:`expect` on every operator, but
+        the connected configurations of all discrete operators using the standard
+        local estimator are merged and deduplicated, and the model is evaluated
+        only once on every distinct configuration. This is much faster when
+        estimating many operators with few connected elements, such as
+        correlation functions. Other operators are estimated one by one.
+
+        Args:
+            operators: A pytree (such as a list or dictionary) of operators.
+
+        Returns:
+            A pytree with the same structure as `operators`, containing the
+            estimates of the corresponding expectation values.
+        """
+        from .expect_many import expect_many
+
+        return expect_many(self, operators)
+
     # override to use chunks
     @timing.timed
     def expect_and_grad(
@@ -802,6 +937,13 @@ def _local_estimators_kernel(kernel, apply_fun, shape, variables, samples, extra
 
 
 def local_estimators(state: MCState, op: AbstractOperator, *, chunk_size: int | None):
+    if state.sample_weights is not None:
+        raise ValueError(
+            "The local estimators of reweighted samples cannot be averaged without "
+            "their importance weights `sample_weights`. Use `expect` instead, or "
+            "call `sample()` to draw samples from the current distribution."
+        )
+
     s, extra_args = get_local_kernel_arguments(state, op)
 
     shape = s.shape
@@ -824,6 +966,27 @@ def local_estimators(state: MCState, op: AbstractOperator, *, chunk_size: int |
     )
 
 
+@partial(jax.jit, static_argnums=(0, 1))
+def _importance_weights(
+    apply_fun, chunk_size, machine_pow, variables, samples, log_prob_old
+):
+    """
+    Computes the importance weights of `samples` with respect to the distribution
+    `log_prob_old` they were sampled from, normalized to have mean 1 across all
+    MPI ranks, and their normalized effective sample size.
+    """
+    log_psi = nkjax.apply_chunked(
+        apply_fun, in_axes=(None, 0), chunk_size=chunk_size
+    )(variables, samples.reshape(-1, samples.shape[-1]))
+    log_w = machine_pow * log_psi.real.reshape(log_prob_old.shape) - log_prob_old
+
+    log_w_max, _ = mpi.mpi_max_jax(jnp.max(log_w))
+    w = jnp.exp(log_w - log_w_max)
+    w = w / mpi.mpi_mean_jax(jnp.mean(w))[0]
+    ess = 1 / mpi.mpi_mean_jax(jnp.mean(w**2))[0]
+    return w, ess
+
+
 # serialization
 def serialize_MCState(vstate):
     # Necessary for correctly syncronising samples without serialising
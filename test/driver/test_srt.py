@@ -258,3 +258,29 @@ def test_SRt_supports_netket_solvers():
         linear_solver_fn=nk.optimizer.solver.pinv_smooth,
     )
     gs.run(5)
+
+
+def test_SRt_mixed_precision_jacobian():
+    """
+    Storing the jacobian in single precision must give the same updates up to
+    single-precision accuracy.
+    """
+    H, opt, vstate = _setup()
+    gs = VMC_SRt(H, opt, variational_state=vstate, diag_shift=0.1)
+    dp = gs._forward_and_backward()
+
+    H, opt, vstate_mixed = _setup()
+    gs_mixed = VMC_SRt(
+        H,
+        opt,
+        variational_state=vstate_mixed,
+        diag_shift=0.1,
+        jacobian_dtype=jnp.float32,
+    )
+    dp_mixed = gs_mixed._forward_and_backward()
+
+    def check(a, b):
+        assert a.dtype == b.dtype
+        np.testing.assert_allclose(a, b, rtol=1e-4, atol=1e-6)
+
+    jax.tree_util.tree_map(check, dp, dp_mixed)
@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from functools import partial
+
 import pytest
 
 import netket as nk
@@ -21,6 +23,9 @@ from math import pi
 import numpy as np
 import igraph as ig
 
+import jax
+import jax.numpy as jnp
+
 from netket.graph import (
     Graph,
     Hypercube,
@@ -31,6 +36,7 @@ from netket.graph import (
     Honeycomb,
     Kagome,
     KitaevHoneycomb,
+    Pyrochlore,
 )
 from netket.graph import _lattice
 from netket.utils import group
@@ -228,6 +234,37 @@ def test_lattice_site_lookup():
         pos = g.position_from_basis_coords([[2]])
 
 
+@pytest.mark.parametrize("g", graphs + symmetric_graphs)
+def test_lattice_site_lookup_vectorised(g):
+    if not isinstance(g, Lattice):
+        return
+    ids = np.arange(g.n_nodes)
+    np.testing.assert_array_equal(g.id_from_position(g.positions), ids)
+    np.testing.assert_array_equal(g.id_from_basis_coords(g.basis_coords), ids)
+    assert g.id_from_position(g.positions[1]) == 1
+
+    # batched input of arbitrary shape, also under jit
+    pos = g.positions.reshape(-1, 1, g.ndim)
+    np.testing.assert_array_equal(g.id_from_position(pos), ids.reshape(-1, 1))
+    np.testing.assert_array_equal(
+        jax.jit(g.id_from_position)(jnp.asarray(pos)), ids.reshape(-1, 1)
+    )
+    np.testing.assert_array_equal(
+        jax.jit(g.id_from_basis_coords)(jnp.asarray(g.basis_coords)), ids
+    )
+
+    # invalid positions are marked with -1 under jit
+    shifted = jnp.asarray(g.positions + 0.1 * g.basis_vectors[0])
+    assert np.all(jax.jit(g.id_from_position)(shifted) == -1)
+
+    if np.all(g.pbc):
+        translated = g.positions + g.basis_vectors[0]
+        np.testing.assert_array_equal(
+            jax.jit(g.id_from_position)(jnp.asarray(translated)),
+            g.id_from_position(translated),
+        )
+
+
 @pytest.mark.parametrize("i,name", list(enumerate(symmetric_graph_names)))
 def test_lattice_symmetry(i, name):
     graph = symmetric_graphs[i]
@@ -313,6 +350,54 @@ def test_graph_wrong():
         nk.graph.Chain([5])
 
 
+def test_graph_from_edge_array():
+    edges = [(0, 1, 0), (1, 2, 1), (2, 3, 0), (3, 0, 2)]
+    g_list = nk.graph.Graph(edges)
+    g_array = nk.graph.Graph(np.array(edges))
+    assert g_array.n_nodes == g_list.n_nodes
+    assert g_array.edges(return_color=True) == g_list.edges(return_color=True)
+    assert all(isinstance(c, int) for c in g_array.edge_colors)
+
+    g_array = nk.graph.Graph(np.array(edges)[:, :2], n_nodes=6)
+    assert g_array.n_nodes == 6
+    assert g_array.edges() == nk.graph.Graph([e[:2] for e in edges]).edges()
+
+    with pytest.raises(ValueError):
+        nk.graph.Graph(np.zeros((3, 4), dtype=int))
+    with pytest.raises(TypeError):
+        nk.graph.Graph(np.zeros((3, 2)))
+
+
+@pytest.mark.parametrize(
+    "lattice",
+    [
+        partial(Kagome, [3, 4]),
+        partial(Honeycomb, [4, 3]),
+        partial(Triangular, [5, 4]),
+        partial(Pyrochlore, [2, 2, 2]),
+        partial(Grid, [3, 4, 2]),
+    ],
+)
+@pytest.mark.parametrize("order", [1, 2, 3])
+def test_lattice_nn_edges_brute_force(lattice, order):
+    g = lattice(pbc=False, max_neighbor_order=order)
+
+    # for open boundary conditions, the edges of color k connect all pairs of
+    # sites at the (k+1)-th smallest distance
+    pos = g.positions
+    dist = np.linalg.norm(pos[:, None, :] - pos[None, :, :], axis=-1)
+    i, j = np.triu_indices(g.n_nodes, k=1)
+    shells = np.unique(np.round(dist[i, j], 8))
+    expected = set()
+    for k in range(order):
+        mask = np.isclose(dist[i, j], shells[k])
+        expected |= {(a, b, k) for a, b in zip(i[mask], j[mask])}
+
+    edges = {(min(a, b), max(a, b), c) for a, b, c in g.edges(return_color=True)}
+    assert g.n_edges == len(expected)
+    assert edges == expected
+
+
 def test_edges_are_correct():
     def check_edges(length, n_dim, pbc):
         x = nx.grid_graph(dim=[length] * n_dim, periodic=pbc)
@@ -502,6 +587,30 @@ def test_automorphisms(graph):
         assert is_automorphism(f, graph)
 
 
+@pytest.mark.parametrize(
+    "graph",
+    [
+        Hypercube(length=3, n_dim=2, pbc=True, max_neighbor_order=2),
+        Honeycomb(extent=[2, 2]),
+        Pyrochlore(extent=[2, 2, 2]),
+        Grid([4, 2], pbc=False, color_edges=True),
+        Graph(edges=[(i, j) for i in range(6) for j in range(i)]),
+        Graph(edges=[(0, 1, 0), (1, 2, 1), (2, 3, 0), (3, 0, 1), (0, 2, 2)]),
+        Edgeless(4),
+    ],
+)
+def test_automorphisms_vf2(graph):
+    # compare with the explicit enumeration of all automorphisms
+    colors = graph.edge_colors
+    expected = graph._igraph.get_isomorphisms_vf2(
+        edge_color1=colors, edge_color2=colors
+    )
+    expected = np.unique(expected, axis=0)
+
+    autom = np.asarray(graph.automorphisms())
+    np.testing.assert_array_equal(autom, expected)
+
+
 def _check_symmgroup(autom, symmgroup):
     """Asserts that symmgroup consists of automorphisms listed in autom and has no duplicate elements."""
 
@@ -474,6 +474,21 @@ def test_local_indices_to_states(hi):
         np.testing.assert_allclose(local_states[idxs[..., s]], x[..., s])
 
 
+@pytest.mark.parametrize("hi", discrete_hilbert_params)
+def test_pack_states(hi):
+    if not hi.is_packable:
+        with pytest.raises(ValueError):
+            hi.pack_states(hi.random_state(jax.random.PRNGKey(3), 2))
+        return
+
+    x = hi.random_state(jax.random.PRNGKey(3), (200))
+    x_packed = hi.pack_states(x)
+    assert x_packed.dtype == np.uint32
+    assert x_packed.shape == (200, -(-hi.size // 32))
+
+    np.testing.assert_array_equal(hi.unpack_states(x_packed, dtype=x.dtype), x)
+
+
 @pytest.mark.parametrize("inverted_ordering", [True, False])
 def test_spin_state_iteration(inverted_ordering: bool):
     hilbert = Spin(s=0.5, N=5, inverted_ordering=inverted_ordering)
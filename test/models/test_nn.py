@@ -400,6 +400,33 @@ def test_modes_DenseEquivariant(lattice, symmetries):
     np.testing.assert_allclose(fft_out, matrix_out)
 
 
+@pytest.mark.parametrize("symmetries", ["trans", "space_group"])
+def test_prepare_variables_fft(symmetries):
+    rng = nk.jax.PRNGSeq(0)
+    g, hi, perms = _setup_symm(symmetries, N=3, lattice=nk.graph.Square)
+
+    ma = nk.models.GCNN(
+        symmetries=perms,
+        mode="fft",
+        shape=tuple(g.extent),
+        layers=2,
+        features=2,
+        param_dtype=complex,
+    )
+    x = hi.random_state(rng.next(), 4)
+    variables = ma.init(rng.next(), x)
+    # the spectra of the kernels are never stored by init
+    assert "precomputed" not in variables
+
+    prepared = nk.nn.prepare_variables(ma, variables, x)
+    assert "precomputed" in prepared
+    np.testing.assert_allclose(ma.apply(prepared, x), ma.apply(variables, x))
+
+    # the spectra are not added to the state by fully mutable applies
+    _, state = ma.apply(variables, x, mutable=True)
+    assert "precomputed" not in state
+
+
 def test_deprecated_inout_features_DenseEquivariant():
     perms = nk.graph.Chain(3).translation_group()
 
@@ -1009,3 +1009,41 @@ def test_fermion_ordering():
     np.testing.assert_allclose(op1_ordered.to_dense(), op1.to_dense())
     np.testing.assert_allclose(op1_ordered.to_dense(), op2.to_dense())
     _dict_compare(op1_ordered.operators, op2.operators, 1e-8)
+
+
+def test_fermion_array_terms():
+    from netket.operator._fermion2nd.utils import _normal_ordering
+
+    hi = nk.hilbert.SpinOrbitalFermions(4)
+    rng = np.random.default_rng(1234)
+    # terms of different lengths, with repeated operators and contractions
+    terms = [
+        tuple((int(i), int(d)) for i, d in rng.integers([4, 2], size=(length, 2)))
+        for length in rng.integers(0, 5, size=50)
+    ]
+    weights = rng.normal(size=50) + 1j * rng.normal(size=50)
+    op = nk.operator.FermionOperator2nd(hi, terms, weights)
+
+    op_ordered = op.to_normal_order()
+    ref = nk.operator.FermionOperator2nd(hi, *_normal_ordering(terms, weights))
+    assert _dict_compare(op_ordered.operators, ref.operators, 1e-10)
+    np.testing.assert_allclose(op_ordered.to_dense(), op.to_dense(), atol=1e-10)
+
+    # terms given as an integer array
+    terms = rng.integers(4, size=(20, 4))
+    daggers = np.broadcast_to([1, 1, 0, 0], (20, 4))
+    weights = rng.normal(size=20)
+    op1 = nk.operator.FermionOperator2ndJax(
+        hi, np.stack([terms, daggers], axis=-1), weights
+    )
+    op2 = nk.operator.FermionOperator2ndJax(
+        hi,
+        [tuple(zip(t, d)) for t, d in zip(terms.tolist(), daggers.tolist())],
+        weights,
+    )
+    assert _dict_compare(op1.operators, op2.operators, 1e-10)
+    np.testing.assert_allclose(op1.to_dense(), op2.to_dense())
+
+    h = op1 + op1.transpose(concrete=True)
+    assert h.is_hermitian
+    assert not op1.is_hermitian
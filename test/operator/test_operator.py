@@ -18,6 +18,11 @@ g = nk.graph.Hypercube(length=10, n_dim=1, pbc=True)
 hi = nk.hilbert.Spin(s=0.5, N=g.n_nodes)
 operators["Ising 1D"] = nk.operator.Ising(hi, g, h=1.321)
 operators["Ising 1D Jax"] = nk.operator.IsingJax(hi, g, h=1.321)
+operators["Sum Jax (Ising+PauliStrings)"] = nk.operator.SumOperatorJax(
+    nk.operator.Ising(hi, g, h=1.321),
+    nk.operator.PauliStringsJax(hi, ["X" + "I" * 9, "ZZ" + "I" * 8], [0.5, -0.3]),
+    coefficients=[1.0, 2.0],
+)
 
 
 # Heisenberg 1D
@@ -424,6 +429,54 @@ def test_operator_on_subspace():
     assert h4.acting_on == h1.acting_on
 
 
+def test_sum_operator_jax():
+    g = nk.graph.Chain(6)
+    hi = nk.hilbert.Spin(0.5, g.n_nodes)
+    ops = [
+        nk.operator.Ising(hi, g, h=1.0),
+        nk.operator.PauliStringsJax(hi, ["XIIIII", "ZZIIII", "IYYIII"], [0.5, 0.3, 2]),
+        nk.operator.spin.sigmax(hi, 2).to_jax_operator(),
+    ]
+    coeffs = [1.0, 2.0, -0.5]
+    ha = nk.operator.SumOperatorJax(*ops, coefficients=coeffs)
+    assert ha.max_conn_size == 7 + 3 + 1
+    assert len((ha + ops[0]).operators) == 4
+
+    dense = sum(c * np.asarray(op.to_dense()) for c, op in zip(coeffs, ops))
+    np.testing.assert_allclose(ha.to_dense(), dense)
+    np.testing.assert_allclose((2 * ha).to_dense(), 2 * dense)
+
+    # the diagonal comes first, and no configuration appears twice
+    x = hi.all_states()
+    xp, mels = jax.jit(lambda ha, x: ha.get_conn_padded(x))(ha, x)
+    np.testing.assert_allclose(mels[:, 0], np.diag(dense))
+    np.testing.assert_array_equal(xp[:, 0], x)
+    for xp_i, mels_i in zip(np.asarray(xp), np.asarray(mels)):
+        xp_i = xp_i[mels_i != 0]
+        assert len(np.unique(xp_i, axis=0)) == len(xp_i)
+
+
+def test_sum_operator_jax_from_add():
+    g = nk.graph.Chain(4)
+    hi = nk.hilbert.Spin(0.5, g.n_nodes)
+    ising = nk.operator.IsingJax(hi, g, h=1.0)
+    pauli = nk.operator.PauliStrings(hi, ["XIII", "ZZII"], [0.5, 0.3])
+    local = nk.operator.spin.sigmax(hi, 2).to_jax_operator()
+
+    dense = np.asarray(ising.to_dense() + pauli.to_dense())
+    for ha in [ising + pauli, pauli + ising, pauli + local, local - pauli]:
+        assert isinstance(ha, nk.operator.SumOperatorJax)
+    np.testing.assert_allclose((ising + pauli).to_dense(), dense)
+    np.testing.assert_allclose((pauli + ising).to_dense(), dense)
+    np.testing.assert_allclose(
+        (local - pauli).to_dense(), local.to_dense() - pauli.to_dense()
+    )
+
+    # sums within the same family are unchanged
+    assert isinstance(pauli + pauli, nk.operator.PauliStrings)
+    assert isinstance(ising + local, nk.operator.LocalOperatorJax)
+
+
 @pytest.mark.parametrize(
     "op", [pytest.param(op, id=name) for name, op in op_jax_compatible.items()]
 )
@@ -622,3 +675,27 @@ def test_operator_jax_n_conn(op):
     assert np.less_equal(n_conn_j, n_conn).all()
     # FIXME: uncomment once the numba implementation is fixed
     # np.testing.assert_equal(n_conn_j, n_conn)
+
+
+@pytest.mark.parametrize(
+    "op",
+    [
+        pytest.param(op, id=name)
+        for name, op in op_jax_compatible.items()
+        if op.hilbert.is_packable
+    ],
+)
+def test_operator_jax_get_conn_padded_packed(op):
+    """Check that the packed connected elements match the unpacked ones"""
+    op_jax = op.to_jax_operator()
+    hi = op.hilbert
+
+    states = hi.random_state(jax.random.PRNGKey(0), (3, 4))
+    sp, mels = op_jax.get_conn_padded(states)
+    sp_packed, mels_packed = jax.jit(lambda o, x: o.get_conn_padded_packed(x))(
+        op_jax, hi.pack_states(states)
+    )
+
+    assert sp_packed.shape == sp.shape[:-1] + (-(-hi.size // 32),)
+    np.testing.assert_allclose(mels_packed, mels)
+    np.testing.assert_array_equal(hi.unpack_states(sp_packed, dtype=sp.dtype), sp)
@@ -449,3 +449,38 @@ def test_cutoff_constrained(Op):
     xp, mels = ha.get_conn_padded(x)
     np.testing.assert_array_equal(mels, 0)
     np.testing.assert_array_equal(xp, x[None])
+
+
+@pytest.mark.parametrize("n_sites", [9, 40])
+def test_pauli_matmul_symplectic(n_sites):
+    from netket.operator._pauli_strings.base import _matmul
+
+    rng = np.random.default_rng(1)
+    strings = ["".join(rng.choice(list("IXYZ"), n_sites)) for _ in range(40)]
+    op1 = nk.operator.PauliStrings(strings + strings[:5], rng.normal(size=45))
+    op2 = nk.operator.PauliStrings(strings[10:30], rng.normal(size=20) + 1j)
+
+    # duplicates are merged and the strings sorted
+    assert len(op1.operators) == 40
+    assert list(op1.operators) == sorted(op1.operators)
+
+    op = op1 @ op2
+    assert list(op.operators) == sorted(op.operators)
+    if n_sites < 10:
+        np.testing.assert_allclose(op.to_dense(), op1.to_dense() @ op2.to_dense())
+
+    # computing the products in chunks gives the same result
+    x, z, weights = _matmul(
+        op1._symplectic, op1.weights, op2._symplectic, op2.weights, dtype=op.dtype
+    )
+    x_c, z_c, weights_c = _matmul(
+        op1._symplectic,
+        op1.weights,
+        op2._symplectic,
+        op2.weights,
+        dtype=op.dtype,
+        chunk_size=50,
+    )
+    np.testing.assert_array_equal(x_c, x)
+    np.testing.assert_array_equal(z_c, z)
+    np.testing.assert_allclose(weights_c, weights)
@@ -68,3 +68,61 @@ def test_pyscf_default():
 
     # check that ED gives same value as FCI in pyscf
     np.testing.assert_allclose(E_fci, nk.exact.lanczos_ed(ha))
+
+
+@pytest.mark.parametrize("chunk_size", [5, 2**22])
+@pytest.mark.parametrize(
+    "cls", [nk.operator.FermionOperator2nd, nk.operator.FermionOperator2ndJax]
+)
+def test_operator_from_integrals(cls, chunk_size, tmp_path):
+    from netket.experimental.operator.pyscf import (
+        operator_from_integrals,
+        _pair_index,
+    )
+
+    n = 3
+    rng = np.random.default_rng(123)
+    tij = rng.normal(size=(n, n))
+    tij = tij + tij.T
+    # two-body integrals (pq|rs) with the 8-fold symmetry of real orbitals
+    v = rng.normal(size=(n, n, n, n))
+    v = v + v.transpose(1, 0, 2, 3)
+    v = v + v.transpose(0, 1, 3, 2)
+    v = v + v.transpose(2, 3, 0, 1)
+    p, q, r, s = np.indices(v.shape).reshape(4, -1)
+    eri = np.zeros(_pair_index(n * (n + 1) // 2, 0))
+    eri[_pair_index(_pair_index(p, q), _pair_index(r, s))] = v[p, q, r, s]
+
+    hi = nk.hilbert.SpinOrbitalFermions(n, s=1 / 2, n_fermions_per_spin=(1, 2))
+    ha_ref = 0.7
+    for σ in (-1, 1):
+        for τ in (-1, 1):
+            for i, j, k, l in zip(p, q, r, s):
+                ha_ref += (
+                    0.5
+                    * v[i, l, j, k]
+                    * nk.operator.fermion.create(hi, i, sz=σ)
+                    @ nk.operator.fermion.create(hi, j, sz=τ)
+                    @ nk.operator.fermion.destroy(hi, k, sz=τ)
+                    @ nk.operator.fermion.destroy(hi, l, sz=σ)
+                )
+        for i, j in np.ndindex(n, n):
+            ha_ref += (
+                tij[i, j]
+                * nk.operator.fermion.create(hi, i, sz=σ)
+                @ nk.operator.fermion.destroy(hi, j, sz=σ)
+            )
+
+    ha = operator_from_integrals(
+        0.7, tij, eri, (1, 2), cls=cls, chunk_size=chunk_size
+    )
+    assert isinstance(ha, cls)
+    assert ha.hilbert == hi
+    assert ha.is_hermitian
+    np.testing.assert_allclose(ha.to_dense(), ha_ref.to_dense(), atol=1e-10)
+
+    ha = operator_from_integrals(
+        0.7, tij, eri, (1, 2), cls=cls, memmap_file=str(tmp_path / "ha")
+    )
+    assert isinstance(ha._term_arrays[0], np.memmap)
+    np.testing.assert_allclose(ha.to_dense(), ha_ref.to_dense(), atol=1e-10)
@@ -58,6 +58,9 @@ QGT_objects["JacobianDense(diag_scale=0.01)"] = partial(
 QGT_objects["JacobianDense(diag_scale=0.01, diag_shift=0.01)"] = partial(
     qgt.QGTJacobianDense, diag_scale=0.01, diag_shift=0.01
 )
+QGT_objects["JacobianDense(streaming)"] = partial(
+    qgt.QGTJacobianDense, streaming=True, diag_shift=0.01
+)
 
 solvers = {}
 solvers_tol = {}
@@ -65,6 +68,9 @@ solvers_tol = {}
 solvers["gmres"] = partial(jax.scipy.sparse.linalg.gmres, tol=1e-6)
 solvers_tol[solvers["gmres"], np.dtype("float64")] = 5e-4, 0
 solvers_tol[solvers["gmres"], np.dtype("float32")] = 1e-2, 1e-4
+solvers["deflated_cg"] = nk.optimizer.solver.deflated_cg(tol=1e-6)
+solvers_tol[solvers["deflated_cg"], np.dtype("float64")] = 5e-4, 0
+solvers_tol[solvers["deflated_cg"], np.dtype("float32")] = 1e-2, 1e-4
 solvers["cholesky"] = nk.optimizer.solver.cholesky
 solvers_tol[solvers["cholesky"], np.dtype("float64")] = 1e-8, 0
 solvers_tol[solvers["cholesky"], np.dtype("float32")] = 1e-2, 1e-4
@@ -423,3 +429,159 @@ def test_qgt_onthefly_correct_chunking_selection():
         vstate.chunk_size = vstate.n_samples // (2 * len(jax.devices()))
         QGT = nk.optimizer.qgt.QGTOnTheFly(vstate)
         assert QGT._mat_vec.func is not _mat_vec
+
+
+@common.skipif_mpi
+@pytest.mark.parametrize(
+    "qgt", [pytest.param(qgt.QGTJacobianDense), pytest.param(qgt.QGTJacobianPyTree)]
+)
+@pytest.mark.parametrize("chunk_size", [None])
+def test_qgt_jacobian_mixed_precision(qgt, vstate):
+    if nk.jax.dtype_real(vstate.model.param_dtype) == np.dtype("float32"):
+        pytest.skip("Only relevant for double precision parameters")
+
+    S = qgt(vstate, diag_shift=0.01)
+    S_mixed = qgt(vstate, diag_shift=0.01, jacobian_dtype=jnp.float32)
+
+    O_dtypes = {x.dtype for x in jax.tree_util.tree_leaves(S_mixed.O)}
+    assert O_dtypes <= {np.dtype("float32"), np.dtype("complex64")}
+
+    # products are accumulated in double precision
+    Sd = S.to_dense()
+    Sd_mixed = S_mixed.to_dense()
+    assert Sd_mixed.dtype == Sd.dtype
+    np.testing.assert_allclose(Sd_mixed, Sd, rtol=1e-5, atol=1e-7)
+
+    x, _ = S.solve(nk.optimizer.solver.cholesky, vstate.parameters)
+    x_mixed, _ = S_mixed.solve(nk.optimizer.solver.cholesky, vstate.parameters)
+
+    def check(a, b):
+        assert a.dtype == b.dtype
+        np.testing.assert_allclose(a, b, rtol=1e-4, atol=1e-6)
+
+    jax.tree_util.tree_map(check, x, x_mixed)
+    jax.tree_util.tree_map(check, S @ vstate.parameters, S_mixed @ vstate.parameters)
+
+    # refinement reduces the error of an inexact solver
+    def residual(S, x):
+        r = jax.tree_util.tree_map(jnp.subtract, vstate.parameters, S @ x)
+        return nk.jax.tree_norm(r)
+
+    solver = partial(jax.scipy.sparse.linalg.cg, maxiter=2)
+    x, _ = S_mixed.solve(solver, vstate.parameters)
+    x_refined, _ = S_mixed.replace(refine_steps=2).solve(solver, vstate.parameters)
+    assert residual(S, x_refined) < residual(S, x)
+
+    # and, as the residuals are computed in full precision, also the error due
+    # to the rounding of the jacobian with an exact solver
+    S_bf16 = qgt(vstate, diag_shift=0.01, jacobian_dtype=jnp.bfloat16)
+    x_bf16, _ = S_bf16.solve(nk.optimizer.solver.cholesky, vstate.parameters)
+    x_refined, _ = S_bf16.replace(refine_steps=3).solve(
+        nk.optimizer.solver.cholesky, vstate.parameters
+    )
+    assert residual(S, x_refined) < 0.1 * residual(S, x_bf16)
+
+
+@pytest.mark.parametrize(
+    "qgt_approx",
+    [
+        pytest.param(qgt.QGTDiagonal, id="Diagonal"),
+        # not a divisor of the number of samples
+        pytest.param(
+            partial(qgt.QGTDiagonal, chunk_size=100), id="Diagonal[chunk=100]"
+        ),
+        pytest.param(qgt.QGTKFAC, id="KFAC"),
+        pytest.param(partial(qgt.QGTKFAC, max_factor_size=2), id="KFAC[diag]"),
+    ],
+)
+@pytest.mark.parametrize(
+    "chunk_size", [pytest.param(x, id=f"chunk={x}") for x in [None, 16]]
+)
+def test_qgt_streaming_approximations(qgt_approx, vstate, chunk_size):
+    # the exact S matrix with the parameters split into real and imaginary part
+    mode = "complex" if nk.jax.tree_leaf_iscomplex(vstate.parameters) else None
+    S_exact = qgt.QGTJacobianDense(vstate, mode=mode).to_dense()
+
+    S = qgt_approx(vstate, diag_shift=0.01)
+    S_dense = S.to_dense()
+    assert S_dense.shape == S_exact.shape
+
+    rtol, atol = dense_tol[nk.jax.dtype_real(vstate.model.param_dtype)]
+    # the diagonal approximation is exact on the diagonal, the Kronecker one
+    # preserves the trace of every block
+    np.testing.assert_allclose(
+        np.trace(S_dense) - 0.01 * S_dense.shape[0],
+        np.trace(S_exact),
+        rtol=rtol,
+        atol=atol,
+    )
+    if isinstance(S, qgt.QGTDiagonalT):
+        np.testing.assert_allclose(
+            np.diag(S_dense) - 0.01, np.diag(S_exact), rtol=rtol, atol=atol
+        )
+
+    # the solution is exact for the approximated matrix
+    x, _ = S.solve(jax.scipy.sparse.linalg.cg, vstate.parameters)
+    dtype = nk.jax.dtype_real(vstate.model.param_dtype)
+    rtol, atol = solvers_tol[solvers["cholesky"], dtype]
+    jax.tree_util.tree_map(
+        partial(testing.assert_allclose, rtol=rtol, atol=atol),
+        S @ x,
+        vstate.parameters,
+    )
+
+
+@pytest.mark.parametrize("chunk_size", [None])
+def test_qgt_streaming_running_average(vstate):
+    sr = nk.optimizer.SR(qgt.QGTKFAC(decay=0.5), diag_shift=0.01)
+    sr(vstate, vstate.parameters)
+    S_old = sr._lhs
+    vstate.sample()
+    sr(vstate, vstate.parameters)
+
+    S_new = qgt.QGTKFAC(vstate, diag_shift=0.01)
+    jax.tree_util.tree_map(
+        lambda old, new, avg: np.testing.assert_allclose(avg, (old + new) / 2),
+        S_old.blocks,
+        S_new.blocks,
+        sr._lhs.blocks,
+    )
+
+    with pytest.raises(ValueError):
+        qgt.QGTKFAC(vstate, diag_scale=0.01)
+
+    # the reduction is a static argument, so it must not change between calls
+    from netket.optimizer.qgt.qgt_kfac import _kfac_moments_fun
+
+    assert _kfac_moments_fun(2048) is _kfac_moments_fun(2048)
+
+
+@pytest.mark.parametrize("diag_scale", [None, 0.01])
+@pytest.mark.parametrize(
+    "chunk_size", [pytest.param(x, id=f"chunk={x}") for x in [None, 16]]
+)
+def test_qgt_jacobian_streaming(vstate, diag_scale):
+    S = qgt.QGTJacobianDense(vstate, diag_shift=0.01, diag_scale=diag_scale)
+    # 100 is not a divisor of the number of samples
+    S_streaming = qgt.QGTJacobianDense(
+        vstate, diag_shift=0.01, diag_scale=diag_scale, streaming=True, chunk_size=100
+    )
+    # the S matrix is stored directly
+    n_pars = S.O.shape[-1]
+    assert S_streaming.S.shape == (n_pars, n_pars)
+
+    rtol, atol = dense_tol[nk.jax.dtype_real(vstate.model.param_dtype)]
+    np.testing.assert_allclose(
+        S_streaming.to_dense(), S.to_dense(), rtol=rtol, atol=atol
+    )
+
+    if S.mode == "complex":
+        with pytest.raises(ValueError):
+            S_streaming.to_imag_part()
+
+    with pytest.raises(NotImplementedError):
+        qgt.QGTJacobianPyTree(vstate, streaming=True)
+    with pytest.raises(ValueError, match="streaming"):
+        qgt.QGTJacobianDense(vstate, streaming=True, jacobian_dtype=jnp.float32)
+    with pytest.raises(ValueError, match="streaming"):
+        qgt.QGTJacobianDense(vstate, streaming=True, refine_steps=1)
@@ -16,6 +16,9 @@ import warnings
 
 import pytest
 
+import jax
+import numpy as np
+
 from collections.abc import Callable
 
 import netket as nk
@@ -171,3 +174,38 @@ def test_sr_diag_warnings(qgt):
         warnings.simplefilter("always")
         nk.optimizer.SR(qgt=qgt)
     assert len(w) == 0, "Unexpected warning(s) raised"
+
+
+def test_sr_solver_recycle():
+    N = 5
+    hi = nk.hilbert.Spin(1 / 2, N)
+    vstate = nk.vqs.MCState(
+        nk.sampler.MetropolisLocal(hi),
+        nk.models.RBM(alpha=1),
+        n_samples=512,
+    )
+    vstate.sample()
+    gradient = vstate.parameters
+
+    sr = nk.optimizer.SR(
+        nk.optimizer.qgt.QGTOnTheFly,
+        solver=nk.optimizer.solver.deflated_cg(tol=1e-8, n_ritz=4),
+        solver_recycle=True,
+    )
+    assert "solver_recycle" in repr(sr)
+
+    x1 = sr(vstate, gradient)
+    n_iter_first = sr.info.n_iter
+    assert sr.info.ritz_vectors.shape == (vstate.n_parameters, 4)
+
+    # solving the same system again deflates the smallest eigenvalues
+    x2 = sr(vstate, gradient)
+    assert sr.info.n_iter < n_iter_first
+    jax.tree_util.tree_map(
+        lambda a, b: np.testing.assert_allclose(a, b, rtol=1e-5, atol=1e-7), x1, x2
+    )
+
+    # recycling requires a solver returning the Ritz vectors
+    sr = nk.optimizer.SR(solver=jax.scipy.sparse.linalg.cg, solver_recycle=True)
+    with pytest.raises(TypeError, match="solver_recycle"):
+        sr(vstate, gradient)
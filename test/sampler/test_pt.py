@@ -201,3 +201,87 @@ def test_multiplerules_pt_mpi(model_and_weights):
         chain_length=10,
     )
     assert samples.shape == (sa.n_batches // sa.n_replicas, 10, hi.size)
+
+
+@common.skipif_mpi
+def test_ladder_adaptation(model_and_weights):
+    hi = nk.hilbert.Spin(s=0.5, N=6)
+    sa = nk.sampler.ParallelTemperingLocal(hi, n_replicas=8, n_adapt=4)
+    ma, w = model_and_weights(hi, sa)
+
+    sampler_state = sa.init_state(ma, w, seed=SAMPLER_SEED)
+    sampler_state = sa.reset(ma, w, state=sampler_state)
+    _, sampler_state = sa.sample(ma, w, state=sampler_state, chain_length=4)
+    assert sampler_state.ladder_adapt_steps == 4 * sa.sweep_size
+
+    # every chain holds a permutation of the same ladder, with fixed endpoints
+    ladder = np.sort(np.asarray(sampler_state.beta), axis=-1)[:, ::-1]
+    np.testing.assert_allclose(ladder, np.broadcast_to(ladder[0], ladder.shape))
+    assert ladder[0, 0] == 1.0
+    np.testing.assert_allclose(ladder[0, -1], sa.sorted_betas[-1])
+    assert np.all(np.diff(ladder[0]) < 0)
+    assert not np.allclose(ladder[0], sa.sorted_betas)
+
+    # the ladder is frozen after the adaptation
+    _, sampler_state = sa.sample(ma, w, state=sampler_state, chain_length=2)
+    np.testing.assert_allclose(
+        np.sort(np.asarray(sampler_state.beta), axis=-1)[:, ::-1], ladder
+    )
+
+
+@common.skipif_mpi
+def test_chunking_invariant(model_and_weights):
+    hi = nk.hilbert.Spin(s=0.5, N=6)
+
+    samples = []
+    for chunk_size in [None, 4]:
+        sa = nk.sampler.ParallelTemperingLocal(
+            hi, n_replicas=4, n_chains=8, chunk_size=chunk_size
+        )
+        ma, w = model_and_weights(hi, sa)
+        sampler_state = sa.init_state(ma, w, seed=SAMPLER_SEED)
+        samples_i, _ = sa.sample(ma, w, state=sampler_state, chain_length=5)
+        samples.append(samples_i)
+
+    np.testing.assert_allclose(samples[0], samples[1])
+
+
+class _Ferro(flax.linen.Module):
+    J: float = 1.5
+
+    @flax.linen.compact
+    def __call__(self, x):
+        b = self.param("b", flax.linen.initializers.zeros, (1,))
+        return self.J * jnp.sum(x * jnp.roll(x, 1, -1), axis=-1) + b[0]
+
+
+@common.skipif_mpi
+def test_ladder_adaptation_equalizes_exchanges():
+    # for a ferromagnet a logarithmic ladder exchanges much more easily at
+    # low temperature: the adaptation should even out the exchange rates
+    hi = nk.hilbert.Spin(s=0.5, N=12)
+    ma = _Ferro()
+    w = ma.init(jax.random.PRNGKey(WEIGHT_SEED), jnp.zeros((1, hi.size)))
+
+    def exchange_rates(n_adapt):
+        sa = nk.sampler.ParallelTemperingLocal(
+            hi, n_replicas=8, n_chains=16, n_adapt=n_adapt, betas="log"
+        )
+        state = sa.reset(ma, w, sa.init_state(ma, w, seed=0))
+        if n_adapt:
+            _, state = sa.sample(ma, w, state=state, chain_length=n_adapt)
+        acc_0 = np.asarray(state.n_accepted_exchanges).sum(0)
+        prop_0 = np.asarray(state.n_proposed_exchanges).sum(0)
+        _, state = sa.sample(ma, w, state=state, chain_length=60)
+        assert state.exchange_acceptance.shape == (sa.n_replicas - 1,)
+        acc = np.asarray(state.n_accepted_exchanges).sum(0) - acc_0
+        prop = np.asarray(state.n_proposed_exchanges).sum(0) - prop_0
+        assert np.all(prop > 0)
+        return acc / prop
+
+    rates_fixed = exchange_rates(0)
+    rates_adapted = exchange_rates(40)
+
+    spread_fixed = rates_fixed.std() / rates_fixed.mean()
+    spread_adapted = rates_adapted.std() / rates_adapted.mean()
+    assert spread_adapted < 0.5 * spread_fixed
@@ -66,11 +66,18 @@ hi_fermion_spin_higher = nk.hilbert.SpinOrbitalFermions(
 
 samplers["Exact: Spin"] = nk.sampler.ExactSampler(hi)
 samplers["Exact: Fock"] = nk.sampler.ExactSampler(hib_u)
+samplers["BlockedExact: Spin"] = nk.sampler.BlockedExactSampler(hi, block_size=5)
+samplers["BlockedExact: Fock"] = nk.sampler.BlockedExactSampler(
+    hib_u, block_size=32, chunk_size=8
+)
 
 samplers["Metropolis(Local): Spin"] = nk.sampler.MetropolisLocal(hi)
 samplers["Metropolis(Local): Spin-chunked"] = nk.sampler.MetropolisLocal(
     hi, chunk_size=8
 )
+samplers["Metropolis(Local,MultipleTry): Spin-chunked"] = nk.sampler.MetropolisLocal(
+    hi, n_tries=3, chunk_size=8
+)
 
 samplers["MetropolisNumpy(Local): Spin"] = nk.sampler.MetropolisLocalNumpy(hi)
 samplers["MetropolisNumpy(Local): Spin-chunked"] = nk.sampler.MetropolisLocalNumpy(
@@ -88,6 +95,8 @@ samplers["MetropolisPT(Local): Fock"] = nk.sampler.ParallelTemperingLocal(
     hib_u, n_replicas=4, sweep_size=hib_u.size * 4
 )
 
+samplers["SMC(Local): Spin"] = nk.sampler.SMCSampler(hi, nk.sampler.rules.LocalRule())
+
 samplers["Metropolis(Exchange): Fock-1particle"] = nk.sampler.MetropolisExchange(
     hib, graph=g
 )
@@ -101,6 +110,20 @@ if not config.netket_experimental_sharding:
         )
     )
 
+samplers["Metropolis(ClusterFlip): Spin"] = nk.sampler.MetropolisSampler(
+    hi, nk.sampler.rules.ClusterFlipRule(g, bond_probability=0.4)
+)
+samplers["Metropolis(ClusterFlip,Antiferromagnetic): Spin"] = (
+    nk.sampler.MetropolisSampler(
+        hi, nk.sampler.rules.ClusterFlipRule(g, antiferromagnetic=True)
+    )
+)
+samplers["Metropolis(LoopExchange): SpinOrbitalFermions"] = (
+    nk.sampler.MetropolisSampler(
+        hi_fermion, nk.sampler.rules.LoopExchangeRule(g, length=3)
+    )
+)
+
 samplers["Metropolis(ParticleExchange): SpinOrbitalFermions"] = (
     nk.sampler.MetropolisFermionHop(hi_fermion, graph=g)
 )
@@ -129,6 +152,22 @@ samplers["Metropolis(Hamiltonian, jax operator): Spin"] = (
     )
 )
 
+ha_bose = sum(
+    nk.operator.boson.create(hib_u, i) + nk.operator.boson.destroy(hib_u, i)
+    for i in range(hib_u.size)
+) + sum(
+    nk.operator.boson.create(hib_u, i) * nk.operator.boson.destroy(hib_u, j)
+    + nk.operator.boson.create(hib_u, j) * nk.operator.boson.destroy(hib_u, i)
+    for i, j in g.edges()
+)
+
+samplers["Metropolis(Hamiltonian, jax local operator): Fock"] = (
+    nk.sampler.MetropolisHamiltonian(
+        hib_u,
+        hamiltonian=ha_bose.to_jax_operator(),
+    )
+)
+
 samplers["Metropolis(Custom: Sx): Spin"] = nk.sampler.MetropolisCustom(
     hi, move_operators=move_op
 )
@@ -170,6 +209,15 @@ samplers["Metropolis(AdjustedLangevin): AdjustedLangevin"] = (
 samplers["Metropolis(AdjustedLangevin): AdjustedLangevin chunk_size"] = (
     nk.sampler.MetropolisAdjustedLangevin(hi_particles, dt=0.1, chunk_size=16)
 )
+samplers["Metropolis(AdjustedLangevin,MultipleTry): AdjustedLangevin"] = (
+    nk.sampler.MetropolisAdjustedLangevin(hi_particles, dt=0.1, n_tries=2)
+)
+samplers["HamiltonianMC: HMC"] = nk.sampler.HamiltonianMC(
+    hi_particles, step_size=0.3, n_leapfrog=5
+)
+samplers["HamiltonianMC: NUTS chunk_size"] = nk.sampler.HamiltonianMC(
+    hi_particles, step_size=0.3, nuts=True, max_tree_depth=5, chunk_size=8
+)
 
 # TensorHilbert sampler
 hi = nk.hilbert.Spin(0.5, 4) * nk.hilbert.Fock(3)
@@ -466,7 +514,9 @@ def test_sampling_sharded_not_communicating(
 ):
     if isinstance(sampler_c, nk.sampler.MetropolisNumpy):
         pytest.skip("Not jit compatible")
-    if isinstance(sampler_c, nk.sampler.ExactSampler):
+    if isinstance(
+        sampler_c, (nk.sampler.ExactSampler, nk.sampler.BlockedExactSampler)
+    ):
         pytest.xfail("Error logic communicates")
 
     sampler = set_pdf_power(sampler_c)
@@ -602,7 +652,11 @@ def test_setup_throwing_multiplerules():
 
 @common.skipif_distributed
 def test_exact_sampler(sampler):
-    known_exact_samplers = (nk.sampler.ExactSampler, nk.sampler.ARDirectSampler)
+    known_exact_samplers = (
+        nk.sampler.ExactSampler,
+        nk.sampler.BlockedExactSampler,
+        nk.sampler.ARDirectSampler,
+    )
     if isinstance(sampler, known_exact_samplers):
         assert sampler.is_exact is True
         assert sampler.n_chains_per_rank == 1
@@ -704,6 +758,60 @@ def test_hamiltonian_jax_sampler_isleaf():
         assert found
 
 
+def test_hamiltonian_jax_local_operator_transition():
+    ha_jax = ha_bose.to_jax_operator()
+    rule = nk.sampler.rules.HamiltonianRule(ha_jax)
+    assert rule._tables is not None
+
+    x = hib_u.random_state(jax.random.PRNGKey(0), 64)
+    key = jax.random.PRNGKey(1)
+    xp, log_prob_corr = rule.transition(None, None, None, None, key, x)
+
+    # the proposed configurations are connected to the initial ones
+    xc, mels = ha_bose.get_conn_padded(np.asarray(x))
+    for i in range(x.shape[0]):
+        connected = xc[i][mels[i] != 0]
+        assert np.any(np.all(connected == np.asarray(xp[i]), axis=-1))
+
+    # and the correction matches the one computed from the full operator
+    log_n_conn = np.log(ha_jax.n_conn(x)) - np.log(ha_jax.n_conn(xp))
+    np.testing.assert_allclose(log_prob_corr, log_n_conn)
+
+
+def test_hamiltonian_jax_local_operator_rule_state():
+    ha_jax = ha_bose.to_jax_operator()
+    sa = nk.sampler.MetropolisSampler(
+        hib_u, nk.sampler.rules.HamiltonianRule(ha_jax), n_chains=16
+    )
+    ma = nk.models.RBM()
+    w = ma.init(jax.random.PRNGKey(WEIGHT_SEED), jnp.zeros((1, hib_u.size)))
+
+    sampler_state = sa.reset(ma, w, sa.init_state(ma, w, seed=SAMPLER_SEED))
+    _, sampler_state = sa.sample(ma, w, state=sampler_state, chain_length=20)
+    assert np.sum(sampler_state.n_accepted) > 0
+
+    # the counts kept along the chain match the ones of the final configurations
+    rule_state = sampler_state.rule_state
+    n_conn = ha_jax.n_conn(sampler_state.σ)
+    np.testing.assert_array_equal(np.asarray(rule_state.n_conn), np.asarray(n_conn))
+    expected = sa.rule.reset(sa, ma, w, sampler_state)
+    np.testing.assert_array_equal(
+        np.asarray(rule_state.tree), np.asarray(expected.tree)
+    )
+
+
+def test_cluster_rules_throwing():
+    with pytest.raises(ValueError, match="bond_probability"):
+        nk.sampler.rules.ClusterFlipRule(g, bond_probability=1.0)
+    sampler = nk.sampler.MetropolisSampler(hib_u, nk.sampler.rules.ClusterFlipRule(g))
+    ma = nk.models.RBM()
+    w = ma.init(jax.random.PRNGKey(WEIGHT_SEED), jnp.zeros((1, hib_u.size)))
+    with pytest.raises(ValueError, match="two local states"):
+        sampler.init_state(ma, w, seed=SAMPLER_SEED)
+    with pytest.raises(ValueError, match="length"):
+        nk.sampler.rules.LoopExchangeRule(g, length=1)
+
+
 # we've got chunked samplers for these two
 @pytest.mark.parametrize(
     "sampler_type", ["MetropolisNumpy(Local): Spin", "Metropolis(Local): Spin"]
@@ -742,3 +850,104 @@ def test_chunking_invariant(model_and_weights, sampler_type):
     )
 
     np.testing.assert_allclose(samples, samples_ch)
+
+
+@common.skipif_distributed
+def test_langevin_cached_gradient(model_and_weights):
+    sa = samplers["Metropolis(AdjustedLangevin): AdjustedLangevin"]
+    ma, w = model_and_weights(sa.hilbert, sa)
+
+    sampler_state = sa.init_state(ma, w, seed=SAMPLER_SEED)
+    sampler_state = sa.reset(ma, w, state=sampler_state)
+    _, sampler_state = sa.sample(ma, w, state=sampler_state, chain_length=10)
+
+    # the rule state must hold the gradient of the log probability at the
+    # current configurations, and the log probability must match the model
+    def log_prob(x):
+        return sa.machine_pow * ma.apply(w, x).real.ravel()[0]
+
+    σ = sampler_state.σ
+    grad = jax.vmap(jax.grad(log_prob))(σ)
+    np.testing.assert_allclose(sampler_state.rule_state, grad, rtol=1e-5, atol=1e-6)
+    np.testing.assert_allclose(
+        sampler_state.log_prob, jax.vmap(log_prob)(σ), rtol=1e-5, atol=1e-6
+    )
+
+
+@common.skipif_distributed
+@pytest.mark.parametrize("nuts", [False, True])
+def test_hamiltonian_mc_adaptation_pbc(nuts):
+    hi = nk.hilbert.Particle(N=2, L=(2.0, 3.0), pbc=(True, False))
+    ma = nk.models.Gaussian()
+    w = ma.init(jax.random.PRNGKey(WEIGHT_SEED), jnp.zeros((1, hi.size)))
+
+    sa = nk.sampler.HamiltonianMC(hi, step_size=1.0, nuts=nuts, n_adapt=10)
+    sampler_state = sa.init_state(ma, w, seed=SAMPLER_SEED)
+    sampler_state = sa.reset(ma, w, state=sampler_state)
+
+    # the step size only changes during the first n_adapt samples
+    _, sampler_state = sa.sample(ma, w, state=sampler_state, chain_length=10)
+    assert sampler_state.n_adapt_steps == 10
+    step_size = sampler_state.step_size
+    assert step_size != 1.0
+
+    samples, sampler_state = sa.sample(ma, w, state=sampler_state, chain_length=20)
+    assert sampler_state.n_adapt_steps == 10
+    assert sampler_state.step_size == step_size
+    assert 0 < sampler_state.acceptance <= 1
+
+    # the periodic dimensions are wrapped in the box
+    samples = np.asarray(samples).reshape(-1, hi.n_particles, 2)
+    assert np.all(samples[..., 0] >= 0) and np.all(samples[..., 0] < 2.0)
+
+    # the gradient in the state is the one at the current configurations
+    def log_prob(x):
+        return sa.machine_pow * ma.apply(w, x).real.ravel()[0]
+
+    grad = jax.vmap(jax.grad(log_prob))(sampler_state.σ)
+    np.testing.assert_allclose(sampler_state.grad_log_prob, grad, rtol=1e-5)
+
+
+def test_multiple_try_throwing():
+    with pytest.raises(ValueError, match="n_tries"):
+        nk.sampler.MetropolisLocal(hi, n_tries=0)
+    with pytest.raises(ValueError, match="n_tries"):
+        nk.sampler.ParallelTemperingLocal(hi, n_replicas=2, n_tries=2)
+    with pytest.raises(ValueError, match="n_tries"):
+        nk.sampler.MetropolisLocalNumpy(hi, n_tries=2)
+
+
+def test_smc_reweighting(model_and_weights):
+    sampler = nk.sampler.SMCSampler(
+        hi, nk.sampler.rules.LocalRule(), n_chains=64, ess_threshold=0.5
+    )
+    ma, w = model_and_weights(hi, sampler)
+
+    # the first reset always thermalizes the population
+    state = sampler.reset(ma, w, sampler.init_state(ma, w, seed=SAMPLER_SEED))
+    assert state.ess == 0
+    assert state.n_rejuvenations == 1
+    _, state = sampler.sample(ma, w, state=state, chain_length=2)
+
+    # the population is already distributed according to the same parameters
+    state = sampler.reset(ma, w, state)
+    np.testing.assert_allclose(state.ess, 1.0)
+    assert state.n_rejuvenations == 1
+    _, state = sampler.sample(ma, w, state=state, chain_length=2)
+
+    # very different parameters make the weights degenerate
+    w2 = jax.tree_util.tree_map(lambda x: 20 * x, w)
+    state = sampler.reset(ma, w2, state)
+    assert state.ess < 0.5
+    assert state.n_rejuvenations == 2
+
+    # the population is only resampled when there are no rejuvenation sweeps
+    sampler = sampler.replace(n_rejuvenation=0)
+    state = sampler.reset(ma, w, sampler.init_state(ma, w, seed=SAMPLER_SEED))
+    assert state.ess == 0
+    assert state.n_rejuvenations == 0
+
+    with pytest.raises(ValueError, match="reset_chains"):
+        nk.sampler.SMCSampler(hi, nk.sampler.rules.LocalRule(), reset_chains=True)
+    with pytest.raises(ValueError, match="ess_threshold"):
+        nk.sampler.SMCSampler(hi, nk.sampler.rules.LocalRule(), ess_threshold=2)
@@ -370,6 +370,72 @@ def test_call_perm(grp):
             assert np.all(σ == s[:, p.apply_to_id(indices)])
 
 
+def test_permutation_group_from_array():
+    sg = nk.graph.Square(4).space_group()
+    perms = np.asarray(sg)
+    names = [repr(g) for g in sg]
+
+    grp = group.PermutationGroup(perms, names=names)
+    assert grp.degree == sg.degree
+    assert grp == sg
+    assert hash(grp) == hash(sg)
+    assert grp.to_array().dtype == np.int32
+    assert [repr(g) for g in grp] == names
+    assert group.Permutation(perms[3]) in grp.elems
+    assert_equal(grp.inverse, sg.inverse)
+    assert_equal(grp.product_table, sg.product_table)
+    assert_allclose(grp.character_table(), sg.character_table(), atol=1e-12)
+
+    # the product of groups is computed on the arrays, the elements lazily
+    tg = nk.graph.Square(4).translation_group()
+    pg = nk.graph.Square(4).point_group()
+    elems = [a @ b for a in tg for b in pg]
+    assert_equal(np.asarray(tg @ pg), [x(np.arange(tg.degree)) for x in elems])
+    assert [repr(g) for g in tg @ pg] == [repr(g) for g in elems]
+
+
+@pytest.mark.parametrize(
+    "grp",
+    [
+        nk.graph.Square(4).space_group(),
+        nk.graph.Chain(6).space_group(),
+        nk.graph.Triangular([3, 3]).space_group(),
+    ],
+)
+def test_permutation_group_tables_brute_force(grp):
+    # reference computed directly on the permutation arrays: the array of g @ h
+    # is h[g] and the one of g^{-1} is argsort(g)
+    perms = np.asarray(grp)
+    index = {tuple(p): i for i, p in enumerate(perms)}
+    inverse = [index[tuple(np.argsort(g))] for g in perms]
+    product_table = [[index[tuple(h[np.argsort(g)])] for h in perms] for g in perms]
+    conjugates = [
+        frozenset(index[tuple(h[g[np.argsort(h)]])] for h in perms) for g in perms
+    ]
+
+    assert_equal(grp.inverse, inverse)
+    assert_equal(grp.product_table, product_table)
+
+    classes, representatives, class_index = grp.conjugacy_classes
+    assert {frozenset(np.flatnonzero(c)) for c in classes} == set(conjugates)
+    assert_equal(representatives, sorted({min(c) for c in conjugates}))
+    for g, c in enumerate(conjugates):
+        assert classes[class_index[g], g]
+        assert set(np.flatnonzero(classes[class_index[g]])) == c
+
+
+def test_permutation_group_remove_duplicates():
+    sg = nk.graph.Square(3).space_group()
+    perms = np.asarray(sg)
+    idx = np.random.default_rng(0).integers(0, len(sg), size=3 * len(sg))
+
+    grp, inverse = group.PermutationGroup(perms[idx]).remove_duplicates(
+        return_inverse=True
+    )
+    assert len(grp) == len(np.unique(idx))
+    assert_equal(np.asarray(grp)[inverse], perms[idx])
+
+
 # Testing __call__() for PointGroup
 @pytest.mark.parametrize("grp", cubics + icosas)
 def test_call_point(grp):
@@ -520,6 +520,170 @@ def test_expect_chunking(vstate, operator, n_chunks):
     )
 
 
+@pytest.mark.parametrize("chunk_size", [None, 2])
+def test_expect_many(vstate, chunk_size):
+    vstate.chunk_size = chunk_size
+    obs = dict(operators)
+    # diagonal operators sharing all their connected elements
+    for i in range(hi.size):
+        obs[f"zz{i}"] = nk.operator.spin.sigmaz(hi, 0) @ nk.operator.spin.sigmaz(hi, i)
+
+    stats_many = vstate.expect_many(obs)
+    assert stats_many.keys() == obs.keys()
+
+    for name, op in obs.items():
+        stats = vstate.expect(op)
+        assert stats_many[name].mean == approx(stats.mean, nan_ok=True)
+        assert stats_many[name].variance == approx(stats.variance, nan_ok=True)
+        assert stats_many[name].error_of_mean == approx(stats.error_of_mean, nan_ok=True)
+
+
+@pytest.mark.parametrize("collide", [False, True])
+def test_expect_many_unique_rows(collide):
+    from netket.vqs.mc.mc_state.expect_many import _UniqueRows
+
+    x = np.random.default_rng(0).integers(0, 2, size=(50, 6)).astype(np.int8)
+    table = _UniqueRows(x)
+    if collide:
+        # all hashes collide, so every row is checked against the stored one
+        table._coeffs[:] = 0
+
+    chunks = [x[:20], x[10:40], x[:0], x[30:], x]
+    indices = [table.add(chunk) for chunk in chunks]
+    for chunk, idx in zip(chunks, indices):
+        np.testing.assert_array_equal(table.rows[idx], chunk)
+    if not collide:
+        assert len(table.rows) == len(np.unique(x, axis=0))
+
+
+@common.skipif_mpi
+def test_reweighting():
+    from netket.experimental.driver import VMC_SRt
+
+    ma = nk.models.RBM(alpha=1, param_dtype=float)
+    sa = nk.sampler.ExactSampler(hilbert=hi)
+    H = operators["operator:(Hermitian Real)"]
+
+    with raises(ValueError, match="reweighting_threshold"):
+        nk.vqs.MCState(sa, ma, reweighting_threshold=0.0)
+
+    vs = nk.vqs.MCState(sa, ma, n_samples=4096, seed=SEED, reweighting_threshold=0.5)
+    vs_exact = nk.vqs.FullSumState(hi, ma, variables=vs.variables)
+
+    samples = vs.samples
+    assert vs.sample_weights is None
+
+    # a small change of the parameters reuses the samples with importance weights
+    vs.parameters = jax.tree_util.tree_map(lambda x: 1.05 * x, vs.parameters)
+    vs_exact.parameters = vs.parameters
+    np.testing.assert_array_equal(vs.samples, samples)
+    weights = vs.sample_weights
+    assert weights.shape == samples.shape[:-1]
+    assert np.mean(weights) == approx(1.0)
+
+    σ = samples.reshape(-1, hi.size)
+    σp, mels = H.get_conn_padded(σ)
+    O_loc = np.sum(mels * np.exp(vs.log_value(σp) - vs.log_value(σ)[:, None]), axis=-1)
+    O_loc = O_loc.reshape(weights.shape)
+
+    E = vs.expect(H)
+    assert E.mean == approx(np.mean(weights * O_loc))
+    assert E.variance == approx(np.mean(weights * np.abs(O_loc - E.mean) ** 2))
+    assert E.mean == approx(vs_exact.expect(H).mean, abs=5 * E.error_of_mean)
+
+    # the QGT is the covariance of the jacobian under the weighted distribution
+    jac = nk.jax.jacobian(
+        vs._apply_fun, vs.parameters, σ, vs.model_state, mode="real", dense=True
+    )
+    pdf = weights.reshape(-1) / weights.size
+    ΔO = jac - pdf @ jac
+    S_exact = (pdf[:, None] * ΔO).T @ ΔO
+    for qgt in [nk.optimizer.qgt.QGTJacobianDense, nk.optimizer.qgt.QGTOnTheFly]:
+        np.testing.assert_allclose(qgt(vs).to_dense(), S_exact, atol=1e-10)
+    np.testing.assert_allclose(
+        nk.optimizer.qgt.QGTDiagonal(vs).to_dense(), np.diag(np.diag(S_exact))
+    )
+
+    with raises(ValueError, match="sample_weights"):
+        vs.local_estimators(H)
+
+    _, f = vs.expect_and_forces(H)
+    vs.chunk_size = 64
+    E_chunked, f_chunked = vs.expect_and_forces(H)
+    assert E_chunked.mean == approx(E.mean)
+    jax.tree_util.tree_map(np.testing.assert_allclose, f_chunked, f)
+    assert vs.expect(H).mean == approx(E.mean)
+    assert vs.expect_many([H])[0].mean == approx(E.mean)
+
+    # a large change of the parameters makes the state sample again
+    vs.parameters = jax.tree_util.tree_map(lambda x: 100 * x, vs.parameters)
+    assert vs.sample_weights is None
+    assert not np.array_equal(vs.samples, samples)
+
+    with raises(ValueError, match="reweighting_threshold"):
+        VMC_SRt(H, nk.optimizer.Sgd(0.01), diag_shift=0.01, variational_state=vs)
+    with raises(ValueError, match="reweighting_threshold"):
+        nk.vqs.MCMixedState(
+            nk.sampler.ExactSampler(nk.hilbert.DoubledHilbert(hi)),
+            nk.models.NDM(),
+            reweighting_threshold=0.5,
+        )
+
+
+@pytest.mark.parametrize("chunk_size", [None, 1, 3, 64])
+def test_logpsi_conn_compacted(chunk_size):
+    from netket.vqs.mc.kernels import logpsi_conn_compacted
+
+    n_evals = []
+
+    def logpsi(x):
+        jax.debug.callback(lambda n: n_evals.append(int(n)), x.shape[0])
+        return x.sum(axis=-1) * 0.1 + 1j * x[..., 0]
+
+    σp = jax.random.normal(jax.random.PRNGKey(0), (4, 5, 3))
+    mels = jax.random.bernoulli(jax.random.PRNGKey(1), 0.3, (4, 5)) * 1.0
+    logpsi_σ = jax.random.normal(jax.random.PRNGKey(2), (4,))
+
+    res = logpsi_conn_compacted(logpsi, σp, mels, logpsi_σ, chunk_size=chunk_size)
+    jax.effects_barrier()
+
+    # only the smallest bucketed width (20, 10 or 5) holding all the nonzero
+    # matrix elements is evaluated
+    n_nonzero = int((mels != 0).sum())
+    width = min(w for w in [20, 10, 5] if w >= n_nonzero)
+    assert width < mels.size
+    assert sum(n_evals) == width
+    if chunk_size is None:
+        assert len(n_evals) == 1
+
+    expected = np.where(mels != 0, logpsi(σp), logpsi_σ[:, None])
+    np.testing.assert_allclose(res, expected)
+
+
+@common.skipif_sharding
+@pytest.mark.parametrize("chunk_size", [2, 500])
+def test_local_values_packed_configurations(vstate, chunk_size):
+    from netket.vqs.mc.kernels import (
+        get_conn_padded_maybe_packed,
+        logpsi_conn_compacted,
+    )
+
+    op = operators["operator:(IsingJax)"]
+    σ = vstate.samples.reshape(-1, hi.size)
+    logpsi = partial(vstate._apply_fun, vstate.variables)
+
+    σp, mels, unpack = get_conn_padded_maybe_packed(op, σ, packed=True)
+    assert σp.dtype == np.uint32
+
+    logpsi_σ = logpsi(σ)
+    logpsi_σp = logpsi_conn_compacted(
+        lambda x: logpsi(unpack(x)), σp, mels, logpsi_σ, chunk_size=chunk_size
+    )
+    O_loc = jax.numpy.sum(mels * np.exp(logpsi_σp - logpsi_σ[:, None]), axis=-1)
+
+    np.testing.assert_allclose(O_loc, vstate.local_estimators(op).reshape(-1))
+
+
 def test_reproducible_copy():
     # This checks that if i duplicate a variational state and perform the same operations
     # I get exactly the same samples
@@ -271,6 +271,16 @@ def test_expect_numpysampler_works(vstate, operator):
     assert isinstance(out, nk.stats.Stats)
 
 
+def test_expect_does_not_prepare_variables_from_diagonal(vstate):
+    # physical observables are estimated from the samples of the diagonal, which
+    # are not inputs of the model, so no variables must be precomputed from them
+    vstate.sampler_diag = nk.sampler.MetropolisLocal(hi, n_chains=16)
+    vstate.n_samples_diag = 512
+    exact = vstate.to_matrix() @ ha.to_dense()
+    out = vstate.expect(ha)
+    assert out.mean == approx(np.trace(exact), abs=5 * out.error_of_mean + 1e-8)
+
+
 @common.skipif_sharding  # no jax version of LocalLiouvillian
 @common.skipif_mpi
 @pytest.mark.parametrize(